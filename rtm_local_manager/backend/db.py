@@ -4,41 +4,254 @@ db.py - SQLite schema and basic data access layer for RTM Local Manager.
 
 This module:
 - Creates the SQLite database and all tables if they don't exist.
+- Applies versioned schema migrations keyed on PRAGMA user_version (see MIGRATIONS).
 - Provides a minimal repository-style API for projects, folders, and issues.
 - Is intentionally simple (no external ORM) so it can run in air-gapped environments.
 """
 
 from __future__ import annotations
 
+import json
 import sqlite3
 import re
 import uuid
-from dataclasses import dataclass
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Iterator, Tuple
+
+from .rows import FolderNode, IssueNode, StepRow, TestcaseExecutionRow, fetch_rows
 
 
 DB_FILENAME = "rtm_local_manager.db"
 
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORE_MODES = {"DEFAULT", "FILE", "MEMORY"}
+
+
+class CachedConnection(sqlite3.Connection):
+    """
+    sqlite3.Connection + 연결 단위 캐시.
+
+    sqlite3.Connection 에는 속성을 붙일 수 없으므로, get_connection() 은 이 클래스를 factory 로 사용한다.
+    - folder_path_cache: project_id -> FolderPathIndex (get_folder_paths 참고)
+    - transaction_depth: 현재 열려 있는 transaction() 블록 중첩 수
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.folder_path_cache: Dict[int, "FolderPathIndex"] = {}
+        self.transaction_depth = 0
+
+
+def load_connection_profile() -> Dict[str, Any]:
+    """
+    local_settings.json 의 "database" 섹션(연결 PRAGMA 프로파일)을 반환한다.
+    """
+    from .local_settings import DEFAULT_LOCAL_SETTINGS, load_local_settings
+
+    profile = dict(DEFAULT_LOCAL_SETTINGS["database"])
+    user = load_local_settings().get("database")
+    if isinstance(user, dict):
+        profile.update(user)
+    return profile
+
+
+def _apply_connection_profile(conn: sqlite3.Connection, profile: Dict[str, Any], read_only: bool = False) -> None:
+    """
+    연결 직후 PRAGMA 프로파일을 적용한다. 잘못된 값은 무시하고 SQLite 기본값을 유지한다.
+    """
+    cur = conn.cursor()
+
+    try:
+        busy_ms = int(profile.get("busy_timeout_ms") or 0)
+    except (TypeError, ValueError):
+        busy_ms = 0
+    if busy_ms > 0:
+        cur.execute(f"PRAGMA busy_timeout = {busy_ms}")
+
+    # journal_mode 는 DB 파일에 기록되는 설정이므로 읽기 전용 연결에서는 바꾸지 않는다.
+    journal_mode = str(profile.get("journal_mode") or "").upper()
+    if journal_mode in _JOURNAL_MODES and not read_only:
+        cur.execute(f"PRAGMA journal_mode = {journal_mode}")
+
+    synchronous = str(profile.get("synchronous") or "").upper()
+    if synchronous in _SYNCHRONOUS_MODES:
+        cur.execute(f"PRAGMA synchronous = {synchronous}")
+
+    try:
+        cache_kb = int(profile.get("cache_size_kb") or 0)
+    except (TypeError, ValueError):
+        cache_kb = 0
+    if cache_kb > 0:
+        # 음수 값은 페이지 수가 아니라 KiB 단위를 의미한다.
+        cur.execute(f"PRAGMA cache_size = -{cache_kb}")
+
+    try:
+        mmap_mb = int(profile.get("mmap_size_mb") or 0)
+    except (TypeError, ValueError):
+        mmap_mb = 0
+    if mmap_mb >= 0:
+        cur.execute(f"PRAGMA mmap_size = {mmap_mb * 1024 * 1024}")
+
+    temp_store = str(profile.get("temp_store") or "").upper()
+    if temp_store in _TEMP_STORE_MODES:
+        cur.execute(f"PRAGMA temp_store = {temp_store}")
+
+    cur.execute(f"PRAGMA foreign_keys = {'ON' if profile.get('foreign_keys') else 'OFF'}")
 
-def get_connection(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    if read_only:
+        cur.execute("PRAGMA query_only = ON")
+
+
+def get_connection(db_path: Optional[Path] = None, profile: Optional[Dict[str, Any]] = None) -> sqlite3.Connection:
     """
     Get a sqlite3 connection. If db_path is None, use DB_FILENAME in current working directory.
+
+    profile 이 None 이면 local_settings.json 의 "database" 섹션을 사용하여
+    WAL / synchronous / cache_size / mmap_size / temp_store / foreign_keys / busy_timeout 을 적용한다.
     """
     if db_path is None:
         db_path = Path(DB_FILENAME)
-    conn = sqlite3.connect(db_path)
+    if profile is None:
+        profile = load_connection_profile()
+    try:
+        timeout = max(float(profile.get("busy_timeout_ms") or 0) / 1000.0, 0.0)
+    except (TypeError, ValueError):
+        timeout = 5.0
+    conn = sqlite3.connect(db_path, timeout=timeout, factory=CachedConnection)
     conn.row_factory = sqlite3.Row
+    _apply_connection_profile(conn, profile)
     return conn
 
 
-def init_db(conn: sqlite3.Connection) -> None:
+def get_readonly_connection(db_path: Optional[Path] = None, profile: Optional[Dict[str, Any]] = None) -> sqlite3.Connection:
     """
-    Create all tables if they do not exist.
-    This function is idempotent and can be safely called on startup.
+    조회 전용 연결을 연다 (mode=ro + PRAGMA query_only).
+
+    - WAL 모드에서는 쓰기 연결이 트랜잭션 중이어도 이 연결의 읽기가 막히지 않는다.
+    - 쓰기 시도는 sqlite3.OperationalError 로 실패한다.
+    - DB 파일이 아직 없으면 먼저 get_connection() + init_db() 로 생성해야 한다.
     """
-    cur = conn.cursor()
+    if db_path is None:
+        db_path = Path(DB_FILENAME)
+    if profile is None:
+        profile = load_connection_profile()
+    try:
+        timeout = max(float(profile.get("busy_timeout_ms") or 0) / 1000.0, 0.0)
+    except (TypeError, ValueError):
+        timeout = 5.0
+    if str(db_path) == ":memory:":
+        conn = sqlite3.connect(":memory:", timeout=timeout, factory=CachedConnection)
+    else:
+        uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=timeout, factory=CachedConnection)
+    conn.row_factory = sqlite3.Row
+    _apply_connection_profile(conn, profile, read_only=True)
+    return conn
+
+
+# --- Unit of work -------------------------------------------------------------------
+#
+# repository 함수들은 transaction() 블록 밖에서 호출되면 예전처럼 각자 커밋하고,
+# 블록 안에서 호출되면 커밋하지 않고 가장 바깥 블록이 끝날 때 한 번에 커밋된다.
+#
+#     with transaction(conn):
+#         update_issue_fields(conn, issue_id, fields)
+#         replace_steps_for_issue(conn, issue_id, steps)
+#
+# 중첩된 transaction() 은 SAVEPOINT 가 되어, 안쪽 블록의 예외는 그 블록의 변경만 되돌린다.
+# (executescript() 는 진행 중인 트랜잭션을 커밋해 버리므로 블록 안에서 쓰지 않는다.)
+
+
+# get_connection() 밖에서 연 일반 sqlite3.Connection 의 transaction() 중첩 수.
+# sqlite3.Connection 은 속성도 weakref 도 붙일 수 없으므로 id(conn) 로 보관하며,
+# 블록이 열려 있는 동안에만 항목이 존재한다 (그동안은 연결이 살아 있으므로 id 가 재사용되지 않는다).
+_RAW_TRANSACTION_DEPTHS: Dict[int, int] = {}
+
+
+def transaction_depth(conn: sqlite3.Connection) -> int:
+    """현재 열려 있는 transaction() 블록 중첩 수 (0 이면 블록 밖)."""
+    if isinstance(conn, CachedConnection):
+        return conn.transaction_depth
+    return _RAW_TRANSACTION_DEPTHS.get(id(conn), 0)
+
+
+def _set_transaction_depth(conn: sqlite3.Connection, depth: int) -> None:
+    if isinstance(conn, CachedConnection):
+        conn.transaction_depth = depth
+    elif depth:
+        _RAW_TRANSACTION_DEPTHS[id(conn)] = depth
+    else:
+        _RAW_TRANSACTION_DEPTHS.pop(id(conn), None)
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    conn 에 대한 원자적 작업 단위를 연다. 정상 종료 시 (가장 바깥 블록에서) COMMIT, 예외 시 ROLLBACK.
+    get_connection() 으로 연 연결이 아니어도 (sqlite3.connect() 로 직접 연 연결) 동작한다.
+    """
+    depth = transaction_depth(conn)
+    savepoint = f"sp_{depth}"
+    if depth == 0:
+        if not conn.in_transaction:
+            # 쓰기 잠금을 처음에 잡아 두어, 블록 중간에 다른 연결과 경합(SQLITE_BUSY)하지 않게 한다.
+            conn.execute("BEGIN IMMEDIATE")
+    else:
+        conn.execute(f"SAVEPOINT {savepoint}")
+
+    _set_transaction_depth(conn, depth + 1)
+    try:
+        yield conn
+    except BaseException:
+        _set_transaction_depth(conn, depth)
+        if depth == 0:
+            conn.rollback()
+        else:
+            conn.execute(f"ROLLBACK TO {savepoint}")
+            conn.execute(f"RELEASE {savepoint}")
+        # 되돌린 폴더 쓰기가 연결의 폴더 경로 캐시에 남지 않도록 한다.
+        invalidate_folder_paths(conn)
+        raise
+    _set_transaction_depth(conn, depth)
+    if depth == 0:
+        conn.commit()
+    else:
+        conn.execute(f"RELEASE {savepoint}")
+
+
+def _commit(conn: sqlite3.Connection) -> None:
+    """transaction() 블록 밖일 때만 커밋한다 (블록 안이면 바깥 블록이 커밋)."""
+    if transaction_depth(conn) == 0:
+        conn.commit()
+
+
+# --- Schema migrations ------------------------------------------------------------
+#
+# DB 파일의 PRAGMA user_version 에 마지막으로 적용된 migration 번호를 기록한다.
+# - 각 migration 은 순서대로 한 번만 실행되며, 중간에 실패해도 다시 실행할 수 있도록 idempotent 하게 작성한다.
+# - 새 컬럼/인덱스/테이블은 MIGRATIONS 끝에 새 항목을 추가하는 방식으로만 배포한다.
+#   (이미 배포된 migration 의 내용을 바꾸지 않는다.)
 
+
+def _table_columns(cur: sqlite3.Cursor, table: str) -> List[str]:
+    cur.execute(f"PRAGMA table_info({table})")
+    return [r[1] for r in cur.fetchall()]
+
+
+def _add_column_if_missing(cur: sqlite3.Cursor, table: str, column: str, decl: str) -> None:
+    if column in _table_columns(cur, table):
+        return
+    try:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+    except sqlite3.OperationalError:
+        pass
+
+
+def _migration_001_base_schema(cur: sqlite3.Cursor) -> None:
+    """Create all base tables if they do not exist."""
     cur.executescript(
         """
         CREATE TABLE IF NOT EXISTS projects (
@@ -167,585 +380,2963 @@ def init_db(conn: sqlite3.Connection) -> None:
         """
     )
 
-    # Lightweight schema migrations for existing DBs
-    cur.execute("PRAGMA table_info(issues)")
-    issue_cols = [r[1] for r in cur.fetchall()]
-    if "preconditions" not in issue_cols:
-        try:
-            cur.execute("ALTER TABLE issues ADD COLUMN preconditions TEXT")
-        except sqlite3.OperationalError:
-            pass
-    if "local_activity" not in issue_cols:
-        try:
-            cur.execute("ALTER TABLE issues ADD COLUMN local_activity TEXT")
-        except sqlite3.OperationalError:
-            pass
-    # Defect / Agile 연동용 필드 (Epic Link / Sprint)
-    if "epic_link" not in issue_cols:
-        try:
-            cur.execute("ALTER TABLE issues ADD COLUMN epic_link TEXT")
-        except sqlite3.OperationalError:
-            pass
-    if "sprint" not in issue_cols:
-        try:
-            cur.execute("ALTER TABLE issues ADD COLUMN sprint TEXT")
-        except sqlite3.OperationalError:
-            pass
-
-    cur.execute("PRAGMA table_info(testcase_steps)")
-    step_cols = [r[1] for r in cur.fetchall()]
-    if "group_no" not in step_cols:
-        try:
-            cur.execute("ALTER TABLE testcase_steps ADD COLUMN group_no INTEGER DEFAULT 1")
-        except sqlite3.OperationalError:
-            pass
 
+def _migration_002_legacy_columns(cur: sqlite3.Cursor) -> None:
+    """Columns added after the first release (older DB files may not have them)."""
+    _add_column_if_missing(cur, "issues", "preconditions", "TEXT")
+    _add_column_if_missing(cur, "issues", "local_activity", "TEXT")
+    # Defect / Agile 연동용 필드 (Epic Link / Sprint)
+    _add_column_if_missing(cur, "issues", "epic_link", "TEXT")
+    _add_column_if_missing(cur, "issues", "sprint", "TEXT")
+    _add_column_if_missing(cur, "testcase_steps", "group_no", "INTEGER DEFAULT 1")
     # testcase_executions 에 actual_time / tce_test_key 컬럼이 없으면 추가
-    cur.execute("PRAGMA table_info(testcase_executions)")
-    tce_cols = [r[1] for r in cur.fetchall()]
-    if "actual_time" not in tce_cols:
-        try:
-            cur.execute("ALTER TABLE testcase_executions ADD COLUMN actual_time INTEGER")
-        except sqlite3.OperationalError:
-            pass
-    if "tce_test_key" not in tce_cols:
-        try:
-            cur.execute("ALTER TABLE testcase_executions ADD COLUMN tce_test_key TEXT")
-        except sqlite3.OperationalError:
-            pass
+    _add_column_if_missing(cur, "testcase_executions", "actual_time", "INTEGER")
+    _add_column_if_missing(cur, "testcase_executions", "tce_test_key", "TEXT")
 
-    conn.commit()
 
+def _migration_003_lookup_indexes(cur: sqlite3.Cursor) -> None:
+    """Indexes for the hot lookup paths (checked by backend/query_plans.py)."""
+    cur.executescript(
+        """
+        -- get_issue_by_jira_key / upsert_issue_from_tree / fetch_folder_tree
+        CREATE INDEX IF NOT EXISTS idx_issues_project_key ON issues(project_id, jira_key);
+        -- delete_folder_if_empty / folder subtree copy
+        CREATE INDEX IF NOT EXISTS idx_issues_folder_deleted ON issues(folder_id, is_deleted);
+        -- ensure_folder_path / fetch_folder_tree
+        CREATE INDEX IF NOT EXISTS idx_folders_project_parent_name ON folders(project_id, parent_id, name);
+        -- delete_folder_if_empty (child folder count) / get_folder_path 하위 탐색
+        CREATE INDEX IF NOT EXISTS idx_folders_parent ON folders(parent_id);
+        CREATE INDEX IF NOT EXISTS idx_tp_tc_testcase ON testplan_testcases(testcase_id);
+        CREATE INDEX IF NOT EXISTS idx_testexecutions_issue ON testexecutions(issue_id);
+        CREATE INDEX IF NOT EXISTS idx_tc_exec_testcase ON testcase_executions(testcase_id);
+        CREATE INDEX IF NOT EXISTS idx_step_exec_tce ON testcase_step_executions(testcase_execution_id);
+        """
+    )
 
-# --- Simple dataclasses & repositories (minimal) --------------------------------
 
+# change_log 에 기록할 테이블 (entity 이름 = 테이블 이름, 모두 id 컬럼이 PK)
+CHANGE_LOG_TABLES = (
+    "folders",
+    "issues",
+    "testcase_steps",
+    "relations",
+    "testplan_testcases",
+    "testexecutions",
+    "testcase_executions",
+    "testcase_step_executions",
+)
 
-@dataclass
-class Project:
-    id: int
-    project_key: str
-    project_id: int
-    name: Optional[str] = None
-    base_url: Optional[str] = None
-    rtm_version: Optional[str] = None
 
+def _install_change_log_triggers(cur: sqlite3.Cursor) -> None:
+    """
+    CHANGE_LOG_TABLES 의 INSERT/UPDATE/DELETE 를 change_log 에 기록하는 trigger 를 (재)생성한다.
 
-def get_or_create_project(
-    conn: sqlite3.Connection,
-    project_key: str,
-    project_id: int,
-    name: Optional[str] = None,
-    base_url: Optional[str] = None,
-) -> Project:
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT * FROM projects WHERE project_key = ?",
-        (project_key,),
-    )
-    row = cur.fetchone()
-    if row:
-        return Project(
-            id=row["id"],
-            project_key=row["project_key"],
-            project_id=row["project_id"],
-            name=row["name"],
-            base_url=row["base_url"],
-            rtm_version=row["rtm_version"],
+    UPDATE trigger 는 현재 테이블 컬럼 목록으로 "바뀐 컬럼" 식을 만들기 때문에,
+    이후 migration 에서 추적 대상 테이블에 컬럼을 추가하면 이 함수를 다시 호출해야 한다.
+    """
+    for table in CHANGE_LOG_TABLES:
+        cols = [c for c in _table_columns(cur, table) if c != "id"]
+        changed_expr = " || ".join(
+            f"CASE WHEN OLD.{c} IS NOT NEW.{c} THEN '{c},' ELSE '' END" for c in cols
+        )
+        when_expr = " OR ".join(f"OLD.{c} IS NOT NEW.{c}" for c in cols)
+        for op in ("INSERT", "UPDATE", "DELETE"):
+            cur.execute(f"DROP TRIGGER IF EXISTS trg_change_log_{table}_{op.lower()}")
+        cur.executescript(
+            f"""
+            CREATE TRIGGER trg_change_log_{table}_insert AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO change_log (entity, entity_id, op, columns)
+                VALUES ('{table}', NEW.id, 'INSERT', NULL);
+            END;
+
+            CREATE TRIGGER trg_change_log_{table}_update AFTER UPDATE ON {table}
+            WHEN {when_expr}
+            BEGIN
+                INSERT INTO change_log (entity, entity_id, op, columns)
+                VALUES ('{table}', NEW.id, 'UPDATE', rtrim({changed_expr}, ','));
+            END;
+
+            CREATE TRIGGER trg_change_log_{table}_delete AFTER DELETE ON {table}
+            BEGIN
+                INSERT INTO change_log (entity, entity_id, op, columns)
+                VALUES ('{table}', OLD.id, 'DELETE', NULL);
+            END;
+            """
         )
 
-    cur.execute(
+
+def _migration_004_change_log(cur: sqlite3.Cursor) -> None:
+    """Change journal with a monotonic sequence, filled by triggers (see get_changes_since)."""
+    cur.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq             INTEGER PRIMARY KEY AUTOINCREMENT,
+            entity          TEXT NOT NULL,
+            -- 선언 타입 없음: folders 의 TEXT id 와 나머지 테이블의 INTEGER id 를 그대로 보존
+            entity_id,
+            op              TEXT NOT NULL,
+            columns         TEXT,
+            changed_at      TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+        );
         """
-        INSERT INTO projects (project_key, project_id, name, base_url)
-        VALUES (?, ?, ?, ?)
-        """,
-        (project_key, project_id, name, base_url),
     )
+    _install_change_log_triggers(cur)
 
-    # Lightweight schema migrations for existing DBs
-    cur.execute("PRAGMA table_info(issues)")
-    issue_cols = [r[1] for r in cur.fetchall()]
-    if "preconditions" not in issue_cols:
-        try:
-            cur.execute("ALTER TABLE issues ADD COLUMN preconditions TEXT")
-        except sqlite3.OperationalError:
-            pass
-    if "epic_link" not in issue_cols:
-        try:
-            cur.execute("ALTER TABLE issues ADD COLUMN epic_link TEXT")
-        except sqlite3.OperationalError:
-            pass
-    if "sprint" not in issue_cols:
-        try:
-            cur.execute("ALTER TABLE issues ADD COLUMN sprint TEXT")
-        except sqlite3.OperationalError:
-            pass
-
-    cur.execute("PRAGMA table_info(testcase_steps)")
-    step_cols = [r[1] for r in cur.fetchall()]
-    if "group_no" not in step_cols:
-        try:
-            cur.execute("ALTER TABLE testcase_steps ADD COLUMN group_no INTEGER DEFAULT 1")
-        except sqlite3.OperationalError:
-            pass
-
-    # testcase_executions 에 actual_time / tce_test_key 컬럼이 없으면 추가
-    cur.execute("PRAGMA table_info(testcase_executions)")
-    tce_cols = [r[1] for r in cur.fetchall()]
-    if "actual_time" not in tce_cols:
-        try:
-            cur.execute("ALTER TABLE testcase_executions ADD COLUMN actual_time INTEGER")
-        except sqlite3.OperationalError:
-            pass
-    if "tce_test_key" not in tce_cols:
-        try:
-            cur.execute("ALTER TABLE testcase_executions ADD COLUMN tce_test_key TEXT")
-        except sqlite3.OperationalError:
-            pass
-
-    conn.commit()
-    return Project(
-        id=cur.lastrowid,
-        project_key=project_key,
-        project_id=project_id,
-        name=name,
-        base_url=base_url,
-        rtm_version=None,
-    )
 
+def _migration_005_fulltext_search(cur: sqlite3.Cursor) -> None:
+    """
+    FTS5 index over issue text (summary/description/preconditions) and test case steps.
 
-def upsert_folder(
-    conn: sqlite3.Connection,
-    project_id: int,
-    folder_id: str,
-    name: str,
-    node_type: str,
-    parent_id: Optional[str],
-    sort_order: int = 0,
-) -> None:
-    cur = conn.cursor()
-    cur.execute("SELECT id FROM folders WHERE id = ?", (folder_id,))
-    if cur.fetchone():
-        cur.execute(
+    external content 테이블이라 본문은 issues/testcase_steps 에만 저장되고,
+    trigger 가 쓰기 때마다 색인을 갱신한다. FTS5 가 빠진 SQLite 빌드에서는 건너뛰며
+    search_local() 이 LIKE 검색으로 동작한다.
+    """
+    try:
+        cur.executescript(
             """
-            UPDATE folders
-               SET project_id = ?, parent_id = ?, name = ?, node_type = ?, sort_order = ?
-             WHERE id = ?
-            """,
-            (project_id, parent_id, name, node_type, sort_order, folder_id),
-        )
-    else:
-        cur.execute(
+            CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5(
+                summary, description, preconditions,
+                content='issues', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS testcase_steps_fts USING fts5(
+                action, input, expected,
+                content='testcase_steps', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            );
             """
-            INSERT INTO folders (id, project_id, parent_id, name, node_type, sort_order)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (folder_id, project_id, parent_id, name, node_type, sort_order),
         )
-    conn.commit()
+    except sqlite3.OperationalError as e:
+        if "fts5" not in str(e).lower():
+            raise
+        return
+    cur.executescript(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_issues_fts_insert AFTER INSERT ON issues
+        BEGIN
+            INSERT INTO issues_fts (rowid, summary, description, preconditions)
+            VALUES (NEW.id, NEW.summary, NEW.description, NEW.preconditions);
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_issues_fts_delete AFTER DELETE ON issues
+        BEGIN
+            INSERT INTO issues_fts (issues_fts, rowid, summary, description, preconditions)
+            VALUES ('delete', OLD.id, OLD.summary, OLD.description, OLD.preconditions);
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_issues_fts_update AFTER UPDATE OF summary, description, preconditions ON issues
+        BEGIN
+            INSERT INTO issues_fts (issues_fts, rowid, summary, description, preconditions)
+            VALUES ('delete', OLD.id, OLD.summary, OLD.description, OLD.preconditions);
+            INSERT INTO issues_fts (rowid, summary, description, preconditions)
+            VALUES (NEW.id, NEW.summary, NEW.description, NEW.preconditions);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_steps_fts_insert AFTER INSERT ON testcase_steps
+        BEGIN
+            INSERT INTO testcase_steps_fts (rowid, action, input, expected)
+            VALUES (NEW.id, NEW.action, NEW.input, NEW.expected);
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_steps_fts_delete AFTER DELETE ON testcase_steps
+        BEGIN
+            INSERT INTO testcase_steps_fts (testcase_steps_fts, rowid, action, input, expected)
+            VALUES ('delete', OLD.id, OLD.action, OLD.input, OLD.expected);
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_steps_fts_update AFTER UPDATE OF action, input, expected ON testcase_steps
+        BEGIN
+            INSERT INTO testcase_steps_fts (testcase_steps_fts, rowid, action, input, expected)
+            VALUES ('delete', OLD.id, OLD.action, OLD.input, OLD.expected);
+            INSERT INTO testcase_steps_fts (rowid, action, input, expected)
+            VALUES (NEW.id, NEW.action, NEW.input, NEW.expected);
+        END;
+
+        -- 기존 DB 파일의 데이터 색인
+        INSERT INTO issues_fts (issues_fts) VALUES ('rebuild');
+        INSERT INTO testcase_steps_fts (testcase_steps_fts) VALUES ('rebuild');
+        """
+    )
 
 
-def upsert_issue_from_tree(
-    conn: sqlite3.Connection,
-    project_id: int,
-    jira_key: Optional[str],
-    jira_id: Optional[int],
-    issue_type: str,
-    summary: str,
-    folder_id: Optional[str],
-) -> int:
+def _migration_006_issue_dimensions(cur: sqlite3.Cursor) -> None:
     """
-    Minimal upsert used during tree sync.
-    Full issue fields will be filled later by type-specific REST calls.
+    Junction tables for the comma-joined labels / components / fix_versions / affects_versions columns.
+
+    issues 의 텍스트 컬럼은 호환용으로 그대로 두고, 이 테이블들은 sync_issue_dimensions() 가
+    쓰기 때마다 텍스트 컬럼에서 다시 계산한다 (필터/집계용 인덱스).
     """
-    cur = conn.cursor()
-    if jira_key:
-        cur.execute(
-            "SELECT id FROM issues WHERE project_id = ? AND jira_key = ?",
-            (project_id, jira_key),
-        )
-        row = cur.fetchone()
-    else:
-        row = None
+    cur.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS issue_labels (
+            issue_id    INTEGER NOT NULL REFERENCES issues(id),
+            label       TEXT NOT NULL,
+            PRIMARY KEY (issue_id, label)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_issue_labels_label ON issue_labels(label, issue_id);
+
+        CREATE TABLE IF NOT EXISTS issue_components (
+            issue_id    INTEGER NOT NULL REFERENCES issues(id),
+            component   TEXT NOT NULL,
+            PRIMARY KEY (issue_id, component)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_issue_components_component ON issue_components(component, issue_id);
+
+        -- kind: 'fix' (fix_versions) / 'affects' (affects_versions)
+        CREATE TABLE IF NOT EXISTS issue_versions (
+            issue_id    INTEGER NOT NULL REFERENCES issues(id),
+            kind        TEXT NOT NULL,
+            version     TEXT NOT NULL,
+            PRIMARY KEY (issue_id, kind, version)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_issue_versions_version ON issue_versions(kind, version, issue_id);
+        """
+    )
+    cur.execute(
+        """
+        SELECT id, labels, components, fix_versions, affects_versions
+          FROM issues
+         WHERE COALESCE(labels, '') <> '' OR COALESCE(components, '') <> ''
+            OR COALESCE(fix_versions, '') <> '' OR COALESCE(affects_versions, '') <> ''
+        """
+    )
+    for row in cur.fetchall():
+        _write_issue_dimensions(cur, row[0], dict(zip(ISSUE_DIMENSIONS, row[1:])))
 
-    if row:
-        issue_id = row["id"]
-        cur.execute(
-            """
-            UPDATE issues
-               SET jira_id = ?, issue_type = ?, summary = ?, folder_id = ?
-             WHERE id = ?
-            """,
-            (jira_id, issue_type, summary, folder_id, issue_id),
-        )
-    else:
-        cur.execute(
+
+def _migration_007_attachments_activity(cur: sqlite3.Cursor) -> None:
+    """
+    Move issues.attachments (JSON list) and issues.local_activity (text log) into child tables.
+
+    기존 값은 한 번만 옮긴 뒤 issues 의 두 컬럼은 NULL 로 비운다 (컬럼 자체는 호환용으로 남김).
+    이후 쓰기는 update_issue_fields() 가 두 키를 새 테이블로 보낸다.
+    """
+    cur.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS issue_attachments (
+            id                  INTEGER PRIMARY KEY AUTOINCREMENT,
+            issue_id            INTEGER NOT NULL REFERENCES issues(id),
+            position            INTEGER NOT NULL DEFAULT 0,
+            filename            TEXT,
+            jira_attachment_id  TEXT,
+            local_path          TEXT,
+            -- 원본 메타 dict 전체 (size, content, mimeType 등) 의 JSON
+            meta                TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_issue_attachments_issue ON issue_attachments(issue_id, position);
+
+        CREATE TABLE IF NOT EXISTS issue_activity (
+            id              INTEGER PRIMARY KEY AUTOINCREMENT,
+            issue_id        INTEGER NOT NULL REFERENCES issues(id),
+            created_at      TEXT NOT NULL DEFAULT (datetime('now')),
+            body            TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_issue_activity_issue ON issue_activity(issue_id, id);
+        """
+    )
+    cur.execute("SELECT id, attachments FROM issues WHERE COALESCE(attachments, '') <> ''")
+    for issue_id, raw in cur.fetchall():
+        cur.executemany(
             """
-            INSERT INTO issues (project_id, jira_key, jira_id, issue_type, summary, folder_id)
+            INSERT INTO issue_attachments (issue_id, position, filename, jira_attachment_id, local_path, meta)
             VALUES (?, ?, ?, ?, ?, ?)
             """,
-            (project_id, jira_key, jira_id, issue_type, summary, folder_id),
+            [(issue_id, *rec) for rec in _attachment_records(parse_attachments(raw))],
         )
-        issue_id = cur.lastrowid
+    cur.execute(
+        """
+        INSERT INTO issue_activity (issue_id, body)
+        SELECT id, local_activity FROM issues WHERE TRIM(COALESCE(local_activity, '')) <> '' ORDER BY id
+        """
+    )
+    cur.execute(
+        """
+        UPDATE issues SET attachments = NULL, local_activity = NULL
+         WHERE attachments IS NOT NULL OR local_activity IS NOT NULL
+        """
+    )
 
-    conn.commit()
-    return issue_id
 
 
-def fetch_folder_tree(conn: sqlite3.Connection, project_id: int) -> Dict[str, Any]:
-    """
-    Fetch folders and issues for a project and build a simple in-memory tree
-    structure suitable for binding to a QTreeView (via QStandardItemModel).
-    This is intentionally generic: caller will convert to Qt items.
+def _migration_008_pending_changes(cur: sqlite3.Cursor) -> None:
     """
-    cur = conn.cursor()
+    Field-level pending changes: which issue columns / child collections changed since the last sync.
 
-    cur.execute(
-        "SELECT * FROM folders WHERE project_id = ? ORDER BY sort_order, name",
-        (project_id,),
-    )
-    folders = [dict(row) for row in cur.fetchall()]
-
-    cur.execute(
-        "SELECT * FROM issues WHERE project_id = ? AND is_deleted = 0 ORDER BY summary",
-        (project_id,),
+    기존 DB 에서 dirty = 1 인 이슈는 어떤 필드가 바뀌었는지 알 수 없으므로 '*' (전체) 로 채운다.
+    """
+    cur.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS issue_pending_changes (
+            project_id  INTEGER NOT NULL REFERENCES projects(id),
+            issue_id    INTEGER NOT NULL REFERENCES issues(id),
+            -- issues 컬럼명 또는 PENDING_COLLECTIONS 의 이름, '*' 는 전체
+            field       TEXT NOT NULL,
+            changed_at  TEXT NOT NULL DEFAULT (datetime('now')),
+            PRIMARY KEY (project_id, issue_id, field)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_issue_pending_changes_issue ON issue_pending_changes(issue_id, field);
+
+        INSERT OR IGNORE INTO issue_pending_changes (project_id, issue_id, field)
+        SELECT project_id, id, '*' FROM issues WHERE dirty = 1 AND is_deleted = 0;
+        """
     )
-    issues = [dict(row) for row in cur.fetchall()]
 
-    folder_map: Dict[str, Dict[str, Any]] = {}
-    for f in folders:
-        folder_map[f["id"]] = {**f, "children": []}
 
-    # attach issues as children of folders
-    roots = []
+def _migration_009_purge_support(cur: sqlite3.Cursor) -> None:
+    """
+    Soft delete timestamp + indexes used by purge_deleted_issues().
 
-    for issue in issues:
-        folder_id = issue.get("folder_id")
-        node = {**issue, "node_type": "ISSUE", "children": []}
-        if folder_id and folder_id in folder_map:
-            folder_map[folder_id]["children"].append(node)
-        else:
-            # 폴더에 속하지 않은 이슈는 트리의 루트 수준에 직접 표시한다.
-            # (엑셀에서 새로 생성한 로컬 이슈 등 folder_id 가 없는 경우 보이도록 하기 위함)
-            roots.append(node)
+    기존에 삭제된 이슈는 언제 삭제되었는지 알 수 없으므로 migration 시각으로 채운다
+    (즉, 보존 기간은 이 migration 이후부터 계산된다).
+    """
+    _add_column_if_missing(cur, "issues", "deleted_at", "TEXT")
+    cur.executescript(
+        """
+        UPDATE issues SET deleted_at = datetime('now') WHERE is_deleted = 1 AND deleted_at IS NULL;
 
-    # build tree roots (folders with no parent)
-    for folder_id, folder in folder_map.items():
-        parent_id = folder.get("parent_id")
-        if parent_id and parent_id in folder_map:
-            folder_map[parent_id]["children"].append(folder)
-        else:
-            roots.append(folder)
+        CREATE INDEX IF NOT EXISTS idx_issues_purge ON issues(deleted_at) WHERE is_deleted = 1;
+        CREATE INDEX IF NOT EXISTS idx_issues_parent ON issues(parent_issue_id);
+        CREATE INDEX IF NOT EXISTS idx_step_exec_step ON testcase_step_executions(testcase_step_id);
+        """
+    )
+    # issues 에 컬럼이 추가되었으므로 UPDATE trigger 를 다시 만든다.
+    _install_change_log_triggers(cur)
+
+
+# --- Coverage / execution statistics (migration 010) ---------------------------
+#
+# stat_* 테이블은 trigger 가 쓰기 때마다 영향을 받는 키(요구사항 / TE / TC)만 다시 계산한다.
+# 결과 문자열은 upper(trim(result)) 로 정규화하고, 결과가 비어 있으면 '' 로 센다.
+
+_STAT_RESULT_EXPR = "upper(trim(coalesce({col}, '')))"
+
+
+def _coverage_insert_sql(req_ids_sql: str) -> str:
+    """req_ids_sql (요구사항 issue id 목록 식 또는 SELECT) 의 stat_requirement_coverage 행을 계산해 넣는 INSERT."""
+    return f"""
+        INSERT INTO stat_requirement_coverage
+            (requirement_id, testcase_count, executed_count, passed_count, failed_count)
+        SELECT req.id,
+               COUNT(DISTINCT tc.id),
+               COUNT(DISTINCT lr.testcase_id),
+               COUNT(DISTINCT CASE WHEN lr.result = 'PASS' THEN lr.testcase_id END),
+               COUNT(DISTINCT CASE WHEN lr.result = 'FAIL' THEN lr.testcase_id END)
+          FROM issues req
+          LEFT JOIN relations r ON r.src_issue_id = req.id
+          LEFT JOIN issues tc ON tc.id = r.dst_issue_id AND tc.issue_type = 'TEST_CASE' AND tc.is_deleted = 0
+          LEFT JOIN stat_testcase_last_result lr ON lr.testcase_id = tc.id
+         WHERE req.id IN ({req_ids_sql}) AND req.issue_type = 'REQUIREMENT' AND req.is_deleted = 0
+         GROUP BY req.id
+    """
 
-    return {"roots": roots}
 
+def _coverage_refresh_sql(req_ids_sql: str) -> str:
+    """req_ids_sql 에 해당하는 요구사항의 커버리지 행을 지우고 다시 계산한다 (trigger 본문용)."""
+    return (
+        f"DELETE FROM stat_requirement_coverage WHERE requirement_id IN ({req_ids_sql});"
+        + _coverage_insert_sql(req_ids_sql)
+        + ";"
+    )
 
-def move_issue_to_folder(
-    conn: sqlite3.Connection, issue_id: int, new_folder_id: Optional[int]
-) -> None:
+
+def _last_result_refresh_sql(tc_id_expr: str) -> str:
+    """TC 하나(tc_id_expr)의 stat_testcase_last_result 를 가장 최근 TE 의 결과로 다시 계산 (값이 같으면 쓰지 않음)."""
+    result = _STAT_RESULT_EXPR.format(col="result")
+    return f"""
+        INSERT INTO stat_testcase_last_result (testcase_id, testcase_execution_id, testexecution_id, result)
+        SELECT testcase_id, id, testexecution_id, {result}
+          FROM testcase_executions
+         WHERE testcase_id = {tc_id_expr} AND {result} <> ''
+         ORDER BY testexecution_id DESC, id DESC
+         LIMIT 1
+        ON CONFLICT (testcase_id) DO UPDATE SET
+            testcase_execution_id = excluded.testcase_execution_id,
+            testexecution_id = excluded.testexecution_id,
+            result = excluded.result
+         WHERE testcase_execution_id IS NOT excluded.testcase_execution_id
+            OR testexecution_id IS NOT excluded.testexecution_id
+            OR result IS NOT excluded.result;
+        DELETE FROM stat_testcase_last_result
+         WHERE testcase_id = {tc_id_expr}
+           AND NOT EXISTS (
+               SELECT 1 FROM testcase_executions WHERE testcase_id = {tc_id_expr} AND {result} <> ''
+           );
     """
-    이슈를 다른 폴더(또는 루트)로 이동한다.
 
-    - new_folder_id 가 None 이면 folder_id 를 NULL 로 설정하여 루트에 위치시킨다.
+
+def _histogram_sql(te_expr: str, result_col: str, delta: int) -> str:
+    """stat_testexecution_results 의 (TE, 결과) 칸을 delta 만큼 증감."""
+    result = _STAT_RESULT_EXPR.format(col=result_col)
+    if delta > 0:
+        return f"""
+        INSERT INTO stat_testexecution_results (testexecution_id, result, count)
+        VALUES ({te_expr}, {result}, {delta})
+        ON CONFLICT (testexecution_id, result) DO UPDATE SET count = count + {delta};
+        """
+    return f"""
+        UPDATE stat_testexecution_results SET count = count - {-delta}
+         WHERE testexecution_id = {te_expr} AND result = {result};
+        DELETE FROM stat_testexecution_results
+         WHERE testexecution_id = {te_expr} AND result = {result} AND count <= 0;
+    """
+
+
+# 처음부터 다시 계산 (migration backfill / rebuild_coverage_stats)
+_STATS_REBUILD_STATEMENTS: List[str] = [
+    "DELETE FROM stat_testexecution_results",
+    f"""
+    INSERT INTO stat_testexecution_results (testexecution_id, result, count)
+    SELECT testexecution_id, {_STAT_RESULT_EXPR.format(col="result")}, COUNT(*)
+      FROM testcase_executions GROUP BY 1, 2
+    """,
+    "DELETE FROM stat_testcase_last_result",
+    f"""
+    INSERT INTO stat_testcase_last_result (testcase_id, testcase_execution_id, testexecution_id, result)
+    SELECT testcase_id, id, testexecution_id, result FROM (
+        SELECT testcase_id, id, testexecution_id, {_STAT_RESULT_EXPR.format(col="result")} AS result,
+               ROW_NUMBER() OVER (PARTITION BY testcase_id ORDER BY testexecution_id DESC, id DESC) AS rn
+          FROM testcase_executions
+         WHERE {_STAT_RESULT_EXPR.format(col="result")} <> ''
+    ) WHERE rn = 1
+    """,
+    "DELETE FROM stat_requirement_coverage",
+    _coverage_insert_sql("SELECT id FROM issues WHERE issue_type = 'REQUIREMENT'"),
+]
+
+
+def _install_stats_triggers(cur: sqlite3.Cursor) -> None:
+    """relations / testcase_executions / issues 쓰기 때 stat_* 테이블을 갱신하는 trigger 를 (재)생성한다."""
+    triggers = {
+        "trg_stats_rel_insert": (
+            "AFTER INSERT ON relations",
+            _coverage_refresh_sql("NEW.src_issue_id"),
+        ),
+        "trg_stats_rel_delete": (
+            "AFTER DELETE ON relations",
+            _coverage_refresh_sql("OLD.src_issue_id"),
+        ),
+        "trg_stats_rel_update": (
+            "AFTER UPDATE OF src_issue_id, dst_issue_id ON relations"
+            " WHEN OLD.src_issue_id IS NOT NEW.src_issue_id OR OLD.dst_issue_id IS NOT NEW.dst_issue_id",
+            _coverage_refresh_sql("OLD.src_issue_id, NEW.src_issue_id"),
+        ),
+        "trg_stats_tce_insert": (
+            "AFTER INSERT ON testcase_executions",
+            _histogram_sql("NEW.testexecution_id", "NEW.result", 1) + _last_result_refresh_sql("NEW.testcase_id"),
+        ),
+        "trg_stats_tce_delete": (
+            "AFTER DELETE ON testcase_executions",
+            _histogram_sql("OLD.testexecution_id", "OLD.result", -1) + _last_result_refresh_sql("OLD.testcase_id"),
+        ),
+        "trg_stats_tce_update": (
+            "AFTER UPDATE OF testexecution_id, testcase_id, result ON testcase_executions"
+            " WHEN OLD.testexecution_id IS NOT NEW.testexecution_id OR OLD.testcase_id IS NOT NEW.testcase_id"
+            " OR OLD.result IS NOT NEW.result",
+            _histogram_sql("OLD.testexecution_id", "OLD.result", -1)
+            + _histogram_sql("NEW.testexecution_id", "NEW.result", 1)
+            + _last_result_refresh_sql("OLD.testcase_id")
+            + _last_result_refresh_sql("NEW.testcase_id"),
+        ),
+        # TC 의 마지막 결과가 바뀌면 그 TC 를 커버하는 요구사항의 집계도 다시 계산
+        "trg_stats_last_result_insert": (
+            "AFTER INSERT ON stat_testcase_last_result",
+            _coverage_refresh_sql("SELECT src_issue_id FROM relations WHERE dst_issue_id = NEW.testcase_id"),
+        ),
+        "trg_stats_last_result_update": (
+            "AFTER UPDATE ON stat_testcase_last_result",
+            _coverage_refresh_sql("SELECT src_issue_id FROM relations WHERE dst_issue_id = NEW.testcase_id"),
+        ),
+        "trg_stats_last_result_delete": (
+            "AFTER DELETE ON stat_testcase_last_result",
+            _coverage_refresh_sql("SELECT src_issue_id FROM relations WHERE dst_issue_id = OLD.testcase_id"),
+        ),
+        # 이슈 삭제/복구, 타입 변경: 요구사항 자신과, TC 라면 그 TC 를 커버하는 요구사항
+        "trg_stats_issue_update": (
+            "AFTER UPDATE OF is_deleted, issue_type ON issues"
+            " WHEN OLD.is_deleted IS NOT NEW.is_deleted OR OLD.issue_type IS NOT NEW.issue_type",
+            _coverage_refresh_sql(
+                "SELECT NEW.id UNION SELECT src_issue_id FROM relations WHERE dst_issue_id = NEW.id"
+            ),
+        ),
+        "trg_stats_issue_delete": (
+            "AFTER DELETE ON issues",
+            "DELETE FROM stat_requirement_coverage WHERE requirement_id = OLD.id;"
+            " DELETE FROM stat_testcase_last_result WHERE testcase_id = OLD.id;",
+        ),
+    }
+    for name, (event, body) in triggers.items():
+        cur.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cur.execute(f"CREATE TRIGGER {name} {event} BEGIN {body} END")
+
+
+def _migration_010_coverage_stats(cur: sqlite3.Cursor) -> None:
+    """
+    Precomputed roll-ups: per-requirement coverage, per-TE result histogram, per-TC last result.
+
+    요구사항 → TC 커버리지는 push 시 testCasesCovered 와 같은 기준(요구사항이 src, TEST_CASE 가 dst 인
+    모든 relation)으로 센다. "마지막 결과" 는 가장 최근(id 가 가장 큰) TE 에서 결과가 비어 있지 않은 TCE 이다.
+    """
+    cur.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS stat_requirement_coverage (
+            requirement_id  INTEGER PRIMARY KEY REFERENCES issues(id),
+            testcase_count  INTEGER NOT NULL DEFAULT 0,
+            -- 아래는 커버하는 TC 들의 마지막 결과 기준
+            executed_count  INTEGER NOT NULL DEFAULT 0,
+            passed_count    INTEGER NOT NULL DEFAULT 0,
+            failed_count    INTEGER NOT NULL DEFAULT 0
+        );
+
+        CREATE TABLE IF NOT EXISTS stat_testexecution_results (
+            testexecution_id    INTEGER NOT NULL REFERENCES testexecutions(id),
+            result              TEXT NOT NULL,
+            count               INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (testexecution_id, result)
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS stat_testcase_last_result (
+            testcase_id             INTEGER PRIMARY KEY REFERENCES issues(id),
+            testcase_execution_id   INTEGER NOT NULL REFERENCES testcase_executions(id),
+            testexecution_id        INTEGER NOT NULL REFERENCES testexecutions(id),
+            result                  TEXT NOT NULL
+        );
+        """
+    )
+    for sql in _STATS_REBUILD_STATEMENTS:
+        cur.execute(sql)
+    _install_stats_triggers(cur)
+
+
+def _migration_011_change_log_consumers(cur: sqlite3.Cursor) -> None:
+    """Registered change_log consumers and the last seq each has processed (see prune_consumed_changes)."""
+    cur.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS change_log_consumers (
+            name            TEXT PRIMARY KEY,
+            seq             INTEGER NOT NULL DEFAULT 0,
+            updated_at      TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+        ) WITHOUT ROWID;
+        """
+    )
+
+
+def _migration_012_pending_local_issues(cur: sqlite3.Cursor) -> None:
+    """
+    Pending '*' rows for dirty issues that have none.
+
+    create_local_issue() / copy_issues() / copy_subtree() 가 pending 기록 없이 dirty = 1 로 만든 이슈를
+    get_pending_changes() 가 찾을 수 있도록 채운다.
     """
-    cur = conn.cursor()
     cur.execute(
-        "UPDATE issues SET folder_id = ? WHERE id = ?",
-        (new_folder_id, issue_id),
+        """
+        INSERT OR IGNORE INTO issue_pending_changes (project_id, issue_id, field)
+        SELECT i.project_id, i.id, '*' FROM issues i
+         WHERE i.dirty = 1 AND i.is_deleted = 0
+           AND NOT EXISTS (SELECT 1 FROM issue_pending_changes p WHERE p.issue_id = i.id)
+        """
     )
-    conn.commit()
 
 
-def move_folder(
-    conn: sqlite3.Connection, folder_id: int, new_parent_id: Optional[int]
-) -> None:
+def _migration_013_deleted_issue_tombstones(cur: sqlite3.Cursor) -> None:
     """
-    폴더를 다른 부모 폴더(또는 루트)로 이동한다.
+    Pending 'is_deleted' rows for JIRA-linked issues soft-deleted before pending tracking existed.
 
-    - new_parent_id 가 None 이면 parent_id 를 NULL 로 설정하여 루트에 위치시킨다.
+    find_purgeable_issue_ids() 는 pending 'is_deleted' 가 있는 행을 tombstone 으로 남기므로,
+    migration 008 / 012 가 채우지 않은 (is_deleted = 1 인) 이슈도 purge 대상에서 빠지도록 채운다.
     """
-    cur = conn.cursor()
     cur.execute(
-        "UPDATE folders SET parent_id = ? WHERE id = ?",
-        (new_parent_id, folder_id),
+        """
+        INSERT OR IGNORE INTO issue_pending_changes (project_id, issue_id, field)
+        SELECT project_id, id, 'is_deleted' FROM issues
+         WHERE is_deleted = 1 AND COALESCE(jira_key, '') <> ''
+        """
     )
-    conn.commit()
 
 
-def get_issue_by_id(conn: sqlite3.Connection, issue_id: int) -> Optional[Dict[str, Any]]:
+def _migration_014_attachment_path_index(cur: sqlite3.Cursor) -> None:
+    """Index for count_attachment_path_references() (copied issues share attachment files)."""
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_issue_attachments_path ON issue_attachments(local_path)"
+        " WHERE local_path IS NOT NULL"
+    )
+
+
+# (version, name, step) - version 은 1 부터 연속으로 증가해야 한다.
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, "base_schema", _migration_001_base_schema),
+    (2, "legacy_columns", _migration_002_legacy_columns),
+    (3, "lookup_indexes", _migration_003_lookup_indexes),
+    (4, "change_log", _migration_004_change_log),
+    (5, "fulltext_search", _migration_005_fulltext_search),
+    (6, "issue_dimensions", _migration_006_issue_dimensions),
+    (7, "attachments_activity", _migration_007_attachments_activity),
+    (8, "pending_changes", _migration_008_pending_changes),
+    (9, "purge_support", _migration_009_purge_support),
+    (10, "coverage_stats", _migration_010_coverage_stats),
+    (11, "change_log_consumers", _migration_011_change_log_consumers),
+    (12, "pending_local_issues", _migration_012_pending_local_issues),
+    (13, "deleted_issue_tombstones", _migration_013_deleted_issue_tombstones),
+    (14, "attachment_path_index", _migration_014_attachment_path_index),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def migrate(conn: sqlite3.Connection) -> List[str]:
     """
-    Fetch a single issue row as a dict.
+    PRAGMA user_version 이후의 migration 을 순서대로 적용하고, 적용한 migration 이름 목록을 반환한다.
+    최신 DB 에서는 pragma 한 번만 읽고 바로 반환한다.
     """
+    version = get_schema_version(conn)
+    if version >= SCHEMA_VERSION:
+        return []
+
+    applied: List[str] = []
     cur = conn.cursor()
-    cur.execute("SELECT * FROM issues WHERE id = ?", (issue_id,))
-    row = cur.fetchone()
-    return dict(row) if row else None
+    for step_version, name, step in MIGRATIONS:
+        if step_version <= version:
+            continue
+        try:
+            step(cur)
+            # PRAGMA 는 바인딩 파라미터를 받지 않으므로 정수로 직접 포맷한다.
+            cur.execute(f"PRAGMA user_version = {int(step_version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(f"{step_version:03d}_{name}")
+    return applied
 
-def get_issue_by_jira_key(conn: sqlite3.Connection, project_id: int, jira_key: str) -> Optional[Dict[str, Any]]:
+
+def init_db(conn: sqlite3.Connection) -> None:
     """
-    Given a project_id and JIRA issue key, return the corresponding local issues row as dict, or None.
+    Create all tables if they do not exist and apply pending schema migrations.
+    This function is idempotent and can be safely called on startup.
+    """
+    migrate(conn)
+
+
+# --- Change journal -----------------------------------------------------------------
+#
+# 모든 추적 대상 테이블의 쓰기는 trigger 로 change_log 에 (entity, entity_id, op, columns) 로 기록된다.
+# 소비자(GUI/exporter/push)는 마지막으로 처리한 seq 를 기억했다가 get_changes_since() 로 그 이후 변경만 읽는다.
+#
+# change_log 는 쓰기마다 한 행씩 늘어나므로, 소비자는 처리한 seq 를 advance_change_consumer() 로 등록하고
+# prune_consumed_changes() 가 모든 (활성) 소비자가 처리한 지점까지만 지운다.
+# retention_days 로 오래된 행을 강제로 지울 수도 있으며, 그보다 뒤처진 소비자는
+# change_log_covers() 가 False 가 되므로 전체를 다시 읽어야 한다.
+
+# prune_consumed_changes(): 이 기간 동안 갱신되지 않은 소비자(종료된 GUI 등)는 무시하고 등록을 지운다.
+CHANGE_CONSUMER_STALE_DAYS = 7.0
+
+
+def get_change_seq(conn: sqlite3.Connection) -> int:
+    """
+    지금까지 발급된 가장 큰 change_log seq 를 반환한다 (변경이 없으면 0).
+    prune_change_log() 로 행을 지워도 값이 줄어들지 않는다.
+    """
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+    return int(row[0]) if row else 0
+
+
+def get_changes_since(
+    conn: sqlite3.Connection,
+    since_seq: int,
+    entities: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    since_seq 이후(초과)의 변경 목록을 seq 오름차순으로 반환한다.
+
+    각 항목: {seq, entity, entity_id, op ("INSERT"/"UPDATE"/"DELETE"), columns (UPDATE 시 바뀐 컬럼 list), changed_at}
+    entities 를 주면 해당 테이블(예: ["issues", "folders"])의 변경만 반환한다.
+    """
+    sql = "SELECT seq, entity, entity_id, op, columns, changed_at FROM change_log WHERE seq > ?"
+    params: List[Any] = [int(since_seq)]
+    if entities:
+        sql += f" AND entity IN ({', '.join('?' for _ in entities)})"
+        params.extend(entities)
+    sql += " ORDER BY seq"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    changes = []
+    for row in cur.fetchall():
+        item = dict(row)
+        item["columns"] = item["columns"].split(",") if item["columns"] else []
+        changes.append(item)
+    return changes
+
+
+def prune_change_log(conn: sqlite3.Connection, upto_seq: int) -> int:
+    """seq <= upto_seq 인 change_log 행을 삭제하고 삭제 건수를 반환한다 (모든 소비자가 처리한 이후에만 호출)."""
+    cur = conn.cursor()
+    cur.execute("DELETE FROM change_log WHERE seq <= ?", (int(upto_seq),))
+    _commit(conn)
+    return cur.rowcount
+
+
+def change_log_covers(conn: sqlite3.Connection, since_seq: int) -> bool:
+    """
+    since_seq 이후의 변경이 change_log 에 모두 남아 있으면 True.
+    False 면 그 사이 행이 prune 되었으므로 소비자는 get_changes_since() 대신 전체를 다시 읽어야 한다.
+    """
+    since_seq = int(since_seq)
+    latest = get_change_seq(conn)
+    if since_seq >= latest:
+        return True
+    row = conn.execute("SELECT MIN(seq) FROM change_log").fetchone()
+    oldest = row[0] if row and row[0] is not None else latest + 1
+    return since_seq + 1 >= int(oldest)
+
+
+def advance_change_consumer(conn: sqlite3.Connection, name: str, seq: int) -> None:
+    """소비자 name 이 seq 까지 처리했음을 기록한다 (seq 는 줄어들지 않는다)."""
+    conn.execute(
+        """
+        INSERT INTO change_log_consumers (name, seq) VALUES (?, ?)
+        ON CONFLICT (name) DO UPDATE SET
+            seq = MAX(change_log_consumers.seq, excluded.seq),
+            updated_at = excluded.updated_at
+        """,
+        (name, int(seq)),
+    )
+    _commit(conn)
+
+
+def remove_change_consumer(conn: sqlite3.Connection, name: str) -> None:
+    """소비자 등록을 지운다 (GUI 종료 시 등). 이후 prune 은 이 소비자를 기다리지 않는다."""
+    conn.execute("DELETE FROM change_log_consumers WHERE name = ?", (name,))
+    _commit(conn)
+
+
+def _change_seq_before(conn: sqlite3.Connection, retention_days: float) -> int:
+    """changed_at 이 retention_days 보다 오래된 마지막 seq (seq 와 changed_at 은 함께 증가한다)."""
+    cutoff = f"-{max(float(retention_days), 0.0)} days"
+    row = conn.execute(
+        """
+        SELECT seq FROM change_log
+         WHERE changed_at >= strftime('%Y-%m-%dT%H:%M:%fZ', 'now', ?)
+         ORDER BY seq LIMIT 1
+        """,
+        (cutoff,),
+    ).fetchone()
+    return int(row[0]) - 1 if row else get_change_seq(conn)
+
+
+def prune_consumed_changes(
+    conn: sqlite3.Connection,
+    retention_days: Optional[float] = None,
+    stale_days: float = CHANGE_CONSUMER_STALE_DAYS,
+) -> int:
     """
+    모든 활성 소비자가 처리한 change_log 행을 지우고 삭제 건수를 반환한다.
+
+    - 활성 소비자: stale_days 안에 advance_change_consumer() 한 소비자. 나머지는 등록을 지운다.
+    - 활성 소비자가 없으면 지금까지의 변경을 모두 지운다 (새 소비자는 전체 읽기로 시작한다).
+    - retention_days 를 주면 그보다 오래된 행은 소비자와 관계없이 지운다 (change_log_covers() 참고).
+    """
+    with transaction(conn):
+        conn.execute(
+            "DELETE FROM change_log_consumers WHERE updated_at < strftime('%Y-%m-%dT%H:%M:%fZ', 'now', ?)",
+            (f"-{max(float(stale_days), 0.0)} days",),
+        )
+        row = conn.execute("SELECT MIN(seq) FROM change_log_consumers").fetchone()
+        upto = int(row[0]) if row and row[0] is not None else get_change_seq(conn)
+        if retention_days is not None:
+            upto = max(upto, _change_seq_before(conn, retention_days))
+        return prune_change_log(conn, upto)
+
+
+# --- Simple dataclasses & repositories (minimal) --------------------------------
+
+
+@dataclass
+class Project:
+    id: int
+    project_key: str
+    project_id: int
+    name: Optional[str] = None
+    base_url: Optional[str] = None
+    rtm_version: Optional[str] = None
+
+
+def get_or_create_project(
+    conn: sqlite3.Connection,
+    project_key: str,
+    project_id: int,
+    name: Optional[str] = None,
+    base_url: Optional[str] = None,
+) -> Project:
     cur = conn.cursor()
     cur.execute(
-        "SELECT * FROM issues WHERE project_id = ? AND jira_key = ? AND is_deleted = 0",
-        (project_id, jira_key),
+        "SELECT * FROM projects WHERE project_key = ?",
+        (project_key,),
     )
     row = cur.fetchone()
-    return dict(row) if row else None
+    if row:
+        return Project(
+            id=row["id"],
+            project_key=row["project_key"],
+            project_id=row["project_id"],
+            name=row["name"],
+            base_url=row["base_url"],
+            rtm_version=row["rtm_version"],
+        )
 
+    cur.execute(
+        """
+        INSERT INTO projects (project_key, project_id, name, base_url)
+        VALUES (?, ?, ?, ?)
+        """,
+        (project_key, project_id, name, base_url),
+    )
 
-def get_local_issues_without_jira_key(
+    _commit(conn)
+    return Project(
+        id=cur.lastrowid,
+        project_key=project_key,
+        project_id=project_id,
+        name=name,
+        base_url=base_url,
+        rtm_version=None,
+    )
+
+
+def upsert_folder(
     conn: sqlite3.Connection,
     project_id: int,
-    issue_type: Optional[str] = None
-) -> List[Dict[str, Any]]:
+    folder_id: str,
+    name: str,
+    node_type: str,
+    parent_id: Optional[str],
+    sort_order: int = 0,
+) -> None:
+    cur = conn.cursor()
+    cur.execute("SELECT id, project_id, parent_id, name FROM folders WHERE id = ?", (folder_id,))
+    existing = cur.fetchone()
+    if existing:
+        cur.execute(
+            """
+            UPDATE folders
+               SET project_id = ?, parent_id = ?, name = ?, node_type = ?, sort_order = ?
+             WHERE id = ?
+            """,
+            (project_id, parent_id, name, node_type, sort_order, folder_id),
+        )
+    else:
+        cur.execute(
+            """
+            INSERT INTO folders (id, project_id, parent_id, name, node_type, sort_order)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (folder_id, project_id, parent_id, name, node_type, sort_order),
+        )
+    _commit(conn)
+
+    # 폴더 경로 캐시 동기화: 새 폴더는 잎으로 추가, 이름/위치가 바뀌면 해당 프로젝트 캐시 무효화
+    if existing is None:
+        cache = getattr(conn, "folder_path_cache", None)
+        index = cache.get(project_id) if cache else None
+        if index is not None and not index.add_leaf(folder_id, parent_id, name):
+            invalidate_folder_paths(conn, project_id)
+    elif (existing["project_id"], existing["parent_id"], existing["name"]) != (project_id, parent_id, name):
+        invalidate_folder_paths(conn, existing["project_id"])
+        invalidate_folder_paths(conn, project_id)
+
+
+def upsert_issue_from_tree(
+    conn: sqlite3.Connection,
+    project_id: int,
+    jira_key: Optional[str],
+    jira_id: Optional[int],
+    issue_type: str,
+    summary: str,
+    folder_id: Optional[str],
+) -> int:
     """
-    jira_key가 NULL이거나 빈 문자열인 로컬 이슈들을 조회합니다.
-    
-    Args:
-        conn: SQLite 연결
-        project_id: 프로젝트 ID
-        issue_type: 이슈 타입 필터 (선택적, None이면 모든 타입)
-    
-    Returns:
-        jira_key가 없는 이슈 목록 (dict 리스트)
+    Minimal upsert used during tree sync.
+    Full issue fields will be filled later by type-specific REST calls.
     """
     cur = conn.cursor()
-    
-    if issue_type:
+    if jira_key:
+        cur.execute(
+            "SELECT id FROM issues WHERE project_id = ? AND jira_key = ?",
+            (project_id, jira_key),
+        )
+        row = cur.fetchone()
+    else:
+        row = None
+
+    if row:
+        issue_id = row["id"]
         cur.execute(
             """
-            SELECT * FROM issues 
-            WHERE project_id = ? 
-              AND (jira_key IS NULL OR jira_key = '')
-              AND is_deleted = 0
-              AND issue_type = ?
-            ORDER BY id
+            UPDATE issues
+               SET jira_id = ?, issue_type = ?, summary = ?, folder_id = ?
+             WHERE id = ?
             """,
-            (project_id, issue_type.upper()),
+            (jira_id, issue_type, summary, folder_id, issue_id),
         )
     else:
         cur.execute(
             """
-            SELECT * FROM issues 
-            WHERE project_id = ? 
+            INSERT INTO issues (project_id, jira_key, jira_id, issue_type, summary, folder_id)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (project_id, jira_key, jira_id, issue_type, summary, folder_id),
+        )
+        issue_id = cur.lastrowid
+
+    _commit(conn)
+    return issue_id
+
+
+# --- Bulk tree ingest (Full Sync) -------------------------------------------------
+
+
+@dataclass
+class TreeIngestStats:
+    """bulk_upsert_tree() 결과 집계 (tree type 하나 단위)."""
+
+    folders_inserted: int = 0
+    folders_updated: int = 0
+    folders_unchanged: int = 0
+    issues_inserted: int = 0
+    issues_updated: int = 0
+    issues_unchanged: int = 0
+
+
+@dataclass
+class TreeIngestState:
+    """
+    Full Sync 동안 한 번만 읽어 두는 기존 행 스냅샷.
+
+    - folders: folder_id -> (project_id, parent_id, name, node_type, sort_order)
+    - issues:  jira_key  -> (id, jira_id, issue_type, summary, folder_id)
+    """
+
+    folders: Dict[str, tuple] = field(default_factory=dict)
+    issues: Dict[str, tuple] = field(default_factory=dict)
+
+
+def load_tree_ingest_state(conn: sqlite3.Connection, project_id: int) -> TreeIngestState:
+    """
+    bulk_upsert_tree() 에서 사용할 기존 folders / issues(jira_key -> id) 맵을 한 번에 읽어 온다.
+    """
+    cur = conn.cursor()
+    state = TreeIngestState()
+    cur.execute(
+        "SELECT id, project_id, parent_id, name, node_type, sort_order FROM folders WHERE project_id = ?",
+        (project_id,),
+    )
+    for row in cur.fetchall():
+        state.folders[row[0]] = tuple(row[1:])
+    cur.execute(
+        """
+        SELECT id, jira_key, jira_id, issue_type, summary, folder_id
+          FROM issues
+         WHERE project_id = ? AND jira_key IS NOT NULL AND jira_key <> ''
+         ORDER BY id
+        """,
+        (project_id,),
+    )
+    for row in cur.fetchall():
+        # upsert_issue_from_tree() 와 동일하게 같은 key 가 여러 행이면 먼저 조회되는 행을 사용
+        state.issues.setdefault(row[1], (row[0], row[2], row[3], row[4], row[5]))
+    return state
+
+
+def bulk_upsert_tree(
+    conn: sqlite3.Connection,
+    project_id: int,
+    folder_rows: List[tuple],
+    issue_rows: List[tuple],
+    state: Optional[TreeIngestState] = None,
+) -> TreeIngestStats:
+    """
+    Tree sync 용 set-based upsert. upsert_folder / upsert_issue_from_tree 를 노드마다 호출하는 대신
+    평탄화된 행 묶음을 executemany + INSERT ... ON CONFLICT DO UPDATE 로 한 트랜잭션에 기록한다.
+
+    - folder_rows: (folder_id, parent_id, name, sort_order) 목록 (부모가 자식보다 먼저 오도록 정렬)
+    - issue_rows:  (jira_key, jira_id, issue_type, summary, folder_id) 목록
+    - state: load_tree_ingest_state() 결과. 여러 tree type 을 연속으로 처리할 때 재사용하면
+             기존 행 조회가 한 번으로 끝난다. 새로 삽입된 이슈도 state 에 반영된다.
+
+    값이 바뀌지 않은 행은 쓰지 않으며, 삽입/갱신/변경없음 건수를 반환한다.
+    """
+    if state is None:
+        state = load_tree_ingest_state(conn, project_id)
+    stats = TreeIngestStats()
+
+    folder_params: List[tuple] = []
+    for folder_id, parent_id, name, sort_order in folder_rows:
+        new_vals = (project_id, parent_id, name, "FOLDER", sort_order)
+        old_vals = state.folders.get(folder_id)
+        if old_vals is None:
+            stats.folders_inserted += 1
+        elif tuple(old_vals) == new_vals:
+            stats.folders_unchanged += 1
+            continue
+        else:
+            stats.folders_updated += 1
+        folder_params.append((folder_id, *new_vals))
+
+    # 같은 jira_key 가 트리에 여러 번 나오면 노드 순서대로 덮어쓰던 기존 동작과 같이 마지막 값을 사용
+    keyed: Dict[str, tuple] = {}
+    keyless: List[tuple] = []
+    for jira_key, jira_id, issue_type, summary, folder_id in issue_rows:
+        if jira_key:
+            keyed[jira_key] = (jira_id, issue_type, summary, folder_id)
+        else:
+            # key 가 없는 노드는 upsert_issue_from_tree() 처럼 받은 값("" / None)을 그대로 저장한다.
+            keyless.append((jira_key, jira_id, issue_type, summary, folder_id))
+
+    insert_params: List[tuple] = list(keyless)
+    update_params: List[tuple] = []
+    for jira_key, new_vals in keyed.items():
+        old = state.issues.get(jira_key)
+        if old is None:
+            insert_params.append((jira_key, *new_vals))
+        elif tuple(old[1:]) == new_vals:
+            stats.issues_unchanged += 1
+        else:
+            update_params.append((old[0], jira_key, *new_vals))
+    stats.issues_inserted = len(insert_params)
+    stats.issues_updated = len(update_params)
+
+    if not folder_params and not insert_params and not update_params:
+        return stats
+
+    cur = conn.cursor()
+    with transaction(conn):
+        if folder_params:
+            cur.executemany(
+                """
+                INSERT INTO folders (id, project_id, parent_id, name, node_type, sort_order)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    project_id = excluded.project_id,
+                    parent_id  = excluded.parent_id,
+                    name       = excluded.name,
+                    node_type  = excluded.node_type,
+                    sort_order = excluded.sort_order
+                """,
+                folder_params,
+            )
+        if update_params:
+            cur.executemany(
+                """
+                INSERT INTO issues (id, project_id, jira_key, jira_id, issue_type, summary, folder_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    jira_id    = excluded.jira_id,
+                    issue_type = excluded.issue_type,
+                    summary    = excluded.summary,
+                    folder_id  = excluded.folder_id
+                """,
+                [(p[0], project_id, *p[1:]) for p in update_params],
+            )
+        if insert_params:
+            cur.execute("SELECT COALESCE(MAX(id), 0) FROM issues")
+            max_id_before = cur.fetchone()[0]
+            cur.executemany(
+                """
+                INSERT INTO issues (project_id, jira_key, jira_id, issue_type, summary, folder_id)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [(project_id, *p) for p in insert_params],
+            )
+            cur.execute(
+                """
+                SELECT id, jira_key, jira_id, issue_type, summary, folder_id
+                  FROM issues
+                 WHERE id > ? AND project_id = ? AND jira_key IS NOT NULL AND jira_key <> ''
+                """,
+                (max_id_before, project_id),
+            )
+            inserted_rows = cur.fetchall()
+        else:
+            inserted_rows = []
+
+    if folder_params:
+        invalidate_folder_paths(conn)
+
+    # transaction 블록이 성공한 뒤에만 state 를 갱신하여, 실패 시 다음 호출이 잘못된 스냅샷을 쓰지 않도록 한다.
+    for p in folder_params:
+        state.folders[p[0]] = tuple(p[1:])
+    for p in update_params:
+        state.issues[p[1]] = (p[0], *p[2:])
+    for row in inserted_rows:
+        state.issues.setdefault(row[1], (row[0], row[2], row[3], row[4], row[5]))
+    return stats
+
+
+# 트리 표시(라벨/아이콘/상태색)에 필요한 컬럼만 조회한다.
+# description / attachments / local_activity / preconditions 같은 큰 컬럼은 트리 경로에서 읽지 않는다.
+# 순서는 rows.FolderNode / rows.IssueNode 의 앞쪽 필드 순서와 같아야 한다.
+TREE_FOLDER_COLUMNS = ("id", "parent_id", "name", "node_type", "sort_order")
+TREE_ISSUE_COLUMNS = ("id", "summary", "jira_key", "issue_type", "folder_id", "dirty")
+
+
+def fetch_folder_tree(
+    conn: sqlite3.Connection,
+    project_id: int,
+    issue_type: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch folders and issues for a project and build a simple in-memory tree
+    structure suitable for binding to a QTreeView (via QStandardItemModel).
+    This is intentionally generic: caller will convert to Qt items.
+
+    - 이슈는 TREE_ISSUE_COLUMNS 만 조회한다 (상세 필드는 get_issue_by_id 로 따로 읽는다).
+    - issue_type 을 주면 해당 타입의 이슈만 조회한다 (모듈 탭 필터).
+    - 노드는 dict 대신 rows.FolderNode / rows.IssueNode (__slots__, dict 읽기 API 호환) 이다.
+      행마다 dict 를 두 번(dict(row), {**row, ...}) 만들지 않고 row_factory 로 노드를 바로 만든다.
+    """
+    cur = conn.cursor()
+
+    folders = fetch_rows(
+        cur,
+        FolderNode,
+        f"SELECT {', '.join(TREE_FOLDER_COLUMNS)} FROM folders WHERE project_id = ? ORDER BY sort_order, name",
+        (project_id,),
+    )
+
+    issue_sql = f"SELECT {', '.join(TREE_ISSUE_COLUMNS)} FROM issues WHERE project_id = ? AND is_deleted = 0"
+    issue_params: List[Any] = [project_id]
+    if issue_type:
+        issue_sql += " AND issue_type = ?"
+        issue_params.append(issue_type.upper())
+    issues = fetch_rows(cur, IssueNode, issue_sql + " ORDER BY summary", issue_params)
+
+    folder_map: Dict[str, FolderNode] = {f.id: f for f in folders}
+
+    # attach issues as children of folders
+    roots: List[Any] = []
+
+    for node in issues:
+        parent = folder_map.get(node.folder_id) if node.folder_id else None
+        if parent is not None:
+            parent.children.append(node)
+        else:
+            # 폴더에 속하지 않은 이슈는 트리의 루트 수준에 직접 표시한다.
+            # (엑셀에서 새로 생성한 로컬 이슈 등 folder_id 가 없는 경우 보이도록 하기 위함)
+            roots.append(node)
+
+    # build tree roots (folders with no parent)
+    for folder in folders:
+        parent = folder_map.get(folder.parent_id) if folder.parent_id else None
+        if parent is not None:
+            parent.children.append(folder)
+        else:
+            roots.append(folder)
+
+    return {"roots": roots}
+
+
+def get_folder_descendant_counts(
+    conn: sqlite3.Connection,
+    project_id: int,
+    folder_ids: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, int]]:
+    """
+    폴더별 하위 트리 전체(자기 자신 포함)의 삭제되지 않은 이슈 수를 issue_type 별로 반환한다.
+
+    Returns:
+        { folder_id: { "TEST_CASE": 12, "REQUIREMENT": 3, ... }, ... }
+        이슈가 하나도 없는 폴더는 결과에 포함되지 않는다.
+
+    folder_ids 를 주면 해당 폴더들에 대해서만 계산한다 (지연 로딩 시 한 단계의 폴더들).
+    하위 폴더와 이슈 모두 project_id 의 것만 센다.
+    """
+    if folder_ids is not None and not folder_ids:
+        return {}
+    cur = conn.cursor()
+    counts: Dict[str, Dict[str, int]] = {}
+
+    if folder_ids is None:
+        seeds = [(None, [project_id])]
+    else:
+        seeds = []
+        for start in range(0, len(folder_ids), _SQL_CHUNK_SIZE):
+            chunk = list(folder_ids[start:start + _SQL_CHUNK_SIZE])
+            seeds.append((chunk, [project_id, *chunk]))
+    # 재귀 단계의 하위 폴더 / 이슈 조인도 같은 프로젝트로 제한한다.
+    seeds = [(chunk, [*params, project_id, project_id]) for chunk, params in seeds]
+
+    for chunk, params in seeds:
+        seed_filter = "" if chunk is None else f" AND id IN ({', '.join('?' for _ in chunk)})"
+        cur.execute(
+            f"""
+            WITH RECURSIVE sub(root_id, id, depth) AS (
+                SELECT id, id, 0 FROM folders WHERE project_id = ?{seed_filter}
+                UNION ALL
+                SELECT s.root_id, f.id, s.depth + 1
+                  FROM sub s
+                  JOIN folders f ON f.project_id = ? AND f.parent_id = s.id
+                 WHERE s.depth < {_FOLDER_PATH_MAX_DEPTH}
+            )
+            SELECT s.root_id, i.issue_type, COUNT(*)
+              FROM sub s
+              JOIN issues i ON i.folder_id = s.id AND i.is_deleted = 0 AND i.project_id = ?
+             GROUP BY s.root_id, i.issue_type
+            """,
+            params,
+        )
+        for root_id, issue_type, cnt in cur.fetchall():
+            counts.setdefault(root_id, {})[issue_type or ""] = int(cnt)
+    return counts
+
+
+def get_folder_local_subfolder_types(
+    conn: sqlite3.Connection,
+    project_id: int,
+    folder_ids: List[str],
+) -> Dict[str, set]:
+    """
+    폴더별로 하위 트리에 있는 사용자 로컬 폴더(LOCAL-<TYPE>-...)의 TYPE 집합을 반환한다.
+
+    LOCAL 폴더는 비어 있어도 자기 타입 탭에 표시되므로, 그런 폴더만 가진 RTM 폴더도 표시해야 한다.
+    LOCAL 폴더 아래로는 내려가지 않는다 (바깥 LOCAL 폴더의 표시 여부가 그 하위를 결정한다).
+    LOCAL 폴더가 없는 폴더는 결과에 포함되지 않는다.
+    """
+    if not folder_ids:
+        return {}
+    cur = conn.cursor()
+    result: Dict[str, set] = {}
+    for start in range(0, len(folder_ids), _SQL_CHUNK_SIZE):
+        chunk = list(folder_ids[start:start + _SQL_CHUNK_SIZE])
+        cur.execute(
+            f"""
+            WITH RECURSIVE sub(root_id, id, depth) AS (
+                SELECT id, id, 0 FROM folders WHERE project_id = ? AND id IN ({', '.join('?' for _ in chunk)})
+                UNION ALL
+                SELECT s.root_id, f.id, s.depth + 1
+                  FROM sub s
+                  JOIN folders f ON f.project_id = ? AND f.parent_id = s.id
+                 WHERE s.depth < {_FOLDER_PATH_MAX_DEPTH} AND s.id NOT LIKE 'LOCAL-%'
+            )
+            SELECT DISTINCT root_id, upper(substr(id, 7, instr(substr(id, 7), '-') - 1))
+              FROM sub
+             WHERE depth > 0 AND id LIKE 'LOCAL-%' AND instr(substr(id, 7), '-') > 1
+            """,
+            [project_id, *chunk, project_id],
+        )
+        for root_id, local_type in cur.fetchall():
+            result.setdefault(root_id, set()).add(local_type)
+    return result
+
+
+def fetch_folder_children(
+    conn: sqlite3.Connection,
+    project_id: int,
+    parent_id: Optional[str] = None,
+    issue_type: Optional[str] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    트리 지연 로딩용: 한 폴더(또는 루트, parent_id=None)의 바로 아래 자식만 조회한다.
+
+    루트 단계에는 전체 트리를 만들던 때처럼 부모 폴더가 (이 프로젝트에) 없는 폴더와
+    folder_id 가 어느 폴더도 가리키지 않는 이슈도 포함한다 (그렇지 않으면 트리에서 닿을 수 없다).
+
+    Returns:
+        {
+          "folders": [ {id, parent_id, name, node_type, sort_order, counts: {issue_type: n},
+                        local_types: {TYPE, ...}}, ... ],
+          "issues":  [ {id, summary, jira_key, issue_type, folder_id, dirty}, ... ],
+        }
+        counts 는 각 하위 폴더의 하위 트리 전체 이슈 수 (get_folder_descendant_counts 참고),
+        local_types 는 하위 트리의 LOCAL 폴더 타입 (get_folder_local_subfolder_types 참고)으로,
+        펼치기 전에 "빈 폴더 숨김" / 개수 표시 여부를 판단하는 데 사용한다.
+    """
+    cur = conn.cursor()
+    if parent_id is None:
+        folder_filter = (
+            "(parent_id IS NULL OR parent_id = ''"
+            " OR NOT EXISTS (SELECT 1 FROM folders p WHERE p.id = folders.parent_id AND p.project_id = ?))"
+        )
+        folder_params: List[Any] = [project_id, project_id]
+        issue_filter = (
+            "(folder_id IS NULL OR folder_id = ''"
+            " OR NOT EXISTS (SELECT 1 FROM folders f WHERE f.id = issues.folder_id AND f.project_id = ?))"
+        )
+        issue_params: List[Any] = [project_id, project_id]
+    else:
+        folder_filter = "parent_id = ?"
+        folder_params = [project_id, parent_id]
+        issue_filter = "folder_id = ?"
+        issue_params = [project_id, parent_id]
+
+    cur.execute(
+        f"""
+        SELECT {', '.join(TREE_FOLDER_COLUMNS)}
+          FROM folders
+         WHERE project_id = ? AND {folder_filter}
+         ORDER BY sort_order, name
+        """,
+        folder_params,
+    )
+    folders = [dict(row) for row in cur.fetchall()]
+    folder_ids = [f["id"] for f in folders]
+    counts = get_folder_descendant_counts(conn, project_id, folder_ids)
+    local_types = get_folder_local_subfolder_types(conn, project_id, folder_ids)
+    for f in folders:
+        f["counts"] = counts.get(f["id"], {})
+        f["local_types"] = local_types.get(f["id"], set())
+
+    issue_sql = (
+        f"SELECT {', '.join(TREE_ISSUE_COLUMNS)} FROM issues"
+        f" WHERE project_id = ? AND {issue_filter} AND is_deleted = 0"
+    )
+    if issue_type:
+        issue_sql += " AND issue_type = ?"
+        issue_params.append(issue_type.upper())
+    cur.execute(issue_sql + " ORDER BY summary", issue_params)
+    issues = [dict(row) for row in cur.fetchall()]
+    return {"folders": folders, "issues": issues}
+
+
+def get_folder_ancestor_ids(conn: sqlite3.Connection, project_id: int, folder_id: Optional[str]) -> List[str]:
+    """
+    folder_id 와 그 상위 폴더 id 들을 루트부터 순서대로 반환한다 ([root, ..., folder_id]).
+    지연 로딩 트리에서 특정 이슈/폴더까지 펼칠 때 사용한다. 없는 폴더면 빈 목록.
+    """
+    if not folder_id:
+        return []
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        WITH RECURSIVE up(id, parent_id, depth) AS (
+            SELECT id, parent_id, 0 FROM folders WHERE project_id = ? AND id = ?
+            UNION ALL
+            SELECT f.id, f.parent_id, u.depth + 1
+              FROM up u
+              JOIN folders f ON f.id = u.parent_id
+             WHERE u.depth < {_FOLDER_PATH_MAX_DEPTH}
+        )
+        SELECT id FROM up ORDER BY depth DESC
+        """,
+        (project_id, folder_id),
+    )
+    return [row[0] for row in cur.fetchall()]
+
+
+def move_issue_to_folder(
+    conn: sqlite3.Connection, issue_id: int, new_folder_id: Optional[int]
+) -> None:
+    """
+    이슈를 다른 폴더(또는 루트)로 이동한다.
+
+    - new_folder_id 가 None 이면 folder_id 를 NULL 로 설정하여 루트에 위치시킨다.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        "UPDATE issues SET folder_id = ? WHERE id = ?",
+        (new_folder_id, issue_id),
+    )
+    _commit(conn)
+
+
+def move_folder(
+    conn: sqlite3.Connection, folder_id: int, new_parent_id: Optional[int]
+) -> None:
+    """
+    폴더를 다른 부모 폴더(또는 루트)로 이동한다.
+
+    - new_parent_id 가 None 이면 parent_id 를 NULL 로 설정하여 루트에 위치시킨다.
+    - new_parent_id 가 자기 자신이나 하위 폴더이면 (순환) ValueError.
+    """
+    cur = conn.cursor()
+    if new_parent_id is not None:
+        row = cur.execute(
+            """
+            WITH RECURSIVE ancestors(id) AS (
+                SELECT ?
+                UNION
+                SELECT f.parent_id FROM folders f JOIN ancestors a ON f.id = a.id WHERE f.parent_id IS NOT NULL
+            )
+            SELECT 1 FROM ancestors WHERE id = ?
+            """,
+            (new_parent_id, folder_id),
+        ).fetchone()
+        if row:
+            raise ValueError("Cannot move a folder into itself or its own subtree")
+    cur.execute(
+        "UPDATE folders SET parent_id = ? WHERE id = ?",
+        (new_parent_id, folder_id),
+    )
+    _commit(conn)
+
+    for index in _cached_folder_path_indexes(conn):
+        if folder_id in index.nodes and not index.move(folder_id, new_parent_id):
+            invalidate_folder_paths(conn, index.project_id)
+
+
+def get_issue_by_id(conn: sqlite3.Connection, issue_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Fetch a single issue row as a dict.
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT * FROM issues WHERE id = ?", (issue_id,))
+    row = cur.fetchone()
+    return dict(row) if row else None
+
+def get_issue_by_jira_key(conn: sqlite3.Connection, project_id: int, jira_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Given a project_id and JIRA issue key, return the corresponding local issues row as dict, or None.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT * FROM issues WHERE project_id = ? AND jira_key = ? AND is_deleted = 0",
+        (project_id, jira_key),
+    )
+    row = cur.fetchone()
+    return dict(row) if row else None
+
+
+def _issue_select_list(columns: Optional[List[str]]) -> str:
+    if not columns:
+        return "*"
+    cols = list(columns)
+    if "id" not in cols:
+        cols.insert(0, "id")
+    return ", ".join(cols)
+
+
+def get_issues_by_ids(
+    conn: sqlite3.Connection,
+    issue_ids: List[int],
+    columns: Optional[List[str]] = None,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    여러 issue id 를 한 번에 조회하여 {id: row dict} 로 반환한다 (없는 id 는 결과에 없음).
+
+    get_issue_by_id() 를 루프에서 반복 호출하는 대신 사용한다.
+    id 목록은 SQLite 바인딩 변수 한도 아래로 _SQL_CHUNK_SIZE 개씩 나누어 조회한다.
+    columns 를 주면 해당 컬럼만 읽는다 (id 는 항상 포함).
+    """
+    ids = sorted({int(i) for i in issue_ids if i not in (None, "")})
+    select_list = _issue_select_list(columns)
+    result: Dict[int, Dict[str, Any]] = {}
+    cur = conn.cursor()
+    for start in range(0, len(ids), _SQL_CHUNK_SIZE):
+        chunk = ids[start:start + _SQL_CHUNK_SIZE]
+        placeholders = ", ".join("?" for _ in chunk)
+        cur.execute(f"SELECT {select_list} FROM issues WHERE id IN ({placeholders})", chunk)
+        for row in cur.fetchall():
+            result[row["id"]] = dict(row)
+    return result
+
+
+def get_issues_by_jira_keys(
+    conn: sqlite3.Connection,
+    project_id: int,
+    jira_keys: List[str],
+    columns: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    여러 JIRA key 를 한 번에 조회하여 {jira_key: row dict} 로 반환한다.
+
+    get_issue_by_jira_key() 와 같이 삭제되지 않은(is_deleted = 0) 이슈만 대상이며,
+    같은 key 의 행이 여럿이면 id 가 가장 작은 행을 사용한다. 없는 key 는 결과에 없다.
+    """
+    keys = sorted({str(k) for k in jira_keys if k})
+    select_list = _issue_select_list(columns)
+    if columns and "jira_key" not in select_list.split(", "):
+        select_list += ", jira_key"
+    result: Dict[str, Dict[str, Any]] = {}
+    cur = conn.cursor()
+    for start in range(0, len(keys), _SQL_CHUNK_SIZE):
+        chunk = keys[start:start + _SQL_CHUNK_SIZE]
+        placeholders = ", ".join("?" for _ in chunk)
+        cur.execute(
+            f"""
+            SELECT {select_list} FROM issues
+             WHERE project_id = ? AND jira_key IN ({placeholders}) AND is_deleted = 0
+             ORDER BY id
+            """,
+            [project_id, *chunk],
+        )
+        for row in cur.fetchall():
+            result.setdefault(row["jira_key"], dict(row))
+    return result
+
+
+def get_local_issues_without_jira_key(
+    conn: sqlite3.Connection,
+    project_id: int,
+    issue_type: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    jira_key가 NULL이거나 빈 문자열인 로컬 이슈들을 조회합니다.
+    
+    Args:
+        conn: SQLite 연결
+        project_id: 프로젝트 ID
+        issue_type: 이슈 타입 필터 (선택적, None이면 모든 타입)
+    
+    Returns:
+        jira_key가 없는 이슈 목록 (dict 리스트)
+    """
+    cur = conn.cursor()
+    
+    if issue_type:
+        cur.execute(
+            """
+            SELECT * FROM issues 
+            WHERE project_id = ? 
               AND (jira_key IS NULL OR jira_key = '')
               AND is_deleted = 0
-            ORDER BY issue_type, id
+              AND issue_type = ?
+            ORDER BY id
+            """,
+            (project_id, issue_type.upper()),
+        )
+    else:
+        cur.execute(
+            """
+            SELECT * FROM issues 
+            WHERE project_id = ? 
+              AND (jira_key IS NULL OR jira_key = '')
+              AND is_deleted = 0
+            ORDER BY issue_type, id
             """,
             (project_id,),
         )
-    
-    rows = cur.fetchall()
-    return [dict(row) for row in rows]
+    
+    rows = cur.fetchall()
+    return [dict(row) for row in rows]
+
+
+
+def update_issue_fields(conn: sqlite3.Connection, issue_id: int, fields: Dict[str, Any]) -> None:
+    """
+    Update given columns of an issue identified by id.
+    Only keys present in `fields` whose value actually differs are written, and those
+    columns are recorded in issue_pending_changes (dirty = 1) until the next sync.
+    동기화 식별 컬럼(jira_key / jira_id, SYNC_IDENTITY_FIELDS)은 서버에서 받은 값을 기록하는 것이므로
+    pending 으로 남기지 않는다 (Push 대상이 아님).
+    labels / components / fix_versions / affects_versions 가 포함되면 junction 테이블도 함께 갱신한다.
+    attachments / local_activity 키는 issues 컬럼 대신 issue_attachments / issue_activity 테이블에 쓴다.
+    """
+    if not fields:
+        return
+    row_fields = {k: v for k, v in fields.items() if k not in ("attachments", "local_activity")}
+    cur = conn.cursor()
+    changed: Dict[str, Any] = {}
+    if row_fields:
+        cur.execute(f"SELECT {', '.join(row_fields)} FROM issues WHERE id = ?", (issue_id,))
+        current = cur.fetchone()
+        if current is None:
+            return
+        # row_factory 가 sqlite3.Row 가 아닌 연결에서도 동작하도록 위치로 읽는다.
+        changed = {
+            k: v for (k, v), old in zip(row_fields.items(), current) if _pending_value(old) != _pending_value(v)
+        }
+    with transaction(conn):
+        if changed:
+            assignments = ", ".join(f"{k} = ?" for k in changed)
+            cur.execute(f"UPDATE issues SET {assignments} WHERE id = ?", [*changed.values(), issue_id])
+            _write_issue_dimensions(cur, issue_id, changed)
+            mark_pending_changes(conn, issue_id, [k for k in changed if k not in SYNC_IDENTITY_FIELDS])
+        if "attachments" in fields:
+            replace_issue_attachments(conn, issue_id, parse_attachments(fields["attachments"]))
+        if "local_activity" in fields:
+            set_issue_activity_text(conn, issue_id, fields["local_activity"])
+
+
+def create_local_issue(
+    conn: sqlite3.Connection,
+    project_id: int,
+    issue_type: str,
+    folder_id: Optional[str] = None,
+    summary: str = "",
+) -> int:
+    """
+    Create a new local-only issue row and return its id.
+
+    - Used by GUI when user clicks 'New Issue' on the local panel.
+    - Minimal fields are populated; user will fill Details/Steps/etc. afterwards.
+    - The new row is recorded as pending '*' (whole issue) so Push / get_pending_changes() see it.
+    """
+    cur = conn.cursor()
+    with transaction(conn):
+        cur.execute(
+            """
+            INSERT INTO issues (
+                project_id,
+                jira_key,
+                jira_id,
+                issue_type,
+                summary,
+                description,
+                status,
+                priority,
+                assignee,
+                reporter,
+                labels,
+                components,
+                security_level,
+                fix_versions,
+                affects_versions,
+                rtm_environment,
+                due_date,
+                created,
+                updated,
+                attachments,
+                folder_id,
+                parent_issue_id,
+                is_deleted,
+                local_only,
+                last_sync_at,
+                dirty
+            )
+            VALUES (?, NULL, NULL, ?, ?, '', '', '', '', '', '', '', '', '', '', '', '', datetime('now'), datetime('now'),
+                    '', ?, NULL, 0, 1, NULL, 1)
+            """,
+            (project_id, issue_type, summary, folder_id),
+        )
+        issue_id = int(cur.lastrowid)
+        # 아직 JIRA 에 없는 이슈이므로 전체가 Push 대상이다.
+        mark_pending_changes(conn, issue_id, [PENDING_ALL])
+    return issue_id
+
+
+def soft_delete_issue(conn: sqlite3.Connection, issue_id: int) -> None:
+    """
+    Soft delete an issue by setting is_deleted = 1 (and deleted_at).
+    The row remains in DB but is hidden from trees and lists,
+    until purge_deleted_issues() removes it after the retention window.
+    """
+    with transaction(conn):
+        conn.execute(
+            "UPDATE issues SET is_deleted = 1, deleted_at = datetime('now') WHERE id = ? AND is_deleted = 0",
+            (issue_id,),
+        )
+        mark_pending_changes(conn, issue_id, ["is_deleted"])
+
+
+def create_folder_node(
+    conn: sqlite3.Connection,
+    project_id: int,
+    name: str,
+    parent_id: Optional[str] = None,
+    sort_order: int = 0,
+    issue_type: Optional[str] = None,
+) -> str:
+    """
+    Create a new folder row under the given parent (or as root if parent_id is None).
+    Returns the generated folder id.
+
+    issue_type 가 주어지면, 폴더 id 에 타입 정보를 포함시켜
+    탭(이슈 타입)별로 자신이 생성한 폴더만 보이도록 사용할 수 있다.
+    예: LOCAL-TEST_CASE-<uuid>
+    """
+    prefix = "LOCAL-"
+    if issue_type:
+        prefix = f"LOCAL-{issue_type.upper()}-"
+    folder_id = f"{prefix}{uuid.uuid4().hex}"
+    upsert_folder(
+        conn,
+        project_id=project_id,
+        folder_id=folder_id,
+        name=name,
+        node_type="FOLDER",
+        parent_id=parent_id,
+        sort_order=sort_order,
+    )
+    return folder_id
+
+
+def delete_folder_if_empty(conn: sqlite3.Connection, folder_id: str) -> bool:
+    """
+    Delete a folder only if it has no child folders and no non-deleted issues.
+    Returns True if deleted, False if not empty.
+    """
+    cur = conn.cursor()
+
+    # Check child folders
+    cur.execute("SELECT COUNT(*) FROM folders WHERE parent_id = ?", (folder_id,))
+    child_folders = cur.fetchone()[0]
+
+    # Check issues attached to this folder
+    cur.execute(
+        "SELECT COUNT(*) FROM issues WHERE folder_id = ? AND is_deleted = 0",
+        (folder_id,),
+    )
+    child_issues = cur.fetchone()[0]
+
+    if child_folders or child_issues:
+        return False
+
+    cur.execute("DELETE FROM folders WHERE id = ?", (folder_id,))
+    _commit(conn)
+    for index in _cached_folder_path_indexes(conn):
+        index.remove(folder_id)
+    return True
+
+
+# --- Subtree copy (set-based) ---------------------------------------------------------
+#
+# 폴더 서브트리 / 이슈 복사는 행 단위 INSERT 대신 INSERT ... SELECT 로 처리한다.
+# 복사 대상과 새 id 는 TEMP 매핑 테이블(_copy_folder_map / _copy_issue_map)에 먼저 만들고,
+# 각 하위 테이블은 매핑 테이블과 JOIN 한 INSERT ... SELECT 한 문장으로 복사한다.
+# TEMP 테이블에는 통계가 없어 planner 가 큰 테이블을 바깥 루프로 고를 수 있으므로,
+# CROSS JOIN 으로 매핑 테이블을 바깥 루프에 고정한다 (SQLite 는 CROSS JOIN 순서를 바꾸지 않는다).
+
+# 그대로 복사하는 issues 컬럼 (jira_key / jira_id / folder_id / parent_issue_id / 상태 컬럼은 따로 정한다.
+# attachments / local_activity 컬럼은 migration 007 이후 사용하지 않는다)
+_COPY_ISSUE_COLUMNS = (
+    "project_id",
+    "issue_type",
+    "summary",
+    "description",
+    "status",
+    "priority",
+    "assignee",
+    "reporter",
+    "labels",
+    "components",
+    "security_level",
+    "fix_versions",
+    "affects_versions",
+    "rtm_environment",
+    "due_date",
+    "epic_link",
+    "sprint",
+    "preconditions",
+)
+
+# (결과 키, 매핑 테이블 기준 INSERT ... SELECT). m = _copy_issue_map (old_id -> new_id)
+_COPY_ISSUE_CHILD_STATEMENTS: List[Tuple[str, str]] = [
+    (
+        "testcase_steps",
+        """
+        INSERT INTO testcase_steps (issue_id, group_no, order_no, action, input, expected)
+        SELECT m.new_id, s.group_no, s.order_no, s.action, s.input, s.expected
+          FROM temp._copy_issue_map m CROSS JOIN testcase_steps s ON s.issue_id = m.old_id
+         ORDER BY m.new_id, s.group_no, s.order_no, s.id
+        """,
+    ),
+    (
+        "issue_labels",
+        "INSERT INTO issue_labels (issue_id, label)"
+        " SELECT m.new_id, l.label FROM temp._copy_issue_map m CROSS JOIN issue_labels l ON l.issue_id = m.old_id",
+    ),
+    (
+        "issue_components",
+        "INSERT INTO issue_components (issue_id, component)"
+        " SELECT m.new_id, c.component FROM temp._copy_issue_map m CROSS JOIN issue_components c ON c.issue_id = m.old_id",
+    ),
+    (
+        "issue_versions",
+        "INSERT INTO issue_versions (issue_id, kind, version)"
+        " SELECT m.new_id, v.kind, v.version FROM temp._copy_issue_map m CROSS JOIN issue_versions v ON v.issue_id = m.old_id",
+    ),
+    # 첨부 파일은 복사하지 않고 원본과 같은 local_path 를 가리킨다 (삭제 시 count_attachment_path_references 확인).
+    (
+        "issue_attachments",
+        """
+        INSERT INTO issue_attachments (issue_id, position, filename, jira_attachment_id, local_path, meta)
+        SELECT m.new_id, a.position, a.filename, a.jira_attachment_id, a.local_path, a.meta
+          FROM temp._copy_issue_map m CROSS JOIN issue_attachments a ON a.issue_id = m.old_id
+         ORDER BY m.new_id, a.position, a.id
+        """,
+    ),
+    (
+        "issue_activity",
+        """
+        INSERT INTO issue_activity (issue_id, created_at, body)
+        SELECT m.new_id, a.created_at, a.body
+          FROM temp._copy_issue_map m CROSS JOIN issue_activity a ON a.issue_id = m.old_id
+         ORDER BY m.new_id, a.id
+        """,
+    ),
+    # 복사된 이슈가 가진(src 인) 링크만 복사한다. 대상이 함께 복사되었으면 복사본을 가리키게 한다.
+    # 외부 이슈 → 복사 대상 링크는 외부 이슈를 바꾸게 되므로 복사하지 않는다.
+    (
+        "relations",
+        """
+        INSERT OR IGNORE INTO relations (src_issue_id, dst_issue_id, relation_type, created_at)
+        SELECT m.new_id, COALESCE(d.new_id, r.dst_issue_id), r.relation_type, datetime('now')
+          FROM temp._copy_issue_map m
+          CROSS JOIN relations r ON r.src_issue_id = m.old_id
+          LEFT JOIN temp._copy_issue_map d ON d.old_id = r.dst_issue_id
+        """,
+    ),
+    # Test Plan 이 복사되면 그 Test Case 목록도 복사한다 (함께 복사된 Test Case 는 복사본으로).
+    (
+        "testplan_testcases",
+        """
+        INSERT OR IGNORE INTO testplan_testcases (testplan_id, testcase_id, order_no)
+        SELECT m.new_id, COALESCE(t.new_id, tp.testcase_id), tp.order_no
+          FROM temp._copy_issue_map m
+          CROSS JOIN testplan_testcases tp ON tp.testplan_id = m.old_id
+          LEFT JOIN temp._copy_issue_map t ON t.old_id = tp.testcase_id
+         ORDER BY m.new_id, tp.order_no, tp.id
+        """,
+    ),
+]
+
+
+@dataclass
+class SubtreeCopyResult:
+    """copy_subtree() / copy_issues() 결과: 원본 id -> 새 id 매핑과 테이블별 복사 행 수."""
+
+    folder_map: Dict[str, str] = field(default_factory=dict)
+    issue_map: Dict[int, int] = field(default_factory=dict)
+    counts: Dict[str, int] = field(default_factory=dict)
+    # 복사된 서브트리 루트 폴더의 새 id (copy_issues 는 None)
+    root_folder_id: Optional[str] = None
+
+    @property
+    def created(self) -> int:
+        """새로 만든 폴더 + 이슈 수."""
+        return len(self.folder_map) + len(self.issue_map)
+
+
+def _prepare_copy_maps(cur: sqlite3.Cursor) -> None:
+    cur.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS _copy_folder_map (old_id TEXT PRIMARY KEY, new_id TEXT NOT NULL UNIQUE)"
+    )
+    cur.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS _copy_issue_map (old_id INTEGER PRIMARY KEY, new_id INTEGER NOT NULL UNIQUE)"
+    )
+    cur.execute("DELETE FROM temp._copy_folder_map")
+    cur.execute("DELETE FROM temp._copy_issue_map")
+
+
+def _next_issue_id_base(cur: sqlite3.Cursor) -> int:
+    """새 issues.id 의 시작점 - 1 (AUTOINCREMENT 가 발급했던 최대값 이후부터 쓴다)."""
+    row = cur.execute("SELECT seq FROM sqlite_sequence WHERE name = 'issues'").fetchone()
+    seq = int(row[0]) if row and row[0] is not None else 0
+    row = cur.execute("SELECT MAX(id) FROM issues").fetchone()
+    return max(seq, int(row[0]) if row and row[0] is not None else 0)
+
+
+def _copy_mapped_issues(cur: sqlite3.Cursor, target_folder_id: Optional[str], result: SubtreeCopyResult) -> None:
+    """
+    _copy_issue_map 에 든 이슈들과 하위 행을 복사한다.
+    폴더는 _copy_folder_map 에 있으면 복사본 폴더로, 없으면 target_folder_id 로 둔다.
+    """
+    columns = ", ".join(_COPY_ISSUE_COLUMNS)
+    source_columns = ", ".join(f"i.{c}" for c in _COPY_ISSUE_COLUMNS)
+    cur.execute(
+        f"""
+        INSERT INTO issues (
+            id, {columns}, jira_key, jira_id, folder_id, parent_issue_id,
+            created, updated, is_deleted, local_only, last_sync_at, dirty
+        )
+        SELECT m.new_id, {source_columns}, NULL, NULL, COALESCE(f.new_id, ?), pm.new_id,
+               datetime('now'), datetime('now'), 0, 1, NULL, 1
+          FROM temp._copy_issue_map m
+          CROSS JOIN issues i ON i.id = m.old_id
+          LEFT JOIN temp._copy_folder_map f ON f.old_id = i.folder_id
+          LEFT JOIN temp._copy_issue_map pm ON pm.old_id = i.parent_issue_id
+         ORDER BY m.new_id
+        """,
+        (target_folder_id,),
+    )
+    result.counts["issues"] = cur.rowcount
+    # 복사본은 JIRA 에 없는 새 이슈이므로 create_local_issue() 와 같이 전체('*')를 pending 으로 둔다.
+    cur.execute(
+        """
+        INSERT OR IGNORE INTO issue_pending_changes (project_id, issue_id, field)
+        SELECT i.project_id, i.id, ? FROM temp._copy_issue_map m CROSS JOIN issues i ON i.id = m.new_id
+        """,
+        (PENDING_ALL,),
+    )
+    for key, sql in _COPY_ISSUE_CHILD_STATEMENTS:
+        cur.execute(sql)
+        result.counts[key] = result.counts.get(key, 0) + max(cur.rowcount, 0)
+    result.issue_map = {int(old): int(new) for old, new in cur.execute("SELECT old_id, new_id FROM temp._copy_issue_map")}
+
+
+def copy_subtree(
+    conn: sqlite3.Connection,
+    src_folder_id: str,
+    dst_parent_id: Optional[str],
+    issue_type: Optional[str] = None,
+) -> SubtreeCopyResult:
+    """
+    src_folder_id 를 루트로 하는 폴더 서브트리(하위 폴더, 삭제되지 않은 이슈, Steps, labels/components/versions,
+    첨부/Activity, 이슈가 가진 relations, Test Plan 의 Test Case 목록)를 dst_parent_id 아래에 한 트랜잭션으로 복사한다.
+
+    - 폴더 목록은 recursive CTE 로 한 번에 구하고, 각 테이블은 INSERT ... SELECT 한 문장으로 복사한다.
+    - 복사본은 로컬 전용이다: 폴더 id 는 LOCAL-<TYPE>-<hex> (원본 LOCAL 폴더의 타입, 없으면 issue_type),
+      이슈는 jira_key/jira_id 없이 local_only = 1, dirty = 1 로 만든다.
+    - Test Execution 실행 기록(testexecutions / testcase_executions)은 복사하지 않는다.
+    - 원본 폴더가 없으면 빈 결과를 반환한다. dst_parent_id 가 서브트리 안이면 ValueError.
+
+    RETURNS: SubtreeCopyResult (folder_map / issue_map 은 원본 id -> 새 id)
+    """
+    result = SubtreeCopyResult()
+    cur = conn.cursor()
+    row = cur.execute("SELECT project_id FROM folders WHERE id = ?", (src_folder_id,)).fetchone()
+    if row is None:
+        return result
+    project_id = int(row[0])
+    type_prefix = f"{issue_type.upper()}-" if issue_type else ""
+
+    with transaction(conn):
+        _prepare_copy_maps(cur)
+        # 새 폴더 id: 원본이 LOCAL-<TYPE>-... 이면 같은 TYPE, 아니면 issue_type (create_folder_node 와 같은 형식)
+        cur.execute(
+            """
+            INSERT INTO temp._copy_folder_map (old_id, new_id)
+            WITH RECURSIVE subtree(id) AS (
+                SELECT id FROM folders WHERE id = ?
+                UNION
+                SELECT f.id FROM folders f JOIN subtree s ON f.parent_id = s.id
+            )
+            SELECT id,
+                   'LOCAL-'
+                   || CASE
+                          WHEN id LIKE 'LOCAL-%' AND instr(substr(id, 7), '-') > 1
+                          THEN upper(substr(id, 7, instr(substr(id, 7), '-') - 1)) || '-'
+                          ELSE ?
+                      END
+                   || lower(hex(randomblob(16)))
+              FROM subtree
+            """,
+            (src_folder_id, type_prefix),
+        )
+        if dst_parent_id is not None and cur.execute(
+            "SELECT 1 FROM temp._copy_folder_map WHERE old_id = ?", (dst_parent_id,)
+        ).fetchone():
+            raise ValueError("Cannot copy a folder into its own subtree")
+
+        cur.execute(
+            """
+            INSERT INTO folders (id, project_id, parent_id, name, node_type, sort_order)
+            SELECT m.new_id, f.project_id, CASE WHEN f.id = ? THEN ? ELSE p.new_id END, f.name, f.node_type, f.sort_order
+              FROM temp._copy_folder_map m
+              CROSS JOIN folders f ON f.id = m.old_id
+              LEFT JOIN temp._copy_folder_map p ON p.old_id = f.parent_id
+            """,
+            (src_folder_id, dst_parent_id),
+        )
+        result.counts["folders"] = cur.rowcount
+        result.folder_map = {old: new for old, new in cur.execute("SELECT old_id, new_id FROM temp._copy_folder_map")}
+        result.root_folder_id = result.folder_map.get(src_folder_id)
+
+        # 새 issues.id 는 원본 id 순서대로 base+1, base+2, ...
+        # (명시한 id 로 INSERT 해도 AUTOINCREMENT 의 sqlite_sequence 는 갱신된다)
+        cur.execute(
+            """
+            INSERT INTO temp._copy_issue_map (old_id, new_id)
+            SELECT i.id, ? + row_number() OVER (ORDER BY i.id)
+              FROM temp._copy_folder_map m
+              CROSS JOIN issues i ON i.folder_id = m.old_id AND i.is_deleted = 0
+            """,
+            (_next_issue_id_base(cur),),
+        )
+        _copy_mapped_issues(cur, dst_parent_id, result)
+
+    # 새 폴더가 여러 개 생겼으므로 경로 인덱스는 다시 만든다.
+    invalidate_folder_paths(conn, project_id)
+    return result
+
+
+def copy_issues(
+    conn: sqlite3.Connection, issue_ids: List[int], target_folder_id: Optional[str]
+) -> SubtreeCopyResult:
+    """
+    이슈들을 target_folder_id 에 복사한다 (copy_subtree 와 같은 규칙, 한 트랜잭션).
+    함께 복사되는 이슈 사이의 relations / Test Plan 링크 / parent_issue_id 는 복사본끼리 연결된다.
+    """
+    result = SubtreeCopyResult()
+    ids = sorted({int(i) for i in issue_ids})
+    if not ids:
+        return result
+    cur = conn.cursor()
+    with transaction(conn):
+        _prepare_copy_maps(cur)
+        # ids 가 정렬되어 있으므로 chunk 마다 이어서 번호를 매기면 원본 id 순서가 유지된다.
+        next_id = _next_issue_id_base(cur)
+        for start in range(0, len(ids), _SQL_CHUNK_SIZE):
+            chunk = ids[start:start + _SQL_CHUNK_SIZE]
+            cur.execute(
+                f"""
+                INSERT INTO temp._copy_issue_map (old_id, new_id)
+                SELECT id, ? + row_number() OVER (ORDER BY id)
+                  FROM issues WHERE id IN ({', '.join('?' * len(chunk))}) AND is_deleted = 0
+                """,
+                [next_id, *chunk],
+            )
+            next_id += cur.rowcount
+        _copy_mapped_issues(cur, target_folder_id, result)
+    return result
+
+
+# --- Pending changes (field-level dirty tracking) ----------------------------------
+#
+# issue_pending_changes 에는 마지막 동기화 이후 바뀐 issues 컬럼명과 자식 컬렉션 이름
+# (PENDING_COLLECTIONS) 이 이슈별로 한 행씩 남는다. issues.dirty 는 이 집합이 비어 있지 않은지의 요약이다.
+# Push 는 이 집합에 있는 필드/컬렉션만 보내고, 성공한 부분을 clear_pending_changes() 로 지운다.
+
+PENDING_COLLECTIONS = (
+    "steps",
+    "relations",
+    "testplan_testcases",
+    "testexecution",
+    "testcase_executions",
+    "attachments",
+)
+# 어떤 필드가 바뀌었는지 모르는 경우 (migration 이전의 dirty 이슈, 아직 JIRA 에 없는 로컬 이슈) - 전체를 보낸다.
+PENDING_ALL = "*"
+# 서버가 정하는 동기화 식별 컬럼 - 로컬 변경으로 추적하지 않는다 (update_issue_fields 참고).
+SYNC_IDENTITY_FIELDS = frozenset({"jira_key", "jira_id"})
+
+
+def _pending_value(value: Any) -> str:
+    """변경 여부 비교용 정규화 (None 과 "" 는 같은 값으로 본다)."""
+    return "" if value is None else str(value)
+
+
+def mark_pending_changes(conn: sqlite3.Connection, issue_id: int, fields: Any) -> None:
+    """issue_id 의 fields (컬럼명 / 컬렉션 이름) 를 pending 으로 기록하고 dirty = 1 로 둔다."""
+    names = sorted({str(f) for f in fields if f})
+    if not names:
+        return
+    cur = conn.cursor()
+    cur.executemany(
+        """
+        INSERT INTO issue_pending_changes (project_id, issue_id, field)
+        SELECT project_id, id, ? FROM issues WHERE id = ?
+        ON CONFLICT (project_id, issue_id, field) DO UPDATE SET changed_at = excluded.changed_at
+        """,
+        [(name, issue_id) for name in names],
+    )
+    cur.execute("UPDATE issues SET dirty = 1 WHERE id = ? AND dirty IS NOT 1", (issue_id,))
+    _commit(conn)
+
+
+def clear_pending_changes(conn: sqlite3.Connection, issue_id: int, fields: Any = None) -> int:
+    """
+    동기화(Push/Pull)가 끝난 fields 의 pending 기록을 지우고 지운 행 수를 반환한다.
+    fields 가 None 이면 이슈의 pending 전체를 지운다. 남은 pending 이 없으면 dirty = 0 이 된다
+    (fields 가 비어 있어도 dirty 는 다시 계산한다).
+    """
+    cur = conn.cursor()
+    deleted = 0
+    if fields is None:
+        cur.execute("DELETE FROM issue_pending_changes WHERE issue_id = ?", (issue_id,))
+        deleted = cur.rowcount
+    else:
+        names = sorted({str(f) for f in fields if f})
+        if names:
+            cur.executemany(
+                "DELETE FROM issue_pending_changes WHERE issue_id = ? AND field = ?",
+                [(issue_id, name) for name in names],
+            )
+            deleted = cur.rowcount
+    cur.execute(
+        """
+        UPDATE issues SET dirty = 0
+         WHERE id = ? AND dirty IS NOT 0
+           AND NOT EXISTS (SELECT 1 FROM issue_pending_changes WHERE issue_id = ?)
+        """,
+        (issue_id, issue_id),
+    )
+    _commit(conn)
+    return deleted
+
+
+def get_pending_fields(conn: sqlite3.Connection, issue_id: int) -> set:
+    """이슈의 pending 필드/컬렉션 이름 집합 (없으면 빈 set)."""
+    cur = conn.cursor()
+    cur.execute("SELECT field FROM issue_pending_changes WHERE issue_id = ?", (issue_id,))
+    return {row[0] for row in cur.fetchall()}
+
+
+def get_pending_changes(
+    conn: sqlite3.Connection,
+    project_id: int,
+    issue_type: Optional[str] = None,
+) -> Dict[int, List[str]]:
+    """
+    프로젝트에서 동기화 대기 중인 변경을 {issue_id: [field, ...]} 로 반환한다 (issue_id 순).
+    삭제된 이슈의 is_deleted 기록도 포함한다.
+    """
+    sql = "SELECT p.issue_id, p.field FROM issue_pending_changes p"
+    params: List[Any] = []
+    if issue_type:
+        sql += " JOIN issues i ON i.id = p.issue_id AND i.issue_type = ?"
+        params.append(issue_type.upper())
+    sql += " WHERE p.project_id = ? ORDER BY p.issue_id, p.field"
+    params.append(project_id)
+    result: Dict[int, List[str]] = {}
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    for issue_id, name in cur.fetchall():
+        result.setdefault(issue_id, []).append(name)
+    return result
+
+
+# --- Labels / components / versions ---------------------------------------------------
+#
+# issues 의 쉼표 구분 텍스트 컬럼(호환용 원본)을 junction 테이블로 정규화하여 인덱스로 필터/집계한다.
+# dimension 이름은 issues 컬럼 이름을 그대로 사용한다.
+
+# dimension -> (table, value column, versions.kind)
+ISSUE_DIMENSIONS: Dict[str, Tuple[str, str, Optional[str]]] = {
+    "labels": ("issue_labels", "label", None),
+    "components": ("issue_components", "component", None),
+    "fix_versions": ("issue_versions", "version", "fix"),
+    "affects_versions": ("issue_versions", "version", "affects"),
+}
+
+
+def split_multi_value(text: Any) -> List[str]:
+    """"a, b, c" 형태의 쉼표 구분 문자열을 공백 제거/중복 제거한 값 목록으로 나눈다 (순서 유지)."""
+    if not text:
+        return []
+    values: List[str] = []
+    for part in str(text).split(","):
+        part = part.strip()
+        if part and part not in values:
+            values.append(part)
+    return values
+
+
+def _dimension_filter(dimension: str) -> Tuple[str, str, str, List[Any]]:
+    """dimension 이름 → (table, value column, 추가 WHERE 절, 추가 파라미터)."""
+    if dimension not in ISSUE_DIMENSIONS:
+        raise ValueError(f"Unknown issue dimension: {dimension!r} (expected one of {sorted(ISSUE_DIMENSIONS)})")
+    table, value_col, kind = ISSUE_DIMENSIONS[dimension]
+    if kind is None:
+        return table, value_col, "", []
+    return table, value_col, " AND d.kind = ?", [kind]
+
+
+def _write_issue_dimensions(cur: sqlite3.Cursor, issue_id: int, fields: Dict[str, Any]) -> None:
+    """fields 에 들어 있는 dimension 컬럼만 junction 테이블에 다시 기록한다 (커밋하지 않음)."""
+    for dimension, text in fields.items():
+        if dimension not in ISSUE_DIMENSIONS:
+            continue
+        table, value_col, kind = ISSUE_DIMENSIONS[dimension]
+        values = split_multi_value(text)
+        if kind is None:
+            cur.execute(f"DELETE FROM {table} WHERE issue_id = ?", (issue_id,))
+            if values:
+                cur.executemany(
+                    f"INSERT OR IGNORE INTO {table} (issue_id, {value_col}) VALUES (?, ?)",
+                    [(issue_id, v) for v in values],
+                )
+        else:
+            cur.execute(f"DELETE FROM {table} WHERE issue_id = ? AND kind = ?", (issue_id, kind))
+            if values:
+                cur.executemany(
+                    f"INSERT OR IGNORE INTO {table} (issue_id, kind, {value_col}) VALUES (?, ?, ?)",
+                    [(issue_id, kind, v) for v in values],
+                )
+
+
+def sync_issue_dimensions(conn: sqlite3.Connection, issue_ids: List[int]) -> None:
+    """
+    issues 행의 현재 텍스트 컬럼으로 junction 테이블을 다시 계산한다.
+    update_issue_fields() 를 거치지 않고 issues 에 직접 INSERT/UPDATE 한 경우 호출한다.
+    """
+    cur = conn.cursor()
+    found = get_issues_by_ids(conn, issue_ids, columns=list(ISSUE_DIMENSIONS))
+    for issue_id, row in found.items():
+        _write_issue_dimensions(cur, issue_id, {d: row.get(d) for d in ISSUE_DIMENSIONS})
+    _commit(conn)
+
+
+def find_issue_ids_by_dimension(
+    conn: sqlite3.Connection,
+    project_id: int,
+    dimension: str,
+    value: str,
+    issue_type: Optional[str] = None,
+) -> List[int]:
+    """
+    dimension ("labels" / "components" / "fix_versions" / "affects_versions") 값이 value 인
+    삭제되지 않은 이슈 id 목록을 반환한다. 예: 컴포넌트 X 의 모든 TEST_CASE.
+    """
+    table, value_col, kind_sql, kind_params = _dimension_filter(dimension)
+    sql = f"""
+        SELECT d.issue_id
+          FROM {table} d
+          JOIN issues i ON i.id = d.issue_id
+         WHERE d.{value_col} = ?{kind_sql}
+           AND i.project_id = ? AND i.is_deleted = 0
+    """
+    params: List[Any] = [value, *kind_params, project_id]
+    if issue_type:
+        sql += " AND i.issue_type = ?"
+        params.append(issue_type.upper())
+    sql += " ORDER BY d.issue_id"
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    return [row[0] for row in cur.fetchall()]
+
+
+def count_issues_by_dimension(
+    conn: sqlite3.Connection,
+    project_id: int,
+    dimension: str,
+    issue_type: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    dimension 값별 (삭제되지 않은) 이슈 수를 반환한다 (Dashboard 집계 / 필터 후보 목록용).
+    RETURNS: {value: count} - 값 이름 순.
+    """
+    table, value_col, kind_sql, kind_params = _dimension_filter(dimension)
+    sql = f"""
+        SELECT d.{value_col}, COUNT(*)
+          FROM {table} d
+          JOIN issues i ON i.id = d.issue_id
+         WHERE i.project_id = ? AND i.is_deleted = 0{kind_sql}
+    """
+    params: List[Any] = [project_id, *kind_params]
+    if issue_type:
+        sql += " AND i.issue_type = ?"
+        params.append(issue_type.upper())
+    sql += f" GROUP BY d.{value_col} ORDER BY d.{value_col}"
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    return {row[0]: row[1] for row in cur.fetchall()}
+
+
+# --- Local full-text search --------------------------------------------------------
+
+# bm25 컬럼 가중치 (summary 일치를 description/preconditions 보다 우선)
+_ISSUE_FTS_WEIGHTS = (10.0, 2.0, 2.0)
+# step 본문 일치는 이슈 본문 일치보다 낮은 순위 (bm25 는 음수, 작을수록 관련도 높음)
+_STEP_FTS_FACTOR = 0.5
+
+
+def _fts_match_expression(query: str) -> Optional[str]:
+    """
+    사용자 입력을 FTS5 MATCH 식으로 바꾼다.
+    공백으로 나눈 각 단어를 prefix 검색("word"*)으로 만들고 모두 포함(AND)하도록 한다.
+    FTS5 문법 문자(", *, :, ( 등)는 따옴표 안에 넣어 그대로 검색어로 취급한다.
+    """
+    terms = [t.replace('"', '""') for t in (query or "").split()]
+    terms = [t for t in terms if t.strip('"')]
+    if not terms:
+        return None
+    return " ".join(f'"{t}"*' for t in terms)
+
+
+def _has_fulltext_index(conn: sqlite3.Connection) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'issues_fts'"
+    ).fetchone()
+    return row is not None
+
+
+def search_local(
+    conn: sqlite3.Connection,
+    project_id: int,
+    query: str,
+    types: Optional[List[str]] = None,
+    limit: int = 100,
+    dimension_filters: Optional[List[Tuple[str, str]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    로컬 DB 에서 이슈 본문(summary/description/preconditions)과 test case step
+    (action/input/expected)을 전문 검색하여 관련도 순으로 반환한다 (오프라인 동작).
+
+    RETURNS: [{id, jira_key, issue_type, summary, folder_id, score, snippet}, ...]
+      - score 는 작을수록 관련도가 높다 (FTS5 bm25).
+      - snippet 은 일치 부분을 [ ] 로 감싼 본문 일부.
+    types 를 주면 해당 issue_type (예: ["TEST_CASE"]) 만 반환한다. 삭제된 이슈는 제외된다.
+    dimension_filters 는 (dimension, value) 목록으로 (예: [("labels", "smoke")]), 모두 만족하는 이슈만
+    반환한다. limit 보다 먼저 SQL 에서 거르므로 일치 결과가 limit 보다 많아도 빠지지 않는다.
+    """
+    match = _fts_match_expression(query)
+    if match is None:
+        return []
+
+    type_sql = ""
+    type_params: List[Any] = []
+    if types:
+        type_sql = f" AND i.issue_type IN ({', '.join('?' for _ in types)})"
+        type_params = [t.upper() for t in types]
+    for dimension, value in dimension_filters or ():
+        table, value_col, kind_sql, kind_params = _dimension_filter(dimension)
+        type_sql += f" AND EXISTS (SELECT 1 FROM {table} d WHERE d.issue_id = i.id AND d.{value_col} = ?{kind_sql})"
+        type_params += [value, *kind_params]
+
+    if not _has_fulltext_index(conn):
+        # FTS5 미지원 빌드: summary/description/preconditions 부분 일치 (순위 없음)
+        like = f"%{query.strip()}%"
+        cur = conn.execute(
+            f"""
+            SELECT i.id, i.jira_key, i.issue_type, i.summary, i.folder_id, 0.0 AS score, i.summary AS snippet
+            FROM issues i
+            WHERE i.project_id = ? AND i.is_deleted = 0{type_sql}
+              AND (i.summary LIKE ? OR i.description LIKE ? OR i.preconditions LIKE ?)
+            ORDER BY i.id
+            LIMIT ?
+            """,
+            [project_id, *type_params, like, like, like, int(limit)],
+        )
+        return [dict(r) for r in cur.fetchall()]
+
+    weights = ", ".join(str(w) for w in _ISSUE_FTS_WEIGHTS)
+    cur = conn.execute(
+        f"""
+        WITH hits AS (
+            SELECT rowid AS issue_id,
+                   bm25(issues_fts, {weights}) AS score,
+                   snippet(issues_fts, -1, '[', ']', '...', 12) AS snippet
+            FROM issues_fts
+            WHERE issues_fts MATCH ?
+            UNION ALL
+            SELECT s.issue_id,
+                   bm25(testcase_steps_fts) * {_STEP_FTS_FACTOR} AS score,
+                   snippet(testcase_steps_fts, -1, '[', ']', '...', 12) AS snippet
+            FROM testcase_steps_fts
+            JOIN testcase_steps s ON s.id = testcase_steps_fts.rowid
+            WHERE testcase_steps_fts MATCH ?
+        )
+        SELECT i.id, i.jira_key, i.issue_type, i.summary, i.folder_id,
+               MIN(h.score) AS score, h.snippet
+        FROM hits h
+        JOIN issues i ON i.id = h.issue_id
+        WHERE i.project_id = ? AND i.is_deleted = 0{type_sql}
+        GROUP BY i.id
+        ORDER BY score, i.id
+        LIMIT ?
+        """,
+        [match, match, project_id, *type_params, int(limit)],
+    )
+    return [dict(r) for r in cur.fetchall()]
+
+
+def rebuild_search_index(conn: sqlite3.Connection) -> None:
+    """FTS 색인을 issues/testcase_steps 내용으로 다시 만든다 (색인 손상/대량 외부 수정 후 복구용)."""
+    if not _has_fulltext_index(conn):
+        return
+    cur = conn.cursor()
+    cur.execute("INSERT INTO issues_fts (issues_fts) VALUES ('rebuild')")
+    cur.execute("INSERT INTO testcase_steps_fts (testcase_steps_fts) VALUES ('rebuild')")
+    _commit(conn)
+
+
+# --- Child row sync (replace_* helpers) --------------------------------------------
+#
+# replace_* 함수는 "부모의 자식 행 전체를 records 로 교체" 의미를 유지하되, 기존 행과 비교하여
+# 바뀐 행만 INSERT/UPDATE/DELETE 한다. 그대로 남는 행은 id 가 유지되므로
+# testcase_step_executions.testcase_step_id 같은 참조가 저장할 때마다 끊기지 않는다.
+
+
+@dataclass
+class RowSyncStats:
+    """replace_* 결과 집계."""
+
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+
+def _sync_child_rows(
+    conn: sqlite3.Connection,
+    table: str,
+    parent_col: str,
+    parent_id: int,
+    columns: Tuple[str, ...],
+    records: List[Tuple[Any, ...]],
+    match_tiers: List[Tuple[str, ...]],
+    order_by: str = "id",
+    record_ids: Optional[List[Optional[int]]] = None,
+    insert_exprs: Optional[Dict[str, str]] = None,
+    pending: Optional[Tuple[int, str]] = None,
+) -> RowSyncStats:
+    """
+    table 에서 parent_col = parent_id 인 행들을 records (columns 순서의 값 tuple) 와 같아지도록 맞춘다.
+
+    기존 행과 새 record 의 짝짓기 순서:
+      1) record_ids[i] 가 기존 행 id 이면 그 행
+      2) match_tiers 의 컬럼 묶음마다, 해당 컬럼 값이 같은 (아직 짝이 없는) 첫 기존 행 (order_by 순)
+         - 빈 tuple () 은 "남은 행을 순서대로" 짝짓는다. record_ids 에 id 가 하나라도 있으면 건너뛴다:
+           호출자가 id 로 행을 지정했다면 id 가 없는 record 는 새 행이고, 짝이 남은 기존 행은 삭제된 행이다.
+           (순서대로 짝지으면 삭제된 행의 id - 와 그 행을 가리키는 다른 테이블 행 - 이 새 record 로 넘어간다.)
+    짝이 된 행은 값이 다르면 UPDATE, 짝이 없는 기존 행은 DELETE, 짝이 없는 record 는 INSERT 한다.
+    insert_exprs 는 INSERT 시에만 넣는 추가 컬럼 SQL 식 (예: {"created_at": "datetime('now')"}).
+    pending = (issue_id, 컬렉션 이름) 을 주면 실제로 바뀐 행이 있을 때 issue_pending_changes 에 기록한다.
+    """
+    col_list = ", ".join(columns)
+    cur = conn.cursor()
+    cur.execute(
+        f"SELECT id, {col_list} FROM {table} WHERE {parent_col} = ? ORDER BY {order_by}",
+        (parent_id,),
+    )
+    existing = [(row[0], tuple(row[1:])) for row in cur.fetchall()]
+    existing_ids = {row_id for row_id, _ in existing}
+
+    matched: List[Optional[int]] = [None] * len(records)
+    used: set = set()
+    addressed_by_id = bool(record_ids) and any(rid is not None for rid in record_ids)
+    if record_ids:
+        for i, rid in enumerate(record_ids):
+            if rid is not None and rid in existing_ids and rid not in used:
+                matched[i] = rid
+                used.add(rid)
+
+    for tier in match_tiers:
+        if not tier and addressed_by_id:
+            continue
+        idx = [columns.index(c) for c in tier]
+        pool: Dict[Tuple[Any, ...], List[int]] = {}
+        for row_id, values in existing:
+            if row_id not in used:
+                pool.setdefault(tuple(values[k] for k in idx), []).append(row_id)
+        for i, rec in enumerate(records):
+            if matched[i] is not None:
+                continue
+            candidates = pool.get(tuple(rec[k] for k in idx))
+            if candidates:
+                row_id = candidates.pop(0)
+                matched[i] = row_id
+                used.add(row_id)
+
+    current = dict(existing)
+    stats = RowSyncStats()
+    updates: List[Tuple[Any, ...]] = []
+    inserts: List[Tuple[Any, ...]] = []
+    for rec, row_id in zip(records, matched):
+        if row_id is None:
+            inserts.append((parent_id, *rec))
+        elif current[row_id] != rec:
+            updates.append((*rec, row_id))
+        else:
+            stats.unchanged += 1
+    deletes = [(row_id,) for row_id, _ in existing if row_id not in used]
+
+    extra = insert_exprs or {}
+    insert_cols = ", ".join([parent_col, *columns, *extra.keys()])
+    insert_vals = ", ".join(["?"] * (len(columns) + 1) + list(extra.values()))
+    with transaction(conn):
+        # DELETE → UPDATE → INSERT 순서: UNIQUE 제약이 있는 테이블에서 중간 충돌을 피한다.
+        if deletes:
+            cur.executemany(f"DELETE FROM {table} WHERE id = ?", deletes)
+        if updates:
+            assignments = ", ".join(f"{c} = ?" for c in columns)
+            cur.executemany(f"UPDATE {table} SET {assignments} WHERE id = ?", updates)
+        if inserts:
+            cur.executemany(f"INSERT INTO {table} ({insert_cols}) VALUES ({insert_vals})", inserts)
+        if pending and pending[0] is not None and (deletes or updates or inserts):
+            mark_pending_changes(conn, pending[0], [pending[1]])
+
+    stats.inserted = len(inserts)
+    stats.updated = len(updates)
+    stats.deleted = len(deletes)
+    return stats
+
+
+def _optional_int(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+# --- Test case steps helpers ----------------------------------------------------
+
+
+def get_steps_for_issue(conn: sqlite3.Connection, issue_id: int) -> List[StepRow]:
+    """
+    Return all testcase_steps rows for given issue_id, ordered by group_no, order_no.
+    (rows.StepRow: dict 읽기 API 호환, dict 가 필요하면 to_dict())
+    """
+    return fetch_rows(
+        conn.cursor(),
+        StepRow,
+        f"SELECT {', '.join(StepRow.columns())} FROM testcase_steps"
+        " WHERE issue_id = ? ORDER BY group_no ASC, order_no ASC, id ASC",
+        (issue_id,),
+    )
+
+
+def replace_steps_for_issue(conn: sqlite3.Connection, issue_id: int, steps: List[Dict[str, Any]]) -> RowSyncStats:
+    """
+    Replace all steps for given issue_id with provided list.
+
+    Each item in `steps` is expected to have keys:
+      - id (int, optional; testcase_steps.id from get_steps_for_issue - keeps that row)
+      - group_no (int, optional; default = 1)
+      - order_no (int)
+      - action (str)
+      - input (str)
+      - expected (str)
+
+    Rows are diffed against the current steps: a step keeps its id when matched
+    (by id, then by identical text, then by position), so step executions stay linked.
+    Matching by position is used only when no step carries an id (JIRA pull / Excel import);
+    the GUI steps table passes ids, and its id-less rows are new steps.
+    """
+    columns = ("group_no", "order_no", "action", "input", "expected")
+    records = [
+        (
+            int(step.get("group_no", 1) or 1),
+            int(step.get("order_no", 0) or 0),
+            step.get("action") or "",
+            step.get("input") or "",
+            step.get("expected") or "",
+        )
+        for step in steps
+    ]
+    return _sync_child_rows(
+        conn,
+        "testcase_steps",
+        "issue_id",
+        issue_id,
+        columns,
+        records,
+        match_tiers=[columns, ("action", "input", "expected"), ()],
+        order_by="group_no, order_no, id",
+        record_ids=[_optional_int(step.get("id")) for step in steps],
+        pending=(issue_id, "steps"),
+    )
 
 
+# --- Attachments / local activity -------------------------------------------------
+#
+# 첨부 메타와 로컬 Activity 메모는 issues 행이 아닌 자식 테이블에 둔다.
+# issues 를 읽는 경로(트리, get_issue_by_id, export)가 이력 크기와 무관하게 작게 유지되고,
+# 메모 추가는 누적 텍스트 전체를 다시 쓰는 대신 한 행 INSERT 로 끝난다.
 
-def update_issue_fields(conn: sqlite3.Connection, issue_id: int, fields: Dict[str, Any]) -> None:
+
+def parse_attachments(raw: Any) -> List[Dict[str, Any]]:
     """
-    Update given columns of an issue identified by id.
-    Only keys present in `fields` will be updated.
+    예전 issues.attachments 값(JSON 배열 문자열 또는 list)을 메타 dict 목록으로 변환한다.
+    JSON 이 아닌 문자열은 filename 만 있는 항목 하나로 취급한다.
     """
-    if not fields:
-        return
-    columns = ", ".join(f"{k} = ?" for k in fields.keys())
-    values = list(fields.values())
-    values.append(issue_id)
-    sql = f"UPDATE issues SET {columns}, dirty = 1 WHERE id = ?"
+    if raw in (None, ""):
+        return []
+    data = raw
+    if isinstance(raw, str):
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return [{"filename": raw}]
+    if isinstance(data, dict):
+        data = [data]
+    if not isinstance(data, list):
+        return [{"filename": str(data)}]
+    return [item if isinstance(item, dict) else {"filename": str(item)} for item in data]
+
+
+def _attachment_records(items: List[Dict[str, Any]]) -> List[Tuple[Any, ...]]:
+    """메타 dict 목록 → (position, filename, jira_attachment_id, local_path, meta) 행 값."""
+    records = []
+    for position, item in enumerate(items):
+        jira_id = item.get("id")
+        records.append(
+            (
+                position,
+                item.get("filename"),
+                str(jira_id) if jira_id not in (None, "") else None,
+                item.get("local_path"),
+                json.dumps(item, ensure_ascii=False),
+            )
+        )
+    return records
+
+
+def get_issue_attachments(conn: sqlite3.Connection, issue_id: int) -> List[Dict[str, Any]]:
+    """이슈의 첨부 메타 dict 목록 (예전 attachments JSON 배열의 항목과 같은 모양)."""
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT meta FROM issue_attachments WHERE issue_id = ? ORDER BY position, id",
+        (issue_id,),
+    )
+    return [json.loads(row[0]) if row[0] else {} for row in cur.fetchall()]
+
+
+def get_issue_attachments_json(conn: sqlite3.Connection, issue_id: int) -> str:
+    """get_issue_attachments() 를 예전 issues.attachments 형식의 JSON 문자열로 반환한다 (없으면 "")."""
+    items = get_issue_attachments(conn, issue_id)
+    return json.dumps(items, ensure_ascii=False) if items else ""
+
+
+def get_attachments_for_issues(conn: sqlite3.Connection, issue_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """여러 이슈의 첨부 메타를 {issue_id: [meta, ...]} 로 한 번에 조회한다 (첨부 없는 이슈는 결과에 없음)."""
+    ids = sorted({int(i) for i in issue_ids if i not in (None, "")})
+    result: Dict[int, List[Dict[str, Any]]] = {}
     cur = conn.cursor()
-    cur.execute(sql, values)
-    conn.commit()
+    for start in range(0, len(ids), _SQL_CHUNK_SIZE):
+        chunk = ids[start:start + _SQL_CHUNK_SIZE]
+        placeholders = ", ".join("?" for _ in chunk)
+        cur.execute(
+            f"""
+            SELECT issue_id, meta FROM issue_attachments
+             WHERE issue_id IN ({placeholders})
+             ORDER BY issue_id, position, id
+            """,
+            chunk,
+        )
+        for issue_id, meta in cur.fetchall():
+            result.setdefault(issue_id, []).append(json.loads(meta) if meta else {})
+    return result
 
 
-def create_local_issue(
-    conn: sqlite3.Connection,
-    project_id: int,
-    issue_type: str,
-    folder_id: Optional[str] = None,
-    summary: str = "",
-) -> int:
+def replace_issue_attachments(
+    conn: sqlite3.Connection, issue_id: int, items: List[Dict[str, Any]]
+) -> RowSyncStats:
     """
-    Create a new local-only issue row and return its id.
-
-    - Used by GUI when user clicks 'New Issue' on the local panel.
-    - Minimal fields are populated; user will fill Details/Steps/etc. afterwards.
+    이슈의 첨부 메타 전체를 items 로 교체한다 (바뀐 항목만 INSERT/UPDATE/DELETE).
+    JIRA 첨부 id 또는 (filename, local_path) 가 같은 기존 행은 id 를 유지한다.
     """
+    columns = ("position", "filename", "jira_attachment_id", "local_path", "meta")
+    return _sync_child_rows(
+        conn,
+        "issue_attachments",
+        "issue_id",
+        issue_id,
+        columns,
+        _attachment_records(parse_attachments(items)),
+        match_tiers=[columns, ("filename", "local_path"), ()],
+        order_by="position, id",
+        pending=(issue_id, "attachments"),
+    )
+
+
+def add_issue_attachment(conn: sqlite3.Connection, issue_id: int, item: Dict[str, Any]) -> int:
+    """첨부 메타 하나를 목록 끝에 추가하고 issue_attachments.id 를 반환한다."""
+    _, filename, jira_id, local_path, meta = _attachment_records([item])[0]
     cur = conn.cursor()
     cur.execute(
         """
-        INSERT INTO issues (
-            project_id,
-            jira_key,
-            jira_id,
-            issue_type,
-            summary,
-            description,
-            status,
-            priority,
-            assignee,
-            reporter,
-            labels,
-            components,
-            security_level,
-            fix_versions,
-            affects_versions,
-            rtm_environment,
-            due_date,
-            created,
-            updated,
-            attachments,
-            folder_id,
-            parent_issue_id,
-            is_deleted,
-            local_only,
-            last_sync_at,
-            dirty
+        INSERT INTO issue_attachments (issue_id, position, filename, jira_attachment_id, local_path, meta)
+        VALUES (
+            ?,
+            (SELECT COALESCE(MAX(position), -1) + 1 FROM issue_attachments WHERE issue_id = ?),
+            ?, ?, ?, ?
         )
-        VALUES (?, NULL, NULL, ?, ?, '', '', '', '', '', '', '', '', '', '', '', '', datetime('now'), datetime('now'),
-                '', ?, NULL, 0, 1, NULL, 1)
         """,
-        (project_id, issue_type, summary, folder_id),
+        (issue_id, issue_id, filename, jira_id, local_path, meta),
     )
-    conn.commit()
-    return int(cur.lastrowid)
+    attachment_id = int(cur.lastrowid)
+    mark_pending_changes(conn, issue_id, ["attachments"])
+    _commit(conn)
+    return attachment_id
 
 
-def soft_delete_issue(conn: sqlite3.Connection, issue_id: int) -> None:
+def delete_issue_attachment(conn: sqlite3.Connection, issue_id: int, local_path: str) -> int:
+    """local_path 가 같은 첨부 메타를 삭제하고 삭제한 행 수를 반환한다 (파일 삭제는 호출 측 담당)."""
+    cur = conn.cursor()
+    cur.execute(
+        "DELETE FROM issue_attachments WHERE issue_id = ? AND local_path = ?",
+        (issue_id, local_path),
+    )
+    deleted = cur.rowcount
+    if deleted:
+        mark_pending_changes(conn, issue_id, ["attachments"])
+    _commit(conn)
+    return deleted
+
+
+def count_attachment_path_references(conn: sqlite3.Connection, local_path: str) -> int:
     """
-    Soft delete an issue by setting is_deleted = 1.
-    The row remains in DB but is hidden from trees and lists.
+    local_path 를 가리키는 첨부 메타 행 수 (모든 이슈).
+    copy_issues() / copy_subtree() 의 복사본은 원본과 같은 파일을 가리키므로, 파일은 이 값이 0 일 때만 지운다.
     """
+    row = conn.execute("SELECT COUNT(*) FROM issue_attachments WHERE local_path = ?", (local_path,)).fetchone()
+    return int(row[0]) if row else 0
+
+
+def get_issue_activity(conn: sqlite3.Connection, issue_id: int) -> List[Dict[str, Any]]:
+    """이슈의 로컬 Activity 항목 (id, created_at, body) 을 추가된 순서대로 반환한다."""
     cur = conn.cursor()
     cur.execute(
-        "UPDATE issues SET is_deleted = 1, dirty = 1 WHERE id = ?",
+        "SELECT id, created_at, body FROM issue_activity WHERE issue_id = ? ORDER BY id",
         (issue_id,),
     )
-    conn.commit()
+    return [dict(row) for row in cur.fetchall()]
 
 
-def create_folder_node(
-    conn: sqlite3.Connection,
-    project_id: int,
-    name: str,
-    parent_id: Optional[str] = None,
-    sort_order: int = 0,
-    issue_type: Optional[str] = None,
-) -> str:
-    """
-    Create a new folder row under the given parent (or as root if parent_id is None).
-    Returns the generated folder id.
+def get_issue_activity_text(conn: sqlite3.Connection, issue_id: int) -> str:
+    """Activity 항목들을 빈 줄로 이어 붙인 텍스트 (예전 issues.local_activity 와 같은 표시 형식)."""
+    return "\n\n".join(entry["body"] for entry in get_issue_activity(conn, issue_id))
 
-    issue_type 가 주어지면, 폴더 id 에 타입 정보를 포함시켜
-    탭(이슈 타입)별로 자신이 생성한 폴더만 보이도록 사용할 수 있다.
-    예: LOCAL-TEST_CASE-<uuid>
+
+def add_issue_activity(conn: sqlite3.Connection, issue_id: int, body: str) -> Optional[int]:
     """
-    prefix = "LOCAL-"
-    if issue_type:
-        prefix = f"LOCAL-{issue_type.upper()}-"
-    folder_id = f"{prefix}{uuid.uuid4().hex}"
-    upsert_folder(
-        conn,
-        project_id=project_id,
-        folder_id=folder_id,
-        name=name,
-        node_type="FOLDER",
-        parent_id=parent_id,
-        sort_order=sort_order,
-    )
-    return folder_id
+    Activity 메모 하나를 추가한다 (append-only INSERT). 빈 메모는 무시하고 None 을 반환한다.
+    로컬 전용 메모이므로 이슈의 dirty 플래그는 건드리지 않는다.
+    """
+    text = (body or "").strip()
+    if not text:
+        return None
+    cur = conn.cursor()
+    cur.execute("INSERT INTO issue_activity (issue_id, body) VALUES (?, ?)", (issue_id, text))
+    _commit(conn)
+    return int(cur.lastrowid)
 
 
-def delete_folder_if_empty(conn: sqlite3.Connection, folder_id: str) -> bool:
+def set_issue_activity_text(conn: sqlite3.Connection, issue_id: int, text: Optional[str]) -> None:
     """
-    Delete a folder only if it has no child folders and no non-deleted issues.
-    Returns True if deleted, False if not empty.
+    Activity 전체 텍스트를 text 로 맞춘다 (GUI 의 "전체 편집" / 예전 local_activity 쓰기 경로).
+
+    - 현재 텍스트와 같으면 아무 것도 쓰지 않는다.
+    - 현재 텍스트 뒤에 덧붙인 형태면 덧붙인 부분만 새 항목으로 INSERT 한다.
+    - 그 밖의 편집은 기존 항목을 지우고 한 항목으로 다시 저장한다.
     """
+    new_text = (text or "").strip()
+    current = get_issue_activity_text(conn, issue_id)
+    if new_text == current:
+        return
+    if current and new_text.startswith(current + "\n\n"):
+        add_issue_activity(conn, issue_id, new_text[len(current):])
+        return
+    with transaction(conn):
+        clear_issue_activity(conn, issue_id)
+        add_issue_activity(conn, issue_id, new_text)
+
+
+def clear_issue_activity(conn: sqlite3.Connection, issue_id: int) -> int:
+    """이슈의 Activity 항목을 모두 삭제하고 삭제한 행 수를 반환한다."""
     cur = conn.cursor()
+    cur.execute("DELETE FROM issue_activity WHERE issue_id = ?", (issue_id,))
+    _commit(conn)
+    return cur.rowcount
 
-    # Check child folders
-    cur.execute("SELECT COUNT(*) FROM folders WHERE parent_id = ?", (folder_id,))
-    child_folders = cur.fetchone()[0]
 
-    # Check issues attached to this folder
-    cur.execute(
-        "SELECT COUNT(*) FROM issues WHERE folder_id = ? AND is_deleted = 0",
-        (folder_id,),
-    )
-    child_issues = cur.fetchone()[0]
+# --- Folder path index ------------------------------------------------------------
+#
+# 폴더 경로("Root/Sub/Child")를 프로젝트 단위로 한 번의 recursive CTE 로 계산하여 연결(CachedConnection)에 캐시한다.
+# - 같은 연결의 폴더 쓰기(upsert_folder / create_folder_node / move_folder / bulk_upsert_tree /
+#   delete_folder_if_empty)는 캐시를 직접 갱신하거나 무효화한다.
+# - 다른 연결의 커밋은 PRAGMA data_version 변화로 감지하여 다시 계산한다.
 
-    if child_folders or child_issues:
-        return False
+# 순환 참조(parent_id 루프)가 있어도 CTE 가 끝나도록 하는 최대 깊이
+_FOLDER_PATH_MAX_DEPTH = 256
+# SQLite 기본 바인딩 변수 한도(999)보다 작게 유지
+_SQL_CHUNK_SIZE = 500
 
-    cur.execute("DELETE FROM folders WHERE id = ?", (folder_id,))
-    conn.commit()
-    return True
 
+def _join_folder_path(parent_path: str, name: Optional[str]) -> str:
+    name = name or ""
+    if not parent_path:
+        return name
+    if not name:
+        return parent_path
+    return f"{parent_path}/{name}"
 
-# --- Test case steps helpers ----------------------------------------------------
 
+@dataclass
+class FolderPathIndex:
+    """한 프로젝트의 folder_id -> 경로 맵 (+ 증분 갱신에 필요한 parent/name 정보)."""
 
-def get_steps_for_issue(conn: sqlite3.Connection, issue_id: int) -> List[Dict[str, Any]]:
-    """
-    Return all testcase_steps rows for given issue_id, ordered by group_no, order_no.
-    """
+    project_id: int
+    data_version: int
+    nodes: Dict[str, Tuple[Optional[str], str]] = field(default_factory=dict)  # id -> (parent_id, name)
+    paths: Dict[str, str] = field(default_factory=dict)
+    _by_path: Optional[Dict[str, str]] = None
+
+    def by_path(self) -> Dict[str, str]:
+        """경로 -> folder_id (같은 경로의 폴더가 여러 개면 먼저 만들어진 것)."""
+        if self._by_path is None:
+            mapping: Dict[str, str] = {}
+            for fid, path in self.paths.items():
+                mapping.setdefault(path, fid)
+            self._by_path = mapping
+        return self._by_path
+
+    def add_leaf(self, folder_id: str, parent_id: Optional[str], name: str) -> bool:
+        """새 폴더를 추가한다. 부모 경로를 모르면 False (호출 측에서 무효화)."""
+        if parent_id and parent_id not in self.paths:
+            return False
+        path = _join_folder_path(self.paths.get(parent_id, "") if parent_id else "", name)
+        self.nodes[folder_id] = (parent_id, name)
+        self.paths[folder_id] = path
+        if self._by_path is not None:
+            self._by_path.setdefault(path, folder_id)
+        return True
+
+    def move(self, folder_id: str, new_parent_id: Optional[str]) -> bool:
+        """폴더와 그 하위 경로를 다시 계산한다. 알 수 없는 부모/순환이면 False."""
+        if folder_id not in self.nodes or (new_parent_id and new_parent_id not in self.paths):
+            return False
+        _old_parent, name = self.nodes[folder_id]
+        self.nodes[folder_id] = (new_parent_id, name)
+        children: Dict[Optional[str], List[str]] = {}
+        for fid, (parent_id, _name) in self.nodes.items():
+            children.setdefault(parent_id, []).append(fid)
+        stack = [(folder_id, self.paths.get(new_parent_id, "") if new_parent_id else "")]
+        visited = set()
+        while stack:
+            fid, parent_path = stack.pop()
+            if fid in visited:
+                return False
+            visited.add(fid)
+            path = _join_folder_path(parent_path, self.nodes[fid][1])
+            self.paths[fid] = path
+            stack.extend((child, path) for child in children.get(fid, []))
+        self._by_path = None
+        return True
+
+    def remove(self, folder_id: str) -> None:
+        self.nodes.pop(folder_id, None)
+        self.paths.pop(folder_id, None)
+        self._by_path = None
+
+
+def _data_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA data_version").fetchone()[0])
+
+
+def _load_folder_path_index(conn: sqlite3.Connection, project_id: int) -> FolderPathIndex:
     cur = conn.cursor()
     cur.execute(
-        "SELECT * FROM testcase_steps WHERE issue_id = ? ORDER BY group_no ASC, order_no ASC, id ASC",
-        (issue_id,),
+        f"""
+        WITH RECURSIVE tree(id, parent_id, name, path, depth) AS (
+            SELECT f.id, f.parent_id, f.name, f.name, 0
+              FROM folders f
+             WHERE f.project_id = ?
+               AND (f.parent_id IS NULL
+                    OR NOT EXISTS (SELECT 1 FROM folders p WHERE p.id = f.parent_id))
+            UNION ALL
+            SELECT c.id, c.parent_id, c.name,
+                   CASE WHEN t.path = '' THEN c.name
+                        WHEN c.name = '' THEN t.path
+                        ELSE t.path || '/' || c.name END,
+                   t.depth + 1
+              FROM folders c
+              JOIN tree t ON c.parent_id = t.id
+             WHERE t.depth < {_FOLDER_PATH_MAX_DEPTH}
+        )
+        SELECT id, parent_id, name, path FROM tree
+        """,
+        (project_id,),
     )
-    rows = cur.fetchall()
-    return [dict(r) for r in rows]
-
+    index = FolderPathIndex(project_id=project_id, data_version=_data_version(conn))
+    for row in cur.fetchall():
+        index.nodes[row[0]] = (row[1], row[2] or "")
+        index.paths[row[0]] = row[3] or ""
+    return index
+
+
+def _folder_path_index(conn: sqlite3.Connection, project_id: int) -> FolderPathIndex:
+    """프로젝트의 경로 인덱스를 반환한다 (CachedConnection 이면 캐시 재사용)."""
+    cache = getattr(conn, "folder_path_cache", None)
+    if cache is None:
+        return _load_folder_path_index(conn, project_id)
+    index = cache.get(project_id)
+    if index is not None and index.data_version == _data_version(conn):
+        return index
+    index = _load_folder_path_index(conn, project_id)
+    cache[project_id] = index
+    return index
+
+
+def _cached_folder_path_indexes(conn: sqlite3.Connection) -> List[FolderPathIndex]:
+    cache = getattr(conn, "folder_path_cache", None)
+    return list(cache.values()) if cache else []
+
+
+def invalidate_folder_paths(conn: sqlite3.Connection, project_id: Optional[int] = None) -> None:
+    """폴더 경로 캐시를 비운다 (project_id 가 None 이면 연결의 모든 프로젝트)."""
+    cache = getattr(conn, "folder_path_cache", None)
+    if not cache:
+        return
+    if project_id is None:
+        cache.clear()
+    else:
+        cache.pop(project_id, None)
 
-def replace_steps_for_issue(conn: sqlite3.Connection, issue_id: int, steps: List[Dict[str, Any]]) -> None:
-    """
-    Replace all steps for given issue_id with provided list.
 
-    Each item in `steps` is expected to have keys:
-      - group_no (int, optional; default = 1)
-      - order_no (int)
-      - action (str)
-      - input (str)
-      - expected (str)
-    """
+def _load_folder_chain_paths(conn: sqlite3.Connection, folder_ids: List[str]) -> Dict[str, str]:
+    """캐시에 없는 folder_id 들의 경로를 조상 체인 recursive CTE 로 한 번에 계산한다."""
+    result: Dict[str, str] = {}
     cur = conn.cursor()
-    cur.execute("DELETE FROM testcase_steps WHERE issue_id = ?", (issue_id,))
-    for step in steps:
+    for start in range(0, len(folder_ids), _SQL_CHUNK_SIZE):
+        chunk = folder_ids[start:start + _SQL_CHUNK_SIZE]
+        placeholders = ", ".join("?" for _ in chunk)
         cur.execute(
-            """
-            INSERT INTO testcase_steps (issue_id, group_no, order_no, action, input, expected)
-            VALUES (?, ?, ?, ?, ?, ?)
+            f"""
+            WITH RECURSIVE chain(start_id, parent_id, name, depth) AS (
+                SELECT id, parent_id, name, 0 FROM folders WHERE id IN ({placeholders})
+                UNION ALL
+                SELECT c.start_id, f.parent_id, f.name, c.depth + 1
+                  FROM chain c
+                  JOIN folders f ON f.id = c.parent_id
+                 WHERE c.depth < {_FOLDER_PATH_MAX_DEPTH}
+            )
+            SELECT start_id, name FROM chain ORDER BY start_id, depth DESC
             """,
-            (
-                issue_id,
-                int(step.get("group_no", 1) or 1),
-                int(step.get("order_no", 0) or 0),
-                step.get("action") or "",
-                step.get("input") or "",
-                step.get("expected") or "",
-            ),
+            chunk,
         )
-    conn.commit()
+        parts: Dict[str, List[str]] = {}
+        for row in cur.fetchall():
+            if row[1]:
+                parts.setdefault(row[0], []).append(row[1])
+            else:
+                parts.setdefault(row[0], [])
+        for fid, names in parts.items():
+            result[fid] = "/".join(names)
+    return result
+
+
+def get_folder_paths(
+    conn: sqlite3.Connection,
+    folder_ids: List[Optional[str]],
+    project_id: Optional[int] = None,
+) -> Dict[str, str]:
+    """
+    여러 folder_id 의 전체 경로("Root/Sub/Child")를 한 번에 반환한다.
 
+    - project_id 를 주면 프로젝트 전체 경로 인덱스(recursive CTE 1회, 연결 단위 캐시)를 사용한다.
+    - 인덱스/캐시에 없는 id 는 조상 체인 CTE 로 묶어서 계산한다.
+    - 존재하지 않는 folder_id 는 결과 dict 에 포함되지 않는다.
+    """
+    wanted = list(dict.fromkeys(fid for fid in folder_ids if fid))
+    result: Dict[str, str] = {}
+    if not wanted:
+        return result
+
+    indexes: List[FolderPathIndex] = []
+    if project_id is not None:
+        indexes.append(_folder_path_index(conn, project_id))
+    else:
+        dv = None
+        for index in _cached_folder_path_indexes(conn):
+            if dv is None:
+                dv = _data_version(conn)
+            if index.data_version == dv:
+                indexes.append(index)
+
+    missing: List[str] = []
+    for fid in wanted:
+        for index in indexes:
+            path = index.paths.get(fid)
+            if path is not None:
+                result[fid] = path
+                break
+        else:
+            missing.append(fid)
+
+    if missing:
+        result.update(_load_folder_chain_paths(conn, missing))
+    return result
 
-def get_folder_path(conn: sqlite3.Connection, folder_id: Optional[str]) -> str:
+
+def get_project_folder_paths(conn: sqlite3.Connection, project_id: int) -> Dict[str, str]:
+    """프로젝트의 모든 folder_id -> 경로 맵을 반환한다 (recursive CTE 1회, 캐시 사용)."""
+    return dict(_folder_path_index(conn, project_id).paths)
+
+
+def get_folder_path(conn: sqlite3.Connection, folder_id: Optional[str], project_id: Optional[int] = None) -> str:
     """
     주어진 folder_id 에 대한 전체 경로를 "Root/Sub/Child" 형태의 문자열로 반환.
     루트 폴더가 없거나 id 가 None 이면 빈 문자열을 반환한다.
+    여러 id 를 조회할 때는 get_folder_paths() 를 사용한다.
     """
     if not folder_id:
         return ""
-    cur = conn.cursor()
-    parts: List[str] = []
-    current = folder_id
-    while current:
-        cur.execute("SELECT id, name, parent_id FROM folders WHERE id = ?", (current,))
-        row = cur.fetchone()
-        if not row:
-            break
-        parts.append(row["name"] or "")
-        current = row["parent_id"]
-    parts = [p for p in reversed(parts) if p]
-    return "/".join(parts)
+    return get_folder_paths(conn, [folder_id], project_id=project_id).get(folder_id, "")
 
 
 def ensure_folder_path(
@@ -760,6 +3351,7 @@ def ensure_folder_path(
 
     - 경로가 비어있으면 None 반환.
     - 이미 존재하는 폴더는 재사용하고, 없으면 create_folder_node() 로 생성한다.
+    - 기존 경로는 폴더 경로 인덱스(get_folder_paths 참고)로 조회하므로 단계별 SELECT 를 반복하지 않는다.
     """
     if not path:
         return None
@@ -771,9 +3363,20 @@ def ensure_folder_path(
     if not parts:
         return None
 
-    cur = conn.cursor()
+    # 폴더 경로 인덱스에서 전체 경로 또는 가장 긴 기존 prefix 를 찾아, 남은 단계만 조회/생성한다.
+    by_path = _folder_path_index(conn, project_id).by_path()
+    hit = by_path.get("/".join(parts))
+    if hit:
+        return hit
     parent_id: Optional[str] = None
+    for depth in range(len(parts) - 1, 0, -1):
+        prefix_id = by_path.get("/".join(parts[:depth]))
+        if prefix_id:
+            parent_id = prefix_id
+            parts = parts[depth:]
+            break
 
+    cur = conn.cursor()
     for name in parts:
         if parent_id is None:
             cur.execute(
@@ -831,29 +3434,42 @@ def get_relations_for_issue(conn: sqlite3.Connection, src_issue_id: int) -> List
     return [dict(r) for r in rows]
 
 
-def replace_relations_for_issue(conn: sqlite3.Connection, src_issue_id: int, relations: List[Dict[str, Any]]) -> None:
+def replace_relations_for_issue(
+    conn: sqlite3.Connection, src_issue_id: int, relations: List[Dict[str, Any]]
+) -> RowSyncStats:
     """
     Replace all relations for a given src_issue_id with the provided list.
 
     Each item in `relations` is expected to have keys:
       - dst_issue_id (int)
       - relation_type (str)
+
+    Existing relations are kept (with their created_at); only added/removed links are written.
     """
-    cur = conn.cursor()
-    cur.execute("DELETE FROM relations WHERE src_issue_id = ?", (src_issue_id,))
+    records: List[Tuple[Any, ...]] = []
+    seen = set()
     for rel in relations:
         dst_id = rel.get("dst_issue_id")
-        rel_type = rel.get("relation_type") or ""
         if not dst_id:
             continue
-        cur.execute(
-            """
-            INSERT INTO relations (src_issue_id, dst_issue_id, relation_type, created_at)
-            VALUES (?, ?, ?, datetime('now'))
-            """,
-            (src_issue_id, int(dst_id), rel_type),
-        )
-    conn.commit()
+        rec = (int(dst_id), rel.get("relation_type") or "")
+        # UNIQUE(src_issue_id, dst_issue_id, relation_type)
+        if rec in seen:
+            continue
+        seen.add(rec)
+        records.append(rec)
+    columns = ("dst_issue_id", "relation_type")
+    return _sync_child_rows(
+        conn,
+        "relations",
+        "src_issue_id",
+        src_issue_id,
+        columns,
+        records,
+        match_tiers=[columns, ("dst_issue_id",)],
+        insert_exprs={"created_at": "datetime('now')"},
+        pending=(src_issue_id, "relations"),
+    )
 
 
 # --- Test plan / test execution helpers ----------------------------------------
@@ -883,29 +3499,34 @@ def get_testplan_testcases(conn: sqlite3.Connection, testplan_id: int) -> List[D
     return [dict(r) for r in rows]
 
 
-def replace_testplan_testcases(conn: sqlite3.Connection, testplan_id: int, records: List[Dict[str, Any]]) -> None:
+def replace_testplan_testcases(
+    conn: sqlite3.Connection, testplan_id: int, records: List[Dict[str, Any]]
+) -> RowSyncStats:
     """
     Replace all Test Plan - Test Case links for the given testplan_id.
 
     Each record is expected to have:
       - testcase_id (int)
       - order_no (int)
+
+    Links are matched by testcase_id; a reorder only updates order_no.
     """
-    cur = conn.cursor()
-    cur.execute("DELETE FROM testplan_testcases WHERE testplan_id = ?", (testplan_id,))
-    for rec in records:
-        tc_id = rec.get("testcase_id")
-        if not tc_id:
-            continue
-        order_no = int(rec.get("order_no", 0) or 0)
-        cur.execute(
-            """
-            INSERT INTO testplan_testcases (testplan_id, testcase_id, order_no)
-            VALUES (?, ?, ?)
-            """,
-            (testplan_id, int(tc_id), order_no),
-        )
-    conn.commit()
+    rows = [
+        (int(rec.get("testcase_id")), int(rec.get("order_no", 0) or 0))
+        for rec in records
+        if rec.get("testcase_id")
+    ]
+    columns = ("testcase_id", "order_no")
+    return _sync_child_rows(
+        conn,
+        "testplan_testcases",
+        "testplan_id",
+        testplan_id,
+        columns,
+        rows,
+        match_tiers=[columns, ("testcase_id",)],
+        pending=(testplan_id, "testplan_testcases"),
+    )
 
 
 def get_or_create_testexecution_for_issue(conn: sqlite3.Connection, issue_id: int) -> Dict[str, Any]:
@@ -926,7 +3547,7 @@ def get_or_create_testexecution_for_issue(conn: sqlite3.Connection, issue_id: in
         """,
         (issue_id,),
     )
-    conn.commit()
+    _commit(conn)
     cur.execute("SELECT * FROM testexecutions WHERE id = ?", (cur.lastrowid,))
     return dict(cur.fetchone())
 
@@ -938,23 +3559,44 @@ def update_testexecution_for_issue(conn: sqlite3.Connection, issue_id: int, fiel
     """
     te_row = get_or_create_testexecution_for_issue(conn, issue_id)
     te_id = te_row["id"]
-    if not fields:
+    changed = {k: v for k, v in (fields or {}).items() if _pending_value(te_row.get(k)) != _pending_value(v)}
+    if not changed:
         return
-    cols = ", ".join(f"{k} = ?" for k in fields.keys())
-    values = list(fields.values())
+    cols = ", ".join(f"{k} = ?" for k in changed.keys())
+    values = list(changed.values())
     values.append(te_id)
     sql = f"UPDATE testexecutions SET {cols} WHERE id = ?"
-    cur = conn.cursor()
-    cur.execute(sql, values)
-    conn.commit()
+    with transaction(conn):
+        conn.execute(sql, values)
+        mark_pending_changes(conn, issue_id, ["testexecution"])
+
+
+def _testexecution_issue_id(conn: sqlite3.Connection, testexecution_id: int) -> Optional[int]:
+    row = conn.execute("SELECT issue_id FROM testexecutions WHERE id = ?", (testexecution_id,)).fetchone()
+    return row[0] if row else None
+
+
+def _tce_issue_id(conn: sqlite3.Connection, testcase_execution_id: int) -> Optional[int]:
+    row = conn.execute(
+        """
+        SELECT te.issue_id
+          FROM testcase_executions t
+          JOIN testexecutions te ON te.id = t.testexecution_id
+         WHERE t.id = ?
+        """,
+        (testcase_execution_id,),
+    ).fetchone()
+    return row[0] if row else None
 
 
-def get_testcase_executions(conn: sqlite3.Connection, testexecution_id: int) -> List[Dict[str, Any]]:
+def get_testcase_executions(conn: sqlite3.Connection, testexecution_id: int) -> List[TestcaseExecutionRow]:
     """
     Return all Test Case Executions for a given testexecution_id, joined with testcase issues.
+    (rows.TestcaseExecutionRow: SELECT 컬럼 순서 == 필드 순서)
     """
-    cur = conn.cursor()
-    cur.execute(
+    return fetch_rows(
+        conn.cursor(),
+        TestcaseExecutionRow,
         """
         SELECT t.id                 AS id,
                t.testcase_id        AS testcase_id,
@@ -974,15 +3616,16 @@ def get_testcase_executions(conn: sqlite3.Connection, testexecution_id: int) ->
         """,
         (testexecution_id,),
     )
-    rows = cur.fetchall()
-    return [dict(r) for r in rows]
 
 
-def replace_testcase_executions(conn: sqlite3.Connection, testexecution_id: int, records: List[Dict[str, Any]]) -> None:
+def replace_testcase_executions(
+    conn: sqlite3.Connection, testexecution_id: int, records: List[Dict[str, Any]]
+) -> RowSyncStats:
     """
     Replace all Test Case Execution rows for the given testexecution_id.
 
     Each record is expected to have:
+      - id (int, optional; testcase_executions.id from get_testcase_executions - keeps that row)
       - testcase_id (int)
       - order_no (int)
       - assignee (str)
@@ -991,39 +3634,55 @@ def replace_testcase_executions(conn: sqlite3.Connection, testexecution_id: int,
       - rtm_environment (str)
       - defects (str)
       - tce_test_key (str, optional; RTM Test Case Execution key)
+
+    Rows are matched by id, then by (tce_test_key, testcase_id), then by testcase_id,
+    so the TCE ids referenced by testcase_step_executions survive a save.
     """
-    cur = conn.cursor()
-    cur.execute("DELETE FROM testcase_executions WHERE testexecution_id = ?", (testexecution_id,))
+    rows: List[Tuple[Any, ...]] = []
+    row_ids: List[Optional[int]] = []
     for rec in records:
         tc_id = rec.get("testcase_id")
         if not tc_id:
             continue
-        order_no = int(rec.get("order_no", 0) or 0)
         actual_time = rec.get("actual_time")
         try:
             actual_time_int = int(actual_time) if actual_time not in (None, "") else 0
         except (TypeError, ValueError):
             actual_time_int = 0
-        tce_test_key = rec.get("tce_test_key") or ""
-        cur.execute(
-            """
-            INSERT INTO testcase_executions
-                (testexecution_id, testcase_id, order_no, assignee, result, actual_time, rtm_environment, defects, tce_test_key)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+        rows.append(
             (
-                testexecution_id,
                 int(tc_id),
-                order_no,
+                int(rec.get("order_no", 0) or 0),
                 rec.get("assignee") or "",
                 rec.get("result") or "",
                 actual_time_int,
                 rec.get("rtm_environment") or "",
                 rec.get("defects") or "",
-                tce_test_key,
-            ),
+                rec.get("tce_test_key") or "",
+            )
         )
-    conn.commit()
+        row_ids.append(_optional_int(rec.get("id")))
+    columns = (
+        "testcase_id",
+        "order_no",
+        "assignee",
+        "result",
+        "actual_time",
+        "rtm_environment",
+        "defects",
+        "tce_test_key",
+    )
+    return _sync_child_rows(
+        conn,
+        "testcase_executions",
+        "testexecution_id",
+        testexecution_id,
+        columns,
+        rows,
+        match_tiers=[columns, ("tce_test_key", "testcase_id"), ("testcase_id",)],
+        record_ids=row_ids,
+        pending=(_testexecution_issue_id(conn, testexecution_id), "testcase_executions"),
+    )
 
 
 # --- Single Test Case Execution helper -----------------------------------------
@@ -1085,9 +3744,10 @@ def replace_step_executions_for_tce(
     conn: sqlite3.Connection,
     testcase_execution_id: int,
     records: List[Dict[str, Any]],
-) -> None:
+) -> RowSyncStats:
     """
     주어진 testcase_execution_id 에 대한 Step 실행 상태를 records 로 완전히 교체한다.
+    기존 행과 testcase_step_id 로 짝지어 바뀐 행만 갱신한다.
 
     각 record 는 다음 키를 포함해야 한다:
       - testcase_step_id (int)
@@ -1095,27 +3755,238 @@ def replace_step_executions_for_tce(
       - actual_result (str)
       - evidence (str)
     """
+    rows = [
+        (
+            int(rec.get("testcase_step_id")),
+            rec.get("status") or "",
+            rec.get("actual_result") or "",
+            rec.get("evidence") or "",
+        )
+        for rec in records
+        if rec.get("testcase_step_id")
+    ]
+    columns = ("testcase_step_id", "status", "actual_result", "evidence")
+    return _sync_child_rows(
+        conn,
+        "testcase_step_executions",
+        "testcase_execution_id",
+        testcase_execution_id,
+        columns,
+        rows,
+        match_tiers=[columns, ("testcase_step_id",)],
+        pending=(_tce_issue_id(conn, testcase_execution_id), "testcase_executions"),
+    )
+
+
+# --- Coverage / execution statistics ---------------------------------------------
+#
+# stat_* 테이블(migration 010)은 trigger 가 유지하므로, 보고서/대시보드는 아래 함수로 미리 계산된 값을 읽는다.
+# 값이 어긋났다고 의심되면 rebuild_coverage_stats() (또는 python -m backend.maintenance --rebuild-stats).
+
+_COVERAGE_COLUMNS = ("testcase_count", "executed_count", "passed_count", "failed_count")
+
+
+def get_requirement_coverage(conn: sqlite3.Connection, requirement_ids: List[int]) -> Dict[int, Dict[str, int]]:
+    """요구사항별 {testcase_count, executed_count, passed_count, failed_count}. 커버리지 행이 없으면 0."""
+    ids = sorted({int(i) for i in requirement_ids if i not in (None, "")})
+    result: Dict[int, Dict[str, int]] = {i: dict.fromkeys(_COVERAGE_COLUMNS, 0) for i in ids}
+    cur = conn.cursor()
+    for start in range(0, len(ids), _SQL_CHUNK_SIZE):
+        chunk = ids[start:start + _SQL_CHUNK_SIZE]
+        placeholders = ", ".join("?" for _ in chunk)
+        cur.execute(
+            f"SELECT requirement_id, {', '.join(_COVERAGE_COLUMNS)} FROM stat_requirement_coverage"
+            f" WHERE requirement_id IN ({placeholders})",
+            chunk,
+        )
+        for row in cur.fetchall():
+            result[row["requirement_id"]] = {c: int(row[c]) for c in _COVERAGE_COLUMNS}
+    return result
+
+
+def get_project_requirement_coverage(conn: sqlite3.Connection, project_id: int) -> List[Dict[str, Any]]:
+    """
+    프로젝트의 (삭제되지 않은) 모든 요구사항과 커버리지 집계.
+    각 항목: {id, jira_key, summary, testcase_count, executed_count, passed_count, failed_count}
+    """
     cur = conn.cursor()
     cur.execute(
-        "DELETE FROM testcase_step_executions WHERE testcase_execution_id = ?",
-        (testcase_execution_id,),
+        f"""
+        SELECT i.id, i.jira_key, i.summary,
+               {', '.join(f'COALESCE(s.{c}, 0) AS {c}' for c in _COVERAGE_COLUMNS)}
+          FROM issues i
+          LEFT JOIN stat_requirement_coverage s ON s.requirement_id = i.id
+         WHERE i.project_id = ? AND i.issue_type = 'REQUIREMENT' AND i.is_deleted = 0
+         ORDER BY i.id
+        """,
+        (project_id,),
     )
-    for rec in records:
-        step_id = rec.get("testcase_step_id")
-        if not step_id:
-            continue
+    return [dict(r) for r in cur.fetchall()]
+
+
+def get_testexecution_result_counts(conn: sqlite3.Connection, testexecution_id: int) -> Dict[str, int]:
+    """TE 하나의 TCE 결과별 개수 {"PASS": 3, "FAIL": 1, "": 2, ...} (결과는 대문자, 빈 결과는 "")."""
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT result, count FROM stat_testexecution_results WHERE testexecution_id = ? ORDER BY result",
+        (testexecution_id,),
+    )
+    return {row["result"]: int(row["count"]) for row in cur.fetchall()}
+
+
+def get_testcase_last_results(conn: sqlite3.Connection, testcase_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    TC 별 마지막 실행 결과 {testcase_id: {result, testexecution_id, testcase_execution_id}}.
+    결과가 기록된 실행이 없는 TC 는 결과에 없다.
+    """
+    ids = sorted({int(i) for i in testcase_ids if i not in (None, "")})
+    result: Dict[int, Dict[str, Any]] = {}
+    cur = conn.cursor()
+    for start in range(0, len(ids), _SQL_CHUNK_SIZE):
+        chunk = ids[start:start + _SQL_CHUNK_SIZE]
+        placeholders = ", ".join("?" for _ in chunk)
         cur.execute(
-            """
-            INSERT INTO testcase_step_executions
-                (testcase_execution_id, testcase_step_id, status, actual_result, evidence)
-            VALUES (?, ?, ?, ?, ?)
+            f"""
+            SELECT testcase_id, result, testexecution_id, testcase_execution_id
+              FROM stat_testcase_last_result
+             WHERE testcase_id IN ({placeholders})
             """,
-            (
-                testcase_execution_id,
-                int(step_id),
-                rec.get("status") or "",
-                rec.get("actual_result") or "",
-                rec.get("evidence") or "",
-            ),
+            chunk,
         )
-    conn.commit()
+        for row in cur.fetchall():
+            item = dict(row)
+            result[item.pop("testcase_id")] = item
+    return result
+
+
+def rebuild_coverage_stats(conn: sqlite3.Connection) -> Dict[str, int]:
+    """stat_* 테이블을 원본 테이블에서 처음부터 다시 계산하고, 테이블별 행 수를 반환한다."""
+    with transaction(conn):
+        cur = conn.cursor()
+        for sql in _STATS_REBUILD_STATEMENTS:
+            cur.execute(sql)
+    return {
+        table: int(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0])
+        for table in ("stat_requirement_coverage", "stat_testexecution_results", "stat_testcase_last_result")
+    }
+
+# --- Purge soft-deleted issues ----------------------------------------------------
+#
+# soft_delete_issue() 로 숨긴 이슈는 보존 기간(retention_days)이 지나면 purge_deleted_issues() 로
+# 이슈 행과 그 이슈에 딸린 하위 행을 실제로 삭제한다. (DB 파일 크기 회수는 backend/maintenance.py 참고)
+# 첨부 파일 자체(attachments 디렉터리)는 건드리지 않는다.
+
+# (결과 집계 키, 삭제 문장) - {ids} 는 삭제 대상 issue id placeholder 목록. 하위 행부터 순서대로 실행한다.
+_PURGE_STATEMENTS: List[Tuple[str, str]] = [
+    (
+        "testcase_step_executions",
+        "DELETE FROM testcase_step_executions WHERE testcase_step_id IN"
+        " (SELECT id FROM testcase_steps WHERE issue_id IN ({ids}))",
+    ),
+    (
+        "testcase_step_executions",
+        "DELETE FROM testcase_step_executions WHERE testcase_execution_id IN"
+        " (SELECT id FROM testcase_executions WHERE testcase_id IN ({ids}))",
+    ),
+    (
+        "testcase_step_executions",
+        "DELETE FROM testcase_step_executions WHERE testcase_execution_id IN"
+        " (SELECT tce.id FROM testexecutions te"
+        " JOIN testcase_executions tce ON tce.testexecution_id = te.id WHERE te.issue_id IN ({ids}))",
+    ),
+    ("testcase_executions", "DELETE FROM testcase_executions WHERE testcase_id IN ({ids})"),
+    (
+        "testcase_executions",
+        "DELETE FROM testcase_executions WHERE testexecution_id IN"
+        " (SELECT id FROM testexecutions WHERE issue_id IN ({ids}))",
+    ),
+    ("testexecutions", "DELETE FROM testexecutions WHERE issue_id IN ({ids})"),
+    ("testcase_steps", "DELETE FROM testcase_steps WHERE issue_id IN ({ids})"),
+    ("relations", "DELETE FROM relations WHERE src_issue_id IN ({ids})"),
+    ("relations", "DELETE FROM relations WHERE dst_issue_id IN ({ids})"),
+    ("testplan_testcases", "DELETE FROM testplan_testcases WHERE testplan_id IN ({ids})"),
+    ("testplan_testcases", "DELETE FROM testplan_testcases WHERE testcase_id IN ({ids})"),
+    ("issue_labels", "DELETE FROM issue_labels WHERE issue_id IN ({ids})"),
+    ("issue_components", "DELETE FROM issue_components WHERE issue_id IN ({ids})"),
+    ("issue_versions", "DELETE FROM issue_versions WHERE issue_id IN ({ids})"),
+    ("issue_attachments", "DELETE FROM issue_attachments WHERE issue_id IN ({ids})"),
+    ("issue_activity", "DELETE FROM issue_activity WHERE issue_id IN ({ids})"),
+    ("issue_pending_changes", "DELETE FROM issue_pending_changes WHERE issue_id IN ({ids})"),
+    # 남아 있는 하위 이슈가 지워진 부모를 가리키지 않게 한다 (집계에는 넣지 않음)
+    ("", "UPDATE issues SET parent_issue_id = NULL WHERE parent_issue_id IN ({ids})"),
+    ("issues", "DELETE FROM issues WHERE id IN ({ids})"),
+]
+
+
+def find_purgeable_issue_ids(
+    conn: sqlite3.Connection, retention_days: float, project_id: Optional[int] = None
+) -> List[int]:
+    """
+    soft delete 된 지 retention_days 일 이상 지난 이슈 id 목록 (deleted_at 오름차순).
+
+    JIRA 에 있는 이슈(jira_key 가 있음)를 로컬에서만 지운 경우(pending 'is_deleted' 가 남아 있음)는 제외한다.
+    그 행은 다음 Full Sync (bulk_upsert_tree) 가 같은 jira_key 를 다시 만들지 않도록 막는 tombstone 이다.
+    """
+    sql = (
+        "SELECT id FROM issues i WHERE is_deleted = 1 AND deleted_at <= datetime('now', ?)"
+        " AND NOT (COALESCE(jira_key, '') <> '' AND EXISTS ("
+        "SELECT 1 FROM issue_pending_changes p WHERE p.issue_id = i.id AND p.field = 'is_deleted'))"
+    )
+    params: List[Any] = [f"-{max(float(retention_days), 0.0)} days"]
+    if project_id is not None:
+        sql += " AND project_id = ?"
+        params.append(int(project_id))
+    sql += " ORDER BY deleted_at"
+    return [int(r[0]) for r in conn.execute(sql, params).fetchall()]
+
+
+def purge_deleted_issues(
+    conn: sqlite3.Connection, retention_days: float = 30, project_id: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    보존 기간이 지난 soft delete 이슈와 그 하위 행(steps, relations, test plan/execution 행,
+    labels/components/versions, 첨부 메타, activity, pending changes)을 한 트랜잭션에서 삭제한다.
+    대상은 find_purgeable_issue_ids() 와 같다 (로컬에서만 지운 JIRA 이슈의 tombstone 은 남긴다).
+
+    반환값: {테이블명: 삭제 행 수} (삭제 대상이 없으면 {"issues": 0})
+    """
+    ids = find_purgeable_issue_ids(conn, retention_days, project_id)
+    if not ids:
+        return {"issues": 0}
+    with transaction(conn):
+        return _hard_delete_issues(conn.cursor(), ids)
+
+
+def _hard_delete_issues(cur: sqlite3.Cursor, ids: List[int]) -> Dict[str, int]:
+    """ids 이슈와 하위 행을 _PURGE_STATEMENTS 순서로 삭제하고 {테이블명: 삭제 행 수} 를 반환한다."""
+    counts: Dict[str, int] = {"issues": 0}
+    for start in range(0, len(ids), _SQL_CHUNK_SIZE):
+        chunk = ids[start:start + _SQL_CHUNK_SIZE]
+        placeholders = ", ".join("?" for _ in chunk)
+        for key, sql in _PURGE_STATEMENTS:
+            cur.execute(sql.format(ids=placeholders), chunk)
+            if key:
+                counts[key] = counts.get(key, 0) + max(cur.rowcount, 0)
+    return counts
+
+
+def delete_project_data(conn: sqlite3.Connection, project_id: int) -> Dict[str, int]:
+    """
+    프로젝트 하나의 모든 로컬 데이터(삭제 여부와 무관한 이슈와 하위 행, 폴더, sync_state, projects 행)를 삭제한다.
+    프로젝트별 DB 로 나눌 때 (backend/shards.py) 다른 프로젝트의 행을 지우는 데 사용한다.
+    """
+    pid = int(project_id)
+    ids = [int(r[0]) for r in conn.execute("SELECT id FROM issues WHERE project_id = ?", (pid,)).fetchall()]
+    with transaction(conn):
+        cur = conn.cursor()
+        counts = _hard_delete_issues(cur, ids) if ids else {"issues": 0}
+        for table, sql in (
+            ("folders", "DELETE FROM folders WHERE project_id = ?"),
+            ("sync_state", "DELETE FROM sync_state WHERE project_id = ?"),
+            ("issue_pending_changes", "DELETE FROM issue_pending_changes WHERE project_id = ?"),
+            ("projects", "DELETE FROM projects WHERE id = ?"),
+        ):
+            cur.execute(sql, (pid,))
+            counts[table] = counts.get(table, 0) + max(cur.rowcount, 0)
+    invalidate_folder_paths(conn, pid)
+    return counts
@@ -0,0 +1,184 @@
+"""
+endpoint_cache.py - Learned endpoint resolution for JiraRTMClient.
+
+jira_config.json 의 endpoints 값은 세미콜론(;) 으로 여러 후보 path 를 가질 수 있고
+(예: tree_get 의 v1 / v2), 클라이언트는 후보를 순서대로 시도한다.
+서버가 두 번째 후보만 지원하면 매 요청마다 실패하는 왕복이 한 번씩 생기므로,
+(base_url, endpoint key) 별로 마지막에 성공한 후보를 기억해 두었다가 다음에는 그것부터 시도한다.
+
+- 저장 위치: jira_config.json 과 같은 디렉터리의 jira_endpoint_cache.json (endpoint_cache_path())
+- 기록은 TTL(기본 7일) 동안만 유효하다. 지나면 설정 순서대로 다시 시도하여 새로 배운다.
+- 기억한 후보가 실패하면 기록을 지우고 나머지 후보를 설정 순서대로 시도한다.
+- 기억한 path 가 더 이상 설정 후보에 없으면 (Endpoint Settings 에서 바뀐 경우) 무시한다.
+
+서버 업그레이드 후 초기화 (rtm_local_manager 디렉터리에서):
+
+    python -m backend.endpoint_cache --list [--config jira_config.json]
+    python -m backend.endpoint_cache --reset [--config jira_config.json] [--base-url URL]
+
+GUI 에서는 Settings > Reset Learned Endpoints 메뉴로 같은 초기화를 실행한다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .logger import get_logger
+
+
+logger = get_logger(__name__)
+
+CACHE_FILE_NAME = "jira_endpoint_cache.json"
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600.0
+
+
+def endpoint_cache_path(config_path: str) -> str:
+    """jira_config.json 경로 → 같은 디렉터리의 jira_endpoint_cache.json 경로."""
+    return os.path.join(os.path.dirname(os.path.abspath(config_path)), CACHE_FILE_NAME)
+
+
+def _entry_key(base_url: str, key: str) -> str:
+    return f"{base_url.rstrip('/')}|{key}"
+
+
+class EndpointCache:
+    """
+    (base_url, endpoint key) → 성공한 path 템플릿.
+
+    path 가 None 이면 메모리에만 기억한다 (프로세스가 끝나면 사라짐).
+    여러 스레드에서 동시에 사용해도 되며, 값이 바뀔 때만 파일을 다시 쓴다.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = float(ttl_seconds)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    # ------------------------------------------------------------------ file I/O
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable endpoint cache: %s", self.path)
+            return {}
+        entries = data.get("entries") if isinstance(data, dict) else None
+        if not isinstance(entries, dict):
+            return {}
+        return {
+            k: v
+            for k, v in entries.items()
+            if isinstance(v, dict) and isinstance(v.get("path"), str) and isinstance(v.get("learned_at"), (int, float))
+        }
+
+    def _save_locked(self) -> None:
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"entries": self._entries}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path)
+        except OSError:
+            # 캐시는 최적화일 뿐이므로 저장 실패는 요청을 막지 않는다.
+            logger.warning("Failed to write endpoint cache: %s", self.path, exc_info=True)
+
+    # ------------------------------------------------------------------ lookup / record
+
+    def get(self, base_url: str, key: str) -> Optional[str]:
+        """TTL 안에 기록된 path 템플릿 (없거나 만료되면 None)."""
+        with self._lock:
+            entry = self._entries.get(_entry_key(base_url, key))
+            if entry is None:
+                return None
+            if time.time() - float(entry["learned_at"]) > self.ttl_seconds:
+                return None
+            return entry["path"]
+
+    def order(self, base_url: str, key: str, candidates: List[str]) -> List[str]:
+        """기억한 후보를 맨 앞으로 옮긴 후보 목록 (나머지는 설정 순서 유지)."""
+        learned = self.get(base_url, key)
+        if learned is None or learned not in candidates or candidates[0] == learned:
+            return candidates
+        return [learned] + [c for c in candidates if c != learned]
+
+    def record(self, base_url: str, key: str, path: str) -> None:
+        """
+        path 가 성공했음을 기록한다.
+        같은 값이 아직 유효하면 그대로 둔다 (learned_at 을 갱신하지 않으므로 TTL 이 지나면 설정 순서대로 다시 배운다).
+        """
+        entry_key = _entry_key(base_url, key)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None and entry["path"] == path and now - float(entry["learned_at"]) <= self.ttl_seconds:
+                return
+            self._entries[entry_key] = {"path": path, "learned_at": now}
+            self._save_locked()
+
+    def forget(self, base_url: str, key: str) -> None:
+        with self._lock:
+            if self._entries.pop(_entry_key(base_url, key), None) is not None:
+                self._save_locked()
+
+    def clear(self, base_url: Optional[str] = None) -> int:
+        """기록을 지우고 지운 개수를 반환한다 (base_url 을 주면 그 서버의 기록만)."""
+        with self._lock:
+            if base_url is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                prefix = _entry_key(base_url, "")
+                stale = [k for k in self._entries if k.startswith(prefix)]
+                for k in stale:
+                    del self._entries[k]
+                removed = len(stale)
+            if removed:
+                self._save_locked()
+            return removed
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """{"base_url|key": {"path": ..., "learned_at": epoch}} 복사본."""
+        with self._lock:
+            return {k: dict(v) for k, v in self._entries.items()}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="List or reset the learned REST endpoint cache.")
+    parser.add_argument(
+        "--config",
+        default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "jira_config.json"),
+        help="jira_config.json path (the cache file lives next to it)",
+    )
+    parser.add_argument("--base-url", default=None, help="only reset entries of this Jira base URL")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--list", action="store_true", help="print learned endpoints")
+    group.add_argument("--reset", action="store_true", help="forget learned endpoints")
+    args = parser.parse_args(argv)
+
+    cache = EndpointCache(endpoint_cache_path(args.config))
+    if args.reset:
+        removed = cache.clear(args.base_url)
+        print(f"Removed {removed} learned endpoint(s) from {cache.path}")
+        return 0
+    entries = cache.entries()
+    if not entries:
+        print(f"No learned endpoints in {cache.path}")
+    for entry_key, entry in sorted(entries.items()):
+        learned = time.strftime("%Y-%m-%d %H:%M", time.localtime(float(entry["learned_at"])))
+        print(f"{entry_key}  ->  {entry['path']}  ({learned})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
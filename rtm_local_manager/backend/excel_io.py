@@ -17,6 +17,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, List
 
+import json
 import sqlite3
 
 from backend.excel_mapping import load_mapping as _load_excel_mapping
@@ -152,7 +153,7 @@ def export_project_to_excel(conn: sqlite3.Connection, project_id: int, file_path
                due_date,
                created,
                updated,
-               attachments,
+               NULL AS attachments,
                epic_link,
                sprint
           FROM issues
@@ -161,7 +162,7 @@ def export_project_to_excel(conn: sqlite3.Connection, project_id: int, file_path
         """,
         (project_id,),
     )
-    from backend.db import get_folder_path
+    from backend.db import get_folder_paths, get_attachments_for_issues
     # DB select 컬럼 순서에 대한 이름 매핑
     db_issue_cols = [
         "id",
@@ -187,11 +188,18 @@ def export_project_to_excel(conn: sqlite3.Connection, project_id: int, file_path
         "epic_link",
         "sprint",
     ]
-    for row in cur.fetchall():
+    issue_rows = cur.fetchall()
+    # 폴더 경로는 이슈마다 조상 폴더를 따라가지 않고 프로젝트 경로 인덱스로 한 번에 계산한다.
+    folder_paths = get_folder_paths(conn, [r[3] for r in issue_rows], project_id=project_id)
+    # 첨부 메타는 issue_attachments 에 있으므로 이슈별로 한 번에 모아 예전 JSON 문자열 형식으로 채운다.
+    attachments_by_issue = get_attachments_for_issues(conn, [r[0] for r in issue_rows])
+    for row in issue_rows:
         row = list(row)
         folder_id = row[3]
-        row[3] = get_folder_path(conn, folder_id)
+        row[3] = folder_paths.get(folder_id, "") if folder_id else ""
         row_dict = {name: row[i] for i, name in enumerate(db_issue_cols)}
+        attachments = attachments_by_issue.get(row_dict["id"])
+        row_dict["attachments"] = json.dumps(attachments, ensure_ascii=False) if attachments else ""
         # excel_key 는 DB 에 없으므로, export 시에는 빈 값으로 채워 템플릿만 제공
         row_dict["excel_key"] = ""
         excel_row = [row_dict.get(col, "") for col in issue_cols]
@@ -909,11 +917,29 @@ def import_project_from_excel(
 
     progress_cb 인자가 주어지면, 시트 단위로 진행 상황을 콜백한다:
         progress_cb(message: str, current_step: int, total_steps: int)
+
+    전체 import 는 하나의 트랜잭션으로 실행된다. 도중에 예외가 나면 아무 것도 반영되지 않는다.
     """
+    from backend.db import transaction
+
+    with transaction(conn):
+        _import_project_from_excel(conn, project_id, file_path, progress_cb)
+
+
+def _import_project_from_excel(
+    conn: sqlite3.Connection,
+    project_id: int,
+    file_path: str,
+    progress_cb: Any | None = None,
+) -> None:
+    """import_project_from_excel() 본문 (호출자가 트랜잭션을 연다)."""
     openpyxl = _ensure_openpyxl()
     from backend.db import (
         get_issue_by_jira_key,
         get_issue_by_id,
+        get_issues_by_ids,
+        get_issues_by_jira_keys,
+        sync_issue_dimensions,
         update_issue_fields,
         replace_steps_for_issue,
         replace_relations_for_issue,
@@ -962,6 +988,54 @@ def import_project_from_excel(
     # - DB에는 저장되지 않고, "한 번에 신규 TC + Steps 생성"을 위한 임시 매핑용이다.
     excel_issue_ref: Dict[str, int] = {}
 
+    # 이슈 조회 캐시: 시트마다 참조하는 id / jira_key / excel_key 를 먼저 모아
+    # get_issues_by_ids / get_issues_by_jira_keys 로 한 번에 읽어 두고, 행 처리 중에는 dict 조회만 한다.
+    # (값이 None 인 항목 = DB 에 없음으로 확인된 id/key)
+    issue_by_id_cache: Dict[int, Dict[str, Any] | None] = {}
+    issue_by_key_cache: Dict[str, Dict[str, Any] | None] = {}
+
+    def _prefetch_issue_refs(data_rows: List[Any], col_idx: Dict[str, int]) -> None:
+        ids: set[int] = set()
+        keys: set[str] = set()
+        for name, idx in col_idx.items():
+            is_key = name.endswith("jira_key")
+            is_ref = name.endswith("excel_key")
+            if idx is None or not (is_key or is_ref or name in ("id", "issue_id")):
+                continue
+            for row in data_rows:
+                if not (0 <= idx < len(row)) or row[idx] in (None, ""):
+                    continue
+                raw = row[idx]
+                if is_key:
+                    keys.add(str(raw))
+                elif is_ref:
+                    mapped = excel_issue_ref.get(str(raw).strip())
+                    if mapped is not None:
+                        ids.add(int(mapped))
+                else:
+                    try:
+                        ids.add(int(str(raw).split(".")[0]))
+                    except ValueError:
+                        pass
+        ids.difference_update(issue_by_id_cache)
+        keys.difference_update(issue_by_key_cache)
+        found_ids = get_issues_by_ids(conn, list(ids))
+        for issue_id in ids:
+            issue_by_id_cache[issue_id] = found_ids.get(issue_id)
+        found_keys = get_issues_by_jira_keys(conn, project_id, list(keys))
+        for key in keys:
+            issue_by_key_cache[key] = found_keys.get(key)
+
+    def _issue_by_id(issue_id: int) -> Dict[str, Any] | None:
+        if issue_id not in issue_by_id_cache:
+            issue_by_id_cache[issue_id] = get_issue_by_id(conn, issue_id)
+        return issue_by_id_cache[issue_id]
+
+    def _issue_by_key(jira_key: str) -> Dict[str, Any] | None:
+        if jira_key not in issue_by_key_cache:
+            issue_by_key_cache[jira_key] = get_issue_by_jira_key(conn, project_id, jira_key)
+        return issue_by_key_cache[jira_key]
+
     # --- Issues 시트 처리
     if "Issues" in wb.sheetnames:
         ws = wb["Issues"]
@@ -972,6 +1046,7 @@ def import_project_from_excel(
             header = [str(h) if h is not None else "" for h in rows[0]]
             # 열 순서와 무관하게, 이름/매핑 기반으로 index 를 해석
             col_idx = _get_col_index("Issues", header)
+            _prefetch_issue_refs(rows[1:], col_idx)
             for row in rows[1:]:
                 if not any(row):
                     continue
@@ -1057,7 +1132,7 @@ def import_project_from_excel(
 
                 # 0-2) local_id 로 업데이트 가능한 경우: 해당 행은 "수정"으로만 처리
                 if local_id is not None:
-                    issue = get_issue_by_id(conn, local_id)
+                    issue = _issue_by_id(local_id)
                     if issue and issue.get("project_id") == project_id:
                         update_issue_fields(conn, local_id, fields)
                         target_issue_id = local_id
@@ -1071,7 +1146,7 @@ def import_project_from_excel(
                 if target_issue_id is None:
                     if jira_key:
                         # JIRA Key 가 있는 경우: 기존 이슈 update 또는 신규 JIRA-연동 이슈 insert
-                        issue = get_issue_by_jira_key(conn, project_id, jira_key)
+                        issue = _issue_by_key(jira_key)
                         if issue:
                             update_issue_fields(conn, issue["id"], fields)
                             target_issue_id = int(issue["id"])
@@ -1104,12 +1179,14 @@ def import_project_from_excel(
                                     fields.get("due_date") or "",
                                 ),
                             )
-                            conn.commit()
+                            issue_by_key_cache.pop(jira_key, None)
                             try:
                                 target_issue_id = int(cur.lastrowid)
+                                # labels / components / versions junction 테이블 갱신
+                                sync_issue_dimensions(conn, [target_issue_id])
                             except Exception:
                                 # lastrowid 를 얻지 못하는 경우, jira_key 로 재조회
-                                issue = get_issue_by_jira_key(conn, project_id, jira_key)
+                                issue = _issue_by_key(jira_key)
                                 if issue:
                                     target_issue_id = int(issue["id"])
                     else:
@@ -1139,6 +1216,10 @@ def import_project_from_excel(
                 if excel_ref and target_issue_id is not None:
                     excel_issue_ref[excel_ref] = target_issue_id
 
+            # Issues 시트에서 필드가 갱신/생성되었으므로 캐시를 비우고, 이후 시트에서 다시 모아 읽는다.
+            issue_by_id_cache.clear()
+            issue_by_key_cache.clear()
+
     # --- TestcaseSteps 시트 처리
     if "Testcase_Steps" in wb.sheetnames:
         ws = wb["Testcase_Steps"]
@@ -1154,6 +1235,7 @@ def import_project_from_excel(
             _progress(f"TestcaseSteps 시트 처리 중 ({len(rows) - 1} data rows)", step_index, total_steps)
             header = [str(h) if h is not None else "" for h in rows[0]]
             col_idx = _get_col_index("TestcaseSteps", header)
+            _prefetch_issue_refs(rows[1:], col_idx)
             # sheet 간 매핑을 위해 issue_id 를 우선 사용, 없으면 issue_jira_key 로 fallback
             steps_by_issue_id: Dict[int, List[Dict[str, Any]]] = {}
             preconditions_by_issue_id: Dict[int, str] = {}
@@ -1174,7 +1256,7 @@ def import_project_from_excel(
                         except Exception:
                             issue_id_val = None
                         if issue_id_val is not None:
-                            issue = get_issue_by_id(conn, issue_id_val)
+                            issue = _issue_by_id(issue_id_val)
                             if issue and issue.get("project_id") != project_id:
                                 issue = None
 
@@ -1187,7 +1269,7 @@ def import_project_from_excel(
                             ref = str(raw_ref).strip()
                             mapped_id = excel_issue_ref.get(ref)
                             if mapped_id is not None:
-                                issue = get_issue_by_id(conn, mapped_id)
+                                issue = _issue_by_id(mapped_id)
                                 if issue and issue.get("project_id") != project_id:
                                     issue = None
 
@@ -1198,7 +1280,7 @@ def import_project_from_excel(
                         jira_key = row[key_idx]
                         if jira_key:
                             jira_key = str(jira_key)
-                            issue = get_issue_by_jira_key(conn, project_id, jira_key)
+                            issue = _issue_by_key(jira_key)
 
                 if not issue:
                     continue
@@ -1260,6 +1342,7 @@ def import_project_from_excel(
             _progress(f"Relations 시트 처리 중 ({len(rows) - 1} data rows)", step_index, total_steps)
             header = [str(h) if h is not None else "" for h in rows[0]]
             col_idx = _get_col_index("Relations", header)
+            _prefetch_issue_refs(rows[1:], col_idx)
             # src_issue_id 기준으로 relations 를 교체한다.
             rels_by_src_id: Dict[int, List[Dict[str, Any]]] = {}
             for row in rows[1:]:
@@ -1272,7 +1355,7 @@ def import_project_from_excel(
                 if src_jira_idx is not None and 0 <= src_jira_idx < len(row):
                     raw = row[src_jira_idx]
                     if raw not in (None, ""):
-                        src_issue = get_issue_by_jira_key(conn, project_id, str(raw))
+                        src_issue = _issue_by_key(str(raw))
                 if not src_issue:
                     src_excel_idx = col_idx.get("src_excel_key")
                     if src_excel_idx is not None and 0 <= src_excel_idx < len(row):
@@ -1281,7 +1364,7 @@ def import_project_from_excel(
                             ref = str(raw_ref).strip()
                             mapped_id = excel_issue_ref.get(ref)
                             if mapped_id is not None:
-                                src_issue = get_issue_by_id(conn, mapped_id)
+                                src_issue = _issue_by_id(mapped_id)
                                 if src_issue and src_issue.get("project_id") != project_id:
                                     src_issue = None
                 if not src_issue:
@@ -1293,7 +1376,7 @@ def import_project_from_excel(
                 if dst_jira_idx is not None and 0 <= dst_jira_idx < len(row):
                     raw = row[dst_jira_idx]
                     if raw not in (None, ""):
-                        dst_issue = get_issue_by_jira_key(conn, project_id, str(raw))
+                        dst_issue = _issue_by_key(str(raw))
                 if not dst_issue:
                     dst_excel_idx = col_idx.get("dst_excel_key")
                     if dst_excel_idx is not None and 0 <= dst_excel_idx < len(row):
@@ -1302,7 +1385,7 @@ def import_project_from_excel(
                             ref = str(raw_ref).strip()
                             mapped_id = excel_issue_ref.get(ref)
                             if mapped_id is not None:
-                                dst_issue = get_issue_by_id(conn, mapped_id)
+                                dst_issue = _issue_by_id(mapped_id)
                                 if dst_issue and dst_issue.get("project_id") != project_id:
                                     dst_issue = None
                 if not dst_issue:
@@ -1340,6 +1423,7 @@ def import_project_from_excel(
             _progress(f"TestPlanTestcases 시트 처리 중 ({len(rows) - 1} data rows)", step_index, total_steps)
             header = [str(h) if h is not None else "" for h in rows[0]]
             col_idx = _get_col_index("TestPlanTestcases", header)
+            _prefetch_issue_refs(rows[1:], col_idx)
             by_tp_id: Dict[int, List[Dict[str, Any]]] = {}
             for row in rows[1:]:
                 if not any(row):
@@ -1351,7 +1435,7 @@ def import_project_from_excel(
                 if tp_jira_idx is not None and 0 <= tp_jira_idx < len(row):
                     raw = row[tp_jira_idx]
                     if raw not in (None, ""):
-                        tp_issue = get_issue_by_jira_key(conn, project_id, str(raw))
+                        tp_issue = _issue_by_key(str(raw))
                 if not tp_issue:
                     tp_excel_idx = col_idx.get("testplan_excel_key")
                     if tp_excel_idx is not None and 0 <= tp_excel_idx < len(row):
@@ -1360,7 +1444,7 @@ def import_project_from_excel(
                             ref = str(raw_ref).strip()
                             mapped_id = excel_issue_ref.get(ref)
                             if mapped_id is not None:
-                                tp_issue = get_issue_by_id(conn, mapped_id)
+                                tp_issue = _issue_by_id(mapped_id)
                                 if tp_issue and tp_issue.get("project_id") != project_id:
                                     tp_issue = None
                 if not tp_issue:
@@ -1372,7 +1456,7 @@ def import_project_from_excel(
                 if tc_jira_idx is not None and 0 <= tc_jira_idx < len(row):
                     raw = row[tc_jira_idx]
                     if raw not in (None, ""):
-                        tc_issue = get_issue_by_jira_key(conn, project_id, str(raw))
+                        tc_issue = _issue_by_key(str(raw))
                 if not tc_issue:
                     tc_excel_idx = col_idx.get("testcase_excel_key")
                     if tc_excel_idx is not None and 0 <= tc_excel_idx < len(row):
@@ -1381,7 +1465,7 @@ def import_project_from_excel(
                             ref = str(raw_ref).strip()
                             mapped_id = excel_issue_ref.get(ref)
                             if mapped_id is not None:
-                                tc_issue = get_issue_by_id(conn, mapped_id)
+                                tc_issue = _issue_by_id(mapped_id)
                                 if tc_issue and tc_issue.get("project_id") != project_id:
                                     tc_issue = None
                 if not tc_issue:
@@ -1430,6 +1514,7 @@ def import_project_from_excel(
             _progress(f"TestExecutions 시트 처리 중 ({len(rows) - 1} data rows)", step_index, total_steps)
             header = [str(h) if h is not None else "" for h in rows[0]]
             col_idx = _get_col_index("TestExecutions", header)
+            _prefetch_issue_refs(rows[1:], col_idx)
             for row in rows[1:]:
                 if not any(row):
                     continue
@@ -1440,7 +1525,7 @@ def import_project_from_excel(
                 if key_idx is not None and 0 <= key_idx < len(row):
                     raw = row[key_idx]
                     if raw not in (None, ""):
-                        te_issue = get_issue_by_jira_key(conn, project_id, str(raw))
+                        te_issue = _issue_by_key(str(raw))
                 if not te_issue:
                     excel_idx = col_idx.get("testexecution_excel_key")
                     if excel_idx is not None and 0 <= excel_idx < len(row):
@@ -1449,7 +1534,7 @@ def import_project_from_excel(
                             ref = str(raw_ref).strip()
                             mapped_id = excel_issue_ref.get(ref)
                             if mapped_id is not None:
-                                te_issue = get_issue_by_id(conn, mapped_id)
+                                te_issue = _issue_by_id(mapped_id)
                                 if te_issue and te_issue.get("project_id") != project_id:
                                     te_issue = None
                 if not te_issue:
@@ -1505,6 +1590,7 @@ def import_project_from_excel(
             _progress(f"TestcaseExecutions 시트 처리 중 ({len(rows) - 1} data rows)", step_index, total_steps)
             header = [str(h) if h is not None else "" for h in rows[0]]
             col_idx = _get_col_index("TestcaseExecutions", header)
+            _prefetch_issue_refs(rows[1:], col_idx)
             by_te_id: Dict[int, List[Dict[str, Any]]] = {}
             for row in rows[1:]:
                 if not any(row):
@@ -1516,7 +1602,7 @@ def import_project_from_excel(
                 if te_jira_idx is not None and 0 <= te_jira_idx < len(row):
                     raw = row[te_jira_idx]
                     if raw not in (None, ""):
-                        te_issue = get_issue_by_jira_key(conn, project_id, str(raw))
+                        te_issue = _issue_by_key(str(raw))
                 if not te_issue:
                     te_excel_idx = col_idx.get("testexecution_excel_key")
                     if te_excel_idx is not None and 0 <= te_excel_idx < len(row):
@@ -1525,7 +1611,7 @@ def import_project_from_excel(
                             ref = str(raw_ref).strip()
                             mapped_id = excel_issue_ref.get(ref)
                             if mapped_id is not None:
-                                te_issue = get_issue_by_id(conn, mapped_id)
+                                te_issue = _issue_by_id(mapped_id)
                                 if te_issue and te_issue.get("project_id") != project_id:
                                     te_issue = None
                 if not te_issue:
@@ -1537,7 +1623,7 @@ def import_project_from_excel(
                 if tc_jira_idx is not None and 0 <= tc_jira_idx < len(row):
                     raw = row[tc_jira_idx]
                     if raw not in (None, ""):
-                        tc_issue = get_issue_by_jira_key(conn, project_id, str(raw))
+                        tc_issue = _issue_by_key(str(raw))
                 if not tc_issue:
                     tc_excel_idx = col_idx.get("testcase_excel_key")
                     if tc_excel_idx is not None and 0 <= tc_excel_idx < len(row):
@@ -1546,7 +1632,7 @@ def import_project_from_excel(
                             ref = str(raw_ref).strip()
                             mapped_id = excel_issue_ref.get(ref)
                             if mapped_id is not None:
-                                tc_issue = get_issue_by_id(conn, mapped_id)
+                                tc_issue = _issue_by_id(mapped_id)
                                 if tc_issue and tc_issue.get("project_id") != project_id:
                                     tc_issue = None
                 if not tc_issue:
@@ -1650,6 +1736,7 @@ def import_project_from_excel(
             _progress(f"TestcaseStepExecutions 시트 처리 중 ({len(rows) - 1} data rows)", step_index, total_steps)
             header = [str(h) if h is not None else "" for h in rows[0]]
             col_idx = _get_col_index("TestcaseStepExecutions", header)
+            _prefetch_issue_refs(rows[1:], col_idx)
 
             # 캐시: (testcase_id) -> {(group_no, order_no): step_id}
             step_cache: Dict[int, Dict[tuple[int, int], int]] = {}
@@ -1673,7 +1760,7 @@ def import_project_from_excel(
                 if te_jira_idx is not None and 0 <= te_jira_idx < len(row):
                     raw = row[te_jira_idx]
                     if raw not in (None, ""):
-                        te_issue = get_issue_by_jira_key(conn, project_id, str(raw))
+                        te_issue = _issue_by_key(str(raw))
                 if not te_issue:
                     te_excel_idx = col_idx.get("testexecution_excel_key")
                     if te_excel_idx is not None and 0 <= te_excel_idx < len(row):
@@ -1682,7 +1769,7 @@ def import_project_from_excel(
                             ref = str(raw_ref).strip()
                             mapped_id = excel_issue_ref.get(ref)
                             if mapped_id is not None:
-                                te_issue = get_issue_by_id(conn, mapped_id)
+                                te_issue = _issue_by_id(mapped_id)
                                 if te_issue and te_issue.get("project_id") != project_id:
                                     te_issue = None
 
@@ -1692,7 +1779,7 @@ def import_project_from_excel(
                 if tc_jira_idx is not None and 0 <= tc_jira_idx < len(row):
                     raw = row[tc_jira_idx]
                     if raw not in (None, ""):
-                        tc_issue = get_issue_by_jira_key(conn, project_id, str(raw))
+                        tc_issue = _issue_by_key(str(raw))
                 if not tc_issue:
                     tc_excel_idx = col_idx.get("testcase_excel_key")
                     if tc_excel_idx is not None and 0 <= tc_excel_idx < len(row):
@@ -1701,7 +1788,7 @@ def import_project_from_excel(
                             ref = str(raw_ref).strip()
                             mapped_id = excel_issue_ref.get(ref)
                             if mapped_id is not None:
-                                tc_issue = get_issue_by_id(conn, mapped_id)
+                                tc_issue = _issue_by_id(mapped_id)
                                 if tc_issue and tc_issue.get("project_id") != project_id:
                                     tc_issue = None
 
@@ -0,0 +1,321 @@
+"""
+http_policy.py - Request policy layer for JiraRTMClient (rate limit / retry / concurrency cap / metrics).
+
+JiraRTMClient._request() 와 download_to_file() 은 실제 전송을 RequestPolicy.send() 에 맡긴다.
+
+- 호스트별 token bucket 으로 초당 요청 수를 제한한다 (rate_limit_per_sec, rate_burst).
+  adaptive_rate 가 켜져 있으면 429/503 을 받을 때마다 속도를 절반으로 줄이고 (min_rate_per_sec 까지),
+  성공할 때마다 조금씩(설정 속도의 5%) 원래 속도로 되돌린다.
+- 429 / 502 / 503 / 504 와 연결 오류는 exponential backoff + full jitter 로 재시도한다 (max_retries).
+  Retry-After 헤더(초 또는 HTTP-date)가 있으면 그 시간을 기다리고, 같은 호스트의 다른 요청도 그동안 멈춘다.
+- 재시도 횟수 / Retry-After 상한은 두 가지다. 기본값(max_retries, max_retry_after)은 GUI 가 UI 스레드에서
+  보내는 대화형 요청용으로 작게 두고, bulk_requests() 블록 안(배치 메서드 워커, 비동기 클라이언트, 트리 동기화)에서
+  보내는 요청만 bulk_max_retries / bulk_max_retry_after 를 쓴다.
+- 재시도는 멱등 메서드(GET/HEAD/OPTIONS/PUT/DELETE)만 한다.
+  POST 등은 서버가 처리하지 않았음이 분명한 429 에서만 재시도한다.
+- max_concurrency > 0 이면 동시에 전송 중인 요청 수를 그 값으로 제한한다.
+- 요청 / 재시도 / 대기 시간은 RequestMetrics 에 누적된다 (JiraRTMClient.metrics_snapshot()).
+
+설정 값은 jira_config.json 의 "http" 섹션 (jira_api.HttpSettings) 에서 읽는다.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from .logger import get_logger
+
+
+logger = get_logger(__name__)
+
+# 재시도 대상 HTTP 상태 (429: 요청 제한, 502/503/504: 게이트웨이 / 일시적 과부하)
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# 요청 제한(throttling) 신호로 보는 상태 - adaptive rate 를 낮춘다
+THROTTLE_STATUSES = frozenset({429, 503})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# adaptive_rate: 성공 1회마다 설정 속도의 이 비율만큼 속도를 되돌린다
+_RATE_RECOVERY_FRACTION = 0.05
+
+# bulk_requests() 블록 안이면 True (스레드 / 코루틴마다 따로 - 워커 스레드에서는 그 안에서 다시 열어야 한다)
+_BULK_REQUESTS: contextvars.ContextVar[bool] = contextvars.ContextVar("rtm_bulk_requests", default=False)
+
+
+@contextmanager
+def bulk_requests() -> Iterator[None]:
+    """이 블록에서 보내는 요청은 bulk 재시도 설정(bulk_max_retries / bulk_max_retry_after)을 쓴다."""
+    token = _BULK_REQUESTS.set(True)
+    try:
+        yield
+    finally:
+        _BULK_REQUESTS.reset(token)
+
+
+def in_bulk_requests() -> bool:
+    return _BULK_REQUESTS.get()
+
+
+class TokenBucket:
+    """초당 rate 개의 토큰이 쌓이는 bucket (최대 burst 개). reserve() 는 기다려야 할 시간을 돌려준다."""
+
+    def __init__(self, rate: float, burst: int, min_rate: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.min_rate = max(min(float(min_rate), self.max_rate), 0.001)
+        self.burst = max(int(burst), 1)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """토큰 하나를 예약하고, 사용하기 전까지 기다려야 하는 시간(초)을 반환한다."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1.0
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            return max(wait, self._paused_until - now, 0.0)
+
+    def pause(self, seconds: float) -> None:
+        """Retry-After 동안 이 호스트로의 모든 요청을 멈춘다."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + max(seconds, 0.0))
+
+    def slow_down(self) -> None:
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = max(self.rate / 2.0, self.min_rate)
+
+    def speed_up(self) -> None:
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill(self._clock())
+                self.rate = min(self.rate + self.max_rate * _RATE_RECOVERY_FRACTION, self.max_rate)
+
+
+@dataclass
+class RequestMetrics:
+    """RequestPolicy 누적 통계 (snapshot() 은 dict 복사본)."""
+
+    requests: int = 0
+    # 재전송 횟수 (첫 시도 제외)
+    retries: int = 0
+    # 429 / 503 응답 수
+    throttled: int = 0
+    # 재시도 후에도 실패한 요청 수 (HTTP 오류 상태 또는 예외)
+    failures: int = 0
+    # rate limiter / Retry-After 로 기다린 시간
+    rate_wait_seconds: float = 0.0
+    # 재시도 backoff 로 기다린 시간
+    backoff_seconds: float = 0.0
+    by_status: Dict[int, int] = field(default_factory=dict)
+
+    def snapshot(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["by_status"] = dict(self.by_status)
+        return data
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP-date) → 기다릴 시간(초). 해석할 수 없으면 None."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(when.timestamp() - (time.time() if now is None else now), 0.0)
+
+
+class RequestPolicy:
+    """
+    Session 으로 요청을 보내면서 rate limit / 재시도 / 동시 요청 제한을 적용한다.
+    여러 스레드에서 동시에 send() 해도 된다.
+    """
+
+    def __init__(self, settings: Any, sleep: Callable[[float], None] = time.sleep):
+        self.settings = settings
+        self.metrics = RequestMetrics()
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+        max_concurrency = int(getattr(settings, "max_concurrency", 0) or 0)
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency > 0 else None
+
+    # --- metrics -------------------------------------------------------------
+
+    def _count(self, **deltas: float) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self.metrics, name, getattr(self.metrics, name) + delta)
+
+    def _count_status(self, status: int) -> None:
+        with self._lock:
+            self.metrics.by_status[status] = self.metrics.by_status.get(status, 0) + 1
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            self.metrics = RequestMetrics()
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return self.metrics.snapshot()
+
+    # --- rate limit ------------------------------------------------------------
+
+    def _bucket(self, url: str) -> Optional[TokenBucket]:
+        rate = float(getattr(self.settings, "rate_limit_per_sec", 0) or 0)
+        if rate <= 0:
+            return None
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(
+                    rate,
+                    int(getattr(self.settings, "rate_burst", 1) or 1),
+                    min_rate=float(getattr(self.settings, "min_rate_per_sec", 1.0) or 1.0),
+                )
+                self._buckets[host] = bucket
+            return bucket
+
+    def _wait_for_token(self, bucket: Optional[TokenBucket]) -> None:
+        if bucket is None:
+            return
+        wait = bucket.reserve()
+        if wait > 0:
+            self._count(rate_wait_seconds=wait)
+            self._sleep(wait)
+
+    # --- retry ---------------------------------------------------------------
+
+    def _backoff(self, attempt: int) -> float:
+        """full jitter: 0 ~ min(backoff_max, backoff_base * 2**attempt) 사이의 임의 시간."""
+        base = float(getattr(self.settings, "backoff_base", 0.5))
+        cap = float(getattr(self.settings, "backoff_max", 30.0))
+        return random.uniform(0.0, min(cap, base * (2 ** attempt)))
+
+    @staticmethod
+    def _can_retry(method: str, status: Optional[int]) -> bool:
+        if method.upper() in IDEMPOTENT_METHODS:
+            return status is None or status in RETRY_STATUSES
+        # POST / PATCH: 429 는 서버가 요청을 처리하지 않았다는 뜻이므로 다시 보내도 된다.
+        return status == 429
+
+    @staticmethod
+    def _rewind(kwargs: Dict[str, Any]) -> None:
+        """재전송 전에 업로드 파일 객체를 처음으로 되돌린다."""
+        files = kwargs.get("files")
+        if not isinstance(files, dict):
+            return
+        for value in files.values():
+            fileobj = value[1] if isinstance(value, (list, tuple)) and len(value) > 1 else value
+            if hasattr(fileobj, "seek"):
+                fileobj.seek(0)
+
+    def retry_limits(self) -> Tuple[int, float]:
+        """(재시도 횟수, 기다릴 수 있는 Retry-After 상한) - bulk_requests() 블록 안이면 bulk 설정."""
+        if in_bulk_requests():
+            retries = getattr(self.settings, "bulk_max_retries", 4)
+            retry_after = getattr(self.settings, "bulk_max_retry_after", 120.0)
+        else:
+            retries = getattr(self.settings, "max_retries", 1)
+            retry_after = getattr(self.settings, "max_retry_after", 5.0)
+        return max(int(retries or 0), 0), float(retry_after)
+
+    def send(self, session: requests.Session, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        요청을 보내고 마지막 응답을 반환한다 (HTTP 오류 상태는 호출자가 raise_for_status 로 처리).
+        재시도할 수 없거나 재시도 횟수를 다 쓴 연결 오류는 그대로 올린다.
+        """
+        max_retries, max_retry_after = self.retry_limits()
+        adaptive = bool(getattr(self.settings, "adaptive_rate", True))
+        bucket = self._bucket(url)
+        attempt = 0
+        while True:
+            self._wait_for_token(bucket)
+            if attempt:
+                self._rewind(kwargs)
+            self._count(requests=1)
+            try:
+                if self._slots is not None:
+                    with self._slots:
+                        resp = session.request(method, url, **kwargs)
+                else:
+                    resp = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= max_retries or not self._can_retry(method, None):
+                    self._count(failures=1)
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning("%s %s failed (%s); retry %d/%d in %.2fs", method, url, e, attempt + 1, max_retries, delay)
+            else:
+                status = resp.status_code
+                self._count_status(status)
+                if status in THROTTLE_STATUSES:
+                    self._count(throttled=1)
+                    if adaptive and bucket is not None:
+                        bucket.slow_down()
+                elif status < 400 and adaptive and bucket is not None:
+                    bucket.speed_up()
+
+                if status not in RETRY_STATUSES:
+                    if status >= 400:
+                        self._count(failures=1)
+                    return resp
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                if (
+                    attempt >= max_retries
+                    or not self._can_retry(method, status)
+                    or (retry_after is not None and retry_after > max_retry_after)
+                ):
+                    self._count(failures=1)
+                    return resp
+                resp.close()
+                if retry_after is not None:
+                    # 같은 호스트로 가는 다른 요청도 Retry-After 동안 멈춘다 (대기 시간은 다음 토큰 예약에서 반영).
+                    if bucket is not None:
+                        bucket.pause(retry_after)
+                        delay = 0.0
+                    else:
+                        delay = retry_after
+                else:
+                    delay = self._backoff(attempt)
+                logger.warning(
+                    "%s %s returned %s; retry %d/%d in %.2fs%s",
+                    method,
+                    url,
+                    status,
+                    attempt + 1,
+                    max_retries,
+                    retry_after if retry_after is not None else delay,
+                    " (Retry-After)" if retry_after is not None else "",
+                )
+            attempt += 1
+            self._count(retries=1)
+            if delay > 0:
+                self._count(backoff_seconds=delay)
+                self._sleep(delay)
@@ -3,6 +3,10 @@ jira_api.py - REST client wrapper for JIRA RTM (Deviniti RTM for Jira Data Cente
 
 역할:
 - Personal Access Token 기반 인증 처리
+- 클라이언트마다 keep-alive 연결 풀을 가진 requests.Session 하나를 재사용
+  (풀 크기 / timeout / gzip 은 jira_config.json 의 "http" 섹션, HttpSettings 참고)
+- 호스트별 rate limit, 429 / 5xx 재시도(Retry-After 준수), 요청 통계 (http_policy.RequestPolicy)
+- 스레드 풀 배치 메서드 (get_entities_many / update_entities_many / get_testcase_steps_many)
 - RTM 관련 주요 엔드포인트에 대한 thin wrapper 제공
   - Tree 구조
   - Requirement / Test Case / Test Plan / Test Execution / Defect (기본 CRUD)
@@ -16,13 +20,19 @@ jira_api.py - REST client wrapper for JIRA RTM (Deviniti RTM for Jira Data Cente
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any, Dict, Optional, List
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, List, Sequence, Tuple, Union
 
+from .endpoint_cache import EndpointCache
+from .http_policy import RequestPolicy, bulk_requests
 from .logger import get_logger
 
 import json
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 
 
@@ -131,6 +141,77 @@ DEFAULT_ENDPOINT_PARAMS: Dict[str, List[str]] = {
 }
 
 
+@dataclass
+class HttpSettings:
+    """
+    jira_config.json 의 "http" 섹션 - JiraRTMClient 의 연결 풀 / timeout / 요청 정책 설정.
+
+    예시:
+        "http": {"pool_maxsize": 10, "connect_timeout": 5.0, "read_timeout": 30.0, "gzip": true}
+    """
+
+    # urllib3 연결 풀 개수 (호스트별 1개, Jira 와 첨부 서버가 다르면 2개 이상)
+    pool_connections: int = 4
+    # 호스트별로 유지하는 연결 수 (동시에 요청하는 스레드 수 이상으로 잡는다)
+    pool_maxsize: int = 10
+    # True 면 풀이 가득 찼을 때 새 연결을 만들지 않고 기다린다
+    pool_block: bool = False
+    # False 면 "Connection: close" 로 요청마다 연결을 닫는다 (프록시 문제 회피용)
+    keep_alive: bool = True
+    # 응답 압축 (Accept-Encoding: gzip, deflate)
+    gzip: bool = True
+    connect_timeout: float = 5.0
+    read_timeout: float = 5.0
+    # --- 요청 정책 (http_policy.RequestPolicy) ---
+    # 호스트별 초당 요청 수 (0 이면 제한 없음) / 한 번에 몰아서 보낼 수 있는 요청 수
+    rate_limit_per_sec: float = 20.0
+    rate_burst: int = 10
+    # 429/503 을 받으면 속도를 절반으로 줄이고 성공하면 천천히 되돌린다 (min_rate_per_sec 까지만 줄인다)
+    adaptive_rate: bool = True
+    min_rate_per_sec: float = 1.0
+    # 429/502/503/504 / 연결 오류 재시도 횟수 (0 이면 재시도 안 함), backoff = 0 ~ min(max, base * 2**n) 초
+    # max_retries / max_retry_after 는 UI 스레드에서 기다리는 대화형 요청용이라 작게 둔다.
+    max_retries: int = 1
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    # Retry-After 가 이보다 길면 기다리지 않고 오류를 반환한다
+    max_retry_after: float = 5.0
+    # bulk_requests() 블록 (배치 메서드, AsyncJiraRTMClient, sync_tree) 의 재시도 횟수 / Retry-After 상한
+    bulk_max_retries: int = 4
+    bulk_max_retry_after: float = 120.0
+    # 동시에 전송 중인 요청 수 상한 (0 이면 제한 없음)
+    max_concurrency: int = 0
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "HttpSettings":
+        """알 수 없는 키 / 잘못된 타입의 값은 무시하고 기본값을 쓴다."""
+        settings = cls()
+        if not isinstance(data, dict):
+            return settings
+        for f in fields(cls):
+            if f.name not in data:
+                continue
+            raw = data[f.name]
+            default = getattr(settings, f.name)
+            if isinstance(default, bool):
+                value: Any = raw if isinstance(raw, bool) else str(raw).strip().lower() in ("1", "true", "yes", "on")
+            else:
+                try:
+                    value = type(default)(raw)
+                except (TypeError, ValueError):
+                    continue
+            setattr(settings, f.name, value)
+        return settings
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """requests 의 timeout=(connect, read)."""
+        return (self.connect_timeout, self.read_timeout)
+
+
 @dataclass
 class JiraConfig:
     base_url: str           # e.g. "https://jira.example.com"
@@ -139,13 +220,100 @@ class JiraConfig:
     project_key: str        # e.g. "KVHSICCU"
     project_id: int         # e.g. 41500
     endpoints: Dict[str, str] = field(default_factory=lambda: dict(DEFAULT_ENDPOINTS))
+    http: HttpSettings = field(default_factory=HttpSettings)
+
+
+@dataclass
+class BatchResult:
+    """*_many() 배치 메서드의 항목별 결과 (입력 순서와 같은 순서로 반환된다)."""
+
+    key: str
+    value: Any = None
+    # 실패한 경우 발생한 예외 (성공이면 None)
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _call_in_bulk(call: Callable[[], Any]) -> Any:
+    """배치 워커 스레드에서 call 을 bulk 재시도 설정으로 실행한다."""
+    with bulk_requests():
+        return call()
+
+
+# progress_cb(message, current, total) - bulk_create / excel_io 와 같은 형식
+ProgressCallback = Callable[[str, int, int], None]
 
 
 class JiraRTMClient:
-    def __init__(self, config: JiraConfig):
+    """
+    JIRA / RTM REST 클라이언트.
+
+    모든 요청은 클라이언트가 가진 requests.Session 하나로 보낸다 (처음 요청할 때 생성).
+    auth / 공통 헤더는 Session 생성 시 한 번만 설정하고 이후 바꾸지 않으며, 연결 풀(urllib3)은 스레드 안전하므로
+    여러 스레드가 같은 클라이언트를 공유해도 된다. 다 쓰면 close() 하거나 with 문으로 사용한다.
+    """
+
+    def __init__(self, config: JiraConfig, endpoint_cache: Optional[EndpointCache] = None):
         self.config = config
         self.base_url = config.base_url.rstrip("/")
         self.logger = get_logger(__name__)
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        # rate limit / 재시도 / 동시 요청 제한 + 요청 통계 (metrics_snapshot())
+        self.policy = RequestPolicy(getattr(config, "http", None) or HttpSettings())
+        # 엔드포인트 후보 중 성공한 path 기억 (없으면 메모리에만, GUI 는 jira_endpoint_cache.json 사용)
+        self.endpoint_cache = endpoint_cache if endpoint_cache is not None else EndpointCache()
+
+    # ------------------------------------------------------------------ session
+
+    def _create_session(self) -> requests.Session:
+        http = getattr(self.config, "http", None) or HttpSettings()
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=max(http.pool_connections, 1),
+            pool_maxsize=max(http.pool_maxsize, 1),
+            pool_block=http.pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.auth = HTTPBasicAuth(self.config.username, self.config.api_token)
+        session.headers["Accept-Encoding"] = "gzip, deflate" if http.gzip else "identity"
+        session.headers["Connection"] = "keep-alive" if http.keep_alive else "close"
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        """공유 Session (없으면 만든다)."""
+        session = self._session
+        if session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+                session = self._session
+        return session
+
+    def close(self) -> None:
+        """Session 과 유지 중인 연결을 닫는다. 이후 요청하면 Session 을 새로 만든다."""
+        with self._session_lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """요청 / 재시도 / 429 횟수와 대기 시간 (http_policy.RequestMetrics)."""
+        return self.policy.metrics_snapshot()
+
+    def reset_metrics(self) -> None:
+        self.policy.reset_metrics()
+
+    def __enter__(self) -> "JiraRTMClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     # ------------------------------------------------------------------ endpoint helper
 
@@ -187,10 +355,40 @@ class JiraRTMClient:
 
         return candidates
 
+    def _request_with_candidates(self, key: str, default_path: str, send: Callable[[str], Any]) -> Any:
+        """
+        key 의 엔드포인트 후보를 send(path_tpl) 로 차례대로 시도하고 처음 성공한 결과를 반환한다.
+
+        - endpoint_cache 에 기억된 후보(이 base_url 에서 마지막으로 성공한 path)를 먼저 시도한다.
+        - 성공한 후보는 기억하고, 기억한 후보가 실패하면 기록을 지운 뒤 나머지를 설정 순서대로 시도한다.
+        - 모든 후보가 실패하면 마지막 예외를 다시 올린다.
+        """
+        candidates = self._endpoint_candidates(key, default_path)
+        learned = self.endpoint_cache.get(self.base_url, key) if len(candidates) > 1 else None
+        ordered = self.endpoint_cache.order(self.base_url, key, candidates) if learned else candidates
+
+        last_exc: Exception | None = None
+        for path_tpl in ordered:
+            try:
+                result = send(path_tpl)
+            except Exception as e:
+                last_exc = e
+                self.logger.warning("%s failed for endpoint '%s': %s", key, path_tpl, e)
+                if path_tpl == learned:
+                    self.endpoint_cache.forget(self.base_url, key)
+                continue
+            if len(candidates) > 1:
+                self.endpoint_cache.record(self.base_url, key, path_tpl)
+            return result
+
+        if last_exc:
+            raise last_exc
+        raise RuntimeError(f"No valid endpoint for {key}")
+
     # ------------------------------------------------------------------ low-level
 
     def _headers(self) -> Dict[str, str]:
-        """공통 JSON 헤더 (Basic Auth는 HTTPBasicAuth에서 처리)."""
+        """공통 JSON 헤더 (Basic Auth 는 Session 의 HTTPBasicAuth 에서 처리)."""
         return {
             "Content-Type": "application/json",
             "Accept": "application/json",
@@ -199,10 +397,9 @@ class JiraRTMClient:
     def _request(self, method: str, path: str, *, headers: Dict[str, str] | None = None, **kwargs) -> Any:
         """
         path: "/rest/rtm/1.0/api/...." 와 같은 RTM 상대 경로
-        Basic Auth(username + api_token)을 사용하여 요청을 보낸다.
+        Basic Auth(username + api_token)을 사용하여 공유 Session 으로 요청을 보낸다.
         """
         url = self.base_url + path
-        auth = HTTPBasicAuth(self.config.username, self.config.api_token)
         if headers is None:
             headers = self._headers()
 
@@ -258,9 +455,9 @@ class JiraRTMClient:
 
         # 네트워크 장애 시 GUI 가 오래 멈추지 않도록, 보수적인 기본 timeout 을 부여한다.
         if "timeout" not in kwargs:
-            kwargs["timeout"] = 5.0
+            kwargs["timeout"] = (getattr(self.config, "http", None) or HttpSettings()).timeout
 
-        resp = requests.request(method, url, headers=headers, auth=auth, **kwargs)
+        resp = self.policy.send(self.session, method, url, headers=headers, **kwargs)
         # ----------------------------- 응답 로깅 -----------------------------
         self.logger.debug("JIRA response status=%s", resp.status_code)
         try:
@@ -309,10 +506,7 @@ class JiraRTMClient:
         """
         pid = project_id if project_id is not None else self.config.project_id
 
-        last_exc: Exception | None = None
-        for path_tpl in self._endpoint_candidates(
-            "tree_get", "/rest/rtm/1.0/api/tree/{projectId}/{treeType}"
-        ):
+        def send(path_tpl: str) -> Any:
             fmt_args: Dict[str, Any] = {"projectId": pid}
 
             # 엔드포인트 템플릿에 treeType 플레이스홀더가 포함된 경우에만 값을 채운다.
@@ -322,17 +516,9 @@ class JiraRTMClient:
                 tt = (tree_type or "requirements").strip()
                 fmt_args["treeType"] = tt
 
-            try:
-                return self._request("GET", path_tpl.format(**fmt_args))
-            except Exception as e:
-                last_exc = e
-                self.logger.warning(
-                    "tree_get failed for endpoint '%s': %s", path_tpl, e
-                )
+            return self._request("GET", path_tpl.format(**fmt_args))
 
-        if last_exc:
-            raise last_exc
-        raise RuntimeError("No valid endpoint for tree_get")
+        return self._request_with_candidates("tree_get", "/rest/rtm/1.0/api/tree/{projectId}/{treeType}", send)
 
     def create_tree_folder(self, project_id: Optional[int], name: str, parent_test_key: str | None = None, issue_type: str | None = None) -> Any:
         """
@@ -456,6 +642,23 @@ class JiraRTMClient:
             path_tpl = self._ep("jira_attachment_add", "/rest/api/2/issue/{key}/attachments")
             return self._request("POST", path_tpl.format(key=jira_key), headers=headers, files=files)
 
+    def download_to_file(self, url: str, dst_path: Any, chunk_size: int = 8192) -> int:
+        """
+        첨부 content URL(절대 경로)을 dst_path 로 내려받고 쓴 바이트 수를 반환한다.
+        공유 Session(연결 재사용, Basic Auth)으로 스트리밍하며, HTTP 오류는 예외로 올린다.
+        rate limit / 재시도는 _request() 와 같은 RequestPolicy 를 따른다.
+        """
+        http = getattr(self.config, "http", None) or HttpSettings()
+        written = 0
+        with self.policy.send(self.session, "GET", url, stream=True, timeout=http.timeout) as resp:
+            resp.raise_for_status()
+            with open(dst_path, "wb") as f:
+                for chunk in resp.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        f.write(chunk)
+                        written += len(chunk)
+        return written
+
     def delete_issue_attachment(self, attachment_id: str | int) -> Any:
         """
         첨부파일을 삭제한다.
@@ -964,6 +1167,97 @@ class JiraRTMClient:
         )
         return self._request("DELETE", path_tpl.format(id=comment_id))
 
+    # ------------------------------------------------------------------ batch (thread pool)
+
+    def _run_many(
+        self,
+        label: str,
+        items: Sequence[Tuple[str, Callable[[], Any]]],
+        max_workers: Optional[int],
+        progress_cb: Optional[ProgressCallback],
+    ) -> List[BatchResult]:
+        """
+        (key, 호출) 목록을 스레드 풀에서 실행하고 입력 순서대로 BatchResult 를 반환한다.
+        한 항목이 실패해도 나머지는 계속 실행한다 (오류는 BatchResult.error 에 담긴다).
+        각 호출은 bulk_requests() 안에서 실행되므로 bulk 재시도 설정을 쓴다.
+        워커 수 기본값은 http.pool_maxsize (공유 Session 의 호스트별 연결 수).
+        """
+        total = len(items)
+        results: List[BatchResult] = [BatchResult(key=key) for key, _ in items]
+        if not items:
+            return results
+        if max_workers is None:
+            max_workers = (getattr(self.config, "http", None) or HttpSettings()).pool_maxsize
+        max_workers = max(min(int(max_workers), total), 1)
+
+        if progress_cb:
+            progress_cb(f"{label}: 0/{total}", 0, total)
+        done = 0
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rtm-batch") as executor:
+            futures = {executor.submit(_call_in_bulk, call): idx for idx, (_, call) in enumerate(items)}
+            for future in as_completed(futures):
+                result = results[futures[future]]
+                try:
+                    result.value = future.result()
+                except Exception as e:
+                    result.error = e
+                done += 1
+                if progress_cb:
+                    progress_cb(f"{label}: {done}/{total} ({result.key})", done, total)
+
+        failed = sum(1 for r in results if not r.ok)
+        if failed:
+            self.logger.warning("%s: %d of %d item(s) failed", label, failed, total)
+        return results
+
+    def get_entities_many(
+        self,
+        issue_type: str,
+        keys: Iterable[str],
+        max_workers: Optional[int] = None,
+        progress_cb: Optional[ProgressCallback] = None,
+    ) -> List[BatchResult]:
+        """여러 이슈를 get_entity() 로 동시에 조회한다 (결과는 keys 순서)."""
+        return self._run_many(
+            "get_entities_many",
+            [(key, functools.partial(self.get_entity, issue_type, key)) for key in keys],
+            max_workers,
+            progress_cb,
+        )
+
+    def update_entities_many(
+        self,
+        issue_type: str,
+        payloads: Union[Mapping[str, Dict[str, Any]], Iterable[Tuple[str, Dict[str, Any]]]],
+        max_workers: Optional[int] = None,
+        progress_cb: Optional[ProgressCallback] = None,
+    ) -> List[BatchResult]:
+        """
+        여러 이슈를 update_entity() 로 동시에 PUT 한다.
+        payloads 는 {jira_key: payload} 또는 (jira_key, payload) 목록이며 결과는 그 순서를 따른다.
+        """
+        pairs = payloads.items() if isinstance(payloads, Mapping) else payloads
+        return self._run_many(
+            "update_entities_many",
+            [(key, functools.partial(self.update_entity, issue_type, key, payload)) for key, payload in pairs],
+            max_workers,
+            progress_cb,
+        )
+
+    def get_testcase_steps_many(
+        self,
+        keys: Iterable[str],
+        max_workers: Optional[int] = None,
+        progress_cb: Optional[ProgressCallback] = None,
+    ) -> List[BatchResult]:
+        """여러 Test Case 의 Steps 를 get_testcase_steps() 로 동시에 조회한다 (결과는 keys 순서)."""
+        return self._run_many(
+            "get_testcase_steps_many",
+            [(key, functools.partial(self.get_testcase_steps, key)) for key in keys],
+            max_workers,
+            progress_cb,
+        )
+
 def load_config_from_file(path: str) -> JiraConfig:
     """
     jira_config.json 을 읽어서 JiraConfig 인스턴스로 변환한다.
@@ -974,8 +1268,10 @@ def load_config_from_file(path: str) -> JiraConfig:
         "username": "jira.user",
         "api_token": "PASSWORD_OR_PAT",
         "project_key": "KVHSICCU",
-        "project_id": 41500
+        "project_id": 41500,
+        "http": {"pool_maxsize": 10, "connect_timeout": 5.0, "read_timeout": 5.0}
     }
+    "http" 은 생략 가능 (HttpSettings 기본값).
     """
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
@@ -993,6 +1289,7 @@ def load_config_from_file(path: str) -> JiraConfig:
         project_key=data["project_key"],
         project_id=int(data["project_id"]),
         endpoints=merged_endpoints,
+        http=HttpSettings.from_dict(data.get("http")),
     )
 
 
@@ -1007,6 +1304,7 @@ def save_config_to_file(path: str, config: JiraConfig) -> None:
         "project_key": config.project_key,
         "project_id": config.project_id,
         "endpoints": config.endpoints or DEFAULT_ENDPOINTS,
+        "http": (getattr(config, "http", None) or HttpSettings()).to_dict(),
     }
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,216 @@
+"""
+jira_async.py - asyncio front-end for JiraRTMClient (concurrent request fan-out).
+
+AsyncJiraRTMClient 는 JiraRTMClient 와 같은 이름의 메서드를 코루틴으로 제공한다.
+
+    async with AsyncJiraRTMClient(config) as client:
+        tc = await client.get_entity("TEST_CASE", "PROJ-1")
+        results = await client.gather_entities(keys, issue_type="TEST_CASE")
+
+구현 방식:
+- 내부에 JiraRTMClient 하나를 두고, 각 호출을 전용 ThreadPoolExecutor 에서 실행한다.
+  따라서 엔드포인트 설정 / _endpoint_candidates() 후보 순회 / 요청 로깅 / 공유 Session 연결 풀 /
+  RequestPolicy(rate limit, 재시도, 통계)를 동기 클라이언트와 그대로 공유한다.
+- asyncio.Semaphore(max_concurrency) 로 동시에 진행 중인 요청 수를 제한한다.
+  기본값은 http.pool_maxsize 로, 연결 풀보다 많은 요청이 동시에 나가 연결을 버리는 일이 없게 한다.
+  전체 처리량의 상한은 여전히 http.rate_limit_per_sec (호스트별 token bucket) 이다.
+- fan-out 용 클라이언트이므로 요청은 bulk 재시도 설정(http.bulk_max_retries / bulk_max_retry_after)을 쓴다.
+- 이벤트 루프는 호출자가 제공한다 (스크립트에서는 asyncio.run(), 동기 코드에서는 run_sync()).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple, TypeVar, Union
+
+from .http_policy import bulk_requests
+from .jira_api import HttpSettings, JiraConfig, JiraRTMClient
+from .logger import get_logger
+
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# JiraRTMClient 에서 그대로 코루틴으로 노출하는 메서드 (이름 / 인자 동일)
+_MIRRORED_METHODS: Tuple[str, ...] = (
+    # Tree
+    "get_tree",
+    "create_tree_folder",
+    "update_tree_folder",
+    "delete_tree_folder",
+    # Jira 이슈 / 댓글 / 첨부 / 메타
+    "get_jira_issue",
+    "get_issue_comments",
+    "add_issue_comment",
+    "update_issue_comment",
+    "delete_issue_comment",
+    "add_issue_attachment_from_path",
+    "download_to_file",
+    "delete_issue_attachment",
+    "search_issues",
+    "get_issue_link_types",
+    "get_priorities",
+    "get_statuses",
+    "get_project_metadata",
+    "create_issue_link",
+    # RTM 엔티티
+    "get_entity",
+    "update_entity",
+    "delete_entity",
+    "create_entity",
+    "get_testcase_steps",
+    "update_testcase_steps",
+    # Test Plan / Test Execution
+    "get_testplan_testcases",
+    "update_testplan_testcases",
+    "get_testexecution_details",
+    "execute_test_plan",
+    "get_testexecution_testcases",
+    "update_testexecution",
+    "update_testexecution_testcases",
+    # Test Case Execution
+    "get_testcase_execution",
+    "update_testcase_execution",
+    "set_tce_step_status",
+    "set_tce_step_comment",
+    "delete_tce_step_comment",
+    "link_tce_defect",
+    "unlink_tce_defect",
+    "delete_tce_attachment",
+    "get_tce_comments",
+    "add_tce_comment",
+    "update_tce_comment",
+    "delete_tce_comment",
+)
+
+
+class AsyncJiraRTMClient:
+    """
+    JiraRTMClient 의 asyncio 버전.
+
+    client 를 넘기면 그 동기 클라이언트(Session / 통계 포함)를 공유하고 aclose() 에서 닫지 않는다.
+    넘기지 않으면 config 로 새로 만들고 aclose() 에서 함께 닫는다.
+    """
+
+    def __init__(
+        self,
+        config: Optional[JiraConfig] = None,
+        *,
+        client: Optional[JiraRTMClient] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        if client is None and config is None:
+            raise ValueError("AsyncJiraRTMClient needs a JiraConfig or a JiraRTMClient")
+        self._owns_client = client is None
+        self.client: JiraRTMClient = client if client is not None else JiraRTMClient(config)  # type: ignore[arg-type]
+        self.config = self.client.config
+        if max_concurrency is None:
+            max_concurrency = (getattr(self.config, "http", None) or HttpSettings()).pool_maxsize
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="rtm-async")
+        # asyncio.Semaphore 는 처음 사용한 이벤트 루프에 묶이므로 루프마다 따로 만든다.
+        self._semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
+    # ------------------------------------------------------------------ lifecycle
+
+    async def aclose(self) -> None:
+        """executor 를 정리하고, 직접 만든 동기 클라이언트면 Session 도 닫는다."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._semaphores.clear()
+        if self._owns_client:
+            self.client.close()
+
+    async def __aenter__(self) -> "AsyncJiraRTMClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        return self.client.metrics_snapshot()
+
+    # ------------------------------------------------------------------ execution
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = self._semaphores.get(loop)
+        if sem is None:
+            sem = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return sem
+
+    async def _call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """동기 함수 fn 을 executor 에서 실행한다 (동시 실행 수는 max_concurrency 이하)."""
+        async with self._semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(_call_in_bulk, fn, *args, **kwargs))
+
+    # ------------------------------------------------------------------ fan-out helpers
+
+    async def gather_entities(
+        self,
+        keys: Iterable[Union[str, Tuple[str, str]]],
+        issue_type: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        여러 이슈를 동시에 GET 하여 {jira_key: 응답 JSON} 을 반환한다 (입력 순서 유지, 중복 키는 한 번만 요청).
+
+        keys 는 jira_key 목록(이때 issue_type 필수) 또는 (issue_type, jira_key) 튜플 목록이다.
+        실패한 키의 값은 발생한 예외 객체이며, 한 키의 실패가 나머지 요청을 취소하지 않는다.
+        """
+        requests_by_key: Dict[str, str] = {}
+        for item in keys:
+            if isinstance(item, tuple):
+                item_type, key = item
+            else:
+                if issue_type is None:
+                    raise ValueError("issue_type is required when keys are plain jira keys")
+                item_type, key = issue_type, item
+            requests_by_key.setdefault(key, item_type)
+
+        results = await asyncio.gather(
+            *(self.get_entity(item_type, key) for key, item_type in requests_by_key.items()),
+            return_exceptions=True,
+        )
+        failed = sum(1 for r in results if isinstance(r, BaseException))
+        if failed:
+            logger.warning("gather_entities: %d of %d request(s) failed", failed, len(results))
+        return dict(zip(requests_by_key, results))
+
+    async def gather(self, *calls: Tuple[str, Tuple[Any, ...]], return_exceptions: bool = True) -> list:
+        """
+        임의의 메서드 호출을 동시에 실행한다.
+
+            await client.gather(("get_testcase_steps", ("P-1",)), ("get_testplan_testcases", ("P-2",)))
+        """
+        return await asyncio.gather(
+            *(getattr(self, name)(*args) for name, args in calls),
+            return_exceptions=return_exceptions,
+        )
+
+
+def _call_in_bulk(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    with bulk_requests():
+        return fn(*args, **kwargs)
+
+
+def _mirror(name: str) -> Callable[..., Awaitable[Any]]:
+    sync_method = getattr(JiraRTMClient, name)
+
+    @functools.wraps(sync_method)
+    async def method(self: AsyncJiraRTMClient, *args: Any, **kwargs: Any) -> Any:
+        return await self._call(getattr(self.client, name), *args, **kwargs)
+
+    return method
+
+
+for _name in _MIRRORED_METHODS:
+    setattr(AsyncJiraRTMClient, _name, _mirror(_name))
+del _name
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """이벤트 루프가 없는 동기 코드(GUI 핸들러 / CLI)에서 코루틴 하나를 끝까지 실행한다."""
+    return asyncio.run(coro)  # type: ignore[arg-type]
@@ -276,13 +276,37 @@ def map_local_to_jira_fields(issue_type: str, local_issue: Dict[str, Any]) -> Di
     return fields
 
 
-def build_jira_update_payload(issue_type: str, local_issue: Dict[str, Any], project_key: Optional[str] = None) -> Dict[str, Any]:
+def build_jira_update_payload(
+    issue_type: str,
+    local_issue: Dict[str, Any],
+    project_key: Optional[str] = None,
+    changed_fields: Optional[Any] = None,
+) -> Dict[str, Any]:
     """
     로컬 이슈 데이터를 JIRA/RTM 업데이트 payload로 변환.
     
     RTM 타입인 경우 build_rtm_payload를 사용하고,
     일반 JIRA 타입인 경우 map_local_to_jira_fields를 사용합니다.
+
+    changed_fields (issues 컬럼명 집합, db.get_pending_fields 참고) 를 주면 해당 컬럼만 payload 에 넣는다.
+    바뀐 컬럼 중 JIRA 로 매핑되는 것이 하나도 없으면 빈 dict 를 반환한다 (업데이트 호출 생략용).
     """
+    if changed_fields is not None:
+        changed = set(changed_fields)
+        partial = {k: v for k, v in local_issue.items() if k in changed}
+        payload = build_jira_update_payload(issue_type, partial, project_key)
+        base = build_jira_update_payload(issue_type, {}, project_key)
+        # 표준 JIRA 매핑은 summary/description 을 항상 채우므로, 빈 이슈 기준 payload 와 같고
+        # 바뀐 컬럼도 아닌 키는 빼서 서버 값을 덮어쓰지 않도록 한다.
+        if "fields" in payload:
+            body = {
+                k: v
+                for k, v in payload["fields"].items()
+                if k in changed or base.get("fields", {}).get(k) != v
+            }
+            return {"fields": body} if body else {}
+        return payload if payload != base else {}
+
     issue_type_upper = (issue_type or "").upper()
     
     # RTM 타입인 경우 build_rtm_payload 사용
@@ -292,6 +316,32 @@ def build_jira_update_payload(issue_type: str, local_issue: Dict[str, Any], proj
         # 일반 JIRA 타입
         return {"fields": map_local_to_jira_fields(issue_type, local_issue)}
 
+def unsent_changed_fields(
+    issue_type: str,
+    local_issue: Dict[str, Any],
+    project_key: Optional[str] = None,
+    changed_fields: Optional[Any] = None,
+) -> set:
+    """
+    changed_fields 중 JIRA 로 매핑되는 컬럼이지만 build_jira_update_payload() 에 들어가지 않는 것.
+
+    비운 값("" / None)은 payload 에서 빠지므로 서버에는 전달되지 않는다. Push 후에도 이런 컬럼은
+    pending 으로 남겨야 한다. JIRA 로 매핑되지 않는 로컬 전용 컬럼(folder_id 등)은 포함하지 않는다.
+    """
+    unsent = set()
+    for name in set(changed_fields or ()):
+        if build_jira_update_payload(issue_type, local_issue, project_key, changed_fields={name}):
+            continue
+        # 값이 있었다면 보냈을 컬럼인지 (= JIRA 매핑 대상인지) 임의의 값으로 확인한다.
+        try:
+            probe = build_jira_update_payload(issue_type, {name: "x"}, project_key, changed_fields={name})
+        except Exception:
+            probe = {}
+        if probe:
+            unsent.add(name)
+    return unsent
+
+
 def build_jira_create_payload(issue_type: str, local_issue: Dict[str, Any]) -> Dict[str, Any]:
     """
     새 RTM 엔티티 생성 시 사용할 payload 구성.
@@ -18,6 +18,52 @@ DEFAULT_LOCAL_SETTINGS: Dict[str, Any] = {
         # Push to JIRA 시 로컬 첨부파일을 자동으로 업로드할지 여부
         "auto_upload_on_push": True,
     },
+    "database": {
+        # SQLite 연결 시 적용할 PRAGMA 프로파일 (db.get_connection 참고)
+        # WAL: 쓰기(동기화/Excel import) 중에도 GUI 읽기가 막히지 않는다.
+        "journal_mode": "WAL",
+        # WAL 과 함께 쓰면 커밋마다 fsync 하지 않아도 DB 손상 위험이 없다.
+        "synchronous": "NORMAL",
+        # 페이지 캐시 크기 (KiB). 큰 프로젝트에서 트리/목록 재조회 비용을 줄인다.
+        "cache_size_kb": 65536,
+        # 메모리 매핑 I/O 크기 (MiB, 0 이면 사용 안 함)
+        "mmap_size_mb": 256,
+        # 임시 테이블/정렬을 메모리에서 처리
+        "temp_store": "MEMORY",
+        # 외래 키 강제 여부. 기본값은 꺼 둔다.
+        # 스키마의 REFERENCES 에 ON DELETE 동작이 없어서, 켜면 아직 참조되는 행을 지우는 쓰기가 실패한다.
+        # 예: 실행 결과(testcase_step_executions)가 남은 step 을 Steps 편집에서 지우거나,
+        #     step 결과가 있는 test case execution 을 replace_testcase_executions 로 빼는 경우.
+        "foreign_keys": False,
+        # 다른 연결이 쓰기 잠금을 잡고 있을 때 대기할 시간 (ms)
+        "busy_timeout_ms": 5000,
+        # 저장 방식: "single" (rtm_local.db 하나) / "per_project" (프로젝트별 DB + rtm_catalog.db, backend/shards.py)
+        "storage_mode": "single",
+    },
+    "maintenance": {
+        # soft delete 된 이슈를 실제로 삭제(purge)하기 전까지 보관할 기간 (일)
+        "retention_days": 30,
+        # change_log(변경 기록) 보관 기간 (일). 모든 소비자가 읽은 행은 기간과 관계없이 정리된다.
+        "change_log_retention_days": 7,
+    },
+    "search": {
+        # 리본 검색창의 검색 범위: "JIRA" (JQL 서버 검색, 기존 동작) / "Local" (로컬 DB 전문 검색)
+        # GUI 에서 범위를 바꾸면 여기에 저장된다.
+        "scope": "JIRA",
+    },
+    "snapshots": {
+        # 스냅샷 저장 디렉터리 (빈 문자열이면 기본값: rtm_local_manager/snapshots)
+        "root_dir": "",
+        # gzip 으로 압축하여 저장할지 여부
+        "compress": True,
+        # backup API 한 단계에서 복사할 페이지 수 (작을수록 복사 중 앱 반응이 좋다)
+        "pages_per_step": 1024,
+        # Full Sync / Excel import 직전에 자동 스냅샷을 남길지 여부
+        "auto_before_full_sync": True,
+        "auto_before_excel_import": True,
+        # 자동 스냅샷은 종류별로 최근 N 개만 보관 (0 이면 모두 보관)
+        "keep_auto": 5,
+    },
 }
 
 
@@ -46,7 +92,7 @@ def _deep_merge(defaults: Dict[str, Any], user: Dict[str, Any]) -> Dict[str, Any
 
 
 def load_local_settings(path: str | None = None) -> Dict[str, Any]:
-    """Load local Activity/Attachments settings from JSON. Returns defaults on error."""
+    """Load local Activity/Attachments/Database settings from JSON. Returns defaults on error."""
     if path is None:
         path = _default_path()
     try:
@@ -63,7 +109,7 @@ def load_local_settings(path: str | None = None) -> Dict[str, Any]:
 
 
 def save_local_settings(settings: Dict[str, Any], path: str | None = None) -> None:
-    """Save local Activity/Attachments settings to JSON file."""
+    """Save local Activity/Attachments/Database settings to JSON file."""
     if path is None:
         path = _default_path()
     try:
@@ -0,0 +1,273 @@
+"""
+maintenance.py - Local DB maintenance (purge / ANALYZE / vacuum).
+
+역할:
+- soft delete 된 이슈 중 보존 기간이 지난 것을 하위 행과 함께 실제로 삭제한다 (db.purge_deleted_issues).
+  로컬에서만 지운 JIRA 이슈는 다음 Full Sync 가 되살리지 않도록 tombstone 으로 남긴다.
+- change_log 중 모든 소비자가 읽은 행과 보관 기간이 지난 행을 지운다 (db.prune_consumed_changes).
+- ANALYZE + PRAGMA optimize 로 쿼리 플래너 통계를 갱신한다.
+- (선택) 커버리지/실행 통계 테이블(stat_*)을 처음부터 다시 계산한다 (--rebuild-stats).
+- incremental vacuum 으로 빈 페이지를 DB 파일에서 돌려준다.
+  auto_vacuum 이 INCREMENTAL 이 아닌 기존 DB 는 처음 한 번만 전체 VACUUM 으로 전환한다.
+- 단계별 소요 시간과 회수한 바이트 수를 MaintenanceReport 로 반환한다.
+
+사용법 (rtm_local_manager 디렉터리에서):
+
+    python -m backend.maintenance [--db rtm_local.db] [--retention-days 30] [--project-id N] [--no-analyze] [--no-vacuum]
+    python -m backend.maintenance --change-log-retention-days 7
+    python -m backend.maintenance --rebuild-stats
+
+storage_mode = "per_project" (backend/shards.py) 이면 CLI 는 프로젝트별 DB 마다 실행한다 (--project-id 면 그 DB 만).
+
+GUI 에서는 Local > Database Maintenance... 메뉴로 같은 작업을 실행한다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from . import db, shards
+
+
+DEFAULT_RETENTION_DAYS = 30
+DEFAULT_CHANGE_LOG_RETENTION_DAYS = 7
+
+# PRAGMA auto_vacuum 값
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+@dataclass
+class MaintenanceReport:
+    """run_maintenance() 결과."""
+
+    retention_days: float
+    purged: Dict[str, int] = field(default_factory=dict)
+    # prune_change_log 단계에서 지운 change_log 행 수
+    change_log_pruned: int = 0
+    # rebuild_stats 를 실행했을 때 stat_* 테이블별 행 수
+    stats_rows: Dict[str, int] = field(default_factory=dict)
+    # 단계 이름 -> 소요 시간 (초), 실행 순서대로
+    timings: Dict[str, float] = field(default_factory=dict)
+    size_before: int = 0
+    size_after: int = 0
+    freelist_before: int = 0
+    freelist_after: int = 0
+    # "incremental", "full (converted to incremental)", "skipped"
+    vacuum_mode: str = "skipped"
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        return max(self.size_before - self.size_after, 0)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.timings.values())
+
+    def summary_lines(self) -> List[str]:
+        """GUI 메시지 박스 / CLI 출력용 요약."""
+        lines = [f"Retention: {self.retention_days:g} day(s)"]
+        purged = {k: v for k, v in self.purged.items() if v}
+        if purged:
+            lines.append("Purged rows:")
+            lines.extend(f"  {table}: {count}" for table, count in purged.items())
+        else:
+            lines.append("Purged rows: none")
+        if "prune_change_log" in self.timings:
+            lines.append(f"Change log rows pruned: {self.change_log_pruned}")
+        if self.stats_rows:
+            lines.append("Rebuilt statistics:")
+            lines.extend(f"  {table}: {count} row(s)" for table, count in self.stats_rows.items())
+        lines.append(f"Vacuum: {self.vacuum_mode}")
+        lines.append(
+            f"DB size: {_format_bytes(self.size_before)} -> {_format_bytes(self.size_after)}"
+            f" (reclaimed {_format_bytes(self.bytes_reclaimed)})"
+        )
+        lines.append(f"Free pages: {self.freelist_before} -> {self.freelist_after}")
+        lines.append("Timings:")
+        lines.extend(f"  {step}: {seconds:.3f}s" for step, seconds in self.timings.items())
+        lines.append(f"  total: {self.total_seconds:.3f}s")
+        return lines
+
+
+def _load_days_setting(key: str, default: float) -> float:
+    from .local_settings import load_local_settings
+
+    cfg = load_local_settings().get("maintenance") or {}
+    try:
+        return max(float(cfg.get(key, default)), 0.0)
+    except (TypeError, ValueError):
+        return float(default)
+
+
+def load_retention_days() -> float:
+    """local_settings.json 의 maintenance.retention_days (잘못된 값이면 DEFAULT_RETENTION_DAYS)."""
+    return _load_days_setting("retention_days", DEFAULT_RETENTION_DAYS)
+
+
+def load_change_log_retention_days() -> float:
+    """local_settings.json 의 maintenance.change_log_retention_days (잘못된 값이면 DEFAULT_CHANGE_LOG_RETENTION_DAYS)."""
+    return _load_days_setting("change_log_retention_days", DEFAULT_CHANGE_LOG_RETENTION_DAYS)
+
+
+def _format_bytes(n: int) -> str:
+    size = float(n)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def _pragma_int(conn: sqlite3.Connection, name: str) -> int:
+    row = conn.execute(f"PRAGMA {name}").fetchone()
+    return int(row[0]) if row else 0
+
+
+def database_size(conn: sqlite3.Connection) -> int:
+    """DB 의 논리 크기 (page_count * page_size, 바이트). WAL 파일은 포함하지 않는다."""
+    return _pragma_int(conn, "page_count") * _pragma_int(conn, "page_size")
+
+
+def _vacuum(conn: sqlite3.Connection) -> str:
+    """빈 페이지를 파일에서 돌려주고 사용한 방식을 반환한다."""
+    if _pragma_int(conn, "auto_vacuum") == _AUTO_VACUUM_INCREMENTAL:
+        # Python 의 execute() 는 문장을 한 번만 step 하므로 (= 한 페이지만 회수)
+        # 끝까지 실행하는 executescript() 를 사용한다.
+        conn.executescript("PRAGMA incremental_vacuum;")
+        mode = "incremental"
+    else:
+        # auto_vacuum 설정은 VACUUM 을 거쳐야 기존 DB 에 적용된다 (한 번만 필요).
+        conn.executescript("PRAGMA auto_vacuum = INCREMENTAL; VACUUM;")
+        mode = "full (converted to incremental)"
+    # WAL 파일도 비워 두어 디스크 사용량이 실제로 줄어들게 한다.
+    if str(conn.execute("PRAGMA journal_mode").fetchone()[0]).upper() == "WAL":
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+    return mode
+
+
+def run_maintenance(
+    conn: sqlite3.Connection,
+    retention_days: float = DEFAULT_RETENTION_DAYS,
+    project_id: Optional[int] = None,
+    analyze: bool = True,
+    vacuum: bool = True,
+    rebuild_stats: bool = False,
+    change_log_retention_days: Optional[float] = DEFAULT_CHANGE_LOG_RETENTION_DAYS,
+    progress: Optional[Callable[[str], None]] = None,
+) -> MaintenanceReport:
+    """
+    purge → prune_change_log → (rebuild_stats) → ANALYZE/optimize → vacuum 순서로 실행하고 MaintenanceReport 를 반환한다.
+
+    change_log_retention_days 가 None 이면 change_log 정리를 건너뛴다.
+    그 외에는 모든 소비자가 읽은 행과, 소비자와 관계없이 그 기간보다 오래된 행을 지운다.
+
+    VACUUM 은 트랜잭션 안에서 실행할 수 없으므로 transaction() 블록 밖에서 호출해야 한다.
+    progress 는 단계가 시작될 때마다 단계 이름으로 호출된다 (GUI 상태 표시용).
+    """
+    if db.transaction_depth(conn) or conn.in_transaction:
+        raise RuntimeError("run_maintenance() cannot run inside an open transaction")
+
+    report = MaintenanceReport(retention_days=float(retention_days))
+    report.size_before = database_size(conn)
+    report.freelist_before = _pragma_int(conn, "freelist_count")
+
+    def _step(name: str, fn: Callable[[], object]) -> object:
+        if progress is not None:
+            progress(name)
+        started = time.perf_counter()
+        result = fn()
+        report.timings[name] = time.perf_counter() - started
+        return result
+
+    report.purged = _step("purge", lambda: db.purge_deleted_issues(conn, retention_days, project_id))  # type: ignore[assignment]
+    if change_log_retention_days is not None:
+        report.change_log_pruned = _step(  # type: ignore[assignment]
+            "prune_change_log", lambda: db.prune_consumed_changes(conn, retention_days=change_log_retention_days)
+        )
+    if rebuild_stats:
+        report.stats_rows = _step("rebuild_stats", lambda: db.rebuild_coverage_stats(conn))  # type: ignore[assignment]
+    if analyze:
+        _step("analyze", lambda: conn.executescript("ANALYZE; PRAGMA optimize;"))
+    if vacuum:
+        report.vacuum_mode = _step("vacuum", lambda: _vacuum(conn))  # type: ignore[assignment]
+
+    report.size_after = database_size(conn)
+    report.freelist_after = _pragma_int(conn, "freelist_count")
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Purge soft-deleted issues, refresh statistics and vacuum the local DB.")
+    parser.add_argument("--db", default=str(Path(__file__).resolve().parent.parent / "rtm_local.db"), help="SQLite DB path")
+    parser.add_argument(
+        "--retention-days",
+        type=float,
+        default=None,
+        help="keep soft-deleted issues this many days (default: local_settings maintenance.retention_days)",
+    )
+    parser.add_argument("--project-id", type=int, default=None, help="only purge issues of this project")
+    parser.add_argument("--no-analyze", action="store_true", help="skip ANALYZE / PRAGMA optimize")
+    parser.add_argument("--no-vacuum", action="store_true", help="skip vacuum")
+    parser.add_argument("--rebuild-stats", action="store_true", help="recompute coverage / execution statistics tables")
+    parser.add_argument(
+        "--change-log-retention-days",
+        type=float,
+        default=None,
+        help="drop change_log rows older than this (default: local_settings maintenance.change_log_retention_days)",
+    )
+    parser.add_argument("--no-change-log", action="store_true", help="skip change_log pruning")
+    args = parser.parse_args(argv)
+    retention_days = args.retention_days if args.retention_days is not None else load_retention_days()
+    if args.no_change_log:
+        change_log_days: Optional[float] = None
+    elif args.change_log_retention_days is not None:
+        change_log_days = args.change_log_retention_days
+    else:
+        change_log_days = load_change_log_retention_days()
+
+    def _run(conn: sqlite3.Connection) -> MaintenanceReport:
+        return run_maintenance(
+            conn,
+            retention_days=retention_days,
+            project_id=args.project_id,
+            analyze=not args.no_analyze,
+            vacuum=not args.no_vacuum,
+            rebuild_stats=args.rebuild_stats,
+            change_log_retention_days=change_log_days,
+        )
+
+    # storage_mode = "per_project" 이면 프로젝트별 DB 마다 (--project-id 가 있으면 그 프로젝트의 DB 만) 실행한다.
+    router = shards.open_project_storage(args.db)
+    if router is not None:
+        try:
+            infos = router.shards()
+            if args.project_id is not None:
+                infos = [i for i in infos if i.id == args.project_id]
+            for info in infos:
+                print(f"[{info.project_key}] {info.path}")
+                print("\n".join(_run(router.connection(info.id)).summary_lines()))
+        finally:
+            router.close()
+        return 0
+
+    if not Path(args.db).exists():
+        print(f"DB not found: {args.db}", file=sys.stderr)
+        return 1
+    conn = db.get_connection(Path(args.db))
+    try:
+        db.init_db(conn)
+        report = _run(conn)
+    finally:
+        conn.close()
+    print("\n".join(report.summary_lines()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+"""
+query_plans.py - EXPLAIN QUERY PLAN regression check for db.py.
+
+역할:
+- 작은 샘플 DB 를 만들고 db.py 의 repository 함수들을 한 번씩 호출하면서
+  실제로 실행된 SQL 을 trace callback 으로 수집한다.
+- 수집한 각 문장에 대해 EXPLAIN QUERY PLAN 을 실행하여,
+  인덱스 없이 테이블 전체를 읽는 계획(SCAN <table>)이 있으면 보고한다.
+- trigger 안에서 실행되는 문장은 trace 에 잡히지 않으므로, sqlite_master 의 trigger 본문을
+  문장 단위로 나누어 같은 방식으로 검사한다 (change_log / FTS / stat_* trigger).
+  NEW.col / OLD.col 참조는 바인딩 파라미터(?)로 바꾸어 EXPLAIN 한다.
+
+사용법 (rtm_local_manager 디렉터리에서):
+
+    python -m backend.query_plans
+
+전체 스캔이 하나라도 있으면 종료 코드 1 을 반환하므로, 인덱스/쿼리 변경 후 회귀 확인용으로 사용한다.
+새 repository 함수를 추가하면 exercise_repository() 에도 호출을 추가해야 검사 대상에 포함된다.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import sys
+from typing import Any, Dict, List, Tuple
+
+from . import db
+
+
+# 의도적으로 전체 스캔을 허용하는 문장 (문장 앞부분 → 사유)
+ALLOWED_FULL_SCANS: Dict[str, str] = {
+    "SELECT seq FROM sqlite_sequence": "sqlite_sequence 는 AUTOINCREMENT 테이블당 1행뿐인 내부 테이블",
+    "SELECT 1 FROM sqlite_master": "스키마 객체 수만큼의 작은 내부 테이블 (FTS 색인 존재 확인)",
+    "DELETE FROM sync_state": "프로젝트당 1행인 작은 테이블 (delete_project_data)",
+    # rebuild_coverage_stats(): 원본 테이블 전체를 다시 집계하는 것이 목적
+    "DELETE FROM stat_testcase_last_result": "rebuild_coverage_stats 전체 재계산",
+    "INSERT INTO stat_testexecution_results (testexecution_id, result, count) SELECT": "rebuild_coverage_stats 전체 재계산",
+    "INSERT INTO stat_testcase_last_result (testcase_id, testcase_execution_id, testexecution_id, result) SELECT": "rebuild_coverage_stats 전체 재계산",
+    "INSERT INTO stat_requirement_coverage": "rebuild_coverage_stats 전체 재계산",
+    "SELECT COUNT(*) FROM stat_": "rebuild_coverage_stats 결과 행 수 보고",
+    # change_log 소비자 등록: 소비자(GUI 창 등) 수만큼의 작은 테이블
+    "DELETE FROM change_log_consumers WHERE updated_at <": "소비자 수만큼의 작은 테이블",
+    # seq(rowid) 순으로 읽다가 retention 안의 첫 행에서 멈춘다 - 읽는 행 수 = 지울 행 수
+    "SELECT seq FROM change_log WHERE changed_at >=": "retention 경계 탐색 (seq 순서, 첫 행에서 종료)",
+}
+
+# copy_subtree / copy_issues 의 TEMP id 매핑 테이블: 복사할 행 집합 자체이므로 전체 읽기가 정상이다.
+_DRIVING_TABLES = {"_copy_folder_map", "_copy_issue_map"}
+
+_SKIP_PREFIXES = ("PRAGMA", "BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "CREATE", "DROP", "ANALYZE", "EXPLAIN")
+
+
+def seed_sample_db(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """검사용 샘플 데이터를 넣고, exercise_repository() 에서 사용할 id 들을 반환한다."""
+    db.init_db(conn)
+    project = db.get_or_create_project(conn, project_key="QP", project_id=1, name="Query Plan")
+    root = db.create_folder_node(conn, project.id, "Root", issue_type="TEST_CASE")
+    sub = db.create_folder_node(conn, project.id, "Sub", parent_id=root, issue_type="TEST_CASE")
+    tc_id = db.upsert_issue_from_tree(conn, project.id, "QP-1", 1001, "TEST_CASE", "Case", sub)
+    tc2_id = db.upsert_issue_from_tree(conn, project.id, "QP-2", 1002, "TEST_CASE", "Case 2", sub)
+    req_id = db.upsert_issue_from_tree(conn, project.id, "QP-3", 1003, "REQUIREMENT", "Req", None)
+    tp_id = db.upsert_issue_from_tree(conn, project.id, "QP-4", 1004, "TEST_PLAN", "Plan", None)
+    te_id = db.upsert_issue_from_tree(conn, project.id, "QP-5", 1005, "TEST_EXECUTION", "Exec", None)
+    local_id = db.create_local_issue(conn, project.id, "TEST_CASE", folder_id=root, summary="Local")
+    db.replace_steps_for_issue(
+        conn,
+        tc_id,
+        [
+            {"group_no": 1, "order_no": 1, "action": "a", "input": "i", "expected": "e"},
+            {"group_no": 1, "order_no": 2, "action": "b", "input": "", "expected": ""},
+        ],
+    )
+    db.replace_relations_for_issue(conn, req_id, [{"dst_issue_id": tc_id, "relation_type": "Tests"}])
+    db.replace_testplan_testcases(conn, tp_id, [{"testcase_id": tc_id, "order_no": 1}])
+    te_row = db.get_or_create_testexecution_for_issue(conn, te_id)
+    db.replace_testcase_executions(
+        conn, te_row["id"], [{"testcase_id": tc_id, "order_no": 1, "result": "PASS", "tce_test_key": "QP-6"}]
+    )
+    tce_id = db.get_testcase_executions(conn, te_row["id"])[0]["id"]
+    step_id = db.get_steps_for_issue(conn, tc_id)[0]["id"]
+    return {
+        "project_id": project.id,
+        "root_folder": root,
+        "sub_folder": sub,
+        "tc_id": tc_id,
+        "tc2_id": tc2_id,
+        "req_id": req_id,
+        "tp_id": tp_id,
+        "te_issue_id": te_id,
+        "te_id": te_row["id"],
+        "tce_id": tce_id,
+        "step_id": step_id,
+        "local_id": local_id,
+    }
+
+
+def exercise_repository(conn: sqlite3.Connection, ids: Dict[str, Any]) -> None:
+    """db.py 의 조회/쓰기 함수를 한 번씩 호출한다 (trace 수집 대상)."""
+    pid = ids["project_id"]
+    db.get_or_create_project(conn, project_key="QP", project_id=1)
+    db.upsert_folder(conn, pid, ids["sub_folder"], "Sub", "FOLDER", ids["root_folder"], 0)
+    db.upsert_issue_from_tree(conn, pid, "QP-1", 1001, "TEST_CASE", "Case", ids["sub_folder"])
+    state = db.load_tree_ingest_state(conn, pid)
+    db.bulk_upsert_tree(
+        conn,
+        pid,
+        [(ids["sub_folder"], ids["root_folder"], "Sub renamed", 0)],
+        [("QP-1", 1001, "TEST_CASE", "Case renamed", ids["sub_folder"]), ("QP-9", 1009, "TEST_CASE", "New", None)],
+        state=state,
+    )
+    db.fetch_folder_tree(conn, pid)
+    db.fetch_folder_tree(conn, pid, issue_type="TEST_CASE")
+    db.fetch_folder_children(conn, pid)
+    db.fetch_folder_children(conn, pid, ids["root_folder"], issue_type="TEST_CASE")
+    db.get_folder_descendant_counts(conn, pid)
+    db.get_folder_ancestor_ids(conn, pid, ids["sub_folder"])
+    db.move_issue_to_folder(conn, ids["tc2_id"], ids["root_folder"])
+    db.move_folder(conn, ids["sub_folder"], ids["root_folder"])
+    db.get_issue_by_id(conn, ids["tc_id"])
+    db.get_issue_by_jira_key(conn, pid, "QP-1")
+    db.get_issues_by_ids(conn, [ids["tc_id"], ids["tc2_id"]])
+    db.get_issues_by_jira_keys(conn, pid, ["QP-1", "QP-2"], columns=["summary"])
+    db.get_local_issues_without_jira_key(conn, pid)
+    db.get_local_issues_without_jira_key(conn, pid, "TEST_CASE")
+    db.update_issue_fields(conn, ids["tc_id"], {"status": "Open"})
+    db.update_issue_fields(conn, ids["tc_id"], {"labels": "smoke, ui", "fix_versions": "1.0"})
+    db.sync_issue_dimensions(conn, [ids["tc_id"], ids["tc2_id"]])
+    db.find_issue_ids_by_dimension(conn, pid, "labels", "smoke")
+    db.find_issue_ids_by_dimension(conn, pid, "fix_versions", "1.0", issue_type="TEST_CASE")
+    db.count_issues_by_dimension(conn, pid, "components")
+    db.count_issues_by_dimension(conn, pid, "affects_versions", issue_type="TEST_CASE")
+    db.update_issue_fields(conn, ids["tc_id"], {"attachments": '[{"id": "10", "filename": "a.txt"}]'})
+    db.add_issue_attachment(conn, ids["tc_id"], {"filename": "b.txt", "local_path": "TEST_CASE/1/b.txt"})
+    db.get_issue_attachments(conn, ids["tc_id"])
+    db.get_attachments_for_issues(conn, [ids["tc_id"], ids["tc2_id"]])
+    db.delete_issue_attachment(conn, ids["tc_id"], "TEST_CASE/1/b.txt")
+    db.count_attachment_path_references(conn, "TEST_CASE/1/b.txt")
+    db.add_issue_activity(conn, ids["tc_id"], "note 1")
+    db.set_issue_activity_text(conn, ids["tc_id"], "note 1\n\nnote 2")
+    db.update_issue_fields(conn, ids["tc_id"], {"local_activity": "rewritten"})
+    db.get_issue_activity(conn, ids["tc_id"])
+    db.clear_issue_activity(conn, ids["tc_id"])
+    db.get_steps_for_issue(conn, ids["tc_id"])
+    db.replace_steps_for_issue(conn, ids["tc2_id"], [{"order_no": 1, "action": "x"}])
+    db.get_folder_path(conn, ids["sub_folder"])
+    db.get_folder_paths(conn, [ids["sub_folder"], ids["root_folder"]], project_id=pid)
+    db.ensure_folder_path(conn, pid, "Root/Sub/New", issue_type="TEST_CASE")
+    db.get_relations_for_issue(conn, ids["req_id"])
+    db.replace_relations_for_issue(conn, ids["req_id"], [{"dst_issue_id": ids["tc_id"], "relation_type": "Tests"}])
+    db.get_testplan_testcases(conn, ids["tp_id"])
+    db.replace_testplan_testcases(conn, ids["tp_id"], [{"testcase_id": ids["tc_id"], "order_no": 1}])
+    db.get_or_create_testexecution_for_issue(conn, ids["te_issue_id"])
+    db.update_testexecution_for_issue(conn, ids["te_issue_id"], {"result": "PASS"})
+    db.get_testcase_executions(conn, ids["te_id"])
+    db.get_testcase_execution_by_id(conn, ids["tce_id"])
+    db.get_step_executions_for_tce(conn, ids["tce_id"])
+    db.replace_step_executions_for_tce(
+        conn, ids["tce_id"], [{"testcase_step_id": ids["step_id"], "status": "PASS"}]
+    )
+    empty = db.create_folder_node(conn, pid, "Empty", issue_type="TEST_CASE")
+    db.delete_folder_if_empty(conn, empty)
+    db.delete_folder_if_empty(conn, ids["root_folder"])
+    db.copy_subtree(conn, ids["root_folder"], None, issue_type="TEST_CASE")
+    db.copy_issues(conn, [ids["tc_id"], ids["tp_id"]], ids["root_folder"])
+    db.get_requirement_coverage(conn, [ids["req_id"]])
+    db.get_project_requirement_coverage(conn, pid)
+    db.get_testexecution_result_counts(conn, ids["te_id"])
+    db.get_testcase_last_results(conn, [ids["tc_id"], ids["tc2_id"]])
+    db.rebuild_coverage_stats(conn)
+    db.soft_delete_issue(conn, ids["local_id"])
+    db.find_purgeable_issue_ids(conn, 30, project_id=pid)
+    db.purge_deleted_issues(conn, retention_days=0)
+    db.mark_pending_changes(conn, ids["tc2_id"], ["summary", "steps"])
+    db.get_pending_fields(conn, ids["tc_id"])
+    db.get_pending_changes(conn, pid)
+    db.get_pending_changes(conn, pid, issue_type="TEST_CASE")
+    db.clear_pending_changes(conn, ids["tc_id"], ["summary", "steps"])
+    db.clear_pending_changes(conn, ids["tc2_id"])
+    db.get_change_seq(conn)
+    db.get_changes_since(conn, 0, entities=["issues", "folders"], limit=10)
+    db.prune_change_log(conn, 1)
+    db.advance_change_consumer(conn, "query_plans", db.get_change_seq(conn))
+    db.change_log_covers(conn, 0)
+    db.prune_consumed_changes(conn, retention_days=30)
+    db.remove_change_consumer(conn, "query_plans")
+    db.search_local(conn, pid, "case", types=["TEST_CASE"], limit=20)
+    db.search_local(conn, pid, "a")
+    db.search_local(conn, pid, "case", limit=20, dimension_filters=[("labels", "smoke"), ("fix_versions", "1.0")])
+    other = db.get_or_create_project(conn, project_key="QX", project_id=2, name="Other")
+    db.create_local_issue(conn, other.id, "TEST_CASE", summary="Other")
+    db.delete_project_data(conn, other.id)
+
+
+def collect_queries(conn: sqlite3.Connection, ids: Dict[str, Any]) -> List[str]:
+    """exercise_repository() 동안 실행된 SQL 문장(바인딩 값 확장됨)을 중복 없이 반환한다."""
+    statements: List[str] = []
+    seen = set()
+
+    def _trace(sql: str) -> None:
+        text = " ".join(sql.split())
+        # "-- ..." 는 virtual table(FTS5) 내부에서 실행된 문장이다.
+        if not text or text.startswith("--") or text.upper().startswith(_SKIP_PREFIXES):
+            return
+        if text not in seen:
+            seen.add(text)
+            statements.append(text)
+
+    conn.set_trace_callback(_trace)
+    try:
+        exercise_repository(conn, ids)
+    finally:
+        conn.set_trace_callback(None)
+    return statements
+
+
+def _cte_names(sql: str) -> set:
+    """
+    WITH 절의 CTE 이름, _DRIVING_TABLES 와 그 별칭
+    (recursive CTE 작업 테이블 / id 매핑 테이블 스캔은 전체 스캔이 아니다).
+    """
+    names = {m.group(1).lower() for m in re.finditer(r"(\w+)\s*(?:\([^)]*\))?\s+AS\s*\(", sql, re.IGNORECASE)}
+    names |= _DRIVING_TABLES
+    for m in re.finditer(r"\b(?:FROM|JOIN)\s+(?:temp\.)?(\w+)\s+(?:AS\s+)?(\w+)", sql, re.IGNORECASE):
+        if m.group(1).lower() in names:
+            names.add(m.group(2).lower())
+    return names
+
+
+_TRIGGER_BODY_RE = re.compile(r"\bBEGIN\b(.*)\bEND\s*$", re.IGNORECASE | re.DOTALL)
+_TRIGGER_ROW_REF_RE = re.compile(r"\b(?:NEW|OLD)\.\w+", re.IGNORECASE)
+
+
+def collect_trigger_statements(conn: sqlite3.Connection) -> List[Tuple[str, str]]:
+    """
+    스키마의 trigger 본문을 (trigger 이름, 문장) 목록으로 반환한다.
+    NEW.col / OLD.col 은 "?" 로 바뀌어 있어 그대로 EXPLAIN 할 수 있다.
+    """
+    statements: List[Tuple[str, str]] = []
+    rows = conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' ORDER BY name").fetchall()
+    for name, sql in rows:
+        m = _TRIGGER_BODY_RE.search(sql or "")
+        if m is None:
+            continue
+        pending = ""
+        # 문자열 리터럴 안의 ";" 에서 자르지 않도록 sqlite3.complete_statement 로 문장 경계를 찾는다.
+        for part in m.group(1).split(";"):
+            pending += part + ";"
+            if not sqlite3.complete_statement(pending):
+                continue
+            text = " ".join(pending.rstrip(";").split())
+            pending = ""
+            if text:
+                statements.append((name, _TRIGGER_ROW_REF_RE.sub("?", text)))
+    return statements
+
+
+def _plan_full_scans(conn: sqlite3.Connection, sql: str) -> List[str]:
+    """EXPLAIN QUERY PLAN 결과 중 테이블 전체 스캔에 해당하는 줄만 반환한다."""
+    # trigger 문장의 "?" 는 값과 관계없이 계획만 보면 되므로 NULL 로 바인딩한다.
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", (None,) * sql.count("?")).fetchall()
+    ctes = _cte_names(sql)
+    scans: List[str] = []
+    for row in rows:
+        detail = str(row[3])
+        # "SCAN t" / "SCAN t USING COVERING INDEX ..." 는 전체 읽기, "SEARCH ..." 는 인덱스 탐색
+        if not detail.startswith("SCAN ") or detail.startswith("SCAN CONSTANT ROW"):
+            continue
+        # "SCAN (subquery-N)" 은 이미 만들어 둔 중간 결과(window 함수 등)를 읽는 것이다
+        if detail.startswith("SCAN ("):
+            continue
+        # FTS5 등 virtual table 은 MATCH 를 자체 색인으로 처리한다
+        if "VIRTUAL TABLE INDEX" in detail:
+            continue
+        target = detail.split()[1].lower().removeprefix("temp.")
+        if target in ctes:
+            continue
+        scans.append(detail)
+    return scans
+
+
+def find_full_scans(conn: sqlite3.Connection | None = None) -> List[Tuple[str, List[str]]]:
+    """
+    샘플 DB 에서 db.py 쿼리와 trigger 본문 문장의 실행 계획을 검사하고,
+    전체 스캔하는 (sql, plan 줄 목록) 을 반환한다 (trigger 문장은 "[trigger 이름] sql").
+    conn 을 생략하면 메모리 DB 를 새로 만든다.
+    """
+    if conn is None:
+        conn = db.get_connection(":memory:")
+    ids = seed_sample_db(conn)
+    offenders: List[Tuple[str, List[str]]] = []
+    for sql in collect_queries(conn, ids):
+        if any(sql.startswith(prefix) for prefix in ALLOWED_FULL_SCANS):
+            continue
+        scans = _plan_full_scans(conn, sql)
+        if scans:
+            offenders.append((sql, scans))
+    # ALLOWED_FULL_SCANS 는 적용하지 않는다: rebuild_coverage_stats 의 전체 재계산 문장과 앞부분이 같은
+    # trigger 문장(한 TC / 요구사항만 갱신)은 반드시 인덱스를 타야 한다.
+    for name, sql in collect_trigger_statements(conn):
+        scans = _plan_full_scans(conn, sql)
+        if scans:
+            offenders.append((f"[{name}] {sql}", scans))
+    return offenders
+
+
+def main() -> int:
+    offenders = find_full_scans()
+    if not offenders:
+        print("OK: no full table scans in db.py queries.")
+        return 0
+    for sql, scans in offenders:
+        print(f"FULL SCAN: {sql}")
+        for detail in scans:
+            print(f"    {detail}")
+    print(f"{len(offenders)} query(ies) fall back to a full table scan.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
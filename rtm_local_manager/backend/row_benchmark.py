@@ -0,0 +1,184 @@
+"""
+row_benchmark.py - Memory / time comparison: dict rows vs rows.py __slots__ rows.
+
+합성 프로젝트(폴더 N개, 이슈 M개, Test Case 마다 Step k개)를 임시 DB 에 만들고,
+트리 / Steps 읽기 경로를 두 방식으로 실행하여 비교한다.
+
+- dict:  이전 구현 (sqlite3.Row → dict(row) → {**row, "node_type": ..., "children": []})
+- slots: 현재 구현 (db.fetch_folder_tree / db.get_steps_for_issue, rows.py 객체)
+
+측정값:
+- retained: 결과 객체가 살아 있는 동안 tracemalloc 으로 잰 순 할당량
+- peak:     읽는 동안의 최대 할당량
+- seconds:  소요 시간 (GC 포함)
+- gc objs:  gc 가 추적하는 객체 수 증가분 (GC 스캔 비용의 근사치)
+
+사용법 (rtm_local_manager 디렉터리에서):
+
+    python -m backend.row_benchmark [--issues 50000] [--folders 2000] [--steps 5] [--step-cases 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import db
+
+
+def seed_synthetic_project(
+    conn: sqlite3.Connection, issues: int, folders: int, steps: int, step_cases: int
+) -> Tuple[int, List[int]]:
+    """합성 데이터를 넣고 (project id, Step 을 가진 Test Case id 목록) 을 반환한다."""
+    db.init_db(conn)
+    project = db.get_or_create_project(conn, project_key="BENCH", project_id=1, name="Benchmark")
+    issue_types = ("TEST_CASE", "REQUIREMENT", "TEST_EXECUTION", "DEFECT")
+    with db.transaction(conn):
+        # 폴더: 10개씩 한 단계 아래로 매달아 깊이가 있는 트리를 만든다.
+        conn.executemany(
+            "INSERT INTO folders (id, project_id, parent_id, name, node_type, sort_order) VALUES (?, ?, ?, ?, 'FOLDER', ?)",
+            (
+                (f"F{i}", project.id, f"F{i // 10}" if i >= 10 else None, f"Folder {i}", i)
+                for i in range(max(folders, 1))
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO issues (project_id, jira_key, issue_type, summary, folder_id) VALUES (?, ?, ?, ?, ?)",
+            (
+                (project.id, f"BENCH-{i}", issue_types[i % len(issue_types)], f"Issue summary {i:06d}", f"F{i % max(folders, 1)}")
+                for i in range(issues)
+            ),
+        )
+        tc_ids = [
+            int(r[0])
+            for r in conn.execute(
+                "SELECT id FROM issues WHERE project_id = ? AND issue_type = 'TEST_CASE' ORDER BY id LIMIT ?",
+                (project.id, step_cases),
+            )
+        ]
+        conn.executemany(
+            "INSERT INTO testcase_steps (issue_id, group_no, order_no, action, input, expected) VALUES (?, 1, ?, ?, ?, ?)",
+            ((tc, n + 1, f"Do step {n + 1}", f"input {n + 1}", f"expected {n + 1}") for tc in tc_ids for n in range(steps)),
+        )
+    return project.id, tc_ids
+
+
+# --- 이전(dict) 구현: 비교 기준 ----------------------------------------------------
+
+
+def _dict_folder_tree(conn: sqlite3.Connection, project_id: int) -> Dict[str, Any]:
+    cur = conn.cursor()
+    cur.execute(
+        f"SELECT {', '.join(db.TREE_FOLDER_COLUMNS)} FROM folders WHERE project_id = ? ORDER BY sort_order, name",
+        (project_id,),
+    )
+    folders = [dict(row) for row in cur.fetchall()]
+    cur.execute(
+        f"SELECT {', '.join(db.TREE_ISSUE_COLUMNS)} FROM issues WHERE project_id = ? AND is_deleted = 0 ORDER BY summary",
+        (project_id,),
+    )
+    issues = [dict(row) for row in cur.fetchall()]
+    folder_map = {f["id"]: {**f, "children": []} for f in folders}
+    roots: List[Dict[str, Any]] = []
+    for issue in issues:
+        node = {**issue, "node_type": "ISSUE", "children": []}
+        folder_id = issue.get("folder_id")
+        (folder_map[folder_id]["children"] if folder_id in folder_map else roots).append(node)
+    for folder in folder_map.values():
+        parent_id = folder.get("parent_id")
+        (folder_map[parent_id]["children"] if parent_id in folder_map else roots).append(folder)
+    return {"roots": roots}
+
+
+def _dict_steps(conn: sqlite3.Connection, tc_ids: List[int]) -> List[List[Dict[str, Any]]]:
+    cur = conn.cursor()
+    result = []
+    for tc in tc_ids:
+        cur.execute("SELECT * FROM testcase_steps WHERE issue_id = ? ORDER BY group_no ASC, order_no ASC, id ASC", (tc,))
+        result.append([dict(r) for r in cur.fetchall()])
+    return result
+
+
+def _slots_steps(conn: sqlite3.Connection, tc_ids: List[int]) -> List[List[Any]]:
+    return [db.get_steps_for_issue(conn, tc) for tc in tc_ids]
+
+
+# --- 측정 ------------------------------------------------------------------------
+
+
+def measure(fn: Callable[[], Any]) -> Dict[str, float]:
+    """fn() 결과를 유지한 상태에서 retained / peak 바이트, 소요 시간, gc 추적 객체 증가분을 잰다."""
+    gc.collect()
+    objects_before = len(gc.get_objects())
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc_objects = len(gc.get_objects()) - objects_before
+    del result
+    gc.collect()
+    return {"retained": retained, "peak": peak, "seconds": seconds, "gc_objects": gc_objects}
+
+
+def _mib(n: float) -> str:
+    return f"{n / (1024 * 1024):8.2f} MiB"
+
+
+def run_benchmark(
+    issues: int = 50000, folders: int = 2000, steps: int = 5, step_cases: int = 2000, db_path: Optional[Path] = None
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """{경로 이름: {"dict": 측정값, "slots": 측정값}} 을 반환한다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = db_path or Path(tmp) / "row_benchmark.db"
+        conn = db.get_connection(path)
+        try:
+            project_id, tc_ids = seed_synthetic_project(conn, issues, folders, steps, step_cases)
+            return {
+                "fetch_folder_tree": {
+                    "dict": measure(lambda: _dict_folder_tree(conn, project_id)),
+                    "slots": measure(lambda: db.fetch_folder_tree(conn, project_id)),
+                },
+                "get_steps_for_issue": {
+                    "dict": measure(lambda: _dict_steps(conn, tc_ids)),
+                    "slots": measure(lambda: _slots_steps(conn, tc_ids)),
+                },
+            }
+        finally:
+            conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare memory use of dict rows and __slots__ rows on read paths.")
+    parser.add_argument("--issues", type=int, default=50000)
+    parser.add_argument("--folders", type=int, default=2000)
+    parser.add_argument("--steps", type=int, default=5, help="steps per test case")
+    parser.add_argument("--step-cases", type=int, default=2000, help="number of test cases that get steps")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.issues, args.folders, args.steps, args.step_cases)
+    print(f"issues={args.issues} folders={args.folders} steps={args.steps}x{args.step_cases}")
+    for name, pair in results.items():
+        print(f"\n{name}")
+        for kind in ("dict", "slots"):
+            m = pair[kind]
+            print(
+                f"  {kind:<5} retained {_mib(m['retained'])}  peak {_mib(m['peak'])}"
+                f"  {m['seconds']:7.3f}s  gc objs {int(m['gc_objects']):>9}"
+            )
+        base, new = pair["dict"]["retained"], pair["slots"]["retained"]
+        if base:
+            print(f"  retained reduction: {100.0 * (base - new) / base:.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
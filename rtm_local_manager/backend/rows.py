@@ -0,0 +1,139 @@
+"""
+rows.py - Compact row objects for hot read paths (tree / steps / test case executions).
+
+db.py 의 getter 대부분은 sqlite3.Row 를 dict 로 바꿔 반환한다.
+트리 / Steps / TCE 목록처럼 행 수가 많은 경로에서는 행마다 dict 를 만드는 비용(메모리, GC)이 커서,
+이 모듈의 __slots__ dataclass 를 sqlite3 row_factory 로 바로 만든다.
+
+- 각 클래스의 필드 순서 == SELECT 컬럼 순서 (db.py 가 fields 에서 컬럼 목록을 만든다).
+- RowMapping 이 dict 읽기 API(get / [] / keys / items / in / dict(row))를 제공하므로
+  기존 호출부(row.get("summary"), row["id"], {**row})는 그대로 동작한다.
+- 정의된 필드에 대한 row["x"] = v 대입은 허용하지만, 새 키는 추가할 수 없다 (필요하면 to_dict()).
+
+메모리 비교는 `python -m backend.row_benchmark` 참고.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, TypeVar
+
+
+R = TypeVar("R", bound="RowMapping")
+
+
+class RowMapping:
+    """__slots__ dataclass 행에 dict 읽기 API 를 붙이는 mixin."""
+
+    __slots__ = ()
+
+    @classmethod
+    def columns(cls) -> Tuple[str, ...]:
+        return tuple(cls.__dataclass_fields__)  # type: ignore[attr-defined]
+
+    @classmethod
+    def row_factory(cls: Type[R]) -> Callable[[sqlite3.Cursor, tuple], R]:
+        """cursor.row_factory 로 쓸 함수 (SELECT 컬럼 순서가 필드 순서와 같아야 한다)."""
+        return lambda _cursor, row: cls(*row)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__dataclass_fields__:  # type: ignore[attr-defined]
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__dataclass_fields__:  # type: ignore[attr-defined]
+            raise KeyError(f"{type(self).__name__} has no field {key!r}")
+        setattr(self, key, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self.__dataclass_fields__:  # type: ignore[attr-defined]
+            return default
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__dataclass_fields__  # type: ignore[attr-defined]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__dataclass_fields__)  # type: ignore[attr-defined]
+
+    def __len__(self) -> int:
+        return len(self.__dataclass_fields__)  # type: ignore[attr-defined]
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.columns()
+
+    def values(self) -> List[Any]:
+        return [getattr(self, k) for k in self.__dataclass_fields__]  # type: ignore[attr-defined]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(k, getattr(self, k)) for k in self.__dataclass_fields__]  # type: ignore[attr-defined]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+
+def fetch_rows(cur: sqlite3.Cursor, cls: Type[R], sql: str, params: Any = ()) -> List[R]:
+    """sql 을 실행하고 결과를 cls 객체 리스트로 반환한다 (cursor 의 row_factory 만 바꾼다)."""
+    previous = cur.row_factory
+    cur.row_factory = cls.row_factory()
+    try:
+        return cur.execute(sql, params).fetchall()
+    finally:
+        cur.row_factory = previous
+
+
+# --- Tree nodes (fetch_folder_tree) ------------------------------------------------
+
+
+@dataclass(slots=True)
+class FolderNode(RowMapping):
+    id: str
+    parent_id: Optional[str]
+    name: Optional[str]
+    node_type: Optional[str]
+    sort_order: Optional[int]
+    children: List[Any] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class IssueNode(RowMapping):
+    id: int
+    summary: Optional[str]
+    jira_key: Optional[str]
+    issue_type: Optional[str]
+    folder_id: Optional[str]
+    dirty: int
+    node_type: str = "ISSUE"
+    # 이슈 노드는 자식이 없으므로 행마다 빈 list 를 만들지 않고 빈 tuple 을 공유한다.
+    children: Tuple[Any, ...] = ()
+
+
+# --- Test case steps / executions ------------------------------------------------
+
+
+@dataclass(slots=True)
+class StepRow(RowMapping):
+    id: int
+    issue_id: int
+    group_no: Optional[int]
+    order_no: Optional[int]
+    action: Optional[str]
+    input: Optional[str]
+    expected: Optional[str]
+
+
+@dataclass(slots=True)
+class TestcaseExecutionRow(RowMapping):
+    id: int
+    testcase_id: int
+    order_no: Optional[int]
+    assignee: Optional[str]
+    result: Optional[str]
+    actual_time: Optional[int]
+    rtm_environment: Optional[str]
+    defects: Optional[str]
+    tce_test_key: Optional[str]
+    jira_key: Optional[str]
+    summary: Optional[str]
@@ -0,0 +1,484 @@
+"""
+shards.py - Optional per-project storage (one SQLite file per project + catalog DB).
+
+기본(storage_mode = "single")은 모든 프로젝트가 rtm_local.db 하나를 공유한다.
+local_settings.json 의 database.storage_mode 를 "per_project" 로 바꾸면:
+
+- <db 디렉터리>/rtm_catalog.db  : project_shards 테이블 (로컬 project id ↔ project key ↔ shard 파일)
+- <db 디렉터리>/shards/rtm_<KEY>.db : 프로젝트별 DB (스키마는 rtm_local.db 와 동일, db.py 가 그대로 사용)
+
+로컬 project id(projects.id)는 catalog 가 발급하므로 shard 간에도 겹치지 않는다.
+
+db.py 함수는 ShardedDB facade 로 호출하면 project_id 에 따라 알맞은 연결로 라우팅된다
+(storage_mode 와 관계없이 같은 코드로 호출할 수 있다):
+
+    store = open_project_db(db_path)              # single 이면 db_path 연결, per_project 면 ShardRouter
+    store.fetch_folder_children(project_id, None)  # project_id 인자로 shard 선택
+    store.get_issue_by_id(issue_id, project_id=project_id)
+
+- project_id 를 받는 함수는 그 값으로 shard 를 고른다.
+- issue id 만 받는 함수(get_issue_by_id, update_issue_fields 등)는 project_id= 키워드로 shard 를 지정한다.
+  issue id 는 shard 마다 따로 발급되므로, issue_id / issue_ids 가 그 shard 에서 그 프로젝트의 이슈가 아니면
+  ValueError 로 막는다 (ShardRouter.connection_for_issues).
+GUI 는 한 번에 한 프로젝트만 열므로 _open_project 에서 self.conn 을 그 프로젝트의 shard 연결로 바꾼다.
+
+여러 프로젝트에 걸친 보고서는 cross_project_query() 가 shard 들을 읽기 전용으로 ATTACH 하여 UNION ALL 로 조회한다.
+프로젝트 사이의 relations(다른 프로젝트 이슈를 가리키는 링크)는 shard 로 나누면 유지되지 않는다.
+
+사용법 (rtm_local_manager 디렉터리에서):
+
+    python -m backend.shards split [--db rtm_local.db]   # 기존 단일 DB 를 프로젝트별 파일로 나눔 (원본은 그대로 둠)
+    python -m backend.shards list
+    python -m backend.shards report
+"""
+
+from __future__ import annotations
+
+import argparse
+import inspect
+import re
+import sqlite3
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import db
+from .logger import get_logger
+
+
+logger = get_logger(__name__)
+
+STORAGE_SINGLE = "single"
+STORAGE_PER_PROJECT = "per_project"
+
+CATALOG_FILENAME = "rtm_catalog.db"
+SHARD_DIRNAME = "shards"
+
+_CATALOG_SCHEMA_VERSION = 1
+
+
+@dataclass
+class ShardInfo:
+    # 로컬 project id (shard 의 projects.id 와 같음)
+    id: int
+    project_key: str
+    project_id: Optional[int]
+    name: Optional[str]
+    base_url: Optional[str]
+    path: Path
+
+
+def get_storage_mode(profile: Optional[Dict[str, Any]] = None) -> str:
+    """local_settings database.storage_mode ("single" / "per_project", 잘못된 값은 "single")."""
+    if profile is None:
+        profile = db.load_connection_profile()
+    mode = str(profile.get("storage_mode") or STORAGE_SINGLE).strip().lower()
+    return mode if mode in (STORAGE_SINGLE, STORAGE_PER_PROJECT) else STORAGE_SINGLE
+
+
+def _init_catalog(conn: sqlite3.Connection) -> None:
+    if int(conn.execute("PRAGMA user_version").fetchone()[0]) >= _CATALOG_SCHEMA_VERSION:
+        return
+    conn.executescript(
+        f"""
+        CREATE TABLE IF NOT EXISTS project_shards (
+            id              INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_key     TEXT NOT NULL UNIQUE,
+            project_id      INTEGER,
+            name            TEXT,
+            base_url        TEXT,
+            -- catalog 디렉터리 기준 상대 경로
+            file_name       TEXT NOT NULL,
+            created_at      TEXT NOT NULL DEFAULT (datetime('now'))
+        );
+        PRAGMA user_version = {_CATALOG_SCHEMA_VERSION};
+        """
+    )
+
+
+def _shard_file_name(project_key: str) -> str:
+    safe = re.sub(r"[^\w.-]+", "_", (project_key or "").strip()) or "PROJECT"
+    return f"{SHARD_DIRNAME}/rtm_{safe}.db"
+
+
+class ShardRouter:
+    """
+    catalog DB 와 프로젝트별 shard 연결을 관리한다.
+
+    shard 연결은 project id 별로 한 번만 열고(init_db 포함) 재사용한다.
+    """
+
+    def __init__(self, base_dir: Path | str, profile: Optional[Dict[str, Any]] = None) -> None:
+        self.base_dir = Path(base_dir)
+        (self.base_dir / SHARD_DIRNAME).mkdir(parents=True, exist_ok=True)
+        self.profile = profile
+        self.catalog = db.get_connection(self.base_dir / CATALOG_FILENAME, profile)
+        _init_catalog(self.catalog)
+        self._connections: Dict[int, sqlite3.Connection] = {}
+
+    # --- catalog ---------------------------------------------------------------
+
+    def _info(self, row: sqlite3.Row) -> ShardInfo:
+        return ShardInfo(
+            id=int(row["id"]),
+            project_key=row["project_key"],
+            project_id=row["project_id"],
+            name=row["name"],
+            base_url=row["base_url"],
+            path=self.base_dir / row["file_name"],
+        )
+
+    def shards(self) -> List[ShardInfo]:
+        rows = self.catalog.execute("SELECT * FROM project_shards ORDER BY id").fetchall()
+        return [self._info(r) for r in rows]
+
+    def shard(self, project_id: int) -> Optional[ShardInfo]:
+        row = self.catalog.execute("SELECT * FROM project_shards WHERE id = ?", (int(project_id),)).fetchone()
+        return self._info(row) if row else None
+
+    def shard_for_key(self, project_key: str) -> Optional[ShardInfo]:
+        row = self.catalog.execute("SELECT * FROM project_shards WHERE project_key = ?", (project_key,)).fetchone()
+        return self._info(row) if row else None
+
+    def register_project(
+        self,
+        project_key: str,
+        project_id: Optional[int],
+        name: Optional[str] = None,
+        base_url: Optional[str] = None,
+        local_id: Optional[int] = None,
+    ) -> ShardInfo:
+        """
+        catalog 에 프로젝트를 등록하고 shard 파일을 만든다 (이미 있으면 기존 항목을 반환).
+        local_id 를 주면 그 값을 로컬 project id 로 사용한다 (split_database 에서 기존 id 유지용).
+        """
+        existing = self.shard_for_key(project_key)
+        if existing is not None:
+            return existing
+        with db.transaction(self.catalog):
+            cur = self.catalog.execute(
+                """
+                INSERT INTO project_shards (id, project_key, project_id, name, base_url, file_name)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (local_id, project_key, project_id, name, base_url, _shard_file_name(project_key)),
+            )
+            shard_id = int(cur.lastrowid)
+        info = self.shard(shard_id)
+        assert info is not None
+        conn = self.connection(shard_id)
+        # shard 의 projects 행은 catalog 의 id 를 그대로 쓴다 (get_or_create_project 는 key 로 찾는다).
+        conn.execute(
+            "INSERT OR IGNORE INTO projects (id, project_key, project_id, name, base_url) VALUES (?, ?, ?, ?, ?)",
+            (shard_id, project_key, project_id, name, base_url),
+        )
+        conn.commit()
+        return info
+
+    # --- routing ---------------------------------------------------------------
+
+    def connection(self, project_id: int) -> sqlite3.Connection:
+        """project id 에 해당하는 shard 연결 (없는 project id 면 KeyError)."""
+        pid = int(project_id)
+        conn = self._connections.get(pid)
+        if conn is not None:
+            return conn
+        info = self.shard(pid)
+        if info is None:
+            raise KeyError(f"No shard registered for project id {pid}")
+        info.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = db.get_connection(info.path, self.profile)
+        db.init_db(conn)
+        self._connections[pid] = conn
+        return conn
+
+    def connection_for_issues(self, project_id: int, issue_ids: Iterable[int]) -> sqlite3.Connection:
+        """
+        project id 의 shard 연결을 반환하되, issue_ids 가 모두 그 shard 에서 그 프로젝트의 이슈인지 확인한다.
+        없는 id 나 다른 프로젝트의 id 가 있으면 ValueError (다른 shard 의 id 를 잘못 넘긴 경우).
+        """
+        pid = int(project_id)
+        conn = self.connection(pid)
+        ids = {int(i) for i in issue_ids if i not in (None, "")}
+        if not ids:
+            return conn
+        rows = db.get_issues_by_ids(conn, list(ids), columns=["project_id"])
+        foreign = sorted(i for i in ids if i not in rows or rows[i]["project_id"] != pid)
+        if foreign:
+            preview = ", ".join(str(i) for i in foreign[:10]) + (" ..." if len(foreign) > 10 else "")
+            raise ValueError(f"Issue id(s) not in project {pid}'s shard: {preview}")
+        return conn
+
+    def open_project(
+        self,
+        project_key: str,
+        project_id: int,
+        name: Optional[str] = None,
+        base_url: Optional[str] = None,
+    ) -> Tuple[sqlite3.Connection, db.Project]:
+        """project key 의 shard 연결과 Project 를 반환한다 (처음이면 shard 를 만든다)."""
+        info = self.register_project(project_key, project_id, name=name, base_url=base_url)
+        conn = self.connection(info.id)
+        project = db.get_or_create_project(conn, project_key=project_key, project_id=project_id, name=name, base_url=base_url)
+        return conn, project
+
+    def close(self) -> None:
+        for conn in self._connections.values():
+            conn.close()
+        self._connections.clear()
+        self.catalog.close()
+
+    # --- cross-project reports ---------------------------------------------------
+
+    def cross_project_query(
+        self,
+        select_sql: str,
+        params: Iterable[Any] = (),
+        project_ids: Optional[Iterable[int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        select_sql 을 각 shard 에 대해 실행한 결과를 합쳐서 반환한다.
+
+        select_sql 의 테이블은 "{schema}.issues" 처럼 {schema} 접두어를 붙여 쓴다.
+        shard 들은 별도의 보고서용 연결에 읽기 전용으로 ATTACH 되고 (SQLite ATTACH 한도만큼씩 묶어서),
+        각 결과 행에는 shard_project_id (로컬 project id) 가 추가된다.
+        """
+        wanted = None if project_ids is None else {int(p) for p in project_ids}
+        infos = [i for i in self.shards() if (wanted is None or i.id in wanted) and i.path.exists()]
+        params = list(params)
+        report = sqlite3.connect("file::memory:", uri=True)
+        report.row_factory = sqlite3.Row
+        rows: List[Dict[str, Any]] = []
+        try:
+            batch_size = max(report.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED), 1)
+            for start in range(0, len(infos), batch_size):
+                batch = infos[start:start + batch_size]
+                attached: List[str] = []
+                try:
+                    for info in batch:
+                        alias = f"shard_{info.id}"
+                        report.execute(f"ATTACH DATABASE ? AS {alias}", (info.path.resolve().as_uri() + "?mode=ro",))
+                        attached.append(alias)
+                    sql = " UNION ALL ".join(
+                        f"SELECT {info.id} AS shard_project_id, * FROM ({select_sql.format(schema=f'shard_{info.id}')})"
+                        for info in batch
+                    )
+                    rows.extend(dict(r) for r in report.execute(sql, params * len(batch)).fetchall())
+                finally:
+                    for alias in attached:
+                        report.execute(f"DETACH DATABASE {alias}")
+        finally:
+            report.close()
+        return rows
+
+
+# ShardedDB 가 shard 소속을 확인하는 issue id 인자
+_ISSUE_ID_PARAMS = ("issue_id", "issue_ids")
+
+
+class ShardedDB:
+    """
+    db.py 함수를 conn 인자 없이 호출하는 facade. project_id 로 연결을 고른다.
+
+    - router 가 있으면 project_id 의 shard 연결, 없으면 항상 conn 을 쓴다 (storage_mode = "single").
+    - db 함수에 project_id 인자가 있으면 그 값으로 고른다 (None 이면 ValueError).
+      없으면 project_id= 키워드를 추가로 받아 고르고, 그 키워드는 db 함수에 전달하지 않는다.
+    - router 가 있고 db 함수에 issue_id / issue_ids 인자가 있으면, 그 이슈가 그 프로젝트의 shard 에
+      있는지 확인한다 (connection_for_issues, 아니면 ValueError).
+    - 첫 인자가 conn 이 아닌 함수 (split_multi_value 등) 는 db 의 함수를 그대로 반환한다.
+    """
+
+    def __init__(self, router: Optional[ShardRouter] = None, conn: Optional[sqlite3.Connection] = None) -> None:
+        if (router is None) == (conn is None):
+            raise ValueError("exactly one of router or conn is required")
+        self.router = router
+        self.conn = conn
+        self._routed: Dict[str, Callable[..., Any]] = {}
+
+    def connection(self, project_id: Optional[int], issue_ids: Iterable[int] = ()) -> sqlite3.Connection:
+        """project_id 의 연결 (router 가 있으면 issue_ids 가 그 shard 의 이슈인지도 확인한다)."""
+        if self.router is None:
+            assert self.conn is not None
+            return self.conn
+        if project_id is None:
+            raise ValueError("project_id is required to pick a project shard")
+        issue_ids = list(issue_ids)
+        if issue_ids:
+            return self.router.connection_for_issues(project_id, issue_ids)
+        return self.router.connection(project_id)
+
+    def __getattr__(self, name: str) -> Any:
+        routed = self._routed.get(name)
+        if routed is not None:
+            return routed
+        func = getattr(db, name)
+        if not callable(func) or inspect.isclass(func):
+            return func
+        params = list(inspect.signature(func).parameters)
+        if not params or params[0] != "conn":
+            return func
+        sig = inspect.signature(func)
+        has_project_param = "project_id" in params
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            project_id = None if has_project_param else kwargs.pop("project_id", None)
+            bound = sig.bind_partial(None, *args, **kwargs).arguments
+            if has_project_param:
+                project_id = bound.get("project_id")
+            issue_ids: List[int] = []
+            for key in _ISSUE_ID_PARAMS:
+                value = bound.get(key)
+                if value is None:
+                    continue
+                issue_ids.extend(value if isinstance(value, (list, tuple, set, frozenset)) else [value])
+            conn = self.connection(project_id, issue_ids)
+            return func(conn, *args, **kwargs)
+
+        call.__name__ = name
+        call.__doc__ = func.__doc__
+        self._routed[name] = call
+        return call
+
+    def close(self) -> None:
+        if self.router is not None:
+            self.router.close()
+        elif self.conn is not None:
+            self.conn.close()
+
+
+# 프로젝트 / 이슈 타입별 이슈 수 (삭제되지 않은 것), 로컬 변경(dirty) 수
+_ISSUE_SUMMARY_SQL = (
+    "SELECT i.project_id AS project_id, p.project_key AS project_key, i.issue_type AS issue_type,"
+    " COUNT(*) AS issues, SUM(CASE WHEN i.dirty = 1 THEN 1 ELSE 0 END) AS dirty"
+    " FROM {schema}.issues i JOIN {schema}.projects p ON p.id = i.project_id"
+    " WHERE i.is_deleted = 0 GROUP BY i.project_id, i.issue_type"
+)
+
+
+def project_issue_summary(
+    conn: Optional[sqlite3.Connection] = None, router: Optional[ShardRouter] = None
+) -> List[Dict[str, Any]]:
+    """
+    프로젝트 / 이슈 타입별 이슈 수 보고서.
+    router 가 있으면 모든 shard 를 ATTACH 하여 조회하고, 없으면 단일 DB(conn)에서 조회한다.
+    """
+    if router is not None:
+        rows = router.cross_project_query(_ISSUE_SUMMARY_SQL)
+        for row in rows:
+            row.pop("shard_project_id", None)
+    elif conn is not None:
+        rows = [dict(r) for r in conn.execute(_ISSUE_SUMMARY_SQL.format(schema="main")).fetchall()]
+    else:
+        raise ValueError("conn or router is required")
+    rows.sort(key=lambda r: (str(r.get("project_key") or ""), str(r.get("issue_type") or "")))
+    return rows
+
+
+def split_database(
+    src_path: Path | str, router: Optional[ShardRouter] = None, pages_per_step: int = 1024
+) -> List[ShardInfo]:
+    """
+    단일 DB(src_path)의 프로젝트마다 shard 파일을 만든다. 원본 파일은 수정하지 않는다.
+
+    각 shard 는 원본을 backup API 로 통째로 복사한 뒤 다른 프로젝트의 행을 지우고(delete_project_data),
+    change_log 를 비운 다음 VACUUM 한다. 로컬 project id / issue id 는 원본 값을 유지한다.
+    이미 catalog 에 있는 프로젝트는 건너뛴다.
+    """
+    src_path = Path(src_path)
+    if router is None:
+        router = ShardRouter(src_path.parent)
+    src = db.get_connection(src_path, router.profile)
+    created: List[ShardInfo] = []
+    try:
+        db.init_db(src)
+        projects = [dict(r) for r in src.execute("SELECT id, project_key, project_id, name, base_url FROM projects ORDER BY id")]
+        for proj in projects:
+            if router.shard_for_key(proj["project_key"]) is not None:
+                continue
+            shard_path = router.base_dir / _shard_file_name(proj["project_key"])
+            if shard_path.exists():
+                raise FileExistsError(f"Shard file already exists but is not in the catalog: {shard_path}")
+            dst = sqlite3.connect(str(shard_path))
+            try:
+                src.backup(dst, pages=pages_per_step)
+            finally:
+                dst.close()
+
+            info = router.register_project(
+                proj["project_key"], proj["project_id"], name=proj["name"], base_url=proj["base_url"], local_id=proj["id"]
+            )
+            conn = router.connection(info.id)
+            for other in projects:
+                if other["id"] != proj["id"]:
+                    db.delete_project_data(conn, other["id"])
+            # 새 shard 에는 아직 change_log 소비자가 없다.
+            db.prune_change_log(conn, db.get_change_seq(conn))
+            conn.executescript("VACUUM;")
+            logger.info("Created shard %s for project %s", info.path, info.project_key)
+            created.append(info)
+    finally:
+        src.close()
+    return created
+
+
+def open_project_storage(
+    db_path: Path | str, profile: Optional[Dict[str, Any]] = None
+) -> Optional[ShardRouter]:
+    """
+    storage_mode 가 "per_project" 이면 db_path 디렉터리의 catalog 로 ShardRouter 를 열어 반환한다 ("single" 이면 None).
+    catalog 가 비어 있고 기존 단일 DB 가 있으면 먼저 split_database() 로 프로젝트별 파일을 만든다.
+    """
+    if get_storage_mode(profile) != STORAGE_PER_PROJECT:
+        return None
+    db_path = Path(db_path)
+    router = ShardRouter(db_path.parent, profile)
+    if not router.shards() and db_path.exists():
+        logger.info("Per-project storage enabled; splitting %s into project shards.", db_path)
+        split_database(db_path, router)
+    return router
+
+
+def open_project_db(db_path: Path | str, profile: Optional[Dict[str, Any]] = None) -> ShardedDB:
+    """
+    storage_mode 에 맞는 ShardedDB 를 연다.
+    "per_project" 면 open_project_storage() 의 ShardRouter, "single" 이면 db_path 연결 (init_db 포함) 을 쓴다.
+    """
+    router = open_project_storage(db_path, profile)
+    if router is not None:
+        return ShardedDB(router)
+    conn = db.get_connection(Path(db_path), profile)
+    db.init_db(conn)
+    return ShardedDB(conn=conn)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-project DB shards: split, list and cross-project report.")
+    parser.add_argument("--db", default=str(Path(__file__).resolve().parent.parent / "rtm_local.db"), help="single-file DB path")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("split", help="create one shard per project from the single-file DB")
+    sub.add_parser("list", help="list registered shards")
+    sub.add_parser("report", help="issue counts per project / issue type (ATTACH over all shards)")
+    args = parser.parse_args(argv)
+
+    router = ShardRouter(Path(args.db).parent)
+    try:
+        if args.command == "split":
+            if not Path(args.db).exists():
+                print(f"DB not found: {args.db}", file=sys.stderr)
+                return 1
+            for info in split_database(args.db, router):
+                print(f"created {info.path} ({info.project_key}, id={info.id})")
+        elif args.command == "list":
+            for info in router.shards():
+                print(f"{info.id:>6}  {info.project_key:<16} {info.path}")
+        else:
+            for row in project_issue_summary(router=router):
+                print(f"{row['project_key']:<16} {row['issue_type']:<16} {row['issues']:>8} {row['dirty']:>8}")
+    finally:
+        router.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+"""
+snapshots.py - Online snapshots of the local SQLite DB (sqlite3 backup API).
+
+역할:
+- 실행 중인 앱의 연결에서 sqlite3.Connection.backup() 으로 DB 를 페이지 묶음 단위로 복사한다.
+  (한 번에 pages_per_step 페이지씩 복사하고 잠금을 놓기 때문에 복사 중에도 앱을 계속 사용할 수 있다.)
+- 선택적으로 gzip 으로 압축한다 (<name>.db.gz).
+- 스냅샷을 현재 DB 로 복원한다 (역시 backup API 로 라이브 연결에 덮어쓴 뒤 migration 적용).
+- Full Sync / Excel import 직전에 자동 스냅샷을 남길 수 있다 (local_settings "snapshots" 섹션).
+
+첨부 파일(attachments 디렉터리)은 스냅샷에 포함되지 않는다.
+
+사용법 (rtm_local_manager 디렉터리에서):
+
+    python -m backend.snapshots create [--db rtm_local.db] [--label manual] [--compress]
+    python -m backend.snapshots list
+    python -m backend.snapshots restore <snapshot file> [--db rtm_local.db]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from . import db
+
+
+SNAPSHOT_PREFIX = "rtm_local"
+DEFAULT_PAGES_PER_STEP = 1024
+
+# rtm_local_20240101-120000_before-full-sync.db(.gz), 같은 초에 여러 개면 rtm_local_20240101-120000-2_...
+_SNAPSHOT_RE = re.compile(
+    rf"^{SNAPSHOT_PREFIX}_(?P<stamp>\d{{8}}-\d{{6}})(?:-(?P<seq>\d+))?_(?P<label>[\w.-]+?)\.db(?P<gz>\.gz)?$"
+)
+
+# progress(copied_pages, total_pages)
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass
+class SnapshotInfo:
+    path: Path
+    label: str
+    created_at: datetime
+    size: int
+    compressed: bool
+    # 같은 초에 만든 스냅샷 순번 (1 부터)
+    seq: int = 1
+    # create_snapshot() / restore_snapshot() 결과에서만 채워진다.
+    pages: int = 0
+    seconds: float = 0.0
+
+
+def load_snapshot_settings() -> Dict[str, Any]:
+    """local_settings.json 의 "snapshots" 섹션 (기본값과 병합됨)."""
+    from .local_settings import DEFAULT_LOCAL_SETTINGS, load_local_settings
+
+    cfg = dict(DEFAULT_LOCAL_SETTINGS["snapshots"])
+    user = load_local_settings().get("snapshots")
+    if isinstance(user, dict):
+        cfg.update(user)
+    return cfg
+
+
+def get_snapshots_root(settings: Optional[Dict[str, Any]] = None) -> Path:
+    """
+    스냅샷 저장 디렉터리. settings["root_dir"] 가 비어 있으면 <rtm_local_manager>/snapshots.
+    """
+    if settings is None:
+        settings = load_snapshot_settings()
+    root_dir = str(settings.get("root_dir") or "").strip()
+    root = Path(root_dir) if root_dir else Path(__file__).resolve().parent.parent / "snapshots"
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def _safe_label(label: str) -> str:
+    text = re.sub(r"[^\w.-]+", "-", (label or "").strip()).strip("-.")
+    return text or "manual"
+
+
+def _pages_per_step(value: Any) -> int:
+    try:
+        pages = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_PAGES_PER_STEP
+    # 0 이하이면 backup() 이 한 번에 전체를 복사하므로 최소 1 페이지로 둔다.
+    return max(pages, 1)
+
+
+def _parse_snapshot(path: Path) -> Optional[SnapshotInfo]:
+    m = _SNAPSHOT_RE.match(path.name)
+    if not m:
+        return None
+    try:
+        created = datetime.strptime(m.group("stamp"), "%Y%m%d-%H%M%S")
+        size = path.stat().st_size
+    except (ValueError, OSError):
+        return None
+    return SnapshotInfo(
+        path=path,
+        label=m.group("label"),
+        created_at=created,
+        size=size,
+        compressed=bool(m.group("gz")),
+        seq=int(m.group("seq") or 1),
+    )
+
+
+def list_snapshots(root: Optional[Path] = None, label: Optional[str] = None) -> List[SnapshotInfo]:
+    """스냅샷 목록 (최신순). label 을 주면 해당 label 만."""
+    if root is None:
+        root = get_snapshots_root()
+    items = [info for info in (_parse_snapshot(p) for p in Path(root).iterdir() if p.is_file()) if info]
+    if label is not None:
+        items = [info for info in items if info.label == _safe_label(label)]
+    items.sort(key=lambda info: (info.created_at, info.seq), reverse=True)
+    return items
+
+
+def prune_snapshots(root: Optional[Path], label: str, keep: int) -> List[Path]:
+    """같은 label 의 스냅샷을 최신 keep 개만 남기고 삭제한다. 삭제한 경로 목록을 반환한다."""
+    if keep <= 0:
+        return []
+    removed: List[Path] = []
+    for info in list_snapshots(root, label)[keep:]:
+        try:
+            info.path.unlink()
+            removed.append(info.path)
+        except OSError:
+            pass
+    return removed
+
+
+def _backup(
+    src: sqlite3.Connection,
+    dst: sqlite3.Connection,
+    pages_per_step: int,
+    sleep: float,
+    progress: Optional[ProgressCallback],
+) -> int:
+    """src → dst 페이지 묶음 복사. 복사한 전체 페이지 수를 반환한다."""
+    total_pages = 0
+
+    def _on_progress(status: int, remaining: int, total: int) -> None:
+        nonlocal total_pages
+        total_pages = total
+        if progress is not None:
+            progress(total - remaining, total)
+
+    src.backup(dst, pages=pages_per_step, progress=_on_progress, sleep=sleep)
+    return total_pages
+
+
+def create_snapshot(
+    conn: sqlite3.Connection,
+    root: Optional[Path] = None,
+    label: str = "manual",
+    compress: bool = False,
+    pages_per_step: int = DEFAULT_PAGES_PER_STEP,
+    sleep: float = 0.0,
+    progress: Optional[ProgressCallback] = None,
+) -> SnapshotInfo:
+    """
+    conn 의 main DB 를 root 아래 스냅샷 파일로 복사한다.
+
+    backup() 은 pages_per_step 페이지마다 잠금을 놓으므로, 복사 중 다른 연결의 쓰기도 가능하다.
+    (다른 연결이 쓰면 SQLite 가 복사를 처음부터 다시 시작하고, 같은 연결의 쓰기는 복사본에 반영된다.)
+    """
+    if root is None:
+        root = get_snapshots_root()
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+
+    label = _safe_label(label)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    base = root / f"{SNAPSHOT_PREFIX}_{stamp}_{label}.db"
+    final_path = base.with_name(base.name + ".gz") if compress else base
+    # 같은 초에 두 번 찍으면 시각 뒤에 순번을 붙인다.
+    n = 1
+    while final_path.exists():
+        n += 1
+        base = root / f"{SNAPSHOT_PREFIX}_{stamp}-{n}_{label}.db"
+        final_path = base.with_name(base.name + ".gz") if compress else base
+    partial = base.with_name(base.name + ".partial")
+
+    started = time.perf_counter()
+    dst = sqlite3.connect(str(partial))
+    try:
+        pages = _backup(conn, dst, _pages_per_step(pages_per_step), sleep, progress)
+        # 원본이 WAL 이면 헤더도 WAL 로 복사되므로, -wal/-shm 없이 단독으로 열 수 있는 파일로 바꾼다.
+        dst.execute("PRAGMA journal_mode = DELETE")
+    except Exception:
+        dst.close()
+        partial.unlink(missing_ok=True)
+        raise
+    dst.close()
+
+    try:
+        if compress:
+            with open(partial, "rb") as src_f, gzip.open(final_path, "wb", compresslevel=6) as dst_f:
+                shutil.copyfileobj(src_f, dst_f, 1024 * 1024)
+            partial.unlink()
+        else:
+            os.replace(partial, final_path)
+    except Exception:
+        partial.unlink(missing_ok=True)
+        final_path.unlink(missing_ok=True)
+        raise
+
+    info = _parse_snapshot(final_path)
+    if info is None:
+        # label 정규화 결과가 패턴과 다를 일은 없지만, 혹시 모를 경우에도 결과는 돌려준다.
+        info = SnapshotInfo(
+            path=final_path, label=label, created_at=datetime.now(), size=final_path.stat().st_size, compressed=compress
+        )
+    info.pages = pages
+    info.seconds = time.perf_counter() - started
+    return info
+
+
+def create_auto_snapshot(conn: sqlite3.Connection, reason: str) -> Optional[SnapshotInfo]:
+    """
+    Full Sync / Excel import 직전 자동 스냅샷. reason 은 "full_sync" 또는 "excel_import".
+    settings 에서 해당 자동 스냅샷이 꺼져 있으면 None 을 반환한다.
+    """
+    settings = load_snapshot_settings()
+    if not settings.get(f"auto_before_{reason}", False):
+        return None
+    root = get_snapshots_root(settings)
+    label = f"before-{reason.replace('_', '-')}"
+    info = create_snapshot(
+        conn,
+        root,
+        label=label,
+        compress=bool(settings.get("compress")),
+        pages_per_step=_pages_per_step(settings.get("pages_per_step")),
+    )
+    try:
+        keep = int(settings.get("keep_auto") or 0)
+    except (TypeError, ValueError):
+        keep = 0
+    prune_snapshots(root, label, keep)
+    return info
+
+
+def restore_snapshot(
+    conn: sqlite3.Connection,
+    snapshot_path: Path | str,
+    pages_per_step: int = DEFAULT_PAGES_PER_STEP,
+    progress: Optional[ProgressCallback] = None,
+) -> SnapshotInfo:
+    """
+    스냅샷 내용으로 conn 의 DB 를 덮어쓴다 (같은 파일을 연 다른 연결에도 즉시 반영된다).
+
+    - 복원 전에 스냅샷이 읽을 수 있는 RTM Local DB 인지 확인하고, 아니면 ValueError.
+    - 복원 후 migrate() 로 스냅샷의 스키마를 현재 버전으로 올린다.
+    - 트랜잭션 안에서는 호출할 수 없다.
+    """
+    if db.transaction_depth(conn) or conn.in_transaction:
+        raise RuntimeError("restore_snapshot() cannot run inside an open transaction")
+    snapshot_path = Path(snapshot_path)
+    if not snapshot_path.is_file():
+        raise FileNotFoundError(str(snapshot_path))
+
+    started = time.perf_counter()
+    compressed = snapshot_path.name.endswith(".gz")
+    tmp_path: Optional[Path] = None
+    if compressed:
+        tmp_path = snapshot_path.with_name(snapshot_path.name[: -len(".gz")] + ".restore")
+        with gzip.open(snapshot_path, "rb") as src_f, open(tmp_path, "wb") as dst_f:
+            shutil.copyfileobj(src_f, dst_f, 1024 * 1024)
+        source_path = tmp_path
+    else:
+        source_path = snapshot_path
+
+    try:
+        src = sqlite3.connect(f"{source_path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            try:
+                row = src.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'issues'").fetchone()
+            except sqlite3.DatabaseError as e:
+                raise ValueError(f"Not a valid snapshot: {e}") from e
+            if not row:
+                raise ValueError("Not a valid snapshot: issues table not found")
+            pages = _backup(src, conn, _pages_per_step(pages_per_step), 0.0, progress)
+        finally:
+            src.close()
+    finally:
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+
+    # 연결 단위 캐시는 복원 전 DB 기준이므로 버린다.
+    db.invalidate_folder_paths(conn)
+    db.migrate(conn)
+
+    info = _parse_snapshot(snapshot_path) or SnapshotInfo(
+        path=snapshot_path,
+        label="",
+        created_at=datetime.fromtimestamp(snapshot_path.stat().st_mtime),
+        size=snapshot_path.stat().st_size,
+        compressed=compressed,
+    )
+    info.pages = pages
+    info.seconds = time.perf_counter() - started
+    return info
+
+
+def _default_db_path() -> str:
+    return str(Path(__file__).resolve().parent.parent / "rtm_local.db")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Create, list and restore local DB snapshots.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_create = sub.add_parser("create", help="snapshot the DB")
+    p_create.add_argument("--db", default=_default_db_path(), help="SQLite DB path")
+    p_create.add_argument("--label", default="manual")
+    p_create.add_argument("--compress", action="store_true", help="gzip the snapshot")
+
+    sub.add_parser("list", help="list snapshots (newest first)")
+
+    p_restore = sub.add_parser("restore", help="overwrite the DB with a snapshot")
+    p_restore.add_argument("snapshot", help="snapshot file (.db or .db.gz)")
+    p_restore.add_argument("--db", default=_default_db_path(), help="SQLite DB path")
+
+    args = parser.parse_args(argv)
+    settings = load_snapshot_settings()
+    root = get_snapshots_root(settings)
+    pages = _pages_per_step(settings.get("pages_per_step"))
+
+    if args.command == "list":
+        for info in list_snapshots(root):
+            print(f"{info.created_at:%Y-%m-%d %H:%M:%S}  {info.label:<24} {info.size:>12,d}  {info.path.name}")
+        return 0
+
+    if args.command == "create" and not Path(args.db).exists():
+        print(f"DB not found: {args.db}", file=sys.stderr)
+        return 1
+    conn = db.get_connection(Path(args.db))
+    try:
+        if args.command == "create":
+            info = create_snapshot(conn, root, label=args.label, compress=args.compress, pages_per_step=pages)
+            print(f"Snapshot written: {info.path} ({info.size:,d} bytes, {info.pages} pages, {info.seconds:.2f}s)")
+        else:
+            info = restore_snapshot(conn, Path(args.snapshot), pages_per_step=pages)
+            print(f"Restored {info.path.name} into {args.db} ({info.pages} pages, {info.seconds:.2f}s)")
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
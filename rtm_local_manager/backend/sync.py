@@ -4,6 +4,7 @@ sync.py - Tree synchronization logic between JIRA RTM and local SQLite DB.
 
 Currently implements:
 - map_rtm_type_to_local
+- flatten_tree(tree)
 - sync_tree(project, client, conn)
 
 This is the "first milestone" for pulling RTM tree structure into local DB.
@@ -11,10 +12,18 @@ This is the "first milestone" for pulling RTM tree structure into local DB.
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from .db import upsert_folder, upsert_issue_from_tree, Project
+from .db import (
+    Project,
+    TreeIngestStats,
+    bulk_upsert_tree,
+    load_tree_ingest_state,
+    transaction,
+)
+from .http_policy import bulk_requests
 from .jira_api import JiraRTMClient
+from .logger import get_logger
 
 
 def map_rtm_type_to_local(node_type: str) -> str:
@@ -29,7 +38,59 @@ def map_rtm_type_to_local(node_type: str) -> str:
     return mapping.get(node_type.upper(), "UNKNOWN")
 
 
-def sync_tree(project: Project, client: JiraRTMClient, conn, tree_types: Optional[list[str]] = None) -> None:
+def _tree_roots(tree: Any) -> List[Dict[str, Any]]:
+    """RTM tree 응답에서 루트 노드 목록을 꺼낸다."""
+    # RTM tree root is usually a list of root nodes
+    if isinstance(tree, list):
+        return tree
+    if isinstance(tree, dict):
+        # some RTM versions may wrap it in an object
+        return tree.get("roots") or tree.get("children") or []
+    return []
+
+
+def flatten_tree(tree: Any) -> Tuple[List[tuple], List[tuple]]:
+    """
+    RTM tree 응답을 bulk_upsert_tree() 입력 형식의 행 묶음으로 평탄화한다.
+
+    Returns:
+        (folder_rows, issue_rows)
+        - folder_rows: (folder_id, parent_id, name, sort_order), 부모가 항상 자식보다 앞에 온다.
+        - issue_rows:  (jira_key, jira_id, issue_type, summary, folder_id)
+    """
+    folder_rows: List[tuple] = []
+    issue_rows: List[tuple] = []
+
+    # 깊은 트리에서도 재귀 한도에 걸리지 않도록 명시적 스택으로 전위 순회한다.
+    stack: List[Tuple[Dict[str, Any], Optional[str], int]] = [
+        (root, None, idx) for idx, root in reversed(list(enumerate(_tree_roots(tree))))
+    ]
+    while stack:
+        node, parent_folder_id, order = stack.pop()
+        node_type = node.get("type")
+        node_id = node.get("id")
+        name = node.get("name") or node.get("summary") or node.get("key") or ""
+
+        if node_type == "FOLDER":
+            folder_rows.append((node_id, parent_folder_id, name, order))
+            children = node.get("children", []) or []
+            for idx in range(len(children) - 1, -1, -1):
+                stack.append((children[idx], node_id, idx))
+        else:
+            issue_type = map_rtm_type_to_local(node_type or "")
+            jira_key = node.get("jiraKey") or node.get("key")
+            jira_id = node.get("jiraId")
+            issue_rows.append((jira_key, jira_id, issue_type, name, parent_folder_id))
+
+    return folder_rows, issue_rows
+
+
+def sync_tree(
+    project: Project,
+    client: JiraRTMClient,
+    conn,
+    tree_types: Optional[list[str]] = None,
+) -> Dict[str, TreeIngestStats]:
     """
     Download RTM tree for the given project and store it in local DB.
 
@@ -38,55 +99,43 @@ def sync_tree(project: Project, client: JiraRTMClient, conn, tree_types: Optiona
       5개 treeType 에 대해 순차적으로 트리를 조회하여 병합 저장한다.
     - 이 함수는 폴더 + 최소한의 이슈 레코드만 보장하며,
       상세 필드(status, description, steps 등)는 별도 동기화 단계에서 채운다.
+    - 노드마다 upsert/commit 하지 않고, treeType 별로 트리를 평탄화한 뒤
+      bulk_upsert_tree() 로 기록한다. 기존 행 맵은 처음에 한 번만 읽는다.
+    - 모든 treeType 을 먼저 내려받은 뒤 한 트랜잭션으로 기록하므로, 도중에 실패하면
+      로컬 DB 는 동기화 이전 상태로 남는다 (네트워크 대기 중에는 쓰기 잠금을 잡지 않는다).
 
     :param tree_types: 사용할 RTM treeType 목록.
                        None 이면 ["requirements", "test-cases", "test-plans",
                                  "test-executions", "defects"] 를 기본값으로 사용한다.
+    :return: treeType -> TreeIngestStats (삽입/갱신/변경없음 건수)
     """
     if tree_types is None:
         tree_types = ["requirements", "test-cases", "test-plans", "test-executions", "defects"]
 
-    def process_node(node: Dict[str, Any], parent_folder_id: Optional[str] = None, order: int = 0) -> None:
-        node_type = node.get("type")
-        node_id = node.get("id")
-        name = node.get("name") or node.get("summary") or node.get("key") or ""
-
-        if node_type == "FOLDER":
-            upsert_folder(
-                conn=conn,
-                project_id=project.id,
-                folder_id=node_id,
-                name=name,
-                node_type="FOLDER",
-                parent_id=parent_folder_id,
-                sort_order=order,
-            )
-            for idx, child in enumerate(node.get("children", [])):
-                process_node(child, parent_folder_id=node_id, order=idx)
-        else:
-            issue_type = map_rtm_type_to_local(node_type or "")
-            jira_key = node.get("jiraKey") or node.get("key")
-            jira_id = node.get("jiraId")
-
-            upsert_issue_from_tree(
-                conn=conn,
-                project_id=project.id,
-                jira_key=jira_key,
-                jira_id=jira_id,
-                issue_type=issue_type,
-                summary=name,
-                folder_id=parent_folder_id,
+    logger = get_logger(__name__)
+    state = load_tree_ingest_state(conn, project.id)
+    results: Dict[str, TreeIngestStats] = {}
+
+    flattened = []
+    # 트리 동기화는 배치 작업이므로 bulk 재시도 설정(Retry-After 를 길게 기다림)을 쓴다.
+    with bulk_requests():
+        for tt in tree_types:
+            tree = client.get_tree(tree_type=tt)
+            flattened.append((tt, flatten_tree(tree)))
+
+    with transaction(conn):
+        for tt, (folder_rows, issue_rows) in flattened:
+            stats = bulk_upsert_tree(conn, project.id, folder_rows, issue_rows, state=state)
+            results[tt] = stats
+            logger.info(
+                "sync_tree %s: folders +%d ~%d =%d, issues +%d ~%d =%d",
+                tt,
+                stats.folders_inserted,
+                stats.folders_updated,
+                stats.folders_unchanged,
+                stats.issues_inserted,
+                stats.issues_updated,
+                stats.issues_unchanged,
             )
 
-    for tt in tree_types:
-        tree = client.get_tree(tree_type=tt)
-
-        # RTM tree root is usually a list of root nodes
-        if isinstance(tree, list):
-            for idx, root in enumerate(tree):
-                process_node(root, parent_folder_id=None, order=idx)
-        elif isinstance(tree, dict):
-            # some RTM versions may wrap it in an object
-            roots = tree.get("roots") or tree.get("children") or []
-            for idx, root in enumerate(roots):
-                process_node(root, parent_folder_id=None, order=idx)
+    return results
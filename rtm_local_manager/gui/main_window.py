@@ -11,9 +11,11 @@ This file provides:
 
 from __future__ import annotations
 
+import os
 import sys
 import json
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Optional, Tuple
 
 
 
@@ -49,6 +51,7 @@ from PySide6.QtWidgets import (
     QComboBox,
     QFormLayout,
     QInputDialog,
+    QProgressDialog,
     QToolButton,
 )
 
@@ -56,12 +59,16 @@ from PySide6.QtWidgets import (
 
 from backend.db import (
     get_connection,
+    get_readonly_connection,
     init_db,
     get_or_create_project,
-    fetch_folder_tree,
+    fetch_folder_children,
+    get_folder_ancestor_ids,
     Project,
     get_issue_by_id,
     get_issue_by_jira_key,
+    get_issues_by_ids,
+    get_issues_by_jira_keys,
     update_issue_fields,
     get_steps_for_issue,
     replace_steps_for_issue,
@@ -82,8 +89,31 @@ from backend.db import (
     delete_folder_if_empty,
     move_issue_to_folder,
     move_folder,
+    get_project_folder_paths,
+    get_change_seq,
+    get_changes_since,
+    change_log_covers,
+    advance_change_consumer,
+    remove_change_consumer,
+    prune_consumed_changes,
+    search_local,
+    transaction,
+    find_issue_ids_by_dimension,
+    get_issue_attachments,
+    get_issue_attachments_json,
+    add_issue_attachment,
+    delete_issue_attachment,
+    count_attachment_path_references,
+    get_issue_activity_text,
+    add_issue_activity,
+    set_issue_activity_text,
+    clear_issue_activity,
+    get_pending_fields,
+    clear_pending_changes,
+    PENDING_ALL,
+    PENDING_COLLECTIONS,
 )
-from backend import jira_mapping, excel_io
+from backend import jira_mapping, excel_io, maintenance, snapshots, shards
 from backend.field_presets import load_presets, save_presets
 from backend.local_settings import load_local_settings, save_local_settings
 from backend.excel_mapping import load_mapping as load_excel_mapping, save_mapping as save_excel_mapping
@@ -93,9 +123,11 @@ from backend.jira_api import (
     save_config_to_file,
     JiraRTMClient,
     JiraConfig,
+    HttpSettings,
     DEFAULT_ENDPOINTS,
     DEFAULT_ENDPOINT_PARAMS,
 )
+from backend.endpoint_cache import EndpointCache, endpoint_cache_path
 from backend.logger import get_logger
 from backend.sync import sync_tree, map_rtm_type_to_local
 
@@ -711,7 +743,10 @@ class IssueTabWidget(QTabWidget):
             self.steps_table.insertRow(row)
             group_val = str(s.get("group_no", 1))
             order_val = str(s.get("order_no", 1))
-            self.steps_table.setItem(row, 0, QTableWidgetItem(group_val))
+            group_item = QTableWidgetItem(group_val)
+            # testcase_steps.id 를 보관해 두었다가 저장 시 같은 step 행(id)을 유지한다.
+            group_item.setData(Qt.UserRole, s.get("id"))
+            self.steps_table.setItem(row, 0, group_item)
             self.steps_table.setItem(row, 1, QTableWidgetItem(order_val))
             self.steps_table.setItem(row, 2, QTableWidgetItem(s.get("action") or ""))
             self.steps_table.setItem(row, 3, QTableWidgetItem(s.get("input") or ""))
@@ -739,6 +774,7 @@ class IssueTabWidget(QTabWidget):
                 order_no = 1
             steps.append(
                 {
+                    "id": group_item.data(Qt.UserRole) if group_item else None,
                     "group_no": group_no,
                     "order_no": order_no,
                     "action": action_item.text().strip() if action_item else "",
@@ -2343,6 +2379,8 @@ class IssueTabWidget(QTabWidget):
             # 생성된 jira_key 를 로컬 DB 에 업데이트
             try:
                 update_issue_fields(main_win.conn, new_issue_id, {"jira_key": defect_key})
+                # 생성 payload 로 이슈 전체를 보냈으므로 create_local_issue() 가 남긴 pending('*') 을 지운다.
+                clear_pending_changes(main_win.conn, new_issue_id)
             except Exception as e_upd:
                 print(f"[WARN] Failed to update local DEFECT jira_key: {e_upd}")
 
@@ -2757,14 +2795,18 @@ class IssueTabWidget(QTabWidget):
                     tce_json = main_win.jira_client.get_testexecution_testcases(te_key)
                     tce_items = jira_mapping.map_jira_testexecution_testcases_to_local(tce_json)
                     if tce_items:
-                        from backend.db import get_issue_by_jira_key
-
+                        tc_issues = get_issues_by_jira_keys(
+                            main_win.conn,
+                            main_win.project.id,
+                            [item.get("testcase_key") for item in tce_items],
+                            columns=["id"],
+                        )
                         tce_records: list[Dict[str, Any]] = []
                         for item in tce_items:
                             tc_key = item.get("testcase_key")
                             if not tc_key:
                                 continue
-                            tc_issue = get_issue_by_jira_key(main_win.conn, main_win.project.id, tc_key)
+                            tc_issue = tc_issues.get(tc_key)
                             if not tc_issue:
                                 continue
                             tce_records.append(
@@ -3689,6 +3731,8 @@ class MainWindow(QMainWindow):
 
         # 설정 파일 경로를 보관하여 Settings 다이얼로그에서 사용
         self.config_path = config_path
+        # 엔드포인트 후보 중 성공한 path 기억 (jira_config.json 옆 jira_endpoint_cache.json, 모든 클라이언트가 공유)
+        self.endpoint_cache = EndpointCache(endpoint_cache_path(config_path))
 
         self.logger.info(
             "MainWindow init: db_path=%s, config_path=%s, mode=%s",
@@ -3705,14 +3749,27 @@ class MainWindow(QMainWindow):
         self.resize(1600, 900)
 
         # DB, Jira client 초기화
-        self.conn = get_connection(db_path)
-        init_db(self.conn)
+        # (조회 전용 작업은 get_readonly_connection(self.db_path) 로 별도 연결을 열어 사용)
+        self.db_path = db_path
+        # storage_mode = "per_project" 이면 프로젝트별 DB 를 쓰고, self.conn 은 프로젝트가 정해질 때
+        # (_open_project) 그 프로젝트의 shard 연결로 설정된다.
+        self.shard_router = shards.open_project_storage(db_path)
+        self.conn = None
+        if self.shard_router is None:
+            self.conn = get_connection(db_path)
+            init_db(self.conn)
+        # reload_local_tree() 가 change_log 를 보고 DB 재조회를 건너뛰기 위한 캐시
+        self._local_tree_cache: Optional[Dict[str, Any]] = None
+        # 로컬 트리 지연 로딩: 펼쳐 둔 폴더 id (reload 후 다시 펼침), 마지막으로 트리를 그린 프로젝트
+        self._expanded_local_folders: set = set()
+        self._local_tree_project_id: Optional[int] = None
+        # change_log 소비자 이름 (이 창이 처리한 seq 까지만 prune 된다)
+        self._change_consumer = f"local_tree:{os.getpid()}"
 
         try:
             self.jira_config = load_config_from_file(config_path)
             # 프로젝트 레코드는 JIRA 사용 여부와 무관하게 생성/로드한다.
-            self.project = get_or_create_project(
-                self.conn,
+            self.project = self._open_project(
                 project_key=self.jira_config.project_key,
                 project_id=self.jira_config.project_id,
                 name=self.jira_config.project_key,
@@ -3729,13 +3786,12 @@ class MainWindow(QMainWindow):
                     "'https://your-jira-server.example.com'; JIRA integration disabled."
                 )
             else:
-                self.jira_client = JiraRTMClient(self.jira_config)
+                self.jira_client = JiraRTMClient(self.jira_config, endpoint_cache=self.endpoint_cache)
                 self.jira_available = True
         except Exception as e:
             # 설정 파일이 없거나 잘못된 경우: 오프라인 전용(Local Only) 프로젝트로 시작
             self.jira_config = None
-            self.project = get_or_create_project(
-                self.conn,
+            self.project = self._open_project(
                 project_key="LOCAL",
                 project_id=0,
                 name="Local Only",
@@ -3853,9 +3909,17 @@ class MainWindow(QMainWindow):
         gj.addLayout(row_jira_issue)
 
         row_jira_search = QHBoxLayout()
+        # 검색 범위: Local = 로컬 DB 전문 검색(오프라인), JIRA = JQL 서버 검색
+        # 기본값은 기존 동작(JIRA)이고, 사용자가 바꾼 범위는 local_settings "search" 에 저장된다.
+        self.cmb_search_scope = QComboBox()
+        self.cmb_search_scope.addItems(["Local", "JIRA"])
+        self.cmb_search_scope.setToolTip("Local: full-text search in the local DB (offline)\nJIRA: JQL search on the server")
         self.jira_filter_edit = QLineEdit()
-        self.jira_filter_edit.setPlaceholderText("JQL or JIRA key (e.g. project = KVHSICCU)")
+        saved_scope = (self.local_settings.get("search") or {}).get("scope")
+        self.cmb_search_scope.setCurrentText(saved_scope if saved_scope in ("Local", "JIRA") else "JIRA")
+        self._update_search_placeholder(self.cmb_search_scope.currentText())
         self.btn_ribbon_search_jira = QPushButton("Search")
+        row_jira_search.addWidget(self.cmb_search_scope)
         row_jira_search.addWidget(self.jira_filter_edit)
         row_jira_search.addWidget(self.btn_ribbon_search_jira)
         gj.addLayout(row_jira_search)
@@ -4269,6 +4333,16 @@ class MainWindow(QMainWindow):
 
         dlg.exec()
 
+    def on_reset_learned_endpoints_clicked(self) -> None:
+        """
+        Settings > Reset Learned Endpoints :
+        - 엔드포인트 후보(';' 로 나열된 path) 중 성공해서 기억해 둔 path 를 모두 지운다.
+        - JIRA / RTM 서버 업그레이드 후, 다음 요청부터 설정 순서대로 다시 시도하게 한다.
+        """
+        removed = self.endpoint_cache.clear()
+        self.logger.info("Reset learned endpoints: %d entr(ies) removed", removed)
+        self.status_bar.showMessage(f"기억된 엔드포인트 {removed}개를 초기화했습니다.", 5000)
+
     def on_edit_api_endpoints_clicked(self) -> None:
         """
         Settings > REST API Endpoint Settings... :
@@ -4493,22 +4567,25 @@ class MainWindow(QMainWindow):
                     "Username 과 API Token/Password 를 모두 입력하세요.",
                 )
                 return None
+            # http(연결 풀 / timeout) 설정은 이 다이얼로그에서 편집하지 않으므로 기존 값을 유지한다.
+            previous = getattr(self, "jira_config", None)
             return JiraConfig(
                 base_url=base_url,
                 username=username,
                 api_token=token,
                 project_key=project_key,
                 project_id=project_id_val,
+                http=previous.http if isinstance(previous, JiraConfig) else HttpSettings(),
             )
 
         def on_test_clicked() -> None:
             cfg_obj = build_config_from_inputs()
             if cfg_obj is None:
                 return
-            client = JiraRTMClient(cfg_obj)
             try:
-                # 간단한 메타데이터 호출로 연결 확인
-                client.get_priorities()
+                # 간단한 메타데이터 호출로 연결 확인 (임시 클라이언트의 Session 은 바로 닫는다)
+                with JiraRTMClient(cfg_obj, endpoint_cache=self.endpoint_cache) as client:
+                    client.get_priorities()
                 QMessageBox.information(
                     dlg,
                     "Test Connection",
@@ -4538,19 +4615,25 @@ class MainWindow(QMainWindow):
             # 저장이 성공했으면 메모리 상의 설정과 Jira 클라이언트도 갱신
             self.jira_config = cfg_obj
             try:
-                self.project = get_or_create_project(
-                    self.conn,
+                previous_conn = self.conn
+                self.project = self._open_project(
                     project_key=cfg_obj.project_key,
                     project_id=cfg_obj.project_id,
                     name=cfg_obj.project_key,
                     base_url=cfg_obj.base_url,
                 )
+                # 프로젝트별 저장 방식에서 프로젝트가 바뀌면 다른 DB 파일을 보게 되므로 트리를 다시 그린다.
+                if self.conn is not previous_conn:
+                    self.reload_local_tree()
             except Exception:
                 # project 초기화 실패는 치명적이지 않으므로 로그만 남기고 진행
                 self.logger.exception("Failed to update local project info from API settings.")
 
+            # 이전 클라이언트의 keep-alive 연결을 정리한다.
+            if self.jira_client is not None:
+                self.jira_client.close()
             try:
-                self.jira_client = JiraRTMClient(cfg_obj)
+                self.jira_client = JiraRTMClient(cfg_obj, endpoint_cache=self.endpoint_cache)
                 self.jira_available = True
             except Exception:
                 self.jira_client = None
@@ -5265,6 +5348,119 @@ class MainWindow(QMainWindow):
                 # 온라인 트리 로딩 실패는 치명적이지 않으므로 무시
                 pass
 
+    def _update_search_placeholder(self, scope: str) -> None:
+        if scope == "JIRA":
+            self.jira_filter_edit.setPlaceholderText("JQL or JIRA key (e.g. project = KVHSICCU)")
+        else:
+            self.jira_filter_edit.setPlaceholderText("Search text, label:X component:X fix:X affects:X (local)")
+
+    def _on_search_scope_changed(self, scope: str) -> None:
+        self._update_search_placeholder(scope)
+        # 다음 실행에도 같은 범위로 시작하도록 저장한다.
+        self.local_settings.setdefault("search", {})["scope"] = scope
+        try:
+            save_local_settings(self.local_settings)
+        except Exception:
+            self.logger.warning("Failed to save search scope", exc_info=True)
+
+    def on_filter_search(self) -> None:
+        """검색창 입력을 선택된 범위(Local / JIRA)에 따라 로컬 전문 검색 또는 JQL 검색으로 보낸다."""
+        if self.cmb_search_scope.currentText() == "JIRA":
+            self.on_jira_filter_search()
+        else:
+            self.on_local_search()
+
+    def on_local_search(self) -> None:
+        """
+        검색창 문자열로 로컬 DB 전문 검색(search_local)을 수행하여
+        왼쪽(Local) 패널 트리에 관련도 순 결과 목록을 표시한다.
+        현재 모듈 탭 타입의 이슈만 검색하며, 검색어를 비우면 원래 폴더 트리로 돌아간다.
+        label: / component: / fix: / affects: 접두어가 붙은 단어는 해당 값으로 필터링한다.
+        """
+        if not self.project:
+            return
+
+        text = self.jira_filter_edit.text().strip()
+        if not text:
+            self.reload_local_tree()
+            return
+
+        type_filter = self.local_issue_type_filter
+        started = time.perf_counter()
+
+        # "label:smoke component:UI fix:1.0 affects:0.9" 형태의 차원 필터는 junction 테이블 인덱스로 거른다.
+        dimension_prefixes = {
+            "label": "labels",
+            "component": "components",
+            "fix": "fix_versions",
+            "affects": "affects_versions",
+        }
+        words: List[str] = []
+        dimension_filters: List[Tuple[str, str]] = []
+        for word in text.split():
+            prefix, sep, value = word.partition(":")
+            dimension = dimension_prefixes.get(prefix.lower()) if sep else None
+            if dimension and value:
+                dimension_filters.append((dimension, value))
+            else:
+                words.append(word)
+
+        if words:
+            # 차원 필터는 search_local 의 SQL 에서 limit 전에 적용한다 (limit 후에 거르면 일치 결과가 빠진다).
+            results = search_local(
+                self.conn,
+                self.project.id,
+                " ".join(words),
+                types=[type_filter] if type_filter else None,
+                limit=500,
+                dimension_filters=dimension_filters,
+            )
+        else:
+            dimension_ids: Optional[set] = None
+            for dimension, value in dimension_filters:
+                ids = set(find_issue_ids_by_dimension(self.conn, self.project.id, dimension, value, type_filter))
+                dimension_ids = ids if dimension_ids is None else dimension_ids & ids
+            found = get_issues_by_ids(
+                self.conn, sorted(dimension_ids or [])[:500], columns=["jira_key", "issue_type", "summary"]
+            )
+            results = list(found.values())
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        model = QStandardItemModel()
+        model.setHorizontalHeaderLabels(["Local Search Results"])
+        root_item = model.invisibleRootItem()
+        issue_icon = self.left_panel.style().standardIcon(QStyle.SP_FileIcon)
+
+        for row in results:
+            jira_key = row.get("jira_key") or ""
+            summary = row.get("summary") or ""
+            label = f"{jira_key} - {summary}" if jira_key else (summary or f"ISSUE {row.get('id')}")
+            item = QStandardItem(label)
+            item.setIcon(issue_icon)
+            item.setEditable(False)
+            # 로컬 트리 이슈 노드와 동일 규약 (선택 시 Details 탭 로드)
+            item.setData("ISSUE", Qt.UserRole)
+            item.setData(row.get("id"), Qt.UserRole + 1)
+            item.setData(jira_key, Qt.UserRole + 2)
+            item.setData(row.get("issue_type") or "", Qt.UserRole + 3)
+            item.setToolTip(row.get("snippet") or summary)
+            root_item.appendRow(item)
+
+        self.left_panel.tree_view.setModel(model)
+        self.left_panel.tree_view.setSelectionMode(QTreeView.ExtendedSelection)
+        try:
+            self.left_panel.tree_view.selectionModel().selectionChanged.connect(
+                self.on_local_tree_selection_changed
+            )
+        except Exception:
+            pass
+
+        if results:
+            self.left_panel.tree_view.setCurrentIndex(model.index(0, 0))
+        self.status_bar.showMessage(
+            f"Local search finished: {len(results)} issue(s) found in {elapsed_ms:.1f} ms."
+        )
+
     def on_jira_filter_search(self) -> None:
         """
         리본 메뉴 우측 JIRA 필터 입력창에서 엔터를 치면,
@@ -5327,27 +5523,76 @@ class MainWindow(QMainWindow):
 
     # --------------------------------------------------------------------- Tree + selection handling
 
-    def reload_local_tree(self):
-        """
-        현재 project 의 folders/issues 를 SQLite 에서 읽어와
-        왼쪽(Local) 패널의 QTreeView 에 바인딩한다.
-        """
-        if not self.project:
-            return
+    # 트리 표시에 영향을 주는 컬럼 (이 외의 컬럼만 바뀐 UPDATE 는 트리를 다시 읽을 필요가 없다)
+    _TREE_COLUMNS = {
+        "folders": {"project_id", "parent_id", "name", "node_type", "sort_order"},
+        "issues": {"project_id", "folder_id", "summary", "jira_key", "issue_type", "dirty", "is_deleted"},
+    }
 
-        tree_data = fetch_folder_tree(self.conn, self.project.id)
+    # _cached_local_tree(): change_log 를 이 개수씩 나눠 읽는다
+    _CHANGE_BATCH = 500
 
-        type_filter = self.local_issue_type_filter
+    # 아직 읽지 않은 폴더 자식 자리 (펼치기 화살표 표시용, Qt.UserRole 값)
+    _TREE_PLACEHOLDER = "PLACEHOLDER"
 
-        model = QStandardItemModel()
-        model.setHorizontalHeaderLabels(["Name"])
+    def _cached_local_tree(self, type_filter):
+        """
+        마지막 reload_local_tree() 이후 change_log 에 트리 관련 변경이 없으면
+        캐시(이미 읽은 폴더 단계들과 folder_paths)를, 있으면 None 을 반환한다.
+        """
+        cache = self._local_tree_cache
+        if not cache or cache["key"] != (self.project.id, type_filter):
+            return None
+        # 캐시 이후 변경이 prune 되었으면 무엇이 바뀌었는지 알 수 없으므로 다시 읽는다.
+        if not change_log_covers(self.conn, cache["seq"]):
+            return None
+        # seq 가 캐시보다 작아졌으면 (스냅샷 복원 등으로 change_log 가 되돌아감) 캐시는 다른 DB 상태의 것이다.
+        if get_change_seq(self.conn) < cache["seq"]:
+            return None
+        # 한 번에 읽는 양을 제한한다 (대량 import 직후에도 메모리에 전부 올리지 않는다).
+        while True:
+            changes = get_changes_since(
+                self.conn, cache["seq"], entities=["folders", "issues"], limit=self._CHANGE_BATCH
+            )
+            for change in changes:
+                if change["op"] != "UPDATE":
+                    return None
+                if self._TREE_COLUMNS[change["entity"]].intersection(change["columns"]):
+                    return None
+            if changes:
+                cache["seq"] = changes[-1]["seq"]
+            if len(changes) < self._CHANGE_BATCH:
+                break
+        self._advance_change_consumer(cache["seq"])
+        return cache
 
-        root_item = model.invisibleRootItem()
+    def _advance_change_consumer(self, seq: int) -> None:
+        """이 창이 seq 까지 처리했음을 기록하고, 모든 소비자가 처리한 change_log 행을 지운다."""
+        try:
+            advance_change_consumer(self.conn, self._change_consumer, seq)
+            prune_consumed_changes(self.conn)
+        except Exception:
+            # 정리 실패는 트리 표시를 막지 않는다 (다음 reload 에서 다시 시도).
+            self.logger.warning("Failed to prune change_log", exc_info=True)
+
+    def _local_tree_level(self, parent_id: Optional[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        로컬 트리의 한 단계(parent_id 바로 아래 폴더/이슈, fetch_folder_children 결과).
+        reload_local_tree() 가 준비한 캐시에 있으면 그대로 쓰고, 없으면 읽어서 캐시에 넣는다.
+        """
+        cache = self._local_tree_cache
+        levels = cache["levels"] if cache else {}
+        level = levels.get(parent_id)
+        if level is None:
+            level = fetch_folder_children(
+                self.conn, self.project.id, parent_id, issue_type=self.local_issue_type_filter
+            )
+            levels[parent_id] = level
+        return level
 
-        # 아이콘 준비: 폴더 / 이슈 (이슈 타입별로 다른 아이콘 사용)
+    def _local_tree_icons(self) -> Tuple[Any, Any, Dict[str, Any]]:
+        """(폴더 아이콘, 기본 이슈 아이콘, 이슈 타입별 아이콘)"""
         style = self.left_panel.style()
-        folder_icon = style.standardIcon(QStyle.SP_DirIcon)
-        default_issue_icon = style.standardIcon(QStyle.SP_FileIcon)
         issue_icon_map = {
             "REQUIREMENT": style.standardIcon(QStyle.SP_FileDialogEnd),
             "TEST_CASE": style.standardIcon(QStyle.SP_FileDialogDetailedView),
@@ -5355,101 +5600,196 @@ class MainWindow(QMainWindow):
             "TEST_EXECUTION": style.standardIcon(QStyle.SP_CommandLink),
             "DEFECT": style.standardIcon(QStyle.SP_MessageBoxWarning),
         }
+        return style.standardIcon(QStyle.SP_DirIcon), style.standardIcon(QStyle.SP_FileIcon), issue_icon_map
 
-        def add_node(parent_item: QStandardItem, node: Dict[str, Any]) -> bool:
-            """
-            현재 이슈 타입 필터에 맞는 이슈가 하나도 없는 폴더 서브트리는 숨기고,
-            각 이슈 타입 탭마다 '자신에게 해당하는' 폴더 트리만 보이도록 구성한다.
-
-            RETURNS: 이 노드(폴더/이슈)가 실제로 트리에 추가되었는지 여부.
-            """
-            node_type = node.get("node_type") or "FOLDER"
-
-            # 이슈 노드
-            if node_type == "ISSUE":
-                issue_type = (node.get("issue_type") or "").upper()
-                if type_filter and issue_type != type_filter:
-                    return False
+    def _local_folder_issue_count(self, folder: Dict[str, Any]) -> Optional[int]:
+        """
+        현재 이슈 타입 탭에서 폴더를 표시할지 판단한다.
+        표시하지 않으면 None, 표시하면 하위 트리 전체의 현재 타입 이슈 수를 반환한다.
 
-                jira_key = node.get("jira_key") or ""
-                label = node.get("summary") or jira_key or f"ISSUE {node.get('id')}"
-                item = QStandardItem(label)
-                icon = issue_icon_map.get(issue_type, default_issue_icon)
-                item.setIcon(icon)
-                item.setEditable(False)
-                item.setData("ISSUE", Qt.UserRole)
-                item.setData(node.get("id"), Qt.UserRole + 1)
-                item.setData(jira_key, Qt.UserRole + 2)
-                item.setData(node.get("issue_type") or "", Qt.UserRole + 3)
-
-                # 트리에서 로컬 전용 / JIRA 연동 / 편집 중(unsaved) 이슈 구분:
-                # - jira_key 없음: 로컬 전용 → 녹색 텍스트
-                # - jira_key 있음: JIRA/RTM 연동 이슈 → 기본색
-                # - dirty_issue_ids 에 포함된 이슈 → 주황색 텍스트로 "편집됨" 표시
-                issue_id_val = int(node.get("id")) if node.get("id") is not None else None
-                is_dirty = issue_id_val is not None and issue_id_val in getattr(self, "dirty_issue_ids", set())
-                if is_dirty:
-                    item.setForeground(QColor("#CC6600"))  # Unsaved edits
-                    base_tip = (
-                        "Local only issue (no JIRA key)"
-                        if not jira_key
-                        else f"Linked to JIRA/RTM issue: {jira_key}"
-                    )
-                    item.setToolTip(base_tip + "\n(Unsaved local changes)")
-                else:
-                    if not jira_key:
-                        item.setForeground(QColor("#007700"))  # Local only
-                        item.setToolTip("Local only issue (no JIRA key)")
-                    else:
-                        # 기본 색으로 두고, Jira Key 정보만 툴팁에 표시
-                        item.setToolTip(f"Linked to JIRA/RTM issue: {jira_key}")
-
-                parent_item.appendRow(item)
-                return True
+        - 사용자가 로컬에서 생성한 폴더(LOCAL-<TYPE>-<uuid>)는 자신의 타입 탭에서만, 비어 있어도 표시한다.
+          구버전(타입 정보 없는 LOCAL-xxxx)은 어떤 탭에도 표시하지 않는다.
+        - RTM 에서 내려온 폴더는 하위 트리에 현재 타입 이슈도, 현재 탭에 보이는 LOCAL 하위 폴더
+          (local_types) 도 없으면 숨긴다.
+        """
+        type_filter = self.local_issue_type_filter
+        counts = folder.get("counts") or {}
+        count = counts.get(type_filter, 0) if type_filter else sum(counts.values())
+        folder_id = str(folder.get("id") or "")
+        if folder_id.startswith("LOCAL-"):
+            parts = folder_id.split("-", 2)
+            local_type = parts[1].upper() if len(parts) >= 3 else ""
+            if not local_type or (type_filter and local_type != type_filter):
+                return None
+            return count
+        if count > 0:
+            return count
+        local_types = folder.get("local_types") or set()
+        if (type_filter in local_types) if type_filter else local_types:
+            return count
+        return None
+
+    def _append_local_tree_level(self, parent_item: QStandardItem, parent_id: Optional[str]) -> None:
+        """
+        parent_id 바로 아래 폴더/이슈를 parent_item 에 추가한다.
+        폴더는 펼칠 때(on_local_tree_expanded) 자식을 읽도록 자리표시 행 하나만 둔다.
+        """
+        level = self._local_tree_level(parent_id)
+        folder_paths = self._local_tree_cache["folder_paths"] if self._local_tree_cache else {}
+        folder_icon, default_issue_icon, issue_icon_map = self._local_tree_icons()
+        type_filter = self.local_issue_type_filter
 
-            # 폴더 노드
-            label = node.get("name") or f"Folder {node.get('id')}"
-            folder_id = str(node.get("id") or "")
-            item = QStandardItem(label)
+        for folder in level["folders"]:
+            count = self._local_folder_issue_count(folder)
+            if count is None:
+                continue
+            folder_id = str(folder.get("id") or "")
+            name = folder.get("name") or f"Folder {folder.get('id')}"
+            item = QStandardItem(f"{name} ({count})" if count else name)
             item.setEditable(False)
             item.setData("FOLDER", Qt.UserRole)
             item.setData(folder_id, Qt.UserRole + 1)
             item.setIcon(folder_icon)
+            item.setToolTip(folder_paths.get(folder_id) or name)
+            # 이슈가 있거나 (LOCAL 폴더처럼) 하위 폴더가 있을 수 있으면 펼치기 화살표를 보이게 한다.
+            if count or folder_id.startswith("LOCAL-") or folder.get("local_types"):
+                placeholder = QStandardItem("")
+                placeholder.setEditable(False)
+                placeholder.setSelectable(False)
+                placeholder.setData(self._TREE_PLACEHOLDER, Qt.UserRole)
+                item.appendRow(placeholder)
+            parent_item.appendRow(item)
 
-            has_visible_child = False
-            for child in node.get("children", []):
-                if add_node(item, child):
-                    has_visible_child = True
+        for node in level["issues"]:
+            issue_type = (node.get("issue_type") or "").upper()
+            if type_filter and issue_type != type_filter:
+                continue
 
-            # 사용자가 로컬에서 생성한 폴더: LOCAL-<TYPE>-<uuid> 형태
-            if folder_id.startswith("LOCAL-"):
-                parts = folder_id.split("-", 2)
-                local_type = parts[1].upper() if len(parts) >= 3 else ""
+            jira_key = node.get("jira_key") or ""
+            label = node.get("summary") or jira_key or f"ISSUE {node.get('id')}"
+            item = QStandardItem(label)
+            icon = issue_icon_map.get(issue_type, default_issue_icon)
+            item.setIcon(icon)
+            item.setEditable(False)
+            item.setData("ISSUE", Qt.UserRole)
+            item.setData(node.get("id"), Qt.UserRole + 1)
+            item.setData(jira_key, Qt.UserRole + 2)
+            item.setData(node.get("issue_type") or "", Qt.UserRole + 3)
+
+            # 트리에서 로컬 전용 / JIRA 연동 / 편집 중(unsaved) 이슈 구분:
+            # - jira_key 없음: 로컬 전용 → 녹색 텍스트
+            # - jira_key 있음: JIRA/RTM 연동 이슈 → 기본색
+            # - dirty_issue_ids 에 포함된 이슈 → 주황색 텍스트로 "편집됨" 표시
+            # - issues.dirty (Push 대기 중인 변경 있음) → 기울임꼴
+            issue_id_val = int(node.get("id")) if node.get("id") is not None else None
+            is_dirty = issue_id_val is not None and issue_id_val in getattr(self, "dirty_issue_ids", set())
+            if is_dirty:
+                item.setForeground(QColor("#CC6600"))  # Unsaved edits
+                base_tip = (
+                    "Local only issue (no JIRA key)"
+                    if not jira_key
+                    else f"Linked to JIRA/RTM issue: {jira_key}"
+                )
+                item.setToolTip(base_tip + "\n(Unsaved local changes)")
+            else:
+                if not jira_key:
+                    item.setForeground(QColor("#007700"))  # Local only
+                    item.setToolTip("Local only issue (no JIRA key)")
+                else:
+                    # 기본 색으로 두고, Jira Key 정보만 툴팁에 표시
+                    item.setToolTip(f"Linked to JIRA/RTM issue: {jira_key}")
+                # issues.dirty: 저장은 되었지만 아직 Push 되지 않은 변경 (issue_pending_changes)
+                if node.get("dirty"):
+                    font = item.font()
+                    font.setItalic(True)
+                    item.setFont(font)
+                    item.setToolTip(item.toolTip() + "\n(Local changes not pushed)")
 
-                # 구버전(타입 정보 없는 LOCAL-xxxx)은 어떤 탭에도 표시하지 않음
-                if not local_type:
-                    return False
+            parent_item.appendRow(item)
 
-                # 현재 탭 타입과 다른 로컬 폴더는 숨김
-                if type_filter and local_type != type_filter:
-                    return False
+    def _load_local_folder_children(self, item: QStandardItem) -> None:
+        """자리표시 행만 있는 폴더 item 의 실제 자식을 읽어 채운다 (이미 읽었으면 아무 것도 하지 않는다)."""
+        if item.rowCount() != 1:
+            return
+        first = item.child(0)
+        if first is None or first.data(Qt.UserRole) != self._TREE_PLACEHOLDER:
+            return
+        item.removeRow(0)
+        self._append_local_tree_level(item, item.data(Qt.UserRole + 1))
 
-                # 자신의 타입 탭에서는, 자식이 없어도 항상 표시
-                parent_item.appendRow(item)
-                return True
+    def on_local_tree_expanded(self, index) -> None:
+        """로컬 트리 폴더를 펼칠 때 그 폴더의 한 단계만 DB 에서 읽는다."""
+        model = self.left_panel.tree_view.model()
+        if not isinstance(model, QStandardItemModel):
+            return
+        item = model.itemFromIndex(index)
+        if item is None or item.data(Qt.UserRole) != "FOLDER":
+            return
+        self._load_local_folder_children(item)
+        folder_id = item.data(Qt.UserRole + 1)
+        if folder_id:
+            self._expanded_local_folders.add(str(folder_id))
 
-            # RTM 에서 내려온 폴더는, 현재 타입 이슈/폴더가 하나도 없으면 숨긴다.
-            if not has_visible_child:
-                return False
+    def on_local_tree_collapsed(self, index) -> None:
+        model = self.left_panel.tree_view.model()
+        if not isinstance(model, QStandardItemModel):
+            return
+        item = model.itemFromIndex(index)
+        if item is not None and item.data(Qt.UserRole) == "FOLDER":
+            self._expanded_local_folders.discard(str(item.data(Qt.UserRole + 1) or ""))
 
-            parent_item.appendRow(item)
-            return True
+    def _expand_local_folders(self, model: QStandardItemModel, parent_item: QStandardItem, folder_ids: set) -> None:
+        """folder_ids 에 있는 폴더를 위에서부터 펼친다 (펼칠 때 자식이 로드되므로 그 아래도 이어서 확인)."""
+        view = self.left_panel.tree_view
+        for row in range(parent_item.rowCount()):
+            child = parent_item.child(row)
+            if child is None or child.data(Qt.UserRole) != "FOLDER":
+                continue
+            if str(child.data(Qt.UserRole + 1) or "") in folder_ids:
+                view.expand(model.indexFromItem(child))
+                self._expand_local_folders(model, child, folder_ids)
+
+    def reload_local_tree(self):
+        """
+        현재 project 의 folders/issues 를 SQLite 에서 읽어와
+        왼쪽(Local) 패널의 QTreeView 에 바인딩한다.
+
+        루트 단계만 읽고, 폴더의 자식은 펼칠 때 읽는다 (fetch_folder_children).
+        폴더 라벨에는 하위 트리 전체의 현재 타입 이슈 수를 표시한다.
+        다시 로드할 때는 펼쳐 두었던 폴더를 다시 펼친다 (처음에는 루트 폴더만 펼친다).
+        """
+        if not self.project:
+            return
+
+        type_filter = self.local_issue_type_filter
+
+        if self._cached_local_tree(type_filter) is None:
+            seq = get_change_seq(self.conn)
+            self._local_tree_cache = {
+                "key": (self.project.id, type_filter),
+                "seq": seq,
+                # parent_id -> fetch_folder_children 결과 (펼친 폴더 단계만 채워진다)
+                "levels": {},
+                # 폴더 툴팁에 전체 경로 표시 (프로젝트 경로 인덱스 1회 조회)
+                "folder_paths": get_project_folder_paths(self.conn, self.project.id),
+            }
+            self._advance_change_consumer(seq)
 
-        for root in tree_data.get("roots", []):
-            add_node(root_item, root)
+        model = QStandardItemModel()
+        model.setHorizontalHeaderLabels(["Name"])
+        root_item = model.invisibleRootItem()
+        self._append_local_tree_level(root_item, None)
 
+        first_load = self._local_tree_project_id != self.project.id
+        self._local_tree_project_id = self.project.id
         self.left_panel.tree_view.setModel(model)
-        self.left_panel.tree_view.expandAll()
+        if first_load:
+            self._expanded_local_folders = {
+                str(root_item.child(r).data(Qt.UserRole + 1) or "")
+                for r in range(root_item.rowCount())
+                if root_item.child(r).data(Qt.UserRole) == "FOLDER"
+            }
+        self._expand_local_folders(model, root_item, set(self._expanded_local_folders))
         self.left_panel.tree_view.setSelectionMode(QTreeView.ExtendedSelection)
 
         # selectionModel 이 새로 생성되므로, selectionChanged 시그널을 다시 연결한다.
@@ -5525,8 +5865,24 @@ class MainWindow(QMainWindow):
         model = self.left_panel.tree_view.model()
         if not model:
             return
-        
-        # 트리 전체를 순회하여 issue_id와 일치하는 항목 찾기
+
+        # 폴더 자식은 펼칠 때 로드되므로, 이슈가 있는 폴더까지 위에서부터 펼친다.
+        issue = get_issue_by_id(self.conn, int(issue_id))
+        chain = get_folder_ancestor_ids(self.conn, self.project.id, issue.get("folder_id")) if issue else []
+        parent_item = model.invisibleRootItem()
+        for folder_id in chain:
+            folder_item = None
+            for i in range(parent_item.rowCount()):
+                child = parent_item.child(i)
+                if child and child.data(Qt.UserRole) == "FOLDER" and str(child.data(Qt.UserRole + 1)) == str(folder_id):
+                    folder_item = child
+                    break
+            if folder_item is None:
+                break
+            self.left_panel.tree_view.expand(model.indexFromItem(folder_item))
+            parent_item = folder_item
+
+        # 트리 전체(로드된 항목)를 순회하여 issue_id와 일치하는 항목 찾기
         def find_item(parent_item, target_id):
             for i in range(parent_item.rowCount()):
                 child = parent_item.child(i)
@@ -5722,6 +6078,17 @@ class MainWindow(QMainWindow):
 
         self.reload_local_tree()
 
+    def _get_local_issue_detail(self, issue_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Details 탭 표시용 로컬 이슈.
+        issues 행에는 첨부/Activity 가 없으므로 전용 테이블에서 읽어 예전 키(attachments, local_activity)로 채운다.
+        """
+        issue = get_issue_by_id(self.conn, issue_id)
+        if issue:
+            issue["attachments"] = get_issue_attachments_json(self.conn, issue_id)
+            issue["local_activity"] = get_issue_activity_text(self.conn, issue_id)
+        return issue
+
     def on_local_tree_selection_changed(self, selected, deselected):
         """
         왼쪽(Local) 트리에서 선택된 이슈가 변경되었을 때 Details 탭에 로드하고,
@@ -5753,7 +6120,7 @@ class MainWindow(QMainWindow):
             self.left_panel.issue_tabs.set_issue(None)
             return
 
-        issue = get_issue_by_id(self.conn, issue_id)
+        issue = self._get_local_issue_detail(issue_id)
         if not issue:
             self.left_panel.issue_tabs.set_issue(None)
             return
@@ -6171,23 +6538,235 @@ class MainWindow(QMainWindow):
         )
         if ret != QMessageBox.Yes:
             return
+        if not self._take_auto_snapshot("full_sync"):
+            return
 
         try:
             self.status_bar.showMessage("Syncing RTM tree from JIRA to local DB...")
             QApplication.setOverrideCursor(Qt.WaitCursor)
 
-            sync_tree(self.project, self.jira_client, self.conn)
+            results = sync_tree(self.project, self.jira_client, self.conn)
             self.reload_local_tree()
             # 온라인 트리도 함께 갱신
             self.on_refresh_online_tree()
 
-            self.status_bar.showMessage("Full tree sync completed.")
+            inserted = sum(s.folders_inserted + s.issues_inserted for s in results.values())
+            updated = sum(s.folders_updated + s.issues_updated for s in results.values())
+            unchanged = sum(s.folders_unchanged + s.issues_unchanged for s in results.values())
+            self.status_bar.showMessage(
+                f"Full tree sync completed: {inserted} inserted, {updated} updated, {unchanged} unchanged."
+            )
         except Exception as e:
             self.status_bar.showMessage(f"Full sync failed: {e}")
             print(f"[ERROR] Full sync failed: {e}")
         finally:
             QApplication.restoreOverrideCursor()
 
+    def _snapshot_progress(self, copied: int, total: int) -> None:
+        """backup API 단계마다 호출: 상태바 갱신 + 이벤트 처리로 복사 중에도 창이 멈추지 않게 한다."""
+        pct = int(copied * 100 / total) if total else 100
+        self.status_bar.showMessage(f"DB snapshot: {pct}% ({copied}/{total} pages)")
+        QApplication.processEvents()
+
+    def _take_auto_snapshot(self, reason: str) -> bool:
+        """
+        Full Sync / Excel import 직전 자동 스냅샷 (local_settings "snapshots" 설정에 따름).
+        실패하면 사용자에게 계속할지 묻고, 취소하면 False 를 반환한다.
+        """
+        try:
+            info = snapshots.create_auto_snapshot(self.conn, reason)
+        except Exception as e:
+            self.logger.exception("Automatic DB snapshot failed")
+            ret = QMessageBox.question(
+                self,
+                "DB Snapshot",
+                f"자동 스냅샷을 만들지 못했습니다.\n\n{e}\n\n스냅샷 없이 계속 진행하시겠습니까?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No,
+            )
+            return ret == QMessageBox.Yes
+        if info is not None:
+            self.status_bar.showMessage(f"DB snapshot saved: {info.path.name}")
+        return True
+
+    def on_create_snapshot_clicked(self) -> None:
+        """실행 중인 DB 를 스냅샷 디렉터리에 복사한다 (backup API, 복사 중에도 앱 사용 가능)."""
+        cfg = snapshots.load_snapshot_settings()
+        try:
+            info = snapshots.create_snapshot(
+                self.conn,
+                snapshots.get_snapshots_root(cfg),
+                label="manual",
+                compress=bool(cfg.get("compress")),
+                pages_per_step=cfg.get("pages_per_step") or snapshots.DEFAULT_PAGES_PER_STEP,
+                progress=self._snapshot_progress,
+            )
+        except Exception as e:
+            self.status_bar.showMessage(f"DB snapshot failed: {e}")
+            self.logger.exception("DB snapshot failed")
+            return
+        self.status_bar.showMessage(
+            f"DB snapshot saved: {info.path} ({info.size:,d} bytes, {info.seconds:.2f}s)"
+        )
+
+    def on_restore_snapshot_clicked(self) -> None:
+        """스냅샷 파일을 골라 현재 DB 를 그 내용으로 덮어쓴다 (복원 직전 상태도 스냅샷으로 남긴다)."""
+        cfg = snapshots.load_snapshot_settings()
+        root = snapshots.get_snapshots_root(cfg)
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Restore DB Snapshot",
+            str(root),
+            "DB Snapshots (*.db *.db.gz);;All Files (*)",
+        )
+        if not file_path:
+            return
+
+        ret = QMessageBox.question(
+            self,
+            "Restore DB Snapshot",
+            (
+                f"로컬 DB 전체를 선택한 스냅샷으로 되돌립니다.\n\n{file_path}\n\n"
+                "- 스냅샷 이후의 로컬 변경 사항은 사라집니다.\n"
+                "- 복원 직전 상태는 'before-restore' 스냅샷으로 저장됩니다.\n"
+                "- 첨부 파일은 복원되지 않습니다.\n\n"
+                "계속 진행하시겠습니까?"
+            ),
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No,
+        )
+        if ret != QMessageBox.Yes:
+            return
+
+        pages = cfg.get("pages_per_step") or snapshots.DEFAULT_PAGES_PER_STEP
+        # 복원 중에는 self.conn 이 덮어쓰이므로, 진행 표시 중 처리되는 이벤트(저장 / Push / 트리 선택 등)가
+        # DB 에 닿지 않도록 창 전체를 막고 취소 버튼 없는 modal 진행 창만 보여 준다.
+        progress_dialog = QProgressDialog("Restoring DB snapshot...", None, 0, 100, self)
+        progress_dialog.setWindowTitle("Restore DB Snapshot")
+        progress_dialog.setWindowModality(Qt.ApplicationModal)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.setAutoClose(False)
+
+        def _restore_progress(copied: int, total: int) -> None:
+            progress_dialog.setValue(int(copied * 100 / total) if total else 100)
+            self._snapshot_progress(copied, total)
+
+        self.setEnabled(False)
+        progress_dialog.show()
+        try:
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            snapshots.create_snapshot(
+                self.conn, root, label="before-restore", compress=bool(cfg.get("compress")), pages_per_step=pages
+            )
+            info = snapshots.restore_snapshot(self.conn, file_path, pages_per_step=pages, progress=_restore_progress)
+        except Exception as e:
+            self.status_bar.showMessage(f"DB restore failed: {e}")
+            self.logger.exception("DB restore failed")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+            progress_dialog.close()
+            self.setEnabled(True)
+
+        # 복원된 change_log 는 캐시 시점보다 과거이므로 캐시로 판단할 수 없다.
+        self._local_tree_cache = None
+        self.reload_local_tree()
+        self.status_bar.showMessage(f"DB restored from {info.path.name} ({info.seconds:.2f}s)")
+
+    def on_project_summary_clicked(self) -> None:
+        """
+        모든 로컬 프로젝트의 이슈 타입별 이슈 수 / 로컬 변경 수를 보여준다.
+        프로젝트별 저장 방식이면 각 프로젝트 DB 를 ATTACH 하여 조회한다.
+        """
+        try:
+            rows = shards.project_issue_summary(conn=self.conn, router=self.shard_router)
+        except Exception as e:
+            self.status_bar.showMessage(f"Cross-project summary failed: {e}")
+            self.logger.exception("Cross-project summary failed")
+            return
+        if not rows:
+            QMessageBox.information(self, "Cross-Project Summary", "로컬 DB 에 이슈가 없습니다.")
+            return
+        lines = [f"{'Project':<16} {'Type':<16} {'Issues':>8} {'Local chg':>10}"]
+        for row in rows:
+            lines.append(
+                f"{str(row['project_key']):<16} {str(row['issue_type']):<16} {row['issues']:>8} {row['dirty'] or 0:>10}"
+            )
+        mode = "per-project DB files" if self.shard_router is not None else "single DB file"
+        box = QMessageBox(self)
+        box.setWindowTitle("Cross-Project Summary")
+        box.setText(f"Storage: {mode}")
+        box.setDetailedText("\n".join(lines))
+        box.exec()
+
+    def on_database_maintenance_clicked(self) -> None:
+        """
+        로컬 DB 정리: 보존 기간이 지난 삭제 이슈 purge, change_log 정리, ANALYZE/optimize, vacuum.
+        결과(삭제 행 수, 회수한 바이트, 단계별 소요 시간)를 메시지 박스로 보여준다.
+        """
+        cfg = (self.local_settings or {}).get("maintenance", {}) if hasattr(self, "local_settings") else {}
+        try:
+            default_days = int(cfg.get("retention_days", maintenance.DEFAULT_RETENTION_DAYS))
+        except (TypeError, ValueError):
+            default_days = maintenance.DEFAULT_RETENTION_DAYS
+
+        days, ok = QInputDialog.getInt(
+            self,
+            "Database Maintenance",
+            "Permanently remove issues deleted more than N days ago.\n"
+            "Then refresh statistics and compact the DB file.\n\n"
+            "Retention (days):",
+            default_days,
+            0,
+            36500,
+        )
+        if not ok:
+            return
+
+        try:
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            report = maintenance.run_maintenance(
+                self.conn,
+                retention_days=days,
+                change_log_retention_days=maintenance.load_change_log_retention_days(),
+                progress=lambda step: self.status_bar.showMessage(f"Database maintenance: {step}..."),
+            )
+        except Exception as e:
+            self.status_bar.showMessage(f"Database maintenance failed: {e}")
+            self.logger.exception("Database maintenance failed")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        if report.purged.get("issues") or report.change_log_pruned:
+            self.reload_local_tree()
+        self.status_bar.showMessage(
+            f"Database maintenance completed: {report.purged.get('issues', 0)} issue(s) purged, "
+            f"{report.bytes_reclaimed} bytes reclaimed in {report.total_seconds:.2f}s."
+        )
+        QMessageBox.information(self, "Database Maintenance", "\n".join(report.summary_lines()))
+
+    def on_rebuild_stats_clicked(self) -> None:
+        """
+        커버리지 / 실행 결과 통계 테이블(stat_*)을 처음부터 다시 계산한다.
+        평소에는 트리거가 유지하므로, 외부 도구로 DB 를 직접 수정한 경우 등에만 필요하다.
+        """
+        from backend.db import rebuild_coverage_stats
+
+        try:
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            counts = rebuild_coverage_stats(self.conn)
+        except Exception as e:
+            self.status_bar.showMessage(f"Rebuilding statistics failed: {e}")
+            self.logger.exception("Rebuilding statistics failed")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        self.status_bar.showMessage(
+            "Statistics rebuilt: " + ", ".join(f"{table}={count}" for table, count in counts.items())
+        )
+
     def on_refresh_online_tree(self):
         """
         오른쪽(JIRA RTM Online) 패널 트리를 서버에서 직접 조회하여 표시한다.
@@ -6346,6 +6925,37 @@ class MainWindow(QMainWindow):
 
     # ------------------------------------------------------------------ 메뉴바 구성
 
+    def _open_project(
+        self,
+        project_key: str,
+        project_id: int,
+        name: Optional[str] = None,
+        base_url: Optional[str] = None,
+    ):
+        """
+        현재 프로젝트 레코드를 열거나 만든다.
+        프로젝트별 저장 방식(shard_router)이면 self.conn / self.db_path 도 그 프로젝트의 DB 로 바꾼다.
+        """
+        if self.shard_router is None:
+            return get_or_create_project(
+                self.conn,
+                project_key=project_key,
+                project_id=project_id,
+                name=name,
+                base_url=base_url,
+            )
+        conn, project = self.shard_router.open_project(project_key, project_id, name=name, base_url=base_url)
+        if conn is not self.conn:
+            if self.conn is not None:
+                try:
+                    remove_change_consumer(self.conn, self._change_consumer)
+                except Exception:
+                    self.logger.warning("Failed to unregister change_log consumer", exc_info=True)
+            self.conn = conn
+            self.db_path = str(self.shard_router.shard(project.id).path)
+            self._local_tree_cache = None
+        return project
+
     def _create_menu_bar(self) -> None:
         """상단 메뉴바에서 주요 기능을 카테고리별로 제공한다."""
         menubar = self.menuBar()
@@ -6380,6 +6990,27 @@ class MainWindow(QMainWindow):
         act_refresh_tree.setShortcut(QKeySequence("F5"))
         local_menu.addAction(act_refresh_tree)
 
+        local_menu.addSeparator()
+        act_snapshot = QAction("Create DB Snapshot", self)
+        act_snapshot.triggered.connect(self.on_create_snapshot_clicked)
+        local_menu.addAction(act_snapshot)
+
+        act_restore_snapshot = QAction("Restore DB Snapshot...", self)
+        act_restore_snapshot.triggered.connect(self.on_restore_snapshot_clicked)
+        local_menu.addAction(act_restore_snapshot)
+
+        act_maintenance = QAction("Database Maintenance...", self)
+        act_maintenance.triggered.connect(self.on_database_maintenance_clicked)
+        local_menu.addAction(act_maintenance)
+
+        act_rebuild_stats = QAction("Rebuild Coverage Statistics", self)
+        act_rebuild_stats.triggered.connect(self.on_rebuild_stats_clicked)
+        local_menu.addAction(act_rebuild_stats)
+
+        act_project_summary = QAction("Cross-Project Summary...", self)
+        act_project_summary.triggered.connect(self.on_project_summary_clicked)
+        local_menu.addAction(act_project_summary)
+
         # JIRA / RTM 메뉴: 온라인 연동 기능
         jira_menu = menubar.addMenu("JIRA / RTM")
         act_pull = QAction("Pull from JIRA (Selected)", self)
@@ -6460,6 +7091,10 @@ class MainWindow(QMainWindow):
         act_api_endpoints.triggered.connect(self.on_edit_api_endpoints_clicked)
         settings_menu.addAction(act_api_endpoints)
 
+        act_reset_endpoints = QAction("Reset Learned Endpoints", self)
+        act_reset_endpoints.triggered.connect(self.on_reset_learned_endpoints_clicked)
+        settings_menu.addAction(act_reset_endpoints)
+
         act_api_tester = QAction("REST API Tester...", self)
         act_api_tester.triggered.connect(self.on_open_api_tester_clicked)
         settings_menu.addAction(act_api_tester)
@@ -7155,8 +7790,8 @@ class MainWindow(QMainWindow):
         로컬 트리에서 선택된 폴더/이슈 리스트(items)를
         현재 선택된 위치를 기준으로 '복사(duplicate)' 한다.
 
-        - FOLDER: 하위 폴더/이슈까지 재귀적으로 모두 복사.
-        - ISSUE : 해당 이슈를 동일한 메타데이터로 새 로컬 이슈로 복제.
+        - FOLDER: 하위 폴더/이슈(Steps, relations, Test Plan 링크 포함)까지 db.copy_subtree 로 한 번에 복사.
+        - ISSUE : db.copy_issues 로 동일한 메타데이터의 새 로컬 이슈로 복제.
         """
         if not self.left_panel or not self.left_panel.tree_view:
             return
@@ -7184,25 +7819,24 @@ class MainWindow(QMainWindow):
                     except Exception:
                         target_folder_id = None
 
+        from backend.db import copy_issues, copy_subtree
+
+        # 이슈는 한 번에 복사해야 함께 복사되는 이슈 사이의 relations / Test Plan 링크가 복사본끼리 연결된다.
+        issue_ids = [int(e["id"]) for e in items if e.get("kind") == "ISSUE" and e.get("id")]
+        folder_ids = [str(e["id"]) for e in items if e.get("kind") == "FOLDER" and e.get("id")]
+        type_hint = getattr(self, "local_issue_type_filter", None)
+
         total_copied = 0
-        for entry in items:
-            kind = entry.get("kind")
-            item_id = entry.get("id")
-            if not item_id:
-                continue
+        if issue_ids:
             try:
-                if kind == "ISSUE":
-                    src_issue = get_issue_by_id(self.conn, int(item_id))
-                    if not src_issue:
-                        continue
-                    self._duplicate_issue_from_row(src_issue, target_folder_id)
-                    total_copied += 1
-                elif kind == "FOLDER":
-                    total_copied += self._duplicate_folder_subtree(
-                        str(item_id), target_folder_id
-                    )
+                total_copied += copy_issues(self.conn, issue_ids, target_folder_id).created
             except Exception as e:
-                self.logger.warning("Failed to copy %s %s: %s", kind, item_id, e)
+                self.logger.warning("Failed to copy issues %s: %s", issue_ids, e)
+        for folder_id in folder_ids:
+            try:
+                total_copied += copy_subtree(self.conn, folder_id, target_folder_id, issue_type=type_hint).created
+            except Exception as e:
+                self.logger.warning("Failed to copy FOLDER %s: %s", folder_id, e)
 
         if total_copied:
             self.reload_local_tree()
@@ -7266,118 +7900,19 @@ class MainWindow(QMainWindow):
         if mode == "cut":
             self._tree_clipboard = None
 
-    def _duplicate_issue_from_row(
-        self, issue: Dict[str, Any], target_folder_id: str | None
-    ) -> int:
-        """
-        단일 이슈 row(dict)를 기반으로, 동일한 메타데이터를 가진 새 로컬 이슈를 생성한다.
-
-        - jira_key / jira_id 는 복사하지 않고, 로컬 전용 이슈로 만든다.
-        - created / updated 는 새로 생성된 시각으로 세팅된다(create_local_issue 사용).
-        """
-        project_id = int(issue.get("project_id") or 0)
-        issue_type = (issue.get("issue_type") or "REQUIREMENT").upper()
-        summary = issue.get("summary") or f"Copy of {issue.get('id')}"
-
-        # 1차: 최소 필드로 로컬 이슈 생성
-        new_issue_id = create_local_issue(
-            self.conn,
-            project_id=project_id,
-            issue_type=issue_type,
-            folder_id=target_folder_id,
-            summary=summary,
-        )
-
-        # 2차: 나머지 메타 필드 복사 (jira_key/jira_id/is_deleted/local_only/dirty 제외)
-        fields: Dict[str, Any] = {}
-        for key in [
-            "description",
-            "status",
-            "priority",
-            "assignee",
-            "reporter",
-            "labels",
-            "components",
-            "security_level",
-            "fix_versions",
-            "affects_versions",
-            "rtm_environment",
-            "due_date",
-            "attachments",
-            "epic_link",
-            "sprint",
-            "preconditions",
-            "local_activity",
-        ]:
-            if key in issue:
-                fields[key] = issue.get(key)
-
-        if fields:
-            update_issue_fields(self.conn, new_issue_id, fields)
-
-        return new_issue_id
-
-    def _duplicate_folder_subtree(
-        self, src_folder_id: str, new_parent_id: str | None
-    ) -> int:
-        """
-        주어진 src_folder_id 를 루트로 하는 폴더/이슈 서브트리를
-        new_parent_id 하위에 재귀적으로 복사한다.
-
-        RETURNS: 생성된 폴더/이슈 개수 (루트 폴더 포함).
-        """
-        cur = self.conn.cursor()
-
-        # 원본 폴더 정보 조회
-        cur.execute("SELECT * FROM folders WHERE id = ?", (src_folder_id,))
-        row = cur.fetchone()
-        if not row:
-            return 0
-        src = dict(row)
-
-        project_id = int(src.get("project_id") or (self.project.id if self.project else 0))
-        name = src.get("name") or ""
-
-        # LOCAL-<TYPE>-uuid 형태인 경우, TYPE 을 추출하여 동일 타입의 로컬 폴더로 복사
-        issue_type_hint: str | None = None
-        fid = str(src.get("id") or "")
-        if fid.startswith("LOCAL-"):
-            parts = fid.split("-", 2)
-            if len(parts) >= 3 and parts[1]:
-                issue_type_hint = parts[1].upper()
-
-        # 현재 로컬 탭 타입이 있으면 그것도 힌트로 사용
-        if not issue_type_hint and getattr(self, "local_issue_type_filter", None):
-            issue_type_hint = str(self.local_issue_type_filter).upper()
-
-        # 새 폴더 생성 (RTM 에서 내려온 폴더라도, 복사본은 로컬 전용 폴더로 만든다)
-        new_folder_id = create_folder_node(
-            self.conn,
-            project_id=project_id,
-            name=name,
-            parent_id=new_parent_id,
-            issue_type=issue_type_hint,
-        )
-
-        created_count = 1  # 새 폴더 1개
-
-        # 이 폴더에 속한 이슈들 복제
-        cur.execute(
-            "SELECT * FROM issues WHERE folder_id = ? AND is_deleted = 0",
-            (src_folder_id,),
-        )
-        for issue_row in cur.fetchall():
-            issue = dict(issue_row)
-            self._duplicate_issue_from_row(issue, new_folder_id)
-            created_count += 1
-
-        # 하위 폴더들 재귀 복제
-        cur.execute("SELECT id FROM folders WHERE parent_id = ?", (src_folder_id,))
-        for child_row in cur.fetchall():
-            child_id = child_row["id"]
-            created_count += self._duplicate_folder_subtree(child_id, new_folder_id)
-
-        return created_count
+    def closeEvent(self, event):
+        """창을 닫을 때 Jira 클라이언트의 keep-alive 연결과 change_log 소비자 등록을 정리한다."""
+        if getattr(self, "conn", None) is not None:
+            try:
+                remove_change_consumer(self.conn, self._change_consumer)
+            except Exception:
+                self.logger.warning("Failed to unregister change_log consumer", exc_info=True)
+        if getattr(self, "jira_client", None) is not None:
+            try:
+                self.jira_client.close()
+            except Exception:
+                self.logger.exception("Failed to close Jira client session")
+        super().closeEvent(event)
 
     # ------------------------------------------------------------------
     # Local tree drag & drop (마우스 드래그로 폴더/이슈 이동)
@@ -7663,7 +8198,11 @@ class MainWindow(QMainWindow):
             self.btn_ribbon_refresh_online.clicked.connect(self.on_refresh_online_tree)
             self.btn_ribbon_delete_in_jira.clicked.connect(self.on_delete_in_jira_clicked)
             self.btn_ribbon_create_in_jira.clicked.connect(self.on_create_in_jira_clicked)
-            self.btn_ribbon_search_jira.clicked.connect(self.on_jira_filter_search)
+
+        # 검색창: Local 검색은 JIRA 연결 없이도 동작하므로 항상 연결한다.
+        self.btn_ribbon_search_jira.clicked.connect(self.on_filter_search)
+        self.jira_filter_edit.returnPressed.connect(self.on_filter_search)
+        self.cmb_search_scope.currentTextChanged.connect(self._on_search_scope_changed)
 
         # ------------------------------------------------------------------
         # Ribbon: Sync (JIRA ↔ Local)
@@ -7758,6 +8297,10 @@ class MainWindow(QMainWindow):
         self.left_panel.btn_save_issue.clicked.connect(self.on_save_issue_clicked)
         self.left_panel.btn_sync_up.clicked.connect(self.on_push_issue_clicked)
 
+        # Local 트리 지연 로딩: 폴더를 펼칠 때 자식을 읽는다
+        self.left_panel.tree_view.expanded.connect(self.on_local_tree_expanded)
+        self.left_panel.tree_view.collapsed.connect(self.on_local_tree_collapsed)
+
         # Local / Online 트리 컨텍스트 메뉴 (우클릭)
         self.left_panel.tree_view.setContextMenuPolicy(Qt.CustomContextMenu)
         self.left_panel.tree_view.customContextMenuRequested.connect(self._on_local_tree_context_menu)
@@ -7835,12 +8378,18 @@ class MainWindow(QMainWindow):
         if not file_path:
             return
 
+        read_conn = None
         try:
-            excel_io.export_project_to_excel(self.conn, self.project.id, file_path)
+            # Export 는 조회만 하므로 읽기 전용 연결을 사용한다 (WAL 에서 다른 쓰기와 겹쳐도 막히지 않음).
+            read_conn = get_readonly_connection(self.db_path) if self.db_path else self.conn
+            excel_io.export_project_to_excel(read_conn, self.project.id, file_path)
             self.status_bar.showMessage(f"Exported project to Excel: {file_path}")
         except Exception as e:
             self.status_bar.showMessage(f"Excel export failed: {e}")
             print(f"[ERROR] Excel export failed: {e}")
+        finally:
+            if read_conn is not None and read_conn is not self.conn:
+                read_conn.close()
 
     def on_import_excel_clicked(self):
         """
@@ -7860,6 +8409,8 @@ class MainWindow(QMainWindow):
         )
         if not file_path:
             return
+        if not self._take_auto_snapshot("excel_import"):
+            return
 
         from PySide6.QtWidgets import (
             QDialog,
@@ -7978,7 +8529,11 @@ class MainWindow(QMainWindow):
 
         jira_key = issue.get("jira_key") or ""
 
-        from backend.db import get_or_create_testexecution_for_issue, get_testcase_executions
+        from backend.db import (
+            get_or_create_testexecution_for_issue,
+            get_testcase_executions,
+            get_testexecution_result_counts,
+        )
 
         # TE 메타 + TCE 목록 조회
         te_row = get_or_create_testexecution_for_issue(self.conn, self.current_issue_id)
@@ -8018,18 +8573,15 @@ class MainWindow(QMainWindow):
         ws_summary.append(["Executed By", te_row.get("executed_by") or ""])
         ws_summary.append([])
 
-        # TCE 결과 집계
-        total = len(tce_rows)
-        result_counts: dict[str, int] = {}
-        for r in tce_rows:
-            res = (r.get("result") or "").strip() or "(empty)"
-            result_counts[res] = result_counts.get(res, 0) + 1
+        # TCE 결과 집계 (stat_testexecution_results 에 트리거로 미리 집계된 값)
+        result_counts = get_testexecution_result_counts(self.conn, te_id)
+        total = sum(result_counts.values())
 
         ws_summary.append(["Total Test Cases", total])
         ws_summary.append([])
         ws_summary.append(["Result", "Count"])
         for res, cnt in result_counts.items():
-            ws_summary.append([res, cnt])
+            ws_summary.append([res or "(empty)", cnt])
 
         # 두 번째 시트: TCE 목록
         ws_tces = wb.create_sheet("TCEs")
@@ -8320,7 +8872,7 @@ class MainWindow(QMainWindow):
 
     def on_refresh_local_activity_clicked(self):
         """
-        현재 선택된 로컬 이슈의 local_activity 텍스트를 Activity 영역에 표시한다.
+        현재 선택된 로컬 이슈의 Activity 메모(issue_activity)를 Activity 영역에 표시한다.
         JIRA 와는 무관한 순수 로컬 메모 영역이다.
         """
         if self.current_issue_id is None:
@@ -8332,14 +8884,14 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("Issue not found in local DB; cannot load local activity.")
             return
 
-        text = issue.get("local_activity") or ""
+        text = get_issue_activity_text(self.conn, self.current_issue_id)
         self.left_panel.issue_tabs.set_activity_text(text)
         self.status_bar.showMessage("Loaded local activity.")
 
     def on_add_local_activity_clicked(self):
         """
-        현재 선택된 로컬 이슈의 local_activity 에 새 메모를 추가한다.
-        - 기존 텍스트 뒤에 공백 줄을 추가하고, 새 입력 내용을 이어붙인다.
+        현재 선택된 로컬 이슈에 새 Activity 메모를 추가한다.
+        - 메모는 issue_activity 에 한 행으로 추가되고, 화면에는 기존 텍스트 뒤에 공백 줄과 함께 이어붙인다.
         """
         if self.current_issue_id is None:
             self.status_bar.showMessage("No local issue selected; cannot add activity.")
@@ -8377,15 +8929,13 @@ class MainWindow(QMainWindow):
         else:
             combined = new_block
 
-        from backend.db import update_issue_fields
-
-        update_issue_fields(self.conn, self.current_issue_id, {"local_activity": combined})
+        add_issue_activity(self.conn, self.current_issue_id, new_block)
         tabs.set_activity_text(combined)
         self.status_bar.showMessage("Added local activity.")
 
     def on_edit_local_activity_clicked(self):
         """
-        현재 선택된 로컬 이슈의 local_activity 전체 텍스트를 편집한다.
+        현재 선택된 로컬 이슈의 Activity 전체 텍스트를 편집한다.
         """
         if self.current_issue_id is None:
             self.status_bar.showMessage("No local issue selected; cannot edit activity.")
@@ -8404,15 +8954,13 @@ class MainWindow(QMainWindow):
             return
 
         new_text = text.strip()
-        from backend.db import update_issue_fields
-
-        update_issue_fields(self.conn, self.current_issue_id, {"local_activity": new_text})
+        set_issue_activity_text(self.conn, self.current_issue_id, new_text)
         tabs.set_activity_text(new_text)
         self.status_bar.showMessage("Updated local activity.")
 
     def on_delete_local_activity_clicked(self):
         """
-        현재 선택된 로컬 이슈의 local_activity 를 모두 삭제한다.
+        현재 선택된 로컬 이슈의 Activity 메모를 모두 삭제한다.
         """
         if self.current_issue_id is None:
             self.status_bar.showMessage("No local issue selected; cannot delete activity.")
@@ -8434,9 +8982,7 @@ class MainWindow(QMainWindow):
         if confirm != QMessageBox.Yes:
             return
 
-        from backend.db import update_issue_fields
-
-        update_issue_fields(self.conn, self.current_issue_id, {"local_activity": ""})
+        clear_issue_activity(self.conn, self.current_issue_id)
         tabs.set_activity_text("")
         self.status_bar.showMessage("Deleted local activity.")
 
@@ -8454,8 +9000,10 @@ class MainWindow(QMainWindow):
             updates = jira_mapping.map_jira_to_local(issue_type, jira_issue_json)
             if updates:
                 update_issue_fields(self.conn, self.current_issue_id, updates)
+                # 서버 값으로 덮어쓴 필드는 더 이상 보낼 변경이 아니다.
+                clear_pending_changes(self.conn, self.current_issue_id, updates.keys())
             # DB 에 반영된 최신 이슈를 다시 로딩하여 UI 갱신
-            refreshed = get_issue_by_id(self.conn, self.current_issue_id)
+            refreshed = self._get_local_issue_detail(self.current_issue_id)
             if refreshed:
                 self.left_panel.issue_tabs.set_issue(refreshed)
         except Exception as e:
@@ -8466,7 +9014,7 @@ class MainWindow(QMainWindow):
         """
         현재 선택된 로컬 이슈에 대해 로컬 첨부파일을 추가한다.
         - 파일 선택 다이얼로그에서 선택한 파일을 attachments/<ISSUE_TYPE>/<ISSUE_ID>/ 아래에 복사
-        - issues.attachments 컬럼에 JSON 메타(파일명, 크기, local_path 등)를 저장하고 리스트를 갱신
+        - issue_attachments 에 메타(파일명, 크기, local_path 등) 한 행을 추가하고 리스트를 갱신
         """
         if self.current_issue_id is None:
             self.status_bar.showMessage("No local issue selected; cannot add attachment.")
@@ -8490,10 +9038,7 @@ class MainWindow(QMainWindow):
 
         from pathlib import Path
         import shutil
-        import os
-        import json
         from backend.attachments_fs import get_issue_attachments_dir
-        from backend.db import update_issue_fields
 
         try:
             src = Path(file_path)
@@ -8508,36 +9053,22 @@ class MainWindow(QMainWindow):
             rel_path = str(dst.relative_to(attachments_root))
             size = dst.stat().st_size if dst.exists() else None
 
-            # 기존 메타 로드
-            raw = issue.get("attachments")
-            items = []
-            if raw:
-                try:
-                    if isinstance(raw, str):
-                        items = json.loads(raw)
-                    elif isinstance(raw, list):
-                        items = raw
-                except Exception:
-                    items = []
-
-            if not isinstance(items, list):
-                items = []
-
-            items.append(
+            add_issue_attachment(
+                self.conn,
+                self.current_issue_id,
                 {
                     "filename": src.name,
                     "size": size,
                     "id": None,
                     "content": None,
                     "local_path": rel_path,
-                }
+                },
             )
 
-            json_text = json.dumps(items, ensure_ascii=False)
-            update_issue_fields(self.conn, self.current_issue_id, {"attachments": json_text})
-
             # UI 갱신
-            self.left_panel.issue_tabs._load_attachments_list(json_text)
+            self.left_panel.issue_tabs._load_attachments_list(
+                get_issue_attachments_json(self.conn, self.current_issue_id)
+            )
             self.status_bar.showMessage("Added local attachment.")
         except Exception as e:
             self.status_bar.showMessage(f"Failed to add local attachment: {e}")
@@ -8547,7 +9078,7 @@ class MainWindow(QMainWindow):
         """
         Details 탭의 첨부 리스트에서 선택된 로컬 첨부파일을 삭제한다.
         - attachments/<ISSUE_TYPE>/<ISSUE_ID>/ 아래의 파일을 삭제하고
-          issues.attachments 메타에서도 제거한다.
+          issue_attachments 메타에서도 제거한다.
         """
         if self.current_issue_id is None:
             self.status_bar.showMessage("No local issue selected; cannot delete attachment.")
@@ -8574,45 +9105,21 @@ class MainWindow(QMainWindow):
         if confirm != QMessageBox.Yes:
             return
 
-        from pathlib import Path
-        import json
-        from backend.db import update_issue_fields
-
         try:
-            root = self._get_attachments_root()
-            full_path = root / local_path
-            try:
-                if full_path.exists():
-                    full_path.unlink()
-            except Exception:
-                # 파일 삭제 실패는 메타만 정리하고 지나간다.
-                pass
+            delete_issue_attachment(self.conn, self.current_issue_id, local_path)
 
-            issue = get_issue_by_id(self.conn, self.current_issue_id)
-            raw = issue.get("attachments")
-            items = []
-            if raw:
+            # 복사된 이슈의 첨부는 원본과 같은 파일을 가리키므로, 다른 이슈가 쓰지 않을 때만 파일을 지운다.
+            if count_attachment_path_references(self.conn, local_path) == 0:
+                root = self._get_attachments_root()
+                full_path = root / local_path
                 try:
-                    if isinstance(raw, str):
-                        items = json.loads(raw)
-                    elif isinstance(raw, list):
-                        items = raw
+                    if full_path.exists():
+                        full_path.unlink()
                 except Exception:
-                    items = []
-            if not isinstance(items, list):
-                items = []
-
-            new_items = []
-            for att in items:
-                if not isinstance(att, dict):
-                    continue
-                if att.get("local_path") == local_path:
-                    continue
-                new_items.append(att)
+                    # 파일 삭제 실패는 메타만 정리하고 지나간다.
+                    pass
 
-            json_text = json.dumps(new_items, ensure_ascii=False)
-            update_issue_fields(self.conn, self.current_issue_id, {"attachments": json_text})
-            tabs._load_attachments_list(json_text)
+            tabs._load_attachments_list(get_issue_attachments_json(self.conn, self.current_issue_id))
             self.status_bar.showMessage("Deleted local attachment.")
         except Exception as e:
             self.status_bar.showMessage(f"Failed to delete local attachment: {e}")
@@ -8662,42 +9169,47 @@ class MainWindow(QMainWindow):
         """
         defects: Dict[int, Dict[str, Any]] = {}
 
-        # 1) Relations 기반 Defects
-        rels = get_relations_for_issue(self.conn, issue_id)
-        for r in rels:
-            if (r.get("dst_issue_type") or "").upper() != "DEFECT":
-                continue
-            dst_id = r.get("dst_issue_id")
-            if not dst_id:
-                continue
-            try:
-                dst_id_int = int(dst_id)
-            except (TypeError, ValueError):
-                continue
-            if dst_id_int in defects:
+        def _add_defect(iss: Dict[str, Any], source: str) -> None:
+            did = iss.get("id")
+            if not did:
+                return
+            if did in defects:
                 # 링크 출처 정보만 추가
-                lf = defects[dst_id_int].setdefault("linked_from", "")
-                lf2 = f"Relation({issue_id})"
+                lf = defects[did].setdefault("linked_from", "")
                 if lf:
-                    if lf2 not in lf.split(", "):
-                        defects[dst_id_int]["linked_from"] = lf + ", " + lf2
+                    if source not in lf.split(", "):
+                        defects[did]["linked_from"] = lf + ", " + source
                 else:
-                    defects[dst_id_int]["linked_from"] = lf2
-                continue
-
-            iss = get_issue_by_id(self.conn, dst_id_int)
-            if not iss:
-                continue
-            defects[dst_id_int] = {
-                "id": dst_id_int,
+                    defects[did]["linked_from"] = source
+                return
+            defects[did] = {
+                "id": did,
                 "jira_key": iss.get("jira_key") or "",
                 "summary": iss.get("summary") or "",
                 "status": iss.get("status") or "",
                 "priority": iss.get("priority") or "",
                 "assignee": iss.get("assignee") or "",
-                "linked_from": f"Relation({issue_id})",
+                "linked_from": source,
             }
 
+        defect_columns = ["jira_key", "summary", "status", "priority", "assignee"]
+
+        # 1) Relations 기반 Defects (대상 이슈는 한 번에 조회)
+        rels = get_relations_for_issue(self.conn, issue_id)
+        dst_ids: List[int] = []
+        for r in rels:
+            if (r.get("dst_issue_type") or "").upper() != "DEFECT":
+                continue
+            try:
+                dst_ids.append(int(r.get("dst_issue_id")))
+            except (TypeError, ValueError):
+                continue
+        rel_issues = get_issues_by_ids(self.conn, dst_ids, columns=defect_columns)
+        for dst_id in dst_ids:
+            iss = rel_issues.get(dst_id)
+            if iss:
+                _add_defect(iss, f"Relation({issue_id})")
+
         # 2) 해당 이슈가 TEST_EXECUTION 인 경우, 그 하위 TCE 의 defects 문자열 기반
         row = None
         try:
@@ -8707,38 +9219,23 @@ class MainWindow(QMainWindow):
 
         if row:
             tces = get_testcase_executions(self.conn, row["id"])
-            from backend.db import get_issue_by_jira_key
-
+            keys_by_tce: List[tuple[Any, List[str]]] = []
             for tce in tces:
                 defects_str = tce.get("defects") or ""
-                if not defects_str:
-                    continue
                 keys = [x.strip() for x in defects_str.split(",") if x.strip()]
+                if keys:
+                    keys_by_tce.append((tce.get("id"), keys))
+            key_issues = get_issues_by_jira_keys(
+                self.conn,
+                self.project.id,
+                [k for _, keys in keys_by_tce for k in keys],
+                columns=defect_columns,
+            )
+            for tce_id, keys in keys_by_tce:
                 for key in keys:
-                    iss = get_issue_by_jira_key(self.conn, self.project.id, key)
-                    if not iss:
-                        continue
-                    did = iss.get("id")
-                    if not did:
-                        continue
-                    if did in defects:
-                        lf = defects[did].setdefault("linked_from", "")
-                        lf2 = f"TCE({tce.get('id')})"
-                        if lf:
-                            if lf2 not in lf.split(", "):
-                                defects[did]["linked_from"] = lf + ", " + lf2
-                        else:
-                            defects[did]["linked_from"] = lf2
-                        continue
-                    defects[did] = {
-                        "id": did,
-                        "jira_key": iss.get("jira_key") or "",
-                        "summary": iss.get("summary") or "",
-                        "status": iss.get("status") or "",
-                        "priority": iss.get("priority") or "",
-                        "assignee": iss.get("assignee") or "",
-                        "linked_from": f"TCE({tce.get('id')})",
-                    }
+                    iss = key_issues.get(key)
+                    if iss:
+                        _add_defect(iss, f"TCE({tce_id})")
 
         return list(defects.values())
 
@@ -8778,7 +9275,7 @@ class MainWindow(QMainWindow):
             return
 
         # 좌측 트리에서 해당 이슈를 선택하도록 시도 (간단 구현: 현재 이슈만 Details 로 로드)
-        defect = get_issue_by_id(self.conn, defect_id)
+        defect = self._get_local_issue_detail(defect_id)
         if not defect:
             self.status_bar.showMessage(f"Defect id={defect_id} not found in DB.")
             return
@@ -8834,48 +9331,53 @@ class MainWindow(QMainWindow):
             "rtm_environment": tabs.ed_rtm_env.currentText().strip(),
             "due_date": tabs.ed_due_date.text().strip(),
             "description": tabs.txt_description.toPlainText().strip(),
-            "attachments": tabs.ed_attachments.text().strip(),
+            # attachments 는 저장하지 않는다: issue_attachments 는 첨부 추가/삭제 핸들러만 변경하며,
+            # 텍스트 박스 값을 되돌려 쓰면 (빈 값 등) 첨부 행이 지워질 수 있다.
         }
         if issue_type == "TEST_CASE" and hasattr(tabs, "get_preconditions_text"):
             fields["preconditions"] = tabs.get_preconditions_text()
         # 빈 문자열만 있는 키는 그대로 둬도 무방하지만, 필요시 None 제거도 가능
-        update_issue_fields(self.conn, self.current_issue_id, fields)
 
-        # 2) Steps 저장 (TEST_CASE일 때만)
-        if issue_type == "TEST_CASE":
-            try:
-                steps = tabs.collect_steps()
-                replace_steps_for_issue(self.conn, self.current_issue_id, steps)
-            except Exception as e_steps:
-                print(f"[WARN] save steps failed: {e_steps}")
+        # 1)~5) 를 한 트랜잭션으로 저장한다 (커밋 1회). 각 부분의 실패는 경고만 남기고
+        #       해당 부분의 변경만 되돌린다 (replace_* 는 내부적으로 savepoint 사용).
+        with transaction(self.conn):
+            update_issue_fields(self.conn, self.current_issue_id, fields)
 
-        # 3) Relations 저장 (모든 이슈 공통)
-        try:
-            rels = tabs.collect_relations()
-            replace_relations_for_issue(self.conn, self.current_issue_id, rels)
-        except Exception as e_rels:
-            print(f"[WARN] save relations failed: {e_rels}")
+            # 2) Steps 저장 (TEST_CASE일 때만)
+            if issue_type == "TEST_CASE":
+                try:
+                    steps = tabs.collect_steps()
+                    replace_steps_for_issue(self.conn, self.current_issue_id, steps)
+                except Exception as e_steps:
+                    print(f"[WARN] save steps failed: {e_steps}")
 
-        # 4) Test Plan - Test Case 매핑 저장
-        if issue_type == "TEST_PLAN":
+            # 3) Relations 저장 (모든 이슈 공통)
             try:
-                tp_records = tabs.collect_testplan_testcases()
-                replace_testplan_testcases(self.conn, self.current_issue_id, tp_records)
-            except Exception as e_tp:
-                print(f"[WARN] save testplan mappings failed: {e_tp}")
+                rels = tabs.collect_relations()
+                replace_relations_for_issue(self.conn, self.current_issue_id, rels)
+            except Exception as e_rels:
+                print(f"[WARN] save relations failed: {e_rels}")
 
-        # 5) Test Execution 메타/케이스 저장
-        if issue_type == "TEST_EXECUTION":
-            try:
-                te_fields = tabs.collect_testexecution_meta()
-                update_testexecution_for_issue(self.conn, self.current_issue_id, te_fields)
+            # 4) Test Plan - Test Case 매핑 저장
+            if issue_type == "TEST_PLAN":
+                try:
+                    tp_records = tabs.collect_testplan_testcases()
+                    replace_testplan_testcases(self.conn, self.current_issue_id, tp_records)
+                except Exception as e_tp:
+                    print(f"[WARN] save testplan mappings failed: {e_tp}")
 
-                tce_records = tabs.collect_testcase_executions()
-                if tce_records:
-                    te_row = get_or_create_testexecution_for_issue(self.conn, self.current_issue_id)
-                    replace_testcase_executions(self.conn, te_row["id"], tce_records)
-            except Exception as e_te:
-                print(f"[WARN] save testexecution data failed: {e_te}")
+            # 5) Test Execution 메타/케이스 저장
+            if issue_type == "TEST_EXECUTION":
+                try:
+                    te_fields = tabs.collect_testexecution_meta()
+                    update_testexecution_for_issue(self.conn, self.current_issue_id, te_fields)
+
+                    tce_records = tabs.collect_testcase_executions()
+                    if tce_records:
+                        te_row = get_or_create_testexecution_for_issue(self.conn, self.current_issue_id)
+                        replace_testcase_executions(self.conn, te_row["id"], tce_records)
+                except Exception as e_te:
+                    print(f"[WARN] save testexecution data failed: {e_te}")
 
         self.status_bar.showMessage("Local issue saved.")
 
@@ -8945,6 +9447,14 @@ class MainWindow(QMainWindow):
             else:
                 from backend.db import update_issue_fields
                 update_issue_fields(self.conn, self.current_issue_id, {"jira_key": new_key})
+                # 생성 payload 에 들어간 필드는 동기화된 것으로 본다.
+                # (Steps 등 자식 컬렉션과 '*' 는 다음 Push 에서 보내도록 남겨 둔다)
+                pending = get_pending_fields(self.conn, self.current_issue_id)
+                clear_pending_changes(
+                    self.conn,
+                    self.current_issue_id,
+                    {f for f in pending if f not in PENDING_COLLECTIONS and f != PENDING_ALL},
+                )
                 self.status_bar.showMessage(f"Created in JIRA as {new_key}.")
                 # 트리 갱신
                 self.reload_local_tree()
@@ -9366,6 +9876,7 @@ class MainWindow(QMainWindow):
         - (TEST_PLAN일 경우) Test Plan - Test Case 매핑 동기화
         - (TEST_EXECUTION일 경우) Test Execution 메타 + Test Case Execution 목록 동기화
         - Relations (Jira issue links) 를 relations 테이블로 동기화
+        가져온 부분은 서버 값으로 덮어쓰였으므로 해당 pending 변경 기록을 지운다.
         """
         if not self.jira_available or not self.jira_client:
             self.status_bar.showMessage("Cannot pull: Jira RTM not configured.")
@@ -9422,8 +9933,13 @@ class MainWindow(QMainWindow):
             # 2) mapping layer 사용하여 로컬 필드 업데이트 dict 생성
             updates = jira_mapping.map_jira_to_local(issue_type, data)
 
+            # 서버 값으로 덮어쓴 필드/컬렉션 (끝에서 pending 기록을 지운다)
+            pulled: set[str] = set()
+            # 실패한 하위 Pull (첨부 / Steps / TP / TE / Relations) - 하나라도 있으면 '*' 는 남겨 둔다
+            pull_failed: list[str] = []
             if updates:
                 update_issue_fields(self.conn, self.current_issue_id, updates)
+                pulled |= set(updates)
 
             # 2-1) 첨부파일: 설정에 따라 JIRA 첨부파일을 로컬 파일로 다운로드하고 메타를 저장
             attach_cfg = (self.local_settings or {}).get("attachments", {}) if hasattr(self, "local_settings") else {}
@@ -9434,8 +9950,6 @@ class MainWindow(QMainWindow):
                     from backend.attachments_fs import get_issue_attachments_dir
                     import json
                     from pathlib import Path
-                    import requests
-                    from requests.auth import HTTPBasicAuth
 
                     fields = data.get("fields") or {}
                     att_list = fields.get("attachment") or []
@@ -9468,16 +9982,7 @@ class MainWindow(QMainWindow):
                             # 동일 파일이 이미 있으면 다운로드를 생략할 수도 있으나,
                             # 여기서는 간단히 항상 덮어쓴다.
                             try:
-                                auth = HTTPBasicAuth(
-                                    self.jira_client.config.username,
-                                    self.jira_client.config.api_token,
-                                )
-                                resp = requests.get(url, auth=auth, stream=True)
-                                resp.raise_for_status()
-                                with open(dst, "wb") as f:
-                                    for chunk in resp.iter_content(chunk_size=8192):
-                                        if chunk:
-                                            f.write(chunk)
+                                self.jira_client.download_to_file(url, dst)
                             except Exception as e_dl:
                                 print(f"[WARN] Failed to download attachment {att_id} from {url}: {e_dl}")
                                 continue
@@ -9500,33 +10005,20 @@ class MainWindow(QMainWindow):
 
                         if items:
                             # 기존 로컬 attachments 메타와 병합 (로컬 전용 항목은 유지)
-                            issue_before = get_issue_by_id(self.conn, self.current_issue_id)
-                            merged: list[dict] = []
-                            if issue_before:
-                                raw = issue_before.get("attachments")
-                                if raw:
-                                    try:
-                                        if isinstance(raw, str):
-                                            prev_items = json.loads(raw)
-                                        elif isinstance(raw, list):
-                                            prev_items = raw
-                                        else:
-                                            prev_items = []
-                                    except Exception:
-                                        prev_items = []
-                                    if isinstance(prev_items, list):
-                                        for it in prev_items:
-                                            if not isinstance(it, dict):
-                                                continue
-                                            # JIRA id 가 없는 순수 로컬 첨부만 유지
-                                            if not it.get("id"):
-                                                merged.append(it)
+                            merged: list[dict] = [
+                                it
+                                for it in get_issue_attachments(self.conn, self.current_issue_id)
+                                # JIRA id 가 없는 순수 로컬 첨부만 유지
+                                if not it.get("id")
+                            ]
                             merged.extend(items)
                             json_text = json.dumps(merged, ensure_ascii=False)
                             update_issue_fields(self.conn, self.current_issue_id, {"attachments": json_text})
                             # UI 갱신
                             self.left_panel.issue_tabs._load_attachments_list(json_text)
+                    pulled.add("attachments")
                 except Exception as e_att:
+                    pull_failed.append("attachments")
                     print(f"[WARN] Failed to sync attachments from JIRA: {e_att}")
 
             # 3) Test Case인 경우: Steps도 별도 endpoint를 통해 동기화
@@ -9536,10 +10028,12 @@ class MainWindow(QMainWindow):
                     local_steps = jira_mapping.map_jira_testcase_steps_to_local(steps_json)
                     from backend.db import replace_steps_for_issue  # local import to avoid circular issues
                     replace_steps_for_issue(self.conn, self.current_issue_id, local_steps)
+                    pulled.add("steps")
                     # UI 갱신
                     if hasattr(self.left_panel.issue_tabs, "load_steps"):
                         self.left_panel.issue_tabs.load_steps(local_steps)
                 except Exception as e_steps:
+                    pull_failed.append("steps")
                     # Steps 동기화 실패는 치명적 에러로 간주하지 않고 로그만 남김
                     print(f"[WARN] Failed to sync Test Case steps from JIRA: {e_steps}")
 
@@ -9549,14 +10043,19 @@ class MainWindow(QMainWindow):
                     tp_json = self.jira_client.get_testplan_testcases(jira_key)
                     tp_items = jira_mapping.map_jira_testplan_testcases_to_local(tp_json)
                     from backend.db import replace_testplan_testcases, get_testplan_testcases
-                    # testcase_key -> local testcase_id 로 변환
-                    from backend.db import get_issue_by_jira_key
+                    # testcase_key -> local testcase_id 로 변환 (한 번에 조회)
+                    tc_issues = get_issues_by_jira_keys(
+                        self.conn,
+                        self.project.id,
+                        [item.get("testcase_key") for item in tp_items],
+                        columns=["id"],
+                    )
                     records = []
                     for item in tp_items:
                         tc_key = item.get("testcase_key")
                         if not tc_key:
                             continue
-                        tc_issue = get_issue_by_jira_key(self.conn, self.project.id, tc_key)
+                        tc_issue = tc_issues.get(tc_key)
                         if not tc_issue:
                             # 로컬에 없는 TC는 스킵
                             continue
@@ -9568,10 +10067,12 @@ class MainWindow(QMainWindow):
                         )
                     if records:
                         replace_testplan_testcases(self.conn, self.current_issue_id, records)
+                        pulled.add("testplan_testcases")
                         tp_rels = get_testplan_testcases(self.conn, self.current_issue_id)
                         if hasattr(self.left_panel.issue_tabs, "load_testplan_testcases"):
                             self.left_panel.issue_tabs.load_testplan_testcases(tp_rels)
                 except Exception as e_tp:
+                    pull_failed.append("testplan_testcases")
                     print(f"[WARN] Failed to sync Test Plan testcases from JIRA: {e_tp}")
 
             # 5) Test Execution인 경우: 메타 + Test Case Execution 동기화
@@ -9584,18 +10085,24 @@ class MainWindow(QMainWindow):
                         # get_or_create 를 이용해 id 확보 후 메타 업데이트
                         te_row = get_or_create_testexecution_for_issue(self.conn, self.current_issue_id)
                         update_testexecution_for_issue(self.conn, self.current_issue_id, te_meta)
+                        pulled.add("testexecution")
                     # Test Case Execution 목록
                     tce_json = self.jira_client.get_testexecution_testcases(jira_key)
                     tce_items = jira_mapping.map_jira_testexecution_testcases_to_local(tce_json)
                     if tce_items:
-                        # testcase_key -> local testcase_id 매핑 필요
-                        from backend.db import get_issue_by_jira_key
+                        # testcase_key -> local testcase_id 매핑 (한 번에 조회)
+                        tc_issues = get_issues_by_jira_keys(
+                            self.conn,
+                            self.project.id,
+                            [item.get("testcase_key") for item in tce_items],
+                            columns=["id"],
+                        )
                         tce_records = []
                         for item in tce_items:
                             tc_key = item.get("testcase_key")
                             if not tc_key:
                                 continue
-                            tc_issue = get_issue_by_jira_key(self.conn, self.project.id, tc_key)
+                            tc_issue = tc_issues.get(tc_key)
                             if not tc_issue:
                                 continue
                             tce_records.append(
@@ -9615,11 +10122,13 @@ class MainWindow(QMainWindow):
                             # 다시 get_or_create로 testexecution id 확보 후 replace
                             te_row = get_or_create_testexecution_for_issue(self.conn, self.current_issue_id)
                             replace_testcase_executions(self.conn, te_row["id"], tce_records)
+                            pulled.add("testcase_executions")
                             # UI 갱신: Executions 탭
                             execs = get_testcase_executions(self.conn, te_row["id"])
                             if hasattr(self.left_panel.issue_tabs, "load_testcase_executions"):
                                 self.left_panel.issue_tabs.load_testcase_executions(execs)
                 except Exception as e_te:
+                    pull_failed.append("testexecution")
                     print(f"[WARN] Failed to sync Test Execution from JIRA: {e_te}")
 
             # 6) Jira issue links + RTM Requirement coverage -> local relations 동기화
@@ -9662,15 +10171,21 @@ class MainWindow(QMainWindow):
                         rel_entries = list(merged.values())
 
                 if rel_entries:
-                    from backend.db import replace_relations_for_issue, get_relations_for_issue, get_issue_by_jira_key
-                    # dst_jira_key 를 로컬 issue_id 로 변환
+                    from backend.db import replace_relations_for_issue, get_relations_for_issue
+                    # dst_jira_key 를 로컬 issue_id 로 변환 (한 번에 조회)
+                    dst_issues = get_issues_by_jira_keys(
+                        self.conn,
+                        self.project.id,
+                        [rel.get("dst_jira_key") for rel in rel_entries],
+                        columns=["id"],
+                    )
                     rel_records = []
                     for rel in rel_entries:
                         dst_key = rel.get("dst_jira_key")
                         rel_type = rel.get("relation_type") or ""
                         if not dst_key:
                             continue
-                        dst_issue = get_issue_by_jira_key(self.conn, self.project.id, dst_key)
+                        dst_issue = dst_issues.get(dst_key)
                         if not dst_issue:
                             # 아직 트리에 존재하지 않는 이슈는 스킵
                             continue
@@ -9682,6 +10197,7 @@ class MainWindow(QMainWindow):
                         )
                     if rel_records:
                         replace_relations_for_issue(self.conn, self.current_issue_id, rel_records)
+                        pulled.add("relations")
                         # UI 갱신: Relations / Requirements / Test Cases 탭
                         rels = get_relations_for_issue(self.conn, self.current_issue_id)
                         if hasattr(self.left_panel.issue_tabs, "load_relations"):
@@ -9698,8 +10214,13 @@ class MainWindow(QMainWindow):
                             ]
                             self.left_panel.issue_tabs.load_linked_testcases(tcs)
             except Exception as e_rel:
+                pull_failed.append("relations")
                 print(f"[WARN] Failed to sync relations from JIRA/RTM: {e_rel}")
 
+            if updates and not pull_failed:
+                pulled.add(PENDING_ALL)
+            clear_pending_changes(self.conn, self.current_issue_id, pulled)
+
             if updates:
                 self.status_bar.showMessage(f"Pulled from JIRA and updated local issue {jira_key}.")
                 self.reload_local_tree()
@@ -9720,6 +10241,9 @@ class MainWindow(QMainWindow):
         - (TEST_EXECUTION일 경우) Test Execution 메타 + Test Case Execution 목록을 RTM으로 업데이트
         - 로컬 relations 를 기준으로 Jira issueLink 를 생성 (단순 skeleton, 중복 링크 체크는 미구현)
         (status / priority / assignee / reporter 등은 기본 매핑에서 제외)
+
+        마지막 동기화 이후 바뀐 필드/컬렉션(issue_pending_changes)만 보내고,
+        성공한 부분의 pending 기록을 지운다.
         """
         if not self.jira_available or not self.jira_client:
             self.status_bar.showMessage("Cannot push: Jira RTM not configured.")
@@ -9746,6 +10270,17 @@ class MainWindow(QMainWindow):
             )
             return
 
+        # 마지막 동기화 이후 바뀐 필드/컬렉션 ('*' 이면 어떤 필드인지 몰라 전체를 보낸다)
+        pending = get_pending_fields(self.conn, self.current_issue_id)
+        if not pending:
+            self.status_bar.showMessage(f"No pending local changes to push for {jira_key}.")
+            return
+        push_all = PENDING_ALL in pending
+        changed_columns = {f for f in pending if f not in PENDING_COLLECTIONS and f != PENDING_ALL}
+
+        def wants(part: str) -> bool:
+            return push_all or part in pending
+
         # 동기화 영향 설명 및 사용자 확인 (Sync 모드에 따라 안내 문구 조정)
         sync_mode = getattr(self, "sync_mode", "server")
         if sync_mode == "server":
@@ -9787,237 +10322,262 @@ class MainWindow(QMainWindow):
 
         # 로컬 필드를 JIRA payload로 변환 (mapping layer 사용)
         project_key = self.project.key if self.project else None
-        payload = jira_mapping.build_jira_update_payload(issue_type, issue, project_key)
+        payload = jira_mapping.build_jira_update_payload(
+            issue_type, issue, project_key, changed_fields=None if push_all else changed_columns
+        )
+        # 비워서 payload 에 들어가지 않은 컬럼은 보낸 것이 아니므로 pending 으로 남긴다.
+        unsent_columns = (
+            set()
+            if push_all
+            else jira_mapping.unsent_changed_fields(issue_type, issue, project_key, changed_columns)
+        )
+        # 성공적으로 보낸 pending 항목 / 실패한 부분
+        pushed: set[str] = set()
+        failed: list[str] = sorted(unsent_columns)
 
         try:
             self.status_bar.showMessage(f"Pushing to JIRA: {jira_key} ({issue_type})...")
             QApplication.setOverrideCursor(Qt.WaitCursor)
 
-            # 1) 기본 필드 업데이트
-            self.jira_client.update_entity(issue_type, jira_key, payload)
+            # 1) 기본 필드 업데이트 (JIRA 로 매핑되는 바뀐 필드가 없으면 생략)
+            if payload:
+                self.jira_client.update_entity(issue_type, jira_key, payload)
+            pushed |= changed_columns - unsent_columns
 
             # 2) Test Case인 경우 Steps도 별도 endpoint로 업데이트
-            if issue_type == "TEST_CASE":
+            if issue_type == "TEST_CASE" and wants("steps"):
                 from backend.db import get_steps_for_issue  # local import
                 local_steps = get_steps_for_issue(self.conn, self.current_issue_id)
                 steps_payload = jira_mapping.build_jira_testcase_steps_payload(local_steps)
                 try:
                     self.jira_client.update_testcase_steps(jira_key, steps_payload)
+                    pushed.add("steps")
                 except Exception as e_steps:
+                    failed.append("steps")
                     print(f"[WARN] Failed to push Test Case steps to JIRA: {e_steps}")
 
             # 3) Test Plan인 경우: Test Case 매핑을 RTM에 업데이트
-            if issue_type == "TEST_PLAN":
+            if issue_type == "TEST_PLAN" and wants("testplan_testcases"):
                 try:
                     from backend.db import get_testplan_testcases
                     tp_rels = get_testplan_testcases(self.conn, self.current_issue_id)
                     # tp_rels 는 join 결과로 testcase_jira_key 또는 jira_key 포함하도록 설계되어 있음
                     tp_payload = jira_mapping.build_jira_testplan_testcases_payload(tp_rels)
                     self.jira_client.update_testplan_testcases(jira_key, tp_payload)
+                    pushed.add("testplan_testcases")
                 except Exception as e_tp:
+                    failed.append("testplan_testcases")
                     print(f"[WARN] Failed to push Test Plan testcases to JIRA: {e_tp}")
 
             # 4) Test Execution인 경우: 메타 + Test Case Execution 목록을 RTM에 업데이트
-            if issue_type == "TEST_EXECUTION":
+            if issue_type == "TEST_EXECUTION" and (wants("testexecution") or wants("testcase_executions")):
+                # 실패한 단계의 컬렉션만 pending 으로 남기기 위해 현재 단계를 기록한다.
+                te_stage = "testexecution" if wants("testexecution") else "testcase_executions"
                 try:
                     from backend.db import get_or_create_testexecution_for_issue, get_testcase_executions
                     te_row = get_or_create_testexecution_for_issue(self.conn, self.current_issue_id)
-                    # te_row 에는 이미 최신 메타가 저장되어 있다고 가정
-                    te_meta = {
-                        "environment": te_row.get("environment"),
-                        "start_date": te_row.get("start_date"),
-                        "end_date": te_row.get("end_date"),
-                        "result": te_row.get("result"),
-                        "executed_by": te_row.get("executed_by"),
-                    }
-                    te_payload = jira_mapping.build_jira_testexecution_payload(te_meta)
-                    self.jira_client.update_testexecution(jira_key, te_payload)
+                    if wants("testexecution"):
+                        # te_row 에는 이미 최신 메타가 저장되어 있다고 가정
+                        te_meta = {
+                            "environment": te_row.get("environment"),
+                            "start_date": te_row.get("start_date"),
+                            "end_date": te_row.get("end_date"),
+                            "result": te_row.get("result"),
+                            "executed_by": te_row.get("executed_by"),
+                        }
+                        te_payload = jira_mapping.build_jira_testexecution_payload(te_meta)
+                        self.jira_client.update_testexecution(jira_key, te_payload)
+                        pushed.add("testexecution")
 
                     # Test Case Executions
-                    tce_records = get_testcase_executions(self.conn, te_row["id"])
-                    tce_payload = jira_mapping.build_jira_testexecution_testcases_payload(tce_records)
-                    self.jira_client.update_testexecution_testcases(jira_key, tce_payload)
+                    if wants("testcase_executions"):
+                        te_stage = "testcase_executions"
+                        tce_records = get_testcase_executions(self.conn, te_row["id"])
+                        tce_payload = jira_mapping.build_jira_testexecution_testcases_payload(tce_records)
+                        self.jira_client.update_testexecution_testcases(jira_key, tce_payload)
+                        pushed.add("testcase_executions")
                 except Exception as e_te:
-                    print(f"[WARN] Failed to push Test Execution to JIRA: {e_te}")
+                    failed.append(te_stage)
+                    print(f"[WARN] Failed to push Test Execution ({te_stage}) to JIRA: {e_te}")
 
             # 5) Relations -> Jira issueLink 생성 (skeleton)
-            try:
-                from backend.db import get_relations_for_issue
-                rels = get_relations_for_issue(self.conn, self.current_issue_id)
-                # Jira issueLink 생성 및 Requirement 의 testCasesCovered 동기화에 함께 사용
-                tc_keys_for_req: set[str] = set()
-                for rel in rels:
-                    dst_issue_id = rel.get("dst_issue_id")
-                    if not dst_issue_id:
-                        continue
-                    dst_issue = get_issue_by_id(self.conn, dst_issue_id)
-                    if not dst_issue:
-                        continue
-                    dst_key = dst_issue.get("jira_key")
-                    if not dst_key:
-                        continue
+            if wants("relations"):
+                try:
+                    from backend.db import get_relations_for_issue
+                    rels = get_relations_for_issue(self.conn, self.current_issue_id)
+                    # Jira issueLink 생성 및 Requirement 의 testCasesCovered 동기화에 함께 사용
+                    tc_keys_for_req: set[str] = set()
+                    for rel in rels:
+                        dst_issue_id = rel.get("dst_issue_id")
+                        if not dst_issue_id:
+                            continue
+                        dst_issue = get_issue_by_id(self.conn, dst_issue_id)
+                        if not dst_issue:
+                            continue
+                        dst_key = dst_issue.get("jira_key")
+                        if not dst_key:
+                            continue
 
-                    rel_type = rel.get("relation_type") or ""
-                    # relation_type 예: "Relates (out)", "Relates (in)"
-                    base_type = rel_type
-                    direction = "out"
-                    if "(" in rel_type and rel_type.endswith(")"):
-                        base_type, paren = rel_type.rsplit("(", 1)
-                        base_type = base_type.strip()
-                        direction = paren[:-1].strip()
-                    if not base_type:
-                        base_type = "Relates"
-
-                    # Requirement 이슈에서 relation_type 이 "Tests" 이고
-                    # 대상 이슈가 TEST_CASE 인 경우, RTM Requirement 의 testCasesCovered 로도 사용
-                    if (issue_type or "").upper() == "REQUIREMENT":
-                        if (dst_issue.get("issue_type") or "").upper() == "TEST_CASE":
-                            if dst_key:
-                                tc_keys_for_req.add(dst_key)
-
-                    # 방향에 따라 inward/outward 설정
-                    if direction == "in":
-                        inward_key = dst_key
-                        outward_key = jira_key
-                    else:
-                        inward_key = jira_key
-                        outward_key = dst_key
+                        rel_type = rel.get("relation_type") or ""
+                        # relation_type 예: "Relates (out)", "Relates (in)"
+                        base_type = rel_type
+                        direction = "out"
+                        if "(" in rel_type and rel_type.endswith(")"):
+                            base_type, paren = rel_type.rsplit("(", 1)
+                            base_type = base_type.strip()
+                            direction = paren[:-1].strip()
+                        if not base_type:
+                            base_type = "Relates"
+
+                        # Requirement 이슈에서 relation_type 이 "Tests" 이고
+                        # 대상 이슈가 TEST_CASE 인 경우, RTM Requirement 의 testCasesCovered 로도 사용
+                        if (issue_type or "").upper() == "REQUIREMENT":
+                            if (dst_issue.get("issue_type") or "").upper() == "TEST_CASE":
+                                if dst_key:
+                                    tc_keys_for_req.add(dst_key)
+
+                        # 방향에 따라 inward/outward 설정
+                        if direction == "in":
+                            inward_key = dst_key
+                            outward_key = jira_key
+                        else:
+                            inward_key = jira_key
+                            outward_key = dst_key
 
-                    try:
-                        self.jira_client.create_issue_link(base_type, inward_key, outward_key)
-                    except Exception as e_link:
-                        print(f"[WARN] Failed to create issue link {base_type} between {jira_key} and {dst_key}: {e_link}")
+                        try:
+                            self.jira_client.create_issue_link(base_type, inward_key, outward_key)
+                        except Exception as e_link:
+                            print(f"[WARN] Failed to create issue link {base_type} between {jira_key} and {dst_key}: {e_link}")
 
-                # Requirement 의 경우, Relations 정보로부터 RTM testCasesCovered 필드를 업데이트
-                if tc_keys_for_req:
-                    try:
-                        rtm_payload = {
-                            "testCasesCovered": [{"key": k} for k in sorted(tc_keys_for_req)]
-                        }
-                        self.jira_client.update_entity("REQUIREMENT", jira_key, rtm_payload)
-                    except Exception as e_rtm:
-                        print(f"[WARN] Failed to push Requirement testCasesCovered to RTM for {jira_key}: {e_rtm}")
-            except Exception as e_rel:
-                print(f"[WARN] Failed to push relations to JIRA: {e_rel}")
+                    # Requirement 의 경우, Relations 정보로부터 RTM testCasesCovered 필드를 업데이트
+                    if tc_keys_for_req:
+                        try:
+                            rtm_payload = {
+                                "testCasesCovered": [{"key": k} for k in sorted(tc_keys_for_req)]
+                            }
+                            self.jira_client.update_entity("REQUIREMENT", jira_key, rtm_payload)
+                        except Exception as e_rtm:
+                            print(f"[WARN] Failed to push Requirement testCasesCovered to RTM for {jira_key}: {e_rtm}")
+                    pushed.add("relations")
+                except Exception as e_rel:
+                    failed.append("relations")
+                    print(f"[WARN] Failed to push relations to JIRA: {e_rel}")
 
             # 6) 로컬 첨부파일을 JIRA 로 업로드 (아직 업로드되지 않은 파일만)
-            try:
-                import json
-                from pathlib import Path
+            if wants("attachments"):
+                try:
+                    import json
+                    from pathlib import Path
 
-                raw = issue.get("attachments")
-                items = []
-                if raw:
-                    try:
-                        if isinstance(raw, str):
-                            items = json.loads(raw)
-                        elif isinstance(raw, list):
-                            items = raw
-                    except Exception:
-                        items = []
-                if isinstance(items, list) and items:
-                    root = self._get_attachments_root()
-                    changed = False
-                    for att in items:
-                        if not isinstance(att, dict):
-                            continue
-                        # 이미 JIRA id 가 있으면 건너뜀
-                        if att.get("id"):
-                            continue
-                        local_path = att.get("local_path")
-                        if not local_path:
-                            continue
-                        full_path = root / local_path
-                        if not full_path.exists():
-                            continue
-                        try:
-                            self.jira_client.add_issue_attachment_from_path(
-                                jira_key, str(full_path)
-                            )
-                            # 성공 시 id/size 등을 다시 채우기 위해 JIRA 표준 이슈를 한번 더 조회
-                            changed = True
-                        except Exception as e_att:
-                            print(f"[WARN] Failed to upload attachment {full_path} to JIRA: {e_att}")
-                    if changed:
-                        # 새로 업로드된 첨부를 반영하기 위해 JIRA 이슈를 다시 읽어
-                        # attachments 메타를 업데이트하되, local_path 는 유지한다.
-                        try:
-                            from backend.attachments_fs import get_issue_attachments_dir
-                            import requests
-                            from requests.auth import HTTPBasicAuth
-
-                            jira_issue_json = self.jira_client.get_jira_issue(jira_key)
-                            fields = jira_issue_json.get("fields") or {}
-                            att_list = fields.get("attachment") or []
-                            if isinstance(att_list, list):
-                                root = self._get_attachments_root()
-                                dst_dir = get_issue_attachments_dir(issue_type or "UNKNOWN", self.current_issue_id, root=root)
-                                merged: list[dict] = []
-                                # 기존 메타에서 local_path 없는 항목(서버 전용) 제외
-                                for old in items:
-                                    if isinstance(old, dict) and not old.get("id"):
-                                        merged.append(old)
-                                auth = HTTPBasicAuth(
-                                    self.jira_client.config.username,
-                                    self.jira_client.config.api_token,
+                    items = get_issue_attachments(self.conn, self.current_issue_id)
+                    if items:
+                        root = self._get_attachments_root()
+                        changed = False
+                        for att in items:
+                            if not isinstance(att, dict):
+                                continue
+                            # 이미 JIRA id 가 있으면 건너뜀
+                            if att.get("id"):
+                                continue
+                            local_path = att.get("local_path")
+                            if not local_path:
+                                continue
+                            full_path = root / local_path
+                            if not full_path.exists():
+                                continue
+                            try:
+                                self.jira_client.add_issue_attachment_from_path(
+                                    jira_key, str(full_path)
                                 )
-                                for att in att_list:
-                                    if not isinstance(att, dict):
-                                        continue
-                                    url = (
-                                        att.get("content")
-                                        or att.get("contentUrl")
-                                        or att.get("self")
-                                    )
-                                    filename = att.get("filename") or att.get("fileName") or att.get("name")
-                                    att_id = att.get("id") or att.get("attachmentId")
-                                    size = att.get("size") or att.get("filesize")
-                                    if not url or not filename or not att_id:
-                                        continue
-                                    sub_dir = dst_dir / str(att_id)
-                                    sub_dir.mkdir(parents=True, exist_ok=True)
-                                    dst = sub_dir / filename
-                                    try:
-                                        resp = requests.get(url, auth=auth, stream=True)
-                                        resp.raise_for_status()
-                                        with open(dst, "wb") as f:
-                                            for chunk in resp.iter_content(chunk_size=8192):
-                                                if chunk:
-                                                    f.write(chunk)
-                                    except Exception:
-                                        # 다운로드 실패 시에도 메타만 먼저 반영
-                                        pass
-                                    try:
-                                        actual_size = dst.stat().st_size
-                                    except OSError:
-                                        actual_size = size
-                                    rel_path = str(dst.relative_to(root))
-                                    merged.append(
-                                        {
-                                            "filename": filename,
-                                            "size": actual_size,
-                                            "id": att_id,
-                                            "content": url,
-                                            "local_path": rel_path,
-                                        }
+                                # 성공 시 id/size 등을 다시 채우기 위해 JIRA 표준 이슈를 한번 더 조회
+                                changed = True
+                            except Exception as e_att:
+                                failed.append("attachments")
+                                print(f"[WARN] Failed to upload attachment {full_path} to JIRA: {e_att}")
+                        if changed:
+                            # 새로 업로드된 첨부를 반영하기 위해 JIRA 이슈를 다시 읽어
+                            # attachments 메타를 업데이트하되, local_path 는 유지한다.
+                            try:
+                                from backend.attachments_fs import get_issue_attachments_dir
+
+                                jira_issue_json = self.jira_client.get_jira_issue(jira_key)
+                                fields = jira_issue_json.get("fields") or {}
+                                att_list = fields.get("attachment") or []
+                                if isinstance(att_list, list):
+                                    root = self._get_attachments_root()
+                                    dst_dir = get_issue_attachments_dir(issue_type or "UNKNOWN", self.current_issue_id, root=root)
+                                    merged: list[dict] = []
+                                    # 기존 메타에서 local_path 없는 항목(서버 전용) 제외
+                                    for old in items:
+                                        if isinstance(old, dict) and not old.get("id"):
+                                            merged.append(old)
+                                    for att in att_list:
+                                        if not isinstance(att, dict):
+                                            continue
+                                        url = (
+                                            att.get("content")
+                                            or att.get("contentUrl")
+                                            or att.get("self")
+                                        )
+                                        filename = att.get("filename") or att.get("fileName") or att.get("name")
+                                        att_id = att.get("id") or att.get("attachmentId")
+                                        size = att.get("size") or att.get("filesize")
+                                        if not url or not filename or not att_id:
+                                            continue
+                                        sub_dir = dst_dir / str(att_id)
+                                        sub_dir.mkdir(parents=True, exist_ok=True)
+                                        dst = sub_dir / filename
+                                        try:
+                                            self.jira_client.download_to_file(url, dst)
+                                        except Exception:
+                                            # 다운로드 실패 시에도 메타만 먼저 반영
+                                            pass
+                                        try:
+                                            actual_size = dst.stat().st_size
+                                        except OSError:
+                                            actual_size = size
+                                        rel_path = str(dst.relative_to(root))
+                                        merged.append(
+                                            {
+                                                "filename": filename,
+                                                "size": actual_size,
+                                                "id": att_id,
+                                                "content": url,
+                                                "local_path": rel_path,
+                                            }
+                                        )
+                                    json_text = json.dumps(merged, ensure_ascii=False)
+                                    from backend.db import update_issue_fields
+
+                                    update_issue_fields(
+                                        self.conn,
+                                        self.current_issue_id,
+                                        {"attachments": json_text},
                                     )
-                                json_text = json.dumps(merged, ensure_ascii=False)
-                                from backend.db import update_issue_fields
-
-                                update_issue_fields(
-                                    self.conn,
-                                    self.current_issue_id,
-                                    {"attachments": json_text},
-                                )
-                                # UI 갱신
-                                self.left_panel.issue_tabs._load_attachments_list(json_text)
-                        except Exception as e_sync_att:
-                            print(f"[WARN] Failed to refresh attachments after upload: {e_sync_att}")
-
-            except Exception as e_all_att:
-                print(f"[WARN] Attachment push phase failed: {e_all_att}")
+                                    # UI 갱신
+                                    self.left_panel.issue_tabs._load_attachments_list(json_text)
+                            except Exception as e_sync_att:
+                                failed.append("attachments")
+                                print(f"[WARN] Failed to refresh attachments after upload: {e_sync_att}")
+
+                    if "attachments" not in failed:
+                        pushed.add("attachments")
+                except Exception as e_all_att:
+                    failed.append("attachments")
+                    print(f"[WARN] Attachment push phase failed: {e_all_att}")
+
+            # 성공한 부분의 pending 기록만 지운다 (실패한 부분은 다음 Push 에서 다시 보낸다)
+            if push_all and not failed:
+                pushed.add(PENDING_ALL)
+            clear_pending_changes(self.conn, self.current_issue_id, pushed)
+            self.reload_local_tree()
 
-            self.status_bar.showMessage(f"Pushed local changes to JIRA for {jira_key}.")
+            if failed:
+                self.status_bar.showMessage(
+                    f"Pushed to JIRA for {jira_key}; still pending: {', '.join(sorted(set(failed)))}."
+                )
+            else:
+                self.status_bar.showMessage(f"Pushed local changes to JIRA for {jira_key}.")
 
         except Exception as e:
             self.status_bar.showMessage(f"Push to JIRA failed: {e}")